@@ -13,6 +13,16 @@ from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf.csrf import CSRFProtect
 
+from app.utils.feed import FeedInbox
+from app.utils.image_cache import ImageCache
+from app.utils.live_events import LiveEvents
+from app.utils.related import RelatedVideos
+from app.utils.sql_metrics import SQLMetrics
+from app.utils.tag_graph import TagGraph
+from app.utils.thumbnails import Thumbnails
+from app.utils.transcode import Transcoder
+from app.utils.view_counter import ViewCounter
+
 # ---------------------------------------------------------------------------
 # DB 확장 객체 (모듈 레벨)
 # 기능: Flask-SQLAlchemy 확장. create_app() 내에서 init_app(app)으로 앱에 연결합니다.
@@ -20,6 +30,26 @@ from flask_wtf.csrf import CSRFProtect
 # ---------------------------------------------------------------------------
 db = SQLAlchemy()
 login_manager = LoginManager()
+# CSRF 보호. 읽기 전용 POST 엔드포인트는 @csrf.exempt 로 제외합니다.
+csrf = CSRFProtect()
+# 조회수 write-behind 버퍼. 라우트에서 from app import view_counter 로 사용.
+view_counter = ViewCounter()
+# 관련 동영상 추천 엔진 (점수화 + 후보 인덱스). 라우트에서 from app import related_videos 로 사용.
+related_videos = RelatedVideos()
+# 태그 동시 출현 행렬 (관련 태그). 라우트에서 from app import tag_graph 로 사용.
+tag_graph = TagGraph()
+# 요청별 SQL 계측 (쿼리 수·DB 시간·N+1 의심). 테스트에서 from app import sql_metrics 로 사용.
+sql_metrics = SQLMetrics()
+# 구독 피드 받은편지함 (fan-out-on-write). 라우트에서 from app import feed_inbox 로 사용.
+feed_inbox = FeedInbox()
+# 비디오별 실시간 카운트 푸시 (SSE). 라우트에서 from app import live_events 로 사용.
+live_events = LiveEvents()
+# 업로드 후 백그라운드 변환 (faststart MP4 + HLS). 라우트에서 from app import transcoder 로 사용.
+transcoder = Transcoder()
+# 썸네일 크기별 WebP/JPEG 파생 이미지. 라우트에서 from app import thumbnails 로 사용.
+thumbnails = Thumbnails()
+# 프로필 이미지 크기 조절 (?w=) 디스크 LRU 캐시. 라우트에서 from app import image_cache 로 사용.
+image_cache = ImageCache()
 
 
 def create_app():
@@ -37,6 +67,14 @@ def create_app():
     video_folder = os.path.join(project_root, "uploads", "videos")
     thumbnail_folder = os.path.join(project_root, "uploads", "thumbnails")
     profile_folder = os.path.join(project_root, "uploads", "profiles")
+    # 조각 업로드 중인 파일 (완료 시 video_folder 로 rename → 같은 파일시스템에 둠)
+    incoming_folder = os.path.join(project_root, "uploads", "incoming")
+    # 변환 결과 (<video_id>/faststart.mp4, master.m3u8, hls_<높이>p/)
+    transcode_folder = os.path.join(project_root, "uploads", "transcoded")
+    # 썸네일 파생 이미지 (<너비>/<썸네일 파일명>.webp|jpg)
+    thumbnail_variant_folder = os.path.join(project_root, "uploads", "derived", "thumbnails")
+    # 프로필 이미지 크기 조절 캐시 (<너비>/<파일명>.<형식>, 크기 상한 LRU)
+    profile_cache_folder = os.path.join(project_root, "uploads", "cache", "profiles")
 
     # ----- 3) 설정(config) 등록 -----
     # 기능: DB URI, 업로드 폴더·용량·확장자, 기본 user_id 등을 앱 설정에 넣습니다.
@@ -55,10 +93,16 @@ def create_app():
         VIDEO_FOLDER=video_folder,
         THUMBNAIL_FOLDER=thumbnail_folder,
         PROFILE_IMAGE_FOLDER=profile_folder,
+        UPLOAD_SESSION_FOLDER=incoming_folder,
+        TRANSCODE_FOLDER=transcode_folder,
+        THUMBNAIL_VARIANT_FOLDER=thumbnail_variant_folder,
+        PROFILE_IMAGE_CACHE_FOLDER=profile_cache_folder,
         # 업로드 제한 (바이트)
         MAX_VIDEO_SIZE=2 * 1024 * 1024 * 1024,  # 2GB
         MAX_THUMBNAIL_SIZE=5 * 1024 * 1024,  # 5MB
         MAX_PROFILE_IMAGE_SIZE=5 * 1024 * 1024,  # 5MB
+        # 요청 본문 전체 상한: 동영상 + 썸네일 + 폼 필드 여유분. 넘으면 Werkzeug 가 본문을 읽는 중에 413
+        MAX_CONTENT_LENGTH=2 * 1024 * 1024 * 1024 + 6 * 1024 * 1024,
         # 허용 확장자 (set, 소문자로 비교)
         ALLOWED_VIDEO_EXTENSIONS={"mp4", "webm", "mov"},
         ALLOWED_THUMBNAIL_EXTENSIONS={"jpg", "jpeg", "png", "gif", "webp"},
@@ -66,6 +110,79 @@ def create_app():
         ALLOWED_IMAGE_EXTENSIONS={"jpg", "jpeg", "png", "gif", "webp"},  # validate_image_file 호환
         # 로그인 미연동 시 업로드에 사용할 user_id (기본 1)
         DEFAULT_USER_ID=1,
+        # 조회수 write-behind: memory(프로세스 내) 또는 file(워커 간 공유 spool)
+        VIEW_COUNTER_BACKEND=os.environ.get("VIEW_COUNTER_BACKEND", "memory"),
+        VIEW_COUNTER_FLUSH_THRESHOLD=50,  # 미반영 조회수가 이 건수에 도달하면 flush
+        VIEW_COUNTER_FLUSH_INTERVAL=5.0,  # 이 초마다 백그라운드 스레드가 flush (기록 시에도 지났으면 flush)
+        VIEW_COUNTER_TIMER=True,  # False 면 주기 flush 스레드 없이 기록 시에만 flush
+        VIEW_COUNTER_SPOOL_PATH=os.path.join(project_root, "instance", "view_counter.spool"),
+        # 검색 인덱스 토크나이저: hangul_bigram(기본) | hangul_trigram | trigram
+        SEARCH_TOKENIZER=os.environ.get("SEARCH_TOKENIZER", "hangul_bigram"),
+        # 관련 동영상 후보 테이블(related_candidates): 비디오별 저장 후보 수, 다시 계산하기까지의 시간(초)
+        RELATED_CANDIDATES=20,
+        RELATED_CACHE_TTL=300,
+        # 태그 동시 출현 행렬 파일 (워커 간 mmap 공유). 델타 이 건수 초과·이 초 경과 시 백그라운드 재구축
+        TAG_GRAPH_PATH=os.environ.get("TAG_GRAPH_PATH", os.path.join(project_root, "instance", "tag_graph.bin")),
+        TAG_GRAPH_COMPACT_EVERY=500,
+        TAG_GRAPH_MAX_AGE=3600,
+        # 요청별 SQL 계측: 느린 문장 보관 수, 같은 문장이 이 횟수 이상이면 N+1 의심,
+        # Server-Timing 헤더 (None 이면 디버그 모드에서만)
+        SQL_METRICS_ENABLED=True,
+        SQL_METRICS_SLOW_TOP=5,
+        SQL_METRICS_N_PLUS_ONE=5,
+        SQL_METRICS_SERVER_TIMING=None,
+        # 댓글 목록: 최상위 댓글 페이지 크기(시청 페이지·더보기·API 기본값), 댓글마다 미리 보여줄 답글 수
+        COMMENTS_PER_PAGE=20,
+        COMMENT_REPLY_PREVIEW=3,
+        # GET /api/comments/<id>/thread 기본 깊이 (답글의 답글 단계 수), 응답 1번의 최대 댓글 수
+        COMMENT_THREAD_DEPTH=5,
+        COMMENT_THREAD_MAX_NODES=500,
+        # POST /api/likes/status 한 번에 조회할 수 있는 비디오 수
+        LIKES_STATUS_MAX_IDS=100,
+        # 구독 피드: 업로드 시 백그라운드 배포 여부, 구독자가 이 수를 넘는 채널은 읽을 때 모음(pull)
+        FEED_FANOUT_ASYNC=True,
+        FEED_FANOUT_MAX_SUBSCRIBERS=5000,
+        # 구독 피드 읽기 전략: inbox(받은편지함) | merge(채널별 k-way 병합) | in_list(기존 IN 쿼리)
+        FEED_STRATEGY=os.environ.get("FEED_STRATEGY", "inbox"),
+        # 실시간 카운트(SSE): 워커 간 전달 memory | db, 프로세스당 연결 상한, 하트비트·연결 최대 유지(초),
+        # 이벤트 최소 간격(초, 그동안 증감분 합침), db 백엔드 polling 주기·보관 기간(초)
+        LIVE_EVENTS_BACKEND=os.environ.get("LIVE_EVENTS_BACKEND", "memory"),
+        LIVE_EVENTS_MAX_CONNECTIONS=100,
+        LIVE_EVENTS_HEARTBEAT=15,
+        LIVE_EVENTS_MAX_AGE=300,
+        LIVE_EVENTS_MIN_INTERVAL=1.0,
+        LIVE_EVENTS_POLL_INTERVAL=1.0,
+        LIVE_EVENTS_RETENTION=60,
+        # 이어 올리기 조각 업로드: 권장 조각 크기, 조각 1개 최대 크기, 마지막 조각 이후 세션 유지 시간(초),
+        # 사용자당 진행 중 세션 수, 전체 세션이 미리 할당한 바이트 합 상한
+        UPLOAD_CHUNK_SIZE=8 * 1024 * 1024,
+        UPLOAD_CHUNK_MAX=64 * 1024 * 1024,
+        UPLOAD_SESSION_TTL=24 * 3600,
+        UPLOAD_SESSION_MAX_PER_USER=3,
+        UPLOAD_SESSION_MAX_RESERVED_BYTES=20 * 1024 * 1024 * 1024,
+        # 업로드 후 변환(ffmpeg): 사용 여부(ffmpeg·ffprobe 가 없으면 자동으로 꺼짐), 노드 전체 동시 ffmpeg 수,
+        # 실행 파일, ffmpeg 1회 제한 시간(초), running 으로 이보다 오래 남은 작업은 죽은 것으로 보고 다시 예약(초),
+        # HLS 세그먼트 길이(초), HLS 화질 (높이, 영상 kbps)
+        TRANSCODE_ENABLED=os.environ.get("TRANSCODE_ENABLED", "1") != "0",
+        TRANSCODE_WORKERS=int(os.environ.get("TRANSCODE_WORKERS", "2")),
+        FFMPEG_PATH=os.environ.get("FFMPEG_PATH", "ffmpeg"),
+        FFPROBE_PATH=os.environ.get("FFPROBE_PATH", "ffprobe"),
+        TRANSCODE_TIMEOUT=3600,
+        TRANSCODE_STALE_AFTER=3 * 3600,
+        HLS_SEGMENT_SECONDS=6,
+        HLS_RENDITIONS=((360, 800), (720, 2800), (1080, 5000)),
+        # 썸네일 파생 이미지: 너비(px, srcset 후보), WebP·JPEG 품질, 생성 작업 스레드 수, 브라우저 캐시(초)
+        THUMBNAIL_WIDTHS=(160, 320, 640),
+        THUMBNAIL_QUALITY=80,
+        THUMBNAIL_WORKERS=2,
+        THUMBNAIL_VARIANT_MAX_AGE=365 * 24 * 3600,
+        # 프로필 이미지 ?w= 크기 조절: 허용 너비(요청 값은 이 중 하나로 올림), 디스크 캐시 상한(바이트, 모든 워커 합계),
+        # 상한 정리(폴더 스캔) 주기(초), 품질, 브라우저 캐시(초, 원본이 내용 해시 이름이라 같은 URL 의 내용은 바뀌지 않음)
+        PROFILE_IMAGE_WIDTHS=(32, 48, 64, 96, 128, 256),
+        PROFILE_IMAGE_CACHE_MAX_BYTES=64 * 1024 * 1024,
+        PROFILE_IMAGE_CACHE_SWEEP_INTERVAL=30,
+        PROFILE_IMAGE_QUALITY=85,
+        PROFILE_IMAGE_MAX_AGE=7 * 24 * 3600,
     )
 
     # ----- 4) 업로드·DB용 디렉터리 생성 -----
@@ -73,6 +190,10 @@ def create_app():
     os.makedirs(app.config["VIDEO_FOLDER"], exist_ok=True)
     os.makedirs(app.config["THUMBNAIL_FOLDER"], exist_ok=True)
     os.makedirs(app.config["PROFILE_IMAGE_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["UPLOAD_SESSION_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["TRANSCODE_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["THUMBNAIL_VARIANT_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["PROFILE_IMAGE_CACHE_FOLDER"], exist_ok=True)
     instance_path = os.path.join(project_root, "instance")
     os.makedirs(instance_path, exist_ok=True)
 
@@ -85,9 +206,18 @@ def create_app():
     # ----- 5) DB 확장을 현재 앱에 연결 -----
     # 기능: db.Model, db.session, db.create_all() 등을 이 앱 컨텍스트에서 사용 가능하게 함.
     db.init_app(app)
+    sql_metrics.init_app(app)
+    view_counter.init_app(app)
+    related_videos.init_app(app)
+    tag_graph.init_app(app)
+    feed_inbox.init_app(app)
+    live_events.init_app(app)
+    transcoder.init_app(app)
+    thumbnails.init_app(app)
+    image_cache.init_app(app)
 
     # ----- 5-0) CSRF 보호 (댓글 등 수동 폼용) -----
-    CSRFProtect(app)
+    csrf.init_app(app)
 
     # ----- 5-1) Flask-Login 초기화 -----
     login_manager.init_app(app)
@@ -112,10 +242,12 @@ def create_app():
     from app.routes.api import api_bp
     from app.routes.comments import comments_bp
     from app.routes.likes import likes_bp
+    from app.routes.live import live_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(comments_bp)
     app.register_blueprint(likes_bp)
+    app.register_blueprint(live_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(studio_bp)
     app.register_blueprint(admin_bp)
@@ -156,6 +288,14 @@ def create_app():
     with app.app_context():
         # 등록된 모델(User, Video) 기준으로 테이블 생성. 없으면 생성, 있으면 스킵
         db.create_all()
+        # 구독 집계 컬럼 (기존 DB 면 컬럼 추가 후 subscriptions 로 채움). users 조회 전에 실행
+        from app.utils.subscription_counts import ensure_subscription_counts
+
+        ensure_subscription_counts(app)
+        # 댓글 수 집계 컬럼 (기존 DB 면 컬럼 추가 후 comments 로 채움). videos 조회 전에 실행
+        from app.utils.comment_counts import ensure_comment_counts
+
+        ensure_comment_counts(app)
         # user_id=1 이 없으면 업로드 시 DEFAULT_USER_ID(1)를 쓸 수 없으므로 기본 유저 생성
         if db.session.get(User, 1) is None:
             default_user = User(
@@ -165,6 +305,24 @@ def create_app():
             default_user.set_password("default")
             db.session.add(default_user)
             db.session.commit()
+        # 전문 검색 인덱스 (SQLite FTS5). 불가하면 LIKE 검색으로 폴백
+        from app.utils.search_index import ensure_index
+
+        ensure_index(app)
+        # 인기 태그 집계 테이블 (기존 DB 면 video_tags 로 한 번 채움)
+        from app.utils.tag_stats import ensure_tag_stats
+
+        ensure_tag_stats(app)
+        # 구독 피드 받은편지함 (기존 DB 면 subscriptions·videos 로 한 번 채움)
+        from app.utils.feed import ensure_feed_inbox
+
+        ensure_feed_inbox(app)
+        # 업로드 파일 참조 수 (기존 DB 면 videos·users 로 한 번 채움)
+        from app.utils.media_store import ensure_media_blobs, release_pins
+
+        ensure_media_blobs(app)
+    # 업로드 후 행에 쓰지 않은 파일 고정 해제 (db 의 세션 정리보다 먼저 실행되도록 db.init_app 이후 등록)
+    app.teardown_appcontext(release_pins)
 
     return app
 
@@ -3,9 +3,15 @@
 from app.models import User, Video, Tag, Subscription 로 사용.
 """
 from app.models.comment import Comment
+from app.models.feed import FeedItem, FeedPullChannel
+from app.models.live_event import LiveEvent
+from app.models.media import MediaBlob
+from app.models.related import RelatedCandidate
+from app.models.rendition import Rendition
 from app.models.subscription import Subscription
-from app.models.tag import Tag
+from app.models.tag import Tag, TagStat
+from app.models.upload import UploadSession
 from app.models.user import User
 from app.models.video import Video
 
-__all__ = ["Comment", "Subscription", "User", "Video", "Tag"]
+__all__ = ["Comment", "FeedItem", "FeedPullChannel", "LiveEvent", "MediaBlob", "RelatedCandidate", "Rendition", "Subscription", "User", "Video", "Tag", "TagStat", "UploadSession"]
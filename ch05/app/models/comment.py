@@ -16,6 +16,12 @@ class Comment(db.Model):
     """비디오 댓글 및 대댓글."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # 비디오별 최상위 댓글 페이지 (app.utils.comment_threads): video_id·parent_id 고정, created_at·id 순
+        db.Index("idx_comments_video_thread", "video_id", "parent_id", "created_at", "id"),
+        # 댓글별 답글 페이지·답글 수
+        db.Index("idx_comments_parent_created", "parent_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     content = db.Column(db.Text, nullable=False)
@@ -32,6 +38,10 @@ class Comment(db.Model):
     parent = db.relationship(
         "Comment",
         remote_side=[id],
-        backref=db.backref("replies", lazy="joined", order_by="Comment.created_at"),
+        # 답글은 필요할 때만 로드 (댓글 목록은 comment_threads 가 페이지 단위로 따로 조회).
+        # 세션에서 댓글을 지우면 답글도 ORM 으로 함께 삭제 → 행마다 after_delete 가 불려 videos.comment_count 가 맞게 유지됨
+        # (SQLite 는 FK CASCADE 를 강제하지 않고, DB 가 지우면 이벤트가 없어 집계가 어긋남)
+        # 삭제 라우트는 답글을 행마다 읽지 않도록 app.utils.comment_tree.delete_subtree 를 사용
+        backref=db.backref("replies", lazy="select", order_by="Comment.created_at", cascade="all, delete-orphan"),
         foreign_keys=[parent_id],
     )
@@ -0,0 +1,37 @@
+"""
+구독 피드 모델 – feed_inbox, feed_pull_channels 테이블.
+구독자별 받은편지함(fan-out-on-write)과, 구독자가 너무 많아 읽을 때 모으는(pull-on-read) 채널 목록.
+"""
+
+from app import db
+
+
+class FeedItem(db.Model):
+    """
+    구독 피드 받은편지함 (feed_inbox): subscriber_id 의 /subscriptions 에 보일 비디오 1건.
+    업로드 시 구독자마다 1행씩 미리 넣어 두고 (app.utils.feed), 피드는 인덱스 범위 스캔 1번으로 읽음.
+    """
+
+    __tablename__ = "feed_inbox"
+    __table_args__ = (
+        # 피드 페이지: subscriber_id 고정, created_at·video_id 역순
+        db.Index("idx_feed_inbox_subscriber", "subscriber_id", "created_at", "video_id"),
+        # 구독 해제(author_id + subscriber_id)·pull 전환(author_id) 시 채널 행 정리
+        db.Index("idx_feed_inbox_author", "author_id", "subscriber_id"),
+    )
+
+    subscriber_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    video_id = db.Column(db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    author_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=True)  # 비디오 업로드 시각 (videos.created_at 복사)
+
+
+class FeedPullChannel(db.Model):
+    """
+    pull-on-read 채널 (feed_pull_channels): 구독자 수가 FEED_FANOUT_MAX_SUBSCRIBERS 를 넘은 채널.
+    이 채널의 비디오는 받은편지함에 넣지 않고 피드를 읽을 때 videos 에서 직접 가져옴.
+    """
+
+    __tablename__ = "feed_pull_channels"
+
+    channel_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,32 @@
+"""
+실시간 카운트 이벤트 모델 – live_events 테이블.
+LIVE_EVENTS_BACKEND="db" 일 때 워커 프로세스끼리 좋아요·댓글·조회수 증감분을 주고받는 우편함.
+"""
+
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class LiveEvent(db.Model):
+    """
+    비디오 1개의 증감분 묶음 (예: {"likes": 1, "views": 3}).
+    쓴 워커는 origin 으로 자기 행을 건너뛰고, 다른 워커는 id 순으로 읽어 자기 SSE 연결에 전달 (app.utils.live_events).
+    보관 기간(LIVE_EVENTS_RETENTION)이 지난 행은 주기적으로 삭제.
+    """
+
+    __tablename__ = "live_events"
+    __table_args__ = (
+        # 오래된 행 정리
+        db.Index("idx_live_events_created", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    video_id = db.Column(db.Integer, nullable=False)
+    origin = db.Column(db.String(32), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON: {필드: 증감분}
+    created_at = db.Column(db.DateTime, nullable=False, default=_utc_now)
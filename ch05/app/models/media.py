@@ -0,0 +1,29 @@
+"""
+미디어 파일 참조 수 모델 – media_blobs 테이블.
+업로드 파일은 내용 해시 이름(<sha256>.<확장자>)으로 저장되어 같은 파일을 여러 행이 함께 쓸 수 있음 (app.utils.media_store).
+"""
+
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class MediaBlob(db.Model):
+    """
+    저장 폴더(kind)의 파일 1개와 그 파일을 가리키는 행 수.
+      kind: video (videos.video_path) | thumbnail (videos.thumbnail_path) | profile (users.profile_image)
+    ref_count 는 Video·User 행 추가·변경·삭제 시 같은 트랜잭션에서 증감, 0 이 되면 commit 후 행·파일 삭제.
+    sha256 은 내용 해시 이름이 아닌 예전 파일(uuid 이름 등)이면 NULL.
+    """
+
+    __tablename__ = "media_blobs"
+
+    kind = db.Column(db.String(16), primary_key=True)
+    filename = db.Column(db.String(255), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=True)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utc_now)
@@ -0,0 +1,24 @@
+"""
+관련 동영상 후보 모델 – related_candidates 테이블.
+비디오별 점수 상위 후보를 순위대로 저장해 두고 상세 페이지는 인덱스 조회로 읽음 (app.utils.related).
+"""
+
+from app import db
+
+
+class RelatedCandidate(db.Model):
+    """
+    video_id 의 관련 동영상 후보 1건 (position 0 이 1위).
+    한 비디오의 후보 목록은 한 트랜잭션에서 통째로 지우고 다시 씀 → computed_at 은 목록 전체가 같음.
+    """
+
+    __tablename__ = "related_candidates"
+    __table_args__ = (
+        # 이 비디오를 후보로 가진 목록 찾기 (비디오 변경·삭제 시 무효화)
+        db.Index("idx_related_candidates_related", "related_id"),
+    )
+
+    video_id = db.Column(db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    related_id = db.Column(db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False)  # 점수 계산 시각 (RELATED_CACHE_TTL 지나면 다시 계산)
@@ -0,0 +1,40 @@
+"""
+변환본 모델 – video_renditions 테이블.
+업로드 후 백그라운드 ffmpeg 작업(app.utils.transcode)이 만드는 faststart MP4·HLS 화질별 상태.
+"""
+
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class Rendition(db.Model):
+    """
+    비디오 1개의 변환본 1개.
+      name: "mp4" (faststart MP4) | "hls_<높이>p" (HLS 화질)
+      status: queued → running → ready | failed | skipped (원본보다 높은 화질)
+      path: TRANSCODE_FOLDER 기준 상대 경로 (mp4 는 파일, hls 는 index.m3u8)
+    """
+
+    __tablename__ = "video_renditions"
+    __table_args__ = (db.UniqueConstraint("video_id", "name", name="uq_video_renditions_video_name"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    video_id = db.Column(db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    name = db.Column(db.String(32), nullable=False)
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    bitrate = db.Column(db.Integer, nullable=True)  # 영상+음성 kbps (HLS BANDWIDTH)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    path = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utc_now)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utc_now, onupdate=_utc_now)
+
+    @property
+    def is_hls(self):
+        return self.name.startswith("hls_")
@@ -15,6 +15,10 @@ class Subscription(db.Model):
     """구독 관계: subscriber_id가 subscribed_to_id 채널을 구독."""
 
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # 채널별 구독자 조회·집계 (PK 는 subscriber_id 가 앞이라 사용 불가)
+        db.Index("idx_subscriptions_channel", "subscribed_to_id", "subscriber_id"),
+    )
 
     subscriber_id = db.Column(
         db.Integer,
@@ -20,3 +20,20 @@ class Tag(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(50), nullable=False, unique=True)
     created_at = db.Column(db.DateTime, default=_utc_now)
+
+
+class TagStat(db.Model):
+    """
+    태그별 사용 통계 (tag_stats) – 인기 태그 조회용 집계 테이블.
+    video_tags 를 매번 GROUP BY 하지 않도록 비디오 태그 변경 시 같은 트랜잭션에서 증감 (app.utils.tag_stats).
+    """
+
+    __tablename__ = "tag_stats"
+    __table_args__ = (
+        # 인기 태그 상위 N개: 이 인덱스를 역순으로 읽고 LIMIT
+        db.Index("idx_tag_stats_popular", "video_count", "tag_id"),
+    )
+
+    tag_id = db.Column(db.Integer, db.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    video_count = db.Column(db.Integer, nullable=False, default=0)  # 태그가 달린 비디오 수
+    last_used_at = db.Column(db.DateTime, nullable=True)  # 마지막으로 비디오에 연결된 시각
@@ -0,0 +1,46 @@
+"""
+이어 올리기(resumable) 업로드 세션 모델 – upload_sessions 테이블.
+studio 의 조각 업로드 API (app.utils.uploads) 가 진행 상태를 워커끼리 공유하는 데 사용.
+"""
+
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class UploadSession(db.Model):
+    """
+    동영상 1개의 조각 업로드 진행 상태.
+    조각은 UPLOAD_SESSION_FOLDER/<filename>.part (미리 size 만큼 할당) 에 바로 기록되고,
+    received 는 앞에서부터 빈틈없이 받은 바이트 수 (다음 조각의 offset).
+    완료하면 VIDEO_FOLDER 에 내용 해시 이름(<sha256>.ext)으로 rename 후 Video 행 생성, 세션 행 삭제.
+    expires_at 이 지난 세션은 조각 파일과 함께 정리.
+    """
+
+    __tablename__ = "upload_sessions"
+    __table_args__ = (
+        # 만료 세션 정리
+        db.Index("idx_upload_sessions_expires", "expires_at"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)  # 업로드 토큰 (uuid4 hex)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)  # 조각 파일 이름 (uuid.ext)
+    original_name = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    received = db.Column(db.BigInteger, nullable=False, default=0)
+    # 완료 시 Video 행에 들어갈 값
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=True)
+    category = db.Column(db.String(50), nullable=True)
+    tags = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utc_now)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    @property
+    def is_complete(self):
+        return self.received >= self.size
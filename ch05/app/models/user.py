@@ -31,6 +31,10 @@ class User(UserMixin, db.Model):
     profile_image = db.Column(db.String(255), nullable=True)           # 프로필 이미지 파일 경로 또는 URL
     profile_image_public_id = db.Column(db.String(255), nullable=True) # 클라우드 저장 시 public_id (예: Cloudinary)
 
+    # ----- 구독 집계 (subscriptions 변경 시 같은 트랜잭션에서 SQL 증감, app.utils.subscription_counts) -----
+    subscriber_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")    # 이 채널의 구독자 수
+    subscription_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # 이 사용자가 구독한 채널 수
+
     # ----- 권한 -----
     is_admin = db.Column(db.Boolean, nullable=False, default=False)   # 관리자 여부
 
@@ -60,13 +64,21 @@ class User(UserMixin, db.Model):
         """입력한 비밀번호가 저장된 해시와 일치하는지 검증."""
         return check_password_hash(self.password_hash, password)
 
-    def get_profile_image_url(self):
+    def get_profile_image_url(self, size=None):
         """
         프로필 이미지 URL 반환 (main.media_profile).
-        없으면 None. 템플릿에서 url_for('main.media_profile', filename=...) 와 동일.
+        없으면 None. size(px)를 주면 ?w=size – 그 크기 이하로 줄인 이미지 (app.utils.image_cache).
         """
         if not self.profile_image:
             return None
         from flask import url_for
 
-        return url_for("main.media_profile", filename=self.profile_image)
+        if size is None:
+            return url_for("main.media_profile", filename=self.profile_image)
+        return url_for("main.media_profile", filename=self.profile_image, w=size)
+
+    def get_profile_image_srcset(self, size):
+        """<img srcset> 값 "<url ?w=size> 1x, <url ?w=size*2> 2x" (고밀도 화면용). 없으면 빈 문자열."""
+        if not self.profile_image:
+            return ""
+        return f"{self.get_profile_image_url(size)} 1x, {self.get_profile_image_url(size * 2)} 2x"
@@ -29,12 +29,28 @@ video_likes = db.Table(
     db.Column("created_at", db.DateTime, default=_utc_now),
 )
 
+# save_tags 가 video_tags 를 바꾼 뒤 호출할 콜백 목록 (검색 인덱스·태그 통계 등 각 모듈이 스스로 등록)
+_TAGS_CHANGED_HOOKS = []
+
+
+def on_tags_changed(callback):
+    """
+    save_tags 로 태그가 바뀌면 같은 트랜잭션 안에서 callback(session, connection, video, added, removed) 호출.
+    added·removed: 추가·삭제된 tag_id 집합. 같은 콜백은 1번만 등록.
+    """
+    if callback not in _TAGS_CHANGED_HOOKS:
+        _TAGS_CHANGED_HOOKS.append(callback)
+
 
 class Video(db.Model):
     """업로드된 동영상 정보."""
 
     # 테이블명
     __tablename__ = "videos"
+    __table_args__ = (
+        # 채널별 최신 비디오 (구독 피드 병합·채널 페이지): user_id 고정, created_at·id 역순
+        db.Index("idx_videos_user_created", "user_id", "created_at", "id"),
+    )
 
     # ----- 기본 키 -----
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -54,6 +70,8 @@ class Video(db.Model):
     # ----- 통계 -----
     views = db.Column(db.Integer, nullable=False, default=0)   # 조회수
     likes = db.Column(db.Integer, nullable=False, default=0) # 좋아요 수
+    # 댓글 수 (답글 포함). 댓글 추가·삭제와 같은 트랜잭션에서 증감 (app.utils.comment_counts)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # ----- 작성자 (users.id 참조. 유저 삭제 시 해당 영상도 CASCADE 삭제) -----
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -76,36 +94,88 @@ class Video(db.Model):
         from flask import url_for
         return url_for("main.media_video", filename=self.video_path)
 
-    def get_thumbnail_url(self):
-        """썸네일 이미지 URL 반환 (poster 등). 없으면 None."""
+    def get_thumbnail_url(self, size=None, fmt="jpg"):
+        """
+        썸네일 이미지 URL 반환 (poster 등). 없으면 None.
+        size(THUMBNAIL_WIDTHS 중 하나)를 주면 그 너비의 파생 이미지 (fmt: webp | jpg, app.utils.thumbnails).
+        """
         if not self.thumbnail_path:
             return None
         from flask import url_for
-        return url_for("main.media_thumbnail", filename=self.thumbnail_path)
+        if size is None or "/" in self.thumbnail_path:
+            return url_for("main.media_thumbnail", filename=self.thumbnail_path)
+        from app.utils.thumbnails import variant_name
+        return url_for("main.media_thumbnail_variant", width=size, filename=variant_name(self.thumbnail_path, fmt))
+
+    def get_thumbnail_srcset(self, fmt="webp"):
+        """<img srcset> 값 "<url> 160w, <url> 320w, ..." (썸네일 없으면 빈 문자열)."""
+        from app import thumbnails
+        return thumbnails.srcset(self, fmt)
 
     def save_tags(self, tag_string, commit=True):
         """
         콤마로 구분된 태그 문자열을 파싱해 Tag 객체로 변환 후 비디오에 연결.
         예: "태그1, 태그2, 태그3" -> [Tag(태그1), Tag(태그2), Tag(태그3)]
         기존 태그 연결은 새 태그 목록으로 교체됨.
+
+        태그 수와 관계없이 쿼리 수가 일정하도록 일괄 처리:
+          1) 이름 IN 조회 1번
+          2) 없는 이름만 multi-row INSERT ... ON CONFLICT DO NOTHING 후 다시 IN 조회
+             (동시 업로드가 같은 새 태그를 만들어도 UNIQUE 위반 없음)
+          3) 현재 video_tags 와 비교해 빠진 행만 DELETE, 추가된 행만 INSERT
+        video_tags 를 Core SQL 로 바꾸므로 ORM 이벤트가 발생하지 않음 → on_tags_changed 로 등록된
+        콜백(검색 인덱스·태그 통계 등)을 같은 트랜잭션에서 호출.
         """
+        from sqlalchemy import delete, select
+        from sqlalchemy.orm.attributes import set_committed_value
+
         from app.models.tag import Tag
+        from app.utils.sql import insert_ignore
 
         if not tag_string or not isinstance(tag_string, str):
             tag_names = []
         else:
             tag_names = [name.strip() for name in tag_string.split(",") if name.strip()]
-
-        tag_objects = []
-        for name in tag_names:
-            if len(name) > 50:
-                continue
-            tag = Tag.query.filter_by(name=name).first()
-            if tag is None:
-                tag = Tag(name=name)
-                db.session.add(tag)
-            tag_objects.append(tag)
-
-        self.tags = tag_objects
+        # 50자 초과 제외, 중복 제거 (입력 순서 유지)
+        tag_names = list(dict.fromkeys(name for name in tag_names if len(name) <= 50))
+
+        session = db.session
+        session.flush()  # 새 비디오면 id 확보
+        tags_by_name = {}
+        if tag_names:
+            tags_by_name = {t.name: t for t in Tag.query.filter(Tag.name.in_(tag_names))}
+            missing = [name for name in tag_names if name not in tags_by_name]
+            if missing:
+                now = _utc_now()
+                insert_ignore(
+                    session.connection(), Tag.__table__,
+                    [{"name": name, "created_at": now} for name in missing], ["name"],
+                )
+                tags_by_name.update({t.name: t for t in Tag.query.filter(Tag.name.in_(missing))})
+        tag_objects = [tags_by_name[name] for name in tag_names if name in tags_by_name]
+
+        connection = session.connection()
+        new_ids = {t.id for t in tag_objects}
+        current_ids = set(
+            connection.execute(select(video_tags.c.tag_id).where(video_tags.c.video_id == self.id)).scalars()
+        )
+        added, removed = new_ids - current_ids, current_ids - new_ids
+        if removed:
+            connection.execute(
+                delete(video_tags).where(video_tags.c.video_id == self.id, video_tags.c.tag_id.in_(removed))
+            )
+        if added:
+            now = _utc_now()
+            insert_ignore(
+                connection, video_tags,
+                [{"video_id": self.id, "tag_id": tag_id, "created_at": now} for tag_id in sorted(added)],
+                ["video_id", "tag_id"],
+            )
+        # DB 와 같은 상태로 컬렉션 설정 (변경 이력이 남지 않아 flush 시 다시 쓰지 않음)
+        set_committed_value(self, "tags", tag_objects)
+
+        if added or removed:
+            for callback in list(_TAGS_CHANGED_HOOKS):
+                callback(session, connection, self, added, removed)
         if commit:
-            db.session.commit()
+            session.commit()
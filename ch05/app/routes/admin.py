@@ -2,12 +2,14 @@
 
 from pathlib import Path
 
-from flask import Blueprint, current_app, flash, redirect, render_template, request, send_file, url_for
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, send_file, url_for
 from flask_login import current_user, login_required
 from sqlalchemy.orm import joinedload
 
-from app import db
+from app import db, live_events, sql_metrics
 from app.models import Comment, User, Video
+from app.utils.comment_counts import site_comment_total
+from app.utils.comment_tree import delete_subtree
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -41,15 +43,9 @@ def index():
         "user_count": User.query.count(),
         "video_count": Video.query.count(),
         "channel_count": User.query.count(),  # 사용자 = 채널
-        "comment_count": 0,  # Comment 모델 미구현 시 0
+        # 영상별 댓글 수 집계 컬럼의 합 (comments 전체 COUNT 없음)
+        "comment_count": site_comment_total(),
     }
-    try:
-        from sqlalchemy import text
-
-        r = db.session.execute(text("SELECT COUNT(*) FROM comments")).scalar()
-        stats["comment_count"] = int(r) if r else 0
-    except Exception:
-        pass
     return render_template("admin/index.html", stats=stats)
 
 
@@ -144,8 +140,11 @@ def comments():
 def comment_delete(comment_id):
     """관리자 댓글 삭제. 본인 확인 없이 삭제 가능."""
     comment = Comment.query.get_or_404(comment_id)
-    db.session.delete(comment)
+    # 답글까지 하위 트리를 DELETE 1번으로 삭제, 댓글 수도 같은 트랜잭션에서 차감
+    video_id = comment.video_id
+    removed = delete_subtree(db.session.connection(), comment.id, video_id)
     db.session.commit()
+    live_events.publish(video_id, comments=-removed)
     flash("댓글이 삭제되었습니다.", "success")
     # 삭제 후 동일 페이지로 리다이렉트 (form hidden 또는 args)
     page = request.form.get("page") or request.args.get("page", 1)
@@ -189,6 +188,20 @@ def query():
     return render_template("admin/query.html")
 
 
+@admin_bp.route("/metrics/sql", methods=["GET", "POST"])
+@login_required
+@_admin_required
+def metrics_sql():
+    """
+    엔드포인트별 SQL 통계 (JSON): 요청 수, 평균·최대 쿼리 수, DB 시간, 느린 문장, N+1 의심 문장.
+    POST 는 누적 통계 초기화.
+    """
+    if request.method == "POST":
+        sql_metrics.reset()
+        return jsonify({"success": True})
+    return jsonify({"success": True, "endpoints": sql_metrics.snapshot()})
+
+
 @admin_bp.route("/table/<table_name>")
 @login_required
 @_admin_required
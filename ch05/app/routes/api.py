@@ -3,21 +3,33 @@ REST API 블루프린트 – 웹/모바일 앱용 JSON API.
 
 엔드포인트:
   - GET /api/videos (목록, 페이지네이션·검색·정렬)
+    ※ 목록 API 3종은 cursor= 를 주면 keyset(커서) 페이지네이션으로 동작 (COUNT·OFFSET 없음)
   - GET /api/videos/<id> (상세 + 관련 동영상)
   - GET /api/tags/popular (인기 태그)
   - GET /api/tags/<tag_name>/videos (태그별 비디오)
+  - GET /api/tags/<tag_name>/related (함께 자주 쓰인 태그, 태그 동시 출현 행렬)
   - GET /api/users/<username> (사용자 프로필 + 채널 통계)
   - GET /api/users/<username>/videos (사용자 업로드 비디오)
+  - POST /api/likes/status (여러 비디오의 좋아요 여부·좋아요 수 일괄 조회)
+  - GET /api/videos/<id>/comments (최상위 댓글 커서 페이지 + 답글 수·앞쪽 답글)
+  - GET /api/comments/<id>/replies (댓글별 답글 커서 페이지)
+  - GET /api/comments/<id>/thread (댓글 + depth 단계까지의 하위 답글, 재귀 CTE)
 """
 
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 
-from flask import abort, Blueprint, jsonify, request
+from flask import abort, Blueprint, current_app, jsonify, request
+from flask_login import current_user
 
-from app import db
-from app.models import Tag, User, Video
-from app.models.video import video_tags
+from app import csrf, db, related_videos, tag_graph, view_counter
+from app.models import Comment, Tag, User, Video
+from app.models.video import video_likes, video_tags
+from app.utils.comment_threads import reply_page, thread_page
+from app.utils.comment_tree import fetch_thread
+from app.utils.pagination import InvalidCursor, keyset_meta, keyset_paginate
+from app.utils.search_index import apply_search
+from app.utils.tag_stats import popular_tags as get_popular_tags
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
@@ -38,6 +50,11 @@ def _video_to_dict(video):
         "created_at": video.created_at.isoformat() if video.created_at else None,
         "video_url": video.get_video_url() if video.video_path else None,
         "thumbnail_url": video.get_thumbnail_url(),
+        # 크기별 파생 이미지 (app.utils.thumbnails) – 카드는 srcset 으로 표시 너비에 맞는 것만 받음
+        "thumbnail_srcset": {
+            "webp": video.get_thumbnail_srcset("webp"),
+            "jpg": video.get_thumbnail_srcset("jpg"),
+        } if video.thumbnail_path else None,
         "channel": {
             "id": video.user.id if video.user else None,
             "username": video.user.username if video.user else "unknown",
@@ -58,9 +75,30 @@ def _pagination_meta(pagination):
     }
 
 
+def _keyset_response(query, sort, per_page, **extra):
+    """
+    cursor 모드 응답. query 는 필터만 적용된 상태(정렬은 keyset_paginate 가 적용).
+    with_total=1 일 때만 전체 개수 COUNT 실행. 잘못된 커서는 400.
+    """
+    cursor = request.args.get("cursor", "", type=str).strip()
+    with_total = request.args.get("with_total", "", type=str).strip().lower() in ("1", "true")
+    try:
+        page = keyset_paginate(query, sort, cursor=cursor or None, per_page=per_page, with_total=with_total)
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify(
+        {
+            "success": True,
+            **extra,
+            "items": [_video_to_dict(v) for v in page.items],
+            "meta": keyset_meta(page),
+        }
+    )
+
+
 # ---------------------------------------------------------------------------
-# 관련 동영상 추천 알고리즘
-# 1순위: 같은 태그, 2순위: 같은 카테고리, 3순위: 같은 작성자, 4순위: 인기순(조회수/좋아요)
+# 관련 동영상 추천 (app.utils.related 엔진 – main.watch 사이드바와 같은 결과)
+# 점수: 공유 태그 > 같은 카테고리 > 같은 작성자 > 인기도(조회수/좋아요)
 # 조건: 현재 비디오 제외, 중복 없이 limit개
 # ---------------------------------------------------------------------------
 def get_related_videos(video_id, limit=5):
@@ -68,61 +106,7 @@ def get_related_videos(video_id, limit=5):
     상세 조회 시 함께 보여줄 추천 비디오 목록 반환.
     우선순위: 같은 태그 > 같은 카테고리 > 같은 작성자 > 인기순.
     """
-    current = db.session.get(Video, video_id)
-    if not current:
-        return []
-
-    exclude_ids = {video_id}
-    result = []
-    seen_ids = set()
-
-    def add_videos(q, max_take=None):
-        """쿼리에서 limit 남은 개수만큼 추가 (중복·현재 비디오 제외)."""
-        nonlocal result, seen_ids
-        remaining = limit - len(result)
-        if remaining <= 0 or (max_take is not None and max_take <= 0):
-            return
-        q = q.filter(Video.id.notin_(exclude_ids)).options(
-            joinedload(Video.user), joinedload(Video.tags)
-        )
-        if seen_ids:
-            q = q.filter(Video.id.notin_(seen_ids))
-        take = min(remaining, limit) if max_take is None else min(remaining, max_take)
-        rows = q.limit(take).all()
-        for v in rows:
-            if len(result) >= limit:
-                break
-            if v.id not in seen_ids:
-                result.append(v)
-                seen_ids.add(v.id)
-
-    # 1순위: 같은 태그
-    tag_ids = [t.id for t in current.tags] if current.tags else []
-    if tag_ids:
-        subq = (
-            db.session.query(video_tags.c.video_id)
-            .filter(video_tags.c.tag_id.in_(tag_ids))
-            .filter(video_tags.c.video_id != video_id)
-        )
-        add_videos(Video.query.filter(Video.id.in_(subq)).order_by(Video.created_at.desc()))
-
-    # 2순위: 같은 카테고리 (태그로 못 채운 경우)
-    if len(result) < limit and current.category:
-        add_videos(
-            Video.query.filter(Video.category == current.category).order_by(Video.created_at.desc())
-        )
-
-    # 3순위: 같은 작성자
-    if len(result) < limit and current.user_id:
-        add_videos(
-            Video.query.filter(Video.user_id == current.user_id).order_by(Video.created_at.desc())
-        )
-
-    # 4순위: 인기순 (조회수, 좋아요)
-    if len(result) < limit:
-        add_videos(Video.query.order_by(Video.views.desc(), Video.likes.desc()))
-
-    return result[:limit]
+    return related_videos.for_video(video_id, limit=limit, with_tags=True)
 
 
 # ===========================================================================
@@ -134,7 +118,8 @@ def get_related_videos(video_id, limit=5):
 def list_videos():
     """
     비디오 목록. 페이지네이션, 정렬, 카테고리, 검색 지원.
-    파라미터: page, per_page, sort, category, search
+    파라미터: page, per_page, sort(latest|popular|views|relevance), category, search
+    cursor 파라미터가 있으면 keyset 모드 (page 무시, meta 에 next_cursor/prev_cursor).
     """
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 12, type=int)
@@ -158,22 +143,22 @@ def list_videos():
         else:
             query = query.filter(Video.id < 0)
 
-    # 검색: 제목 또는 설명에 검색어 포함
+    # 검색: 제목·설명·태그 전문 검색 (FTS5, 불가 시 LIKE 폴백)
+    rank = None
     if search:
-        pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                Video.title.ilike(pattern),
-                and_(Video.description.isnot(None), Video.description.ilike(pattern)),
-            )
-        )
+        query, rank = apply_search(query, search)
 
     # 카테고리 필터 (all 또는 빈 값이면 필터 없음)
     if category and category != "all":
         query = query.filter(Video.category == category)
 
-    # 정렬
-    if sort == "popular":
+    if "cursor" in request.args:
+        return _keyset_response(query, sort, per_page)
+
+    # 정렬 (relevance 는 검색어가 인덱스로 조회됐을 때만 적용, 아니면 최신순)
+    if sort == "relevance" and rank is not None:
+        query = query.order_by(rank.asc(), Video.id.desc())
+    elif sort == "popular":
         query = query.order_by(Video.likes.desc(), Video.views.desc())
     elif sort == "views":
         query = query.order_by(Video.views.desc())
@@ -201,9 +186,8 @@ def video_detail(video_id):
     if not video:
         abort(404)
 
-    # 조회수 증가
-    video.views += 1
-    db.session.commit()
+    # 조회수 증가 (write-behind 버퍼, 일정 건수·주기마다 일괄 반영)
+    view_counter.record(video)
 
     related = get_related_videos(video_id, limit=5)
     related_items = [_video_to_dict(v) for v in related]
@@ -232,24 +216,39 @@ def popular_tags():
     if limit < 1 or limit > 50:
         limit = 10
 
-    tags = (
-        db.session.query(Tag)
-        .join(video_tags)
-        .group_by(Tag.id)
-        .order_by(func.count(video_tags.c.video_id).desc())
-        .limit(limit)
-        .all()
-    )
+    # tag_stats 집계 테이블에서 비디오 수 상위 N개 (video_tags GROUP BY 없음)
+    tags = get_popular_tags(limit)
 
     items = [{"id": t.id, "name": t.name} for t in tags]
 
     return jsonify({"success": True, "items": items})
 
 
+@api_bp.route("/tags/<tag_name>/related", methods=["GET"])
+def related_tags(tag_name):
+    """
+    함께 자주 쓰인 태그 (app.utils.tag_graph 행렬에서 바로 계산, DB 조회 없음).
+    파라미터: limit (기본 10, 최대 50)
+    """
+    limit = request.args.get("limit", 10, type=int)
+    if limit < 1 or limit > 50:
+        limit = 10
+
+    info = tag_graph.tag_info(tag_name)
+    if info is None:
+        # 행렬에 없으면 비디오가 달린 적 없는 태그 → 존재 여부만 DB 확인
+        tag_obj = Tag.query.filter_by(name=tag_name).first_or_404()
+        info = {"id": tag_obj.id, "name": tag_obj.name, "count": 0}
+
+    items = tag_graph.related(tag_name, limit=limit)
+    return jsonify({"success": True, "tag": info, "items": items})
+
+
 @api_bp.route("/tags/<tag_name>/videos", methods=["GET"])
 def tag_videos(tag_name):
     """
     특정 태그가 달린 비디오 목록. 최신순, 페이지네이션.
+    cursor 파라미터가 있으면 keyset 모드 (sort=latest|views|popular).
     """
     tag_obj = Tag.query.filter_by(name=tag_name).first_or_404()
     page = request.args.get("page", 1, type=int)
@@ -259,13 +258,16 @@ def tag_videos(tag_name):
     if per_page < 1 or per_page > 100:
         per_page = 12
 
-    pagination = (
+    query = (
         Video.query.options(joinedload(Video.user), joinedload(Video.tags))
         .join(video_tags)
         .filter(video_tags.c.tag_id == tag_obj.id)
-        .order_by(Video.created_at.desc())
-        .paginate(page=page, per_page=per_page)
     )
+    if "cursor" in request.args:
+        sort = request.args.get("sort", "latest", type=str).strip() or "latest"
+        return _keyset_response(query, sort, per_page, tag={"id": tag_obj.id, "name": tag_obj.name})
+
+    pagination = query.order_by(Video.created_at.desc()).paginate(page=page, per_page=per_page)
     items = [_video_to_dict(v) for v in pagination.items]
 
     return jsonify(
@@ -286,7 +288,7 @@ def tag_videos(tag_name):
 @api_bp.route("/users/<username>", methods=["GET"])
 def user_profile(username):
     """
-    사용자 프로필 + 채널 통계 (총 조회수, 총 좋아요, 구독자 수).
+    사용자 프로필 + 채널 통계 (총 조회수, 총 좋아요, 구독자 수, 구독 수).
     """
     user = User.query.filter_by(username=username).first_or_404()
 
@@ -299,7 +301,7 @@ def user_profile(username):
         .filter(Video.user_id == user.id)
         .first()
     )
-    subscriber_count = user.subscribers_rel.count()
+    subscriber_count = user.subscriber_count
 
     return jsonify(
         {
@@ -315,6 +317,7 @@ def user_profile(username):
                     "total_likes": int(stats_row.total_likes or 0),
                     "video_count": int(stats_row.video_count or 0),
                     "subscriber_count": subscriber_count,
+                    "subscription_count": user.subscription_count,
                 },
             },
         }
@@ -325,6 +328,7 @@ def user_profile(username):
 def user_videos(username):
     """
     해당 사용자가 업로드한 비디오 목록. 페이지네이션.
+    cursor 파라미터가 있으면 keyset 모드 (sort=latest|views|popular).
     """
     user = User.query.filter_by(username=username).first_or_404()
     page = request.args.get("page", 1, type=int)
@@ -334,12 +338,12 @@ def user_videos(username):
     if per_page < 1 or per_page > 100:
         per_page = 12
 
-    pagination = (
-        Video.query.options(joinedload(Video.user), joinedload(Video.tags))
-        .filter(Video.user_id == user.id)
-        .order_by(Video.created_at.desc())
-        .paginate(page=page, per_page=per_page)
-    )
+    query = Video.query.options(joinedload(Video.user), joinedload(Video.tags)).filter(Video.user_id == user.id)
+    if "cursor" in request.args:
+        sort = request.args.get("sort", "latest", type=str).strip() or "latest"
+        return _keyset_response(query, sort, per_page, user={"id": user.id, "username": user.username})
+
+    pagination = query.order_by(Video.created_at.desc()).paginate(page=page, per_page=per_page)
     items = [_video_to_dict(v) for v in pagination.items]
 
     return jsonify(
@@ -350,3 +354,161 @@ def user_videos(username):
             "meta": _pagination_meta(pagination),
         }
     )
+
+
+# ===========================================================================
+# 4. 좋아요 API
+# ===========================================================================
+
+
+@api_bp.route("/likes/status", methods=["POST"])
+@csrf.exempt
+def likes_status():
+    """
+    여러 비디오의 좋아요 상태 일괄 조회 (목록 화면 카드 배지용).
+    요청 JSON: {"video_ids": [1, 2, ...]} (최대 LIKES_STATUS_MAX_IDS 개)
+    응답: {"success": true, "items": {"<id>": {"is_liked": bool, "likes_count": int}, ...}}
+    - likes.like_status 와 같은 의미: 비로그인은 is_liked 항상 False, 좋아요 수는 videos.likes
+    - 없는 비디오 id 는 items 에서 빠짐
+    - 쿼리: videos IN 1번 + (로그인 시) video_likes IN 1번
+    - 읽기 전용이라 CSRF 검사에서 제외 (POST 는 id 목록을 본문으로 받기 위한 것일 뿐 상태를 바꾸지 않음)
+    """
+    data = request.get_json(silent=True) or {}
+    video_ids = data.get("video_ids")
+    if not isinstance(video_ids, list) or not all(type(v) is int for v in video_ids):
+        return jsonify({"success": False, "error": "video_ids 는 정수 목록이어야 합니다."}), 400
+    limit = current_app.config.get("LIKES_STATUS_MAX_IDS", 100)
+    video_ids = list(dict.fromkeys(video_ids))
+    if len(video_ids) > limit:
+        return jsonify({"success": False, "error": f"video_ids 는 최대 {limit}개까지 가능합니다."}), 400
+    if not video_ids:
+        return jsonify({"success": True, "items": {}})
+
+    counts = dict(db.session.execute(select(Video.id, Video.likes).where(Video.id.in_(video_ids))).all())
+    liked = set()
+    if current_user.is_authenticated and counts:
+        liked = set(
+            db.session.execute(
+                select(video_likes.c.video_id).where(
+                    video_likes.c.user_id == current_user.id,
+                    video_likes.c.video_id.in_(list(counts)),
+                )
+            ).scalars()
+        )
+    items = {
+        str(vid): {"is_liked": vid in liked, "likes_count": counts[vid]}
+        for vid in video_ids
+        if vid in counts
+    }
+    return jsonify({"success": True, "items": items})
+
+
+# ===========================================================================
+# 5. 댓글 API
+# ===========================================================================
+
+
+def _comment_to_dict(comment):
+    """댓글 객체를 API 응답용 딕셔너리로 변환 (작성자는 joinedload 된 상태로 가정)."""
+    return {
+        "id": comment.id,
+        "parent_id": comment.parent_id,
+        "content": comment.content,
+        "likes": comment.likes,
+        "created_at": comment.created_at.isoformat() if comment.created_at else None,
+        "updated_at": comment.updated_at.isoformat() if comment.updated_at else None,
+        "user": {
+            "id": comment.user.id if comment.user else None,
+            "username": comment.user.username if comment.user else "unknown",
+            "profile_image": comment.user.profile_image if comment.user else None,
+        },
+    }
+
+
+def _comments_per_page():
+    per_page = request.args.get("per_page", current_app.config.get("COMMENTS_PER_PAGE", 20), type=int)
+    if per_page < 1 or per_page > 100:
+        per_page = current_app.config.get("COMMENTS_PER_PAGE", 20)
+    return per_page
+
+
+@api_bp.route("/videos/<int:video_id>/comments", methods=["GET"])
+def video_comments(video_id):
+    """
+    최상위 댓글 (작성 시간 순) 커서 페이지. 댓글마다 reply_count 와 앞쪽 답글 replies 개(기본 COMMENT_REPLY_PREVIEW, 최대 10).
+    남은 답글은 /api/comments/<id>/replies?cursor=<replies_cursor> 로 이어서 조회 (replies_cursor 가 null 이면 처음부터).
+    total_comments 는 videos.comment_count (답글 포함).
+    """
+    total = db.session.execute(select(Video.comment_count).where(Video.id == video_id)).scalar()
+    if total is None:
+        abort(404)
+    preview = request.args.get("replies", current_app.config.get("COMMENT_REPLY_PREVIEW", 3), type=int)
+    preview = min(max(preview, 0), 10)
+    cursor = request.args.get("cursor", "", type=str).strip()
+    try:
+        page = thread_page(video_id, cursor=cursor or None, per_page=_comments_per_page(), preview=preview)
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    items = []
+    for thread in page.items:
+        item = _comment_to_dict(thread.comment)
+        item["reply_count"] = thread.reply_count
+        item["replies"] = [_comment_to_dict(r) for r in thread.replies]
+        item["has_more_replies"] = thread.more_replies > 0
+        item["replies_cursor"] = thread.replies_cursor
+        items.append(item)
+    return jsonify(
+        {
+            "success": True,
+            "video_id": video_id,
+            "total_comments": total,
+            "items": items,
+            "meta": {"has_next": page.has_next, "next_cursor": page.next_cursor},
+        }
+    )
+
+
+@api_bp.route("/comments/<int:comment_id>/replies", methods=["GET"])
+def comment_replies(comment_id):
+    """댓글 comment_id 의 답글 (작성 시간 순) 커서 페이지."""
+    if db.session.get(Comment, comment_id) is None:
+        abort(404)
+    cursor = request.args.get("cursor", "", type=str).strip()
+    try:
+        page = reply_page(comment_id, cursor=cursor or None, per_page=_comments_per_page())
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify(
+        {
+            "success": True,
+            "comment_id": comment_id,
+            "items": [_comment_to_dict(r) for r in page.items],
+            "meta": {"has_next": page.has_next, "next_cursor": page.next_cursor},
+        }
+    )
+
+
+@api_bp.route("/comments/<int:comment_id>/thread", methods=["GET"])
+def comment_thread(comment_id):
+    """
+    댓글과 그 아래 depth 단계(기본 COMMENT_THREAD_DEPTH, 최대 50)까지의 답글을 화면 순서로.
+    항목마다 depth (댓글 자신은 0). 하위 트리는 재귀 CTE 로 한 번에 펼침.
+    한 응답은 최대 COMMENT_THREAD_MAX_NODES 개 – 넘으면 truncated=true, continue 의 댓글 id 마다
+    이 API 를 다시 호출해 빠진 답글을 이어 읽음.
+    """
+    depth = request.args.get("depth", current_app.config.get("COMMENT_THREAD_DEPTH", 5), type=int)
+    depth = min(max(depth, 0), 50)
+    limit = current_app.config.get("COMMENT_THREAD_MAX_NODES", 500)
+    thread = fetch_thread(comment_id, max_depth=depth, limit=limit)
+    if not thread.items:
+        abort(404)
+    return jsonify(
+        {
+            "success": True,
+            "comment_id": comment_id,
+            "depth": depth,
+            "items": [dict(_comment_to_dict(comment), depth=level) for comment, level in thread.items],
+            "truncated": thread.truncated,
+            "continue": thread.continue_ids,
+        }
+    )
@@ -1,17 +1,15 @@
 """인증 라우트 – 로그인/회원가입/프로필."""
 
-import os
-from datetime import datetime
-
 from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, login_user, logout_user
 from sqlalchemy import or_
-from werkzeug.utils import secure_filename
 
 from app import db
 from app.forms import LoginForm
 from app.models import User
+from app.utils import media_store
 from app.utils.image import validate_image_file
+from app.utils.ingest import IngestError
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -215,31 +213,19 @@ def profile():
                 email=email or current_user.email,
             ), 400
 
-        save_dir = current_app.config["PROFILE_IMAGE_FOLDER"]
-        # 기존 프로필 이미지 삭제
-        if current_user.profile_image:
-            old_path = os.path.join(save_dir, current_user.profile_image)
-            if os.path.isfile(old_path):
-                try:
-                    os.remove(old_path)
-                except OSError:
-                    pass
-
-        # secure_filename + 타임스탬프로 파일명 생성 (중복 방지)
-        base_name = secure_filename(profile_file.filename) or "profile"
-        if "." in base_name:
-            name_part, ext_part = base_name.rsplit(".", 1)
-            ext_part = ext_part.lower() if ext_part else "jpg"
-        else:
-            name_part, ext_part = base_name, "jpg"
-        timestamp_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = f"{timestamp_prefix}_{name_part}.{ext_part}".replace(" ", "_")
-        if not safe_name or safe_name.startswith("."):
-            safe_name = f"{timestamp_prefix}_profile.{ext_part}"
-
+        # 내용 해시 이름으로 저장 (같은 이미지는 파일 1개 공유). 이전 이미지는 참조 수가 0 이 되면 commit 후 삭제
+        # (app.utils.media_store – 다른 사용자가 같은 파일을 쓰고 있으면 유지)
+        ext_part = profile_file.filename.rsplit(".", 1)[-1].lower()
         try:
-            profile_file.save(os.path.join(save_dir, safe_name))
-            current_user.profile_image = safe_name
+            stored_name, _, _ = media_store.store_upload(profile_file.stream, "profile", ext_part, max_size)
+            current_user.profile_image = stored_name
+        except IngestError as e:
+            flash(str(e), "error")
+            return render_template(
+                "auth/profile.html",
+                nickname=nickname or current_user.nickname or "",
+                email=email or current_user.email,
+            ), 400
         except OSError as e:
             flash(f"프로필 이미지 저장 실패: {e}", "error")
             return render_template(
@@ -1,13 +1,17 @@
 """
 댓글 블루프린트 – 비디오 댓글·대댓글 CRUD.
 작성/수정/삭제는 모두 로그인 필요, 수정/삭제는 본인만 가능.
+답글 더보기(GET /comments/<id>/replies)는 로그인 없이 조회 가능.
 """
 
-from flask import Blueprint, flash, redirect, request, url_for
+from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
-from app import db
+from app import db, live_events
 from app.models import Comment, Video
+from app.utils.comment_threads import reply_page
+from app.utils.comment_tree import delete_subtree
+from app.utils.pagination import InvalidCursor
 
 comments_bp = Blueprint("comments", __name__, url_prefix="/comments")
 
@@ -70,6 +74,23 @@ def reply(comment_id):
     return redirect(_get_watch_url(parent.video_id))
 
 
+# ----- 답글 더보기 -----
+@comments_bp.route("/<int:comment_id>/replies", methods=["GET"])
+def replies(comment_id):
+    """시청 페이지 '답글 더보기': cursor 다음 답글 페이지 HTML 조각. 잘못된 커서면 400."""
+    if db.session.get(Comment, comment_id) is None:
+        return "", 404
+    try:
+        page = reply_page(
+            comment_id,
+            cursor=request.args.get("cursor", "", type=str).strip() or None,
+            per_page=current_app.config.get("COMMENTS_PER_PAGE", 20),
+        )
+    except InvalidCursor:
+        return "", 400
+    return render_template("main/comment_replies.html", reply_page=page, parent_id=comment_id)
+
+
 # ----- 댓글 수정 -----
 @comments_bp.route("/<int:comment_id>/edit", methods=["POST"])
 @login_required
@@ -103,8 +124,10 @@ def delete(comment_id):
         flash("본인의 댓글만 삭제할 수 있습니다.", "error")
         return redirect(_get_watch_url(comment.video_id))
 
+    # 답글까지 하위 트리를 DELETE 1번으로 삭제 (세션에 답글을 읽어 오지 않음), 댓글 수도 같은 트랜잭션에서 차감
     video_id = comment.video_id
-    db.session.delete(comment)
+    removed = delete_subtree(db.session.connection(), comment.id, video_id)
     db.session.commit()
+    live_events.publish(video_id, comments=-removed)
     flash("댓글이 삭제되었습니다.", "success")
     return redirect(_get_watch_url(video_id))
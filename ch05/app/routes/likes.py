@@ -7,24 +7,22 @@
 
 from flask import Blueprint, jsonify
 from flask_login import current_user, login_required
-from sqlalchemy import delete, insert, select
+from sqlalchemy import delete, select, update
 
-from app import db
+from app import db, live_events
 from app.models import Video
 from app.models.video import video_likes
+from app.utils.sql import insert_ignore
 
 likes_bp = Blueprint("likes", __name__)
 
 
 def _get_likes_count(video_id):
     """
-    video_likes 테이블에서 해당 영상의 좋아요 개수를 세어 반환.
-    videos.likes 컬럼과 동기화를 위해 실제 중간 테이블 행 수를 사용.
+    videos.likes (비정규화된 좋아요 수) 반환. 영상이 없으면 None.
+    토글 때마다 video_likes 행 변경과 같은 트랜잭션에서 ±1 되므로 video_likes 를 다시 세지 않음.
     """
-    result = db.session.execute(
-        select(db.func.count()).select_from(video_likes).where(video_likes.c.video_id == video_id)
-    )
-    return result.scalar() or 0
+    return db.session.execute(select(Video.likes).where(Video.id == video_id)).scalar()
 
 
 def _is_user_liked(video_id, user_id):
@@ -51,39 +49,45 @@ def toggle_like(video_id):
     - 이미 좋아요를 눌렀으면: video_likes에서 삭제 (좋아요 해제)
     - 아직 누르지 않았으면: video_likes에 추가 (좋아요)
 
-    처리 후 video.likes 카운트를 갱신하고 JSON 응답 반환.
+    조회 후 분기하지 않고 DELETE 결과 행 수로 판단하며, videos.likes 는 SQL 에서 likes ± 1 로 갱신.
+    (같은 트랜잭션이라 동시 토글이 겹쳐도 행 변경과 카운트가 어긋나거나 옛 값으로 덮어쓰지 않음)
     """
     # 1) 영상 존재 여부 확인
-    video = db.session.get(Video, video_id)
-    if video is None:
+    if _get_likes_count(video_id) is None:
         return jsonify({"success": False, "error": "영상을 찾을 수 없습니다."}), 404
 
     user_id = current_user.id
+    connection = db.session.connection()
 
-    # 2) video_likes 테이블에서 현재 사용자의 좋아요 여부 조회
-    already_liked = _is_user_liked(video_id, user_id)
-
-    if already_liked:
-        # 3-a) 이미 좋아요를 눌렀다면 → 삭제 (토글 off)
-        db.session.execute(
-            delete(video_likes).where(
-                video_likes.c.video_id == video_id,
-                video_likes.c.user_id == user_id,
-            )
+    # 2) 좋아요 행 삭제 시도 → 지운 행이 있으면 해제, 없으면 추가 (이미 있으면 무시)
+    removed = connection.execute(
+        delete(video_likes).where(
+            video_likes.c.video_id == video_id,
+            video_likes.c.user_id == user_id,
         )
+    ).rowcount
+    if removed:
+        delta = -removed
         is_liked_after = False
     else:
-        # 3-b) 아직 누르지 않았다면 → 추가 (토글 on)
-        stmt = insert(video_likes).values(video_id=video_id, user_id=user_id)
-        db.session.execute(stmt)
+        delta = insert_ignore(
+            connection,
+            video_likes,
+            [{"video_id": video_id, "user_id": user_id}],
+            ["user_id", "video_id"],
+        )
         is_liked_after = True
 
-    # 4) video.likes 컬럼 갱신 (실제 video_likes 행 수와 동기화)
+    # 3) 실제로 바뀐 행 수만큼 videos.likes 증감 (읽고-쓰기 없음)
+    if delta:
+        videos = Video.__table__
+        connection.execute(update(videos).where(videos.c.id == video_id).values(likes=videos.c.likes + delta))
     new_count = _get_likes_count(video_id)
-    video.likes = new_count
     db.session.commit()
+    if delta:
+        live_events.publish(video_id, likes=delta)
 
-    # 5) JSON 응답 반환
+    # 4) JSON 응답 반환
     return jsonify({
         "success": True,
         "is_liked": is_liked_after,
@@ -101,19 +105,16 @@ def like_status(video_id):
 
     비로그인 사용자도 호출 가능 (is_liked는 항상 False).
     """
-    # 1) 영상 존재 여부 확인
-    video = db.session.get(Video, video_id)
-    if video is None:
+    # 1) 좋아요 수 (videos.likes) – 영상이 없으면 None
+    likes_count = _get_likes_count(video_id)
+    if likes_count is None:
         return jsonify({"success": False, "error": "영상을 찾을 수 없습니다."}), 404
 
     # 2) 로그인한 사용자인지 확인 후 좋아요 여부 조회
     user_id = current_user.id if current_user.is_authenticated else None
     is_liked = _is_user_liked(video_id, user_id)
 
-    # 3) 좋아요 수: video_likes 테이블의 행 수 (video.likes와 동기화됨)
-    likes_count = _get_likes_count(video_id)
-
-    # 4) JSON 응답 반환
+    # 3) JSON 응답 반환
     return jsonify({
         "success": True,
         "is_liked": is_liked,
@@ -0,0 +1,41 @@
+"""
+실시간 카운트 블루프린트 – 시청 페이지용 Server-Sent Events.
+
+- GET /video/<video_id>/events: 좋아요·댓글·조회수 증감분 스트림 (text/event-stream)
+"""
+
+from flask import Blueprint, Response, jsonify
+from sqlalchemy import select
+
+from app import db, live_events
+from app.models import Video
+
+live_bp = Blueprint("live", __name__)
+
+
+# ----- GET /video/<video_id>/events: 실시간 카운트 스트림 -----
+@live_bp.route("/video/<int:video_id>/events", methods=["GET"])
+def video_events(video_id):
+    """
+    "event: counts" 마다 data 로 {"likes": 1, "comments": -1, "views": 3} 같은 증감분 JSON.
+    연결 수 상한이면 503 (EventSource 가 retry 간격 뒤 재시도).
+    스트림 동안 DB 세션·앱 컨텍스트를 잡지 않도록 stream_with_context 는 쓰지 않음.
+    """
+    if db.session.execute(select(Video.id).where(Video.id == video_id)).scalar() is None:
+        return jsonify({"success": False, "error": "영상을 찾을 수 없습니다."}), 404
+
+    subscriber = live_events.subscribe(video_id)
+    if subscriber is None:
+        response = jsonify({"success": False, "error": "실시간 연결이 많아 잠시 후 다시 시도해주세요."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "10"
+        return response
+
+    return Response(
+        live_events.stream(subscriber),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 끔
+        },
+    )
@@ -1,34 +1,47 @@
 """메인 라우트 – DB·미디어 연동."""
 
-from sqlalchemy import and_, func, or_
+import os
+
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
-from flask import Blueprint, current_app, jsonify, redirect, render_template, request, send_from_directory, url_for
+from flask import (
+    Blueprint, abort, current_app, flash, jsonify, redirect, render_template, request, send_file, send_from_directory, url_for,
+)
 
-from app import db
-from app.models import Comment, Subscription, Tag, User, Video
+from app import db, feed_inbox, image_cache, related_videos, tag_graph, thumbnails, transcoder, view_counter
+from app.models import Subscription, Tag, User, Video
 from app.models.video import video_tags
+from app.utils.comment_threads import thread_page
+from app.utils.media import send_media_file
+from app.utils.pagination import InvalidCursor, keyset_paginate
+from app.utils.search_index import apply_search
+from app.utils.tag_stats import popular_tags
 
 main_bp = Blueprint("main", __name__)
 
 
 def _get_popular_tags(limit=12):
-    """동영상이 연결된 태그를 비디오 수 기준으로 정렬해 반환."""
-    return (
-        db.session.query(Tag)
-        .join(video_tags)
-        .group_by(Tag.id)
-        .order_by(func.count(video_tags.c.video_id).desc())
-        .limit(limit)
-        .all()
-    )
+    """동영상이 연결된 태그를 비디오 수 기준으로 정렬해 반환 (tag_stats 집계 테이블 인덱스 조회)."""
+    return popular_tags(limit)
 
 
 # ----- 업로드된 미디어 서빙 (비디오·썸네일 URL) -----
 @main_bp.route("/media/videos/<path:filename>")
 def media_video(filename):
-    """업로드된 비디오 파일 응답."""
-    return send_from_directory(current_app.config["VIDEO_FOLDER"], filename)
+    """업로드된 비디오 파일 응답. Range 요청 시 206 부분 전송 (플레이어 탐색용)."""
+    return send_media_file(current_app.config["VIDEO_FOLDER"], filename)
+
+
+@main_bp.route("/media/transcoded/<int:video_id>/<path:filename>")
+def media_transcoded(video_id, filename):
+    """
+    변환 결과 응답 (faststart.mp4, master.m3u8, hls_<높이>p/ 플레이리스트·세그먼트). Range 지원.
+    점(.)으로 시작하는 경로는 404 – 변환 중 임시 출력(.<이름>.tmp/)·슬롯 잠금 파일은 완성 전이라 내보내지 않음.
+    """
+    if any(part.startswith(".") for part in filename.split("/")):
+        abort(404)
+    return send_media_file(os.path.join(current_app.config["TRANSCODE_FOLDER"], str(video_id)), filename)
 
 
 @main_bp.route("/media/thumbnails/<path:filename>")
@@ -37,10 +50,45 @@ def media_thumbnail(filename):
     return send_from_directory(current_app.config["THUMBNAIL_FOLDER"], filename)
 
 
+@main_bp.route("/media/thumbnails/<int:width>/<filename>")
+def media_thumbnail_variant(width, filename):
+    """
+    썸네일 파생 이미지 (<원본 파일명>.webp|jpg, 너비 THUMBNAIL_WIDTHS 중 하나). 없으면 바로 생성.
+    원본이 내용 해시 이름이라 내용이 바뀌지 않으므로 immutable 캐시.
+    """
+    found = thumbnails.variant(width, filename)
+    if found is None:
+        abort(404)
+    response = send_from_directory(*found, max_age=current_app.config["THUMBNAIL_VARIANT_MAX_AGE"])
+    response.cache_control.immutable = True
+    return response
+
+
 @main_bp.route("/media/profiles/<path:filename>")
 def media_profile(filename):
-    """업로드된 프로필 이미지 응답."""
-    return send_from_directory(current_app.config["PROFILE_IMAGE_FOLDER"], filename)
+    """
+    업로드된 프로필 이미지 응답. ?w=<px> 면 그 크기 이하로 줄인 이미지 (app.utils.image_cache – 디스크 LRU 캐시,
+    너비는 PROFILE_IMAGE_WIDTHS 중 하나로 올림, 내용 SHA-256 strong ETag → If-None-Match 304).
+    """
+    width = request.args.get("w")
+    if width is None:
+        return send_from_directory(current_app.config["PROFILE_IMAGE_FOLDER"], filename)
+    try:
+        width = int(width)
+    except ValueError:
+        abort(400)
+    if width <= 0:
+        abort(400)
+    item = image_cache.resized(filename, width)
+    if item is None:
+        abort(404)
+    return send_file(
+        item.path,
+        mimetype=item.mimetype,
+        etag=item.etag,
+        conditional=True,
+        max_age=current_app.config["PROFILE_IMAGE_MAX_AGE"],
+    )
 
 
 @main_bp.route("/")
@@ -63,13 +111,25 @@ def index():
             q = q.join(video_tags).filter(video_tags.c.tag_id == tag_obj.id)
         else:
             q = q.filter(Video.id < 0)
-    if sort == "popular":
-        q = q.order_by(Video.likes.desc(), Video.views.desc())
-    elif sort == "views":
-        q = q.order_by(Video.views.desc())
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        # keyset 모드: COUNT·OFFSET 없이 정렬 키 기준으로 다음 12개
+        try:
+            videos = keyset_paginate(q, sort, cursor=cursor.strip() or None, per_page=per_page)
+        except InvalidCursor:
+            # API 는 같은 커서에 400 – 화면은 알림 후 커서만 비운 주소(첫 페이지)로 이동
+            flash("목록 위치 정보가 올바르지 않아 처음부터 보여드립니다.", "error")
+            args = request.args.to_dict()
+            args["cursor"] = ""
+            return redirect(url_for("main.index", **args))
     else:
-        q = q.order_by(Video.created_at.desc())
-    videos = q.paginate(page=page, per_page=per_page)
+        if sort == "popular":
+            q = q.order_by(Video.likes.desc(), Video.views.desc())
+        elif sort == "views":
+            q = q.order_by(Video.views.desc())
+        else:
+            q = q.order_by(Video.created_at.desc())
+        videos = q.paginate(page=page, per_page=per_page)
     popular_tags = _get_popular_tags()
     return render_template(
         "main/index.html",
@@ -82,29 +142,22 @@ def index():
 @main_bp.route("/watch/<int:video_id>")
 def watch(video_id):
     video = Video.query.get_or_404(video_id)
-    video.views += 1
-    db.session.commit()
+    # 조회수는 write-behind 버퍼에 기록 (매 요청 UPDATE·COMMIT 없음)
+    view_counter.record(video)
     user = db.session.get(User, video.user_id) if video.user_id else None
     channel_name = user.username if user else "default"
-    related = (
-        Video.query.options(joinedload(Video.user))
-        .filter(Video.id != video_id)
-        .order_by(Video.created_at.desc())
-        .limit(10)
-        .all()
-    )
+    # 관련 동영상: api.video_detail 과 같은 추천 엔진 (후보 인덱스 적중 시 조회 1번)
+    related = related_videos.for_video(video_id, limit=10)
     current = _get_subscriptions_user()
     is_subscribed = _is_subscribed(current.id if current else None, video.user_id)
-    subscriber_count = user.subscribers_rel.count() if user else 0
-
-    # 최상위 댓글만 작성 시간 오름차순으로 조회 (대댓글은 replies로 포함)
-    top_comments = (
-        Comment.query.filter_by(video_id=video_id, parent_id=None)
-        .options(db.joinedload(Comment.user), db.joinedload(Comment.replies).joinedload(Comment.user))
-        .order_by(Comment.created_at.asc())
-        .all()
+    subscriber_count = user.subscriber_count if user else 0
+
+    # 댓글: 최상위 댓글 첫 페이지 + 댓글별 앞쪽 답글만 (나머지는 더보기로 이어서 조회)
+    comment_page = thread_page(
+        video_id,
+        per_page=current_app.config.get("COMMENTS_PER_PAGE", 20),
+        preview=current_app.config.get("COMMENT_REPLY_PREVIEW", 3),
     )
-    total_comments = sum(1 + len(c.replies) for c in top_comments)
 
     return render_template(
         "main/watch.html",
@@ -113,15 +166,35 @@ def watch(video_id):
         related_videos=related,
         is_subscribed=is_subscribed,
         subscriber_count=subscriber_count,
-        comments=top_comments,
-        total_comments=total_comments,
+        comment_page=comment_page,
+        total_comments=video.comment_count,
+        # 변환이 끝났으면 faststart MP4·HLS master, 아니면 원본 (app.utils.transcode)
+        playback=transcoder.playback(video),
     )
 
 
+@main_bp.route("/watch/<int:video_id>/comments")
+def watch_comments(video_id):
+    """시청 페이지 '댓글 더보기': cursor 다음 최상위 댓글 페이지 HTML 조각. 잘못된 커서면 400."""
+    if db.session.get(Video, video_id) is None:
+        return "", 404
+    try:
+        comment_page = thread_page(
+            video_id,
+            cursor=request.args.get("cursor", "", type=str).strip() or None,
+            per_page=current_app.config.get("COMMENTS_PER_PAGE", 20),
+            preview=current_app.config.get("COMMENT_REPLY_PREVIEW", 3),
+        )
+    except InvalidCursor:
+        return "", 400
+    return render_template("main/comment_threads.html", comment_page=comment_page, video_id=video_id)
+
+
 @main_bp.route("/search", methods=["GET"])
 def search():
     """
     비디오 검색 – 키워드(q), 카테고리(category), 정렬(sort), 페이지(page) 지원.
+    sort: latest(기본) | popular | views | relevance
     """
     q_param = request.args.get("q", "").strip()
     category = request.args.get("category", "").strip()
@@ -136,20 +209,17 @@ def search():
     else:
         query = Video.query.options(joinedload(Video.user))
 
-        # ➂ 복합 키워드 검색: 제목 또는 설명에 검색어 포함
-        pattern = f"%{q_param}%"
-        keyword_filter = or_(
-            Video.title.ilike(pattern),
-            and_(Video.description.isnot(None), Video.description.ilike(pattern)),
-        )
-        query = query.filter(keyword_filter)
+        # ➂ 복합 키워드 검색: 제목·설명·태그 전문 검색 (FTS5, 불가 시 LIKE 폴백)
+        query, rank = apply_search(query, q_param)
 
         # ➃ 카테고리 필터
         if category:
             query = query.filter(Video.category == category)
 
-        # ➄ 동적 정렬
-        if sort == "popular":
+        # ➄ 동적 정렬 (relevance: bm25 관련도순, 인덱스 미사용 시 최신순)
+        if sort == "relevance" and rank is not None:
+            query = query.order_by(rank.asc(), Video.id.desc())
+        elif sort == "popular":
             query = query.order_by(Video.likes.desc(), Video.views.desc())
         elif sort == "views":
             query = query.order_by(Video.views.desc())
@@ -233,23 +303,12 @@ def subscriptions():
         videos = Video.query.filter(Video.id < 0).paginate(page=1, per_page=12)
         return render_template("main/subscriptions.html", videos=videos)
 
-    # 구독 중인 채널 ID 목록
-    subscribed_ids = [
-        s.subscribed_to_id for s in user.subscriptions_rel.all()
-    ]
     page = request.args.get("page", 1, type=int)
     if page < 1:
         page = 1
 
-    if not subscribed_ids:
-        videos = Video.query.filter(Video.id < 0).paginate(page=1, per_page=12)
-    else:
-        videos = (
-            Video.query.options(joinedload(Video.user))
-            .filter(Video.user_id.in_(subscribed_ids))
-            .order_by(Video.created_at.desc())
-            .paginate(page=page, per_page=12)
-        )
+    # 받은편지함(feed_inbox) 범위 스캔 + 대형(pull) 채널 비디오 (app.utils.feed)
+    videos = feed_inbox.page(user.id, page=page, per_page=12)
 
     return render_template("main/subscriptions.html", videos=videos)
 
@@ -276,7 +335,8 @@ def subscribe_toggle(username):
         db.session.add(Subscription(subscriber_id=current.id, subscribed_to_id=target.id))
         is_subscribed = True
     db.session.commit()
-    subscriber_count = target.subscribers_rel.count()
+    # 구독 행 변경과 같은 트랜잭션에서 SQL 로 증감된 값 (commit 후 다시 읽음)
+    subscriber_count = target.subscriber_count
 
     return jsonify({"ok": True, "is_subscribed": is_subscribed, "subscriber_count": subscriber_count})
 
@@ -298,12 +358,15 @@ def tag(tag_name):
         )
         results_count = tag_obj.videos.count()
     popular_tags = _get_popular_tags()
+    # 관련 태그: 태그 동시 출현 행렬에서 조회 (DB 조회 없음)
+    related_tags = tag_graph.related(tag_name, limit=10) if tag_obj else []
     return render_template(
         "main/tag.html",
         tag=tag_name,
         videos=videos,
         results_count=results_count,
         popular_tags=popular_tags,
+        related_tags=related_tags,
     )
 
 
@@ -322,7 +385,7 @@ def user_profile(username):
         .filter(Video.user_id == user.id)
         .first()
     )
-    subscriber_count = user.subscribers_rel.count()
+    subscriber_count = user.subscriber_count
     stats = {
         "total_views": stats_row.total_views or 0,
         "total_likes": stats_row.total_likes or 0,
@@ -1,15 +1,15 @@
 # Studio 라우트 – 동영상 관리·업로드
 
-import os
-import uuid
 from datetime import datetime, timedelta, timezone
 
-from flask import Blueprint, abort, current_app, flash, redirect, render_template, request, url_for
+from flask import Blueprint, abort, current_app, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from sqlalchemy import func
 
-from app import db
-from app.models import Video
+from app import db, transcoder
+from app.models import Rendition, Video
+from app.utils import media_store, uploads
+from app.utils.ingest import IngestError, too_large_message
 
 studio_bp = Blueprint("studio", __name__, url_prefix="/studio")
 
@@ -62,6 +62,8 @@ def _get_studio_dashboard_data(user_id):
             func.count(Video.id).label("video_count"),
             func.coalesce(func.sum(Video.views), 0).label("total_views"),
             func.coalesce(func.sum(Video.likes), 0).label("total_likes"),
+            # 채널 댓글 수: 영상별 집계 컬럼(videos.comment_count)의 합 – comments 를 세지 않음
+            func.coalesce(func.sum(Video.comment_count), 0).label("total_comments"),
         )
         .filter(Video.user_id == user_id)
         .first()
@@ -69,20 +71,7 @@ def _get_studio_dashboard_data(user_id):
     video_count = int(row.video_count or 0)
     total_views = int(row.total_views or 0)
     total_likes = int(row.total_likes or 0)
-    total_comments = 0
-    try:
-        from sqlalchemy import text
-
-        r = db.session.execute(
-            text(
-                "SELECT COUNT(*) FROM comments c "
-                "INNER JOIN videos v ON c.video_id = v.id WHERE v.user_id = :uid"
-            ),
-            {"uid": user_id},
-        ).scalar()
-        total_comments = int(r or 0)
-    except Exception:
-        pass
+    total_comments = int(row.total_comments or 0)
     avg_views = round(total_views / video_count, 1) if video_count else 0
     avg_likes = round(total_likes / video_count, 1) if video_count else 0.0
 
@@ -141,9 +130,10 @@ def _allowed_file(filename, allowed_extensions):
     return ext in allowed_extensions
 
 
-def _save_upload_file(file_storage, save_dir, allowed_extensions, max_size):
+def _save_upload_file(file_storage, kind, allowed_extensions, max_size):
     """
-    업로드 파일 검증 후 저장.
+    업로드 파일 검증 후 kind(video|thumbnail) 폴더에 저장 (app.utils.media_store – 블록 단위로 크기·매직 바이트 검사,
+    SHA-256 이름으로 저장, 이미 같은 파일이 있으면 그 파일 사용).
     반환: (저장된 파일명, None) 또는 (None, 에러메시지)
     """
     if not file_storage or not file_storage.filename:
@@ -153,21 +143,42 @@ def _save_upload_file(file_storage, save_dir, allowed_extensions, max_size):
     if not _allowed_file(filename, allowed_extensions):
         return None, f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(allowed_extensions))}"
 
-    file_storage.seek(0, os.SEEK_END)
-    size = file_storage.tell()
-    file_storage.seek(0)
-    if size > max_size:
-        max_mb = max_size // (1024 * 1024)
-        return None, f"파일 크기가 너무 큽니다. 최대 {max_mb}MB까지 업로드할 수 있습니다."
-
     ext = filename.rsplit(".", 1)[-1].lower()
-    safe_filename = f"{uuid.uuid4().hex}.{ext}"
-    save_path = os.path.join(save_dir, safe_filename)
     try:
-        file_storage.save(save_path)
+        stored_name, saved, deduped = media_store.store_upload(file_storage.stream, kind, ext, max_size)
+    except IngestError as e:
+        return None, str(e)
     except OSError as e:
         return None, f"파일 저장 중 오류가 발생했습니다: {e}"
-    return safe_filename, None
+    current_app.logger.info("업로드 저장: %s (%d bytes, 중복=%s)", stored_name, saved.size, deduped)
+    return stored_name, None
+
+
+def _create_video(user_id, title, description, category, video_filename, thumbnail_filename, tags):
+    """Video 행 생성·commit 후 태그 연결 (upload, upload_complete 공용). 실패 시 예외 – 호출자가 rollback·파일 정리."""
+    video = Video(
+        title=title,
+        description=description or None,
+        category=category,
+        video_path=video_filename,
+        thumbnail_path=thumbnail_filename,
+        user_id=user_id,
+    )
+    db.session.add(video)
+    db.session.commit()
+    if tags:
+        video.save_tags(tags, commit=True)
+    return video
+
+
+@studio_bp.errorhandler(413)
+def request_too_large(e):
+    """요청 본문이 MAX_CONTENT_LENGTH 초과 – Werkzeug 가 본문을 다 받기 전에 끊음."""
+    message = too_large_message(current_app.config["MAX_VIDEO_SIZE"])
+    if request.endpoint == "studio.upload":
+        flash(message, "error")
+        return render_template("studio/upload.html"), 413
+    return jsonify({"success": False, "error": message}), 413
 
 
 @studio_bp.route("/")
@@ -184,9 +195,38 @@ def index():
         recent_7d=dashboard["recent_7d"],
         recent_30d=dashboard["recent_30d"],
         top_videos=dashboard["top_videos"],
+        # 변환 상태 배지 (비디오별 GROUP BY 1번)
+        transcode=transcoder.summary([v.id for v in videos]),
     )
 
 
+@studio_bp.route("/videos/<int:video_id>/transcode", methods=["GET"])
+@login_required
+def transcode_status(video_id):
+    """변환 진행 상태 (화질별 행). 소유자만."""
+    video = Video.query.get_or_404(video_id)
+    _require_video_owner(video)
+    renditions = Rendition.query.filter_by(video_id=video_id).order_by(Rendition.height, Rendition.id).all()
+    return jsonify({
+        "success": True,
+        "video_id": video_id,
+        "duration": video.duration,
+        "summary": transcoder.summary([video_id]).get(video_id),
+        "renditions": [
+            {
+                "name": r.name,
+                "status": r.status,
+                "width": r.width,
+                "height": r.height,
+                "bitrate": r.bitrate,
+                "error": r.error,
+                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+            }
+            for r in renditions
+        ],
+    })
+
+
 @studio_bp.route("/upload", methods=["GET", "POST"])
 @login_required
 def upload():
@@ -212,11 +252,10 @@ def upload():
         return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
 
     # 비디오 파일 검증 후 저장
-    video_folder = current_app.config["VIDEO_FOLDER"]
     allowed_video = current_app.config["ALLOWED_VIDEO_EXTENSIONS"]
     max_video_size = current_app.config["MAX_VIDEO_SIZE"]
     video_filename, video_error = _save_upload_file(
-        video_file, video_folder, allowed_video, max_video_size
+        video_file, "video", allowed_video, max_video_size
     )
     if video_error:
         flash(video_error, "error")
@@ -225,48 +264,27 @@ def upload():
     # 썸네일(선택) 검증 후 저장
     thumbnail_filename = None
     if thumbnail_file and thumbnail_file.filename:
-        thumb_folder = current_app.config["THUMBNAIL_FOLDER"]
         allowed_thumb = current_app.config["ALLOWED_THUMBNAIL_EXTENSIONS"]
         max_thumb_size = current_app.config["MAX_THUMBNAIL_SIZE"]
         thumbnail_filename, thumb_error = _save_upload_file(
-            thumbnail_file, thumb_folder, allowed_thumb, max_thumb_size
+            thumbnail_file, "thumbnail", allowed_thumb, max_thumb_size
         )
         if thumb_error:
-            # 비디오는 이미 저장됐으므로 저장된 비디오 파일 삭제 후 에러 반환
-            try:
-                os.remove(os.path.join(video_folder, video_filename))
-            except OSError:
-                pass
+            # 비디오는 이미 저장됐으므로 정리 후 에러 반환 (같은 파일을 쓰는 다른 비디오가 있으면 유지)
+            media_store.discard("video", video_filename)
             flash(thumb_error, "error")
             return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
 
     # DB에 Video 저장
     user_id = _current_user_id()
     try:
-        video = Video(
-            title=title,
-            description=description or None,
-            category=category_input,
-            video_path=video_filename,
-            thumbnail_path=thumbnail_filename,
-            user_id=user_id,
-        )
-        db.session.add(video)
-        db.session.commit()
-        if tags_input:
-            video.save_tags(tags_input, commit=True)
+        _create_video(user_id, title, description, category_input, video_filename, thumbnail_filename, tags_input)
     except Exception as e:
         db.session.rollback()
-        # 저장된 파일 정리
-        try:
-            os.remove(os.path.join(video_folder, video_filename))
-        except OSError:
-            pass
+        # 저장된 파일 정리 (다른 행이 가리키는 파일은 유지)
+        media_store.discard("video", video_filename)
         if thumbnail_filename:
-            try:
-                os.remove(os.path.join(current_app.config["THUMBNAIL_FOLDER"], thumbnail_filename))
-            except OSError:
-                pass
+            media_store.discard("thumbnail", thumbnail_filename)
         flash(f"DB 저장 중 오류가 발생했습니다: {e}", "error")
         return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 500
 
@@ -274,6 +292,175 @@ def upload():
     return redirect(url_for("studio.index"))
 
 
+# ---------------------------------------------------------------------------
+# 이어 올리기 조각 업로드 API (app.utils.uploads). 응답은 JSON, 오류는 {"success": false, "error": ...}
+# ---------------------------------------------------------------------------
+def _upload_error(message, code, **extra):
+    return jsonify({"success": False, "error": message, **extra}), code
+
+
+def _upload_state(upload):
+    return {
+        "success": True,
+        "upload_id": upload.id,
+        "offset": upload.received,
+        "size": upload.size,
+        "expires_at": upload.expires_at.isoformat(),
+    }
+
+
+def _upload_not_found():
+    return _upload_error("업로드 세션을 찾을 수 없거나 만료되었습니다.", 404)
+
+
+@studio_bp.route("/uploads", methods=["POST"])
+@login_required
+def upload_create():
+    """
+    조각 업로드 세션 생성. 본문(JSON 또는 form): filename, size, title, description, category, tags.
+    201 + upload_id·offset(0)·권장 chunk_size. 조각 파일은 size 만큼 미리 할당.
+    """
+    data = request.get_json(silent=True) or request.form
+    filename = (data.get("filename") or "").strip()
+    title = (data.get("title") or "").strip()
+    try:
+        size = int(data.get("size"))
+    except (TypeError, ValueError):
+        return _upload_error("size 가 올바르지 않습니다.", 400)
+
+    if not title:
+        return _upload_error("제목을 입력해주세요.", 400)
+    if len(title) > 200:
+        return _upload_error("제목은 200자 이하여야 합니다.", 400)
+    allowed_video = current_app.config["ALLOWED_VIDEO_EXTENSIONS"]
+    if not _allowed_file(filename, allowed_video):
+        return _upload_error(f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(allowed_video))}", 400)
+    max_size = current_app.config["MAX_VIDEO_SIZE"]
+    if size <= 0 or size > max_size:
+        return _upload_error(too_large_message(max_size), 400)
+
+    try:
+        upload = uploads.create_session(
+            _current_user_id(),
+            filename,
+            filename.rsplit(".", 1)[-1].lower(),
+            size,
+            title,
+            description=(data.get("description") or "").strip() or None,
+            category=(data.get("category") or "").strip() or None,
+            tags=(data.get("tags") or "").strip() or None,
+        )
+    except uploads.UploadLimitExceeded as e:
+        return _upload_error(str(e), e.status)
+    except OSError as e:
+        return _upload_error(f"파일 저장 공간을 확보하지 못했습니다: {e}", 507)
+    state = _upload_state(upload)
+    state["chunk_size"] = current_app.config["UPLOAD_CHUNK_SIZE"]
+    return jsonify(state), 201
+
+
+@studio_bp.route("/uploads/<upload_id>", methods=["GET"])
+@login_required
+def upload_status(upload_id):
+    """진행 상태: offset(받은 바이트 수 = 다음 조각 위치), size. 끊긴 업로드를 이어 보낼 때 사용."""
+    upload = uploads.get_session(upload_id, _current_user_id())
+    if upload is None:
+        return _upload_not_found()
+    return jsonify(_upload_state(upload))
+
+
+@studio_bp.route("/uploads/<upload_id>", methods=["PUT"])
+@login_required
+def upload_chunk(upload_id):
+    """
+    조각 기록. ?offset=N (받은 위치와 같아야 함), 본문 = 조각 바이트 (Content-Length 필수).
+    200 + 새 offset. offset 불일치 409 + 현재 offset, 크기 초과 400, 조각이 UPLOAD_CHUNK_MAX 초과 413.
+    """
+    upload = uploads.get_session(upload_id, _current_user_id())
+    if upload is None:
+        return _upload_not_found()
+    offset = request.args.get("offset", type=int)
+    length = request.content_length
+    if offset is None:
+        return _upload_error("offset 이 필요합니다.", 400, offset=upload.received)
+    if length is None:
+        return _upload_error("Content-Length 가 필요합니다.", 411)
+    if length > current_app.config["UPLOAD_CHUNK_MAX"]:
+        return _upload_error("조각이 너무 큽니다.", 413)
+    try:
+        new_offset = uploads.write_chunk(upload, offset, request.stream, length)
+    except uploads.UploadConflict as e:
+        return _upload_error("offset 이 받은 위치와 다릅니다.", 409, offset=e.offset)
+    except IngestError as e:
+        return _upload_error(str(e), 415, offset=upload.received)
+    except ValueError:
+        return _upload_error("조각이 파일 크기를 넘습니다.", 400, offset=upload.received)
+    return jsonify({"success": True, "upload_id": upload_id, "offset": new_offset, "size": upload.size})
+
+
+@studio_bp.route("/uploads/<upload_id>/complete", methods=["POST"])
+@login_required
+def upload_complete(upload_id):
+    """
+    업로드 완료: 세션 삭제(claim) 후 조각 파일을 VIDEO_FOLDER 로 rename, Video 생성.
+    form 에 thumbnail(선택) 파일을 함께 보낼 수 있음. 201 + video_id·시청 URL. 덜 받았거나 이미 완료 중이면 409.
+    """
+    upload = uploads.get_session(upload_id, _current_user_id())
+    if upload is None:
+        return _upload_not_found()
+    if not upload.is_complete:
+        return _upload_error("아직 모든 조각을 받지 않았습니다.", 409, offset=upload.received)
+
+    thumbnail_filename = None
+    thumbnail_file = request.files.get("thumbnail")
+    if thumbnail_file and thumbnail_file.filename:
+        thumbnail_filename, thumb_error = _save_upload_file(
+            thumbnail_file,
+            "thumbnail",
+            current_app.config["ALLOWED_THUMBNAIL_EXTENSIONS"],
+            current_app.config["MAX_THUMBNAIL_SIZE"],
+        )
+        if thumb_error:
+            return _upload_error(thumb_error, 400)
+
+    # 세션 행을 먼저 가져간 요청만 조각 파일을 옮김 (같은 세션에 /complete 가 동시에 오면 나머지는 409)
+    if not uploads.claim_session(upload):
+        if thumbnail_filename:
+            media_store.discard("thumbnail", thumbnail_filename)
+        return _upload_error("이미 완료 처리 중인 업로드입니다.", 409)
+    try:
+        video_filename = uploads.finalize_file(upload)
+    except OSError as e:
+        if thumbnail_filename:
+            media_store.discard("thumbnail", thumbnail_filename)
+        return _upload_error(f"파일 저장 중 오류가 발생했습니다. 다시 업로드해 주세요: {e}", 500)
+    try:
+        video = _create_video(
+            upload.user_id, upload.title, upload.description, upload.category,
+            video_filename, thumbnail_filename, upload.tags,
+        )
+    except Exception as e:
+        db.session.rollback()
+        # 세션은 이미 지웠고 조각 파일도 저장소로 옮겨졌으므로 다시 업로드하게 함
+        media_store.discard("video", video_filename)
+        if thumbnail_filename:
+            media_store.discard("thumbnail", thumbnail_filename)
+        return _upload_error(f"DB 저장 중 오류가 발생했습니다. 다시 업로드해 주세요: {e}", 500)
+    flash("동영상이 업로드되었습니다.", "success")
+    return jsonify({"success": True, "video_id": video.id, "url": url_for("main.watch", video_id=video.id)}), 201
+
+
+@studio_bp.route("/uploads/<upload_id>", methods=["DELETE"])
+@login_required
+def upload_cancel(upload_id):
+    """업로드 취소: 세션과 조각 파일 삭제."""
+    upload = uploads.get_session(upload_id, _current_user_id())
+    if upload is None:
+        return _upload_not_found()
+    uploads.discard_session(upload)
+    return jsonify({"success": True})
+
+
 @studio_bp.route("/edit/<int:video_id>", methods=["GET", "POST"])
 @login_required
 def edit(video_id):
@@ -313,14 +500,12 @@ def edit(video_id):
 @login_required
 def delete(video_id):
     """
-    동영상 삭제: DB 레코드 먼저 삭제 후, 성공 시 uploads/ 내 실제 파일 삭제.
-    파일이 없어도 DB 삭제는 완료 (고아 파일 방지).
+    동영상 삭제: DB 레코드 삭제. 동영상·썸네일 파일은 참조 수가 0 이 되면 commit 후 삭제
+    (같은 파일을 쓰는 다른 비디오가 있으면 유지 – app.utils.media_store).
     로그인 미구현: 소유자(DEFAULT_USER_ID)만 삭제 가능.
     """
     video = Video.query.get_or_404(video_id)
     _require_video_owner(video)
-    video_path = video.video_path
-    thumbnail_path = video.thumbnail_path
 
     db.session.delete(video)
     try:
@@ -330,19 +515,5 @@ def delete(video_id):
         flash(f"삭제 중 오류가 발생했습니다: {e}", "error")
         return redirect(url_for("studio.edit", video_id=video_id))
 
-    # DB 삭제 성공 후 실제 파일 삭제 (파일 없어도 OSError 무시)
-    video_folder = current_app.config["VIDEO_FOLDER"]
-    thumb_folder = current_app.config["THUMBNAIL_FOLDER"]
-    if video_path:
-        try:
-            os.remove(os.path.join(video_folder, video_path))
-        except OSError:
-            pass
-    if thumbnail_path:
-        try:
-            os.remove(os.path.join(thumb_folder, thumbnail_path))
-        except OSError:
-            pass
-
     flash("동영상이 삭제되었습니다.", "success")
     return redirect(url_for("studio.index"))
@@ -1,6 +1,7 @@
 /**
  * 홈(index) 페이지 – REST API 연동 "더 보기"
  * GET /api/videos 에서 추가 영상 로드
+ * data-next-cursor 가 있으면 커서(keyset) 모드, 없으면 page 번호 모드
  */
 (function () {
   const grid = document.getElementById('video-grid');
@@ -12,16 +13,18 @@
     const category = grid.dataset.category || 'all';
     const sort = grid.dataset.sort || 'latest';
     const tag = grid.dataset.tag || '';
+    const nextCursor = loadMoreBtn.dataset.nextCursor;
     const nextPage = parseInt(loadMoreBtn.dataset.nextPage || '2', 10);
 
     loadMoreBtn.disabled = true;
     loadMoreBtn.textContent = '로딩 중...';
 
     const params = new URLSearchParams({
-      page: nextPage,
       per_page: 12,
       sort: sort
     });
+    if (nextCursor !== undefined) params.set('cursor', nextCursor);
+    else params.set('page', nextPage);
     if (category && category !== 'all') params.set('category', category);
     if (tag) params.set('tag', tag);
 
@@ -35,7 +38,8 @@
         // 다음 페이지 정보 업데이트
         var meta = data.meta || {};
         if (meta.has_next) {
-          loadMoreBtn.dataset.nextPage = String((meta.current_page || nextPage) + 1);
+          if (nextCursor !== undefined) loadMoreBtn.dataset.nextCursor = meta.next_cursor;
+          else loadMoreBtn.dataset.nextPage = String((meta.current_page || nextPage) + 1);
           loadMoreBtn.disabled = false;
           loadMoreBtn.textContent = '더 보기';
         } else {
@@ -50,9 +54,18 @@
   });
 
   function createVideoCard(v) {
-    var thumb = v.thumbnail_url
-      ? '<img src="' + escapeHtml(v.thumbnail_url) + '" alt="" class="video-card-thumb-img">'
-      : '<span>📹</span>';
+    var thumb = '<span>📹</span>';
+    var srcset = v.thumbnail_srcset;
+    if (srcset && srcset.webp) {
+      // 서버 템플릿(main/_thumbnail.html)과 같은 <picture>: WebP srcset + JPEG 폴백
+      var sizes = '(max-width: 600px) 100vw, 320px';
+      thumb = '<picture class="thumb-picture">' +
+        '<source type="image/webp" srcset="' + escapeHtml(srcset.webp) + '" sizes="' + sizes + '">' +
+        '<img src="' + escapeHtml(v.thumbnail_url) + '" srcset="' + escapeHtml(srcset.jpg) + '" sizes="' + sizes + '"' +
+        ' alt="" class="video-card-thumb-img" loading="lazy" decoding="async"></picture>';
+    } else if (v.thumbnail_url) {
+      thumb = '<img src="' + escapeHtml(v.thumbnail_url) + '" alt="" class="video-card-thumb-img" loading="lazy">';
+    }
     var channel = (v.channel && v.channel.username) || 'default';
     var profileUrl = '/user/' + encodeURIComponent(channel);
     var watchUrl = '/watch/' + (v.id || '');
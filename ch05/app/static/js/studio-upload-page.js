@@ -1,5 +1,5 @@
 /**
- * Studio 업로드 페이지 – 프론트 전용. DB·백엔드 없음.
+ * Studio 업로드 페이지 – 파일 선택·검증, 조각 업로드(이어 올리기) API 로 전송.
  */
 
 (function () {
@@ -175,12 +175,113 @@
         return;
       }
 
-      // 검증 통과 시 서버 제출 (preventDefault 하지 않음)
       if (submitBtn) {
         submitBtn.disabled = true;
         submitBtn.textContent = "업로드 중...";
       }
+
+      // 조각 업로드 API 사용 가능하면 이어 올리기, 아니면 폼 전체 POST (preventDefault 하지 않음)
+      const uploadsUrl = form.getAttribute("data-uploads-url");
+      if (uploadsUrl && window.fetch && Blob.prototype.slice) {
+        e.preventDefault();
+        chunkedUpload(uploadsUrl, video).catch(function (err) {
+          showError(err.message || "업로드에 실패했습니다.");
+          if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.textContent = "업로드";
+          }
+        });
+      }
+    });
+  }
+
+  function showError(message) {
+    if (msgEl) {
+      msgEl.textContent = message;
+      msgEl.className = "auth-msg auth-msg--error is-visible";
+    }
+  }
+
+  function csrfHeaders(extra) {
+    const headers = extra || {};
+    const csrfMeta = document.querySelector('meta[name="csrf-token"]');
+    if (csrfMeta) headers["X-CSRFToken"] = csrfMeta.getAttribute("content");
+    return headers;
+  }
+
+  function readJson(res) {
+    return res.json().then(function (data) {
+      if (!res.ok && res.status !== 409) {
+        throw new Error((data && data.error) || "업로드에 실패했습니다.");
+      }
+      return data;
+    });
+  }
+
+  function sleep(ms) {
+    return new Promise(function (resolve) {
+      setTimeout(resolve, ms);
+    });
+  }
+
+  // 이어 올리기: 세션 생성 → 조각 PUT (끊기면 GET 으로 받은 위치 확인 후 재시도) → 완료
+  const MAX_RETRIES = 5;
+
+  async function chunkedUpload(uploadsUrl, file) {
+    const fields = new FormData(form);
+    const session = await fetch(uploadsUrl, {
+      method: "POST",
+      headers: csrfHeaders({ "Content-Type": "application/json" }),
+      body: JSON.stringify({
+        filename: file.name,
+        size: file.size,
+        title: fields.get("title") || "",
+        description: fields.get("description") || "",
+        category: fields.get("category") || "",
+        tags: fields.get("tags") || "",
+      }),
+    }).then(readJson);
+
+    const sessionUrl = uploadsUrl.replace(/\/$/, "") + "/" + session.upload_id;
+    const chunkSize = session.chunk_size;
+    let offset = session.offset;
+    let retries = 0;
+    while (offset < file.size) {
+      try {
+        const res = await fetch(sessionUrl + "?offset=" + offset, {
+          method: "PUT",
+          headers: csrfHeaders({ "Content-Type": "application/octet-stream" }),
+          body: file.slice(offset, Math.min(offset + chunkSize, file.size)),
+        });
+        const data = await readJson(res);
+        offset = data.offset; // 409 면 서버가 받은 위치부터 다시
+        retries = 0;
+      } catch (err) {
+        if (++retries > MAX_RETRIES) throw err;
+        await sleep(1000 * retries);
+        const state = await fetch(sessionUrl).then(readJson).catch(function () {
+          return { offset: offset };
+        });
+        offset = state.offset;
+      }
+      if (submitBtn) {
+        submitBtn.textContent = "업로드 중... " + Math.floor((offset / file.size) * 100) + "%";
+      }
+    }
+
+    const finish = new FormData();
+    const thumb = thumbnailInput && thumbnailInput.files[0];
+    if (thumb) finish.append("thumbnail", thumb);
+    await fetch(sessionUrl + "/complete", {
+      method: "POST",
+      headers: csrfHeaders(),
+      body: finish,
+    }).then(function (res) {
+      return res.json().then(function (data) {
+        if (!res.ok) throw new Error((data && data.error) || "업로드에 실패했습니다.");
+      });
     });
+    window.location.href = form.getAttribute("data-done-url") || "/studio/";
   }
 
   // 문자 수 카운터 (선택)
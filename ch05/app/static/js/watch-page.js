@@ -5,9 +5,17 @@
 (function () {
   // 로그인 미연동: 시청은 로그인 없이 사용 가능 (업로드와 동일)
 
+  // HLS: 변환이 끝난 동영상은 data-hls(master.m3u8). 브라우저가 HLS 를 직접 재생할 수 있을 때만 사용,
+  // 아니면 <source> 의 faststart MP4(또는 원본) 그대로 재생
+  var player = document.querySelector('.video-player-el');
+  if (player && player.dataset.hls && player.canPlayType('application/vnd.apple.mpegurl')) {
+    player.src = player.dataset.hls;
+  }
+
   // 좋아요 버튼 – GET /video/<id>/like/status로 초기화, POST /video/<id>/like로 토글
   const likeBtn = document.getElementById('btn-like');
   const videoId = likeBtn && likeBtn.dataset.videoId;
+  var liveCounts = false; // 실시간 카운트(SSE) 연결 여부
 
   // 페이지 로드 시: GET /video/<id>/like/status로 현재 좋아요 상태 불러오기
   if (likeBtn && videoId) {
@@ -59,7 +67,7 @@
           if (data.success) {
             data.is_liked ? btn.classList.add('active') : btn.classList.remove('active');
             var countEl = btn.querySelector('.action-count');
-            if (countEl) countEl.textContent = data.likes_count;
+            if (countEl && !liveCounts) countEl.textContent = data.likes_count;
           } else {
             alert(data.error || '오류가 발생했습니다.');
           }
@@ -69,6 +77,32 @@
     });
   }
 
+  // 실시간 카운트 – GET /video/<id>/events (SSE) 로 받은 증감분을 화면 숫자에 더함.
+  // 연결돼 있는 동안은 내 좋아요 토글도 이벤트로 반영되므로 토글 응답 값으로 덮어쓰지 않음 (이중 가산 방지)
+  if (videoId && window.EventSource) {
+    var source = new EventSource('/video/' + videoId + '/events');
+    source.addEventListener('open', function () { liveCounts = true; });
+    source.addEventListener('error', function () { liveCounts = false; });
+    source.addEventListener('counts', function (e) {
+      var deltas;
+      try { deltas = JSON.parse(e.data); } catch (err) { return; }
+      var likesEl = likeBtn.querySelector('.action-count');
+      if (deltas.likes && likesEl) {
+        likesEl.textContent = Math.max(0, (parseInt(likesEl.textContent, 10) || 0) + deltas.likes);
+      }
+      var commentsEl = document.getElementById('comments-count');
+      if (deltas.comments && commentsEl) {
+        commentsEl.textContent = Math.max(0, (parseInt(commentsEl.textContent, 10) || 0) + deltas.comments);
+      }
+      var viewsEl = document.getElementById('video-views');
+      if (deltas.views && viewsEl) {
+        viewsEl.dataset.views = (parseInt(viewsEl.dataset.views, 10) || 0) + deltas.views;
+        viewsEl.textContent = '조회수 ' + viewsEl.dataset.views + '회';
+      }
+    });
+    window.addEventListener('beforeunload', function () { source.close(); });
+  }
+
   // 구독 버튼 (DB 반영)
   const subscribeBtn = document.getElementById('btn-subscribe');
   if (subscribeBtn) {
@@ -143,47 +177,51 @@
     });
   }
 
-  // 답글 버튼 – 클릭 시 답글 폼 표시
-  document.querySelectorAll('.comment-reply-btn').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const parentId = this.dataset.parentId;
-      const wrap = document.getElementById('reply-form-wrap-' + parentId);
-      if (!wrap) return;
-      wrap.style.display = wrap.style.display === 'none' ? 'block' : 'none';
-    });
-  });
-
-  // 답글 취소
-  document.querySelectorAll('.reply-cancel').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const parentId = this.dataset.parentId;
-      const wrap = document.getElementById('reply-form-wrap-' + parentId);
-      if (wrap) wrap.style.display = 'none';
-    });
-  });
+  // 댓글 목록 버튼 – 더보기로 나중에 붙는 댓글에도 동작하도록 목록에 위임
+  const commentsList = document.getElementById('comments-list');
+  if (commentsList) {
+    commentsList.addEventListener('click', function (e) {
+      var btn = e.target.closest('button');
+      if (!btn || !commentsList.contains(btn)) return;
+
+      // 답글 버튼 – 클릭 시 답글 폼 표시 / 답글 취소
+      if (btn.classList.contains('comment-reply-btn') || btn.classList.contains('reply-cancel')) {
+        var wrap = document.getElementById('reply-form-wrap-' + btn.dataset.parentId);
+        if (!wrap) return;
+        var show = btn.classList.contains('comment-reply-btn') && wrap.style.display === 'none';
+        wrap.style.display = show ? 'block' : 'none';
+        return;
+      }
 
-  // 수정 버튼 – 클릭 시 편집 폼 표시
-  document.querySelectorAll('.comment-edit-btn').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const commentId = this.dataset.commentId;
-      const textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
-      const formWrap = document.getElementById('edit-form-' + commentId);
-      if (!textEl || !formWrap) return;
-      textEl.style.display = 'none';
-      formWrap.style.display = 'block';
-    });
-  });
+      // 수정 버튼 – 클릭 시 편집 폼 표시 / 수정 취소
+      if (btn.classList.contains('comment-edit-btn') || btn.classList.contains('comment-edit-cancel')) {
+        var commentId = btn.dataset.commentId;
+        var textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
+        var formWrap = document.getElementById('edit-form-' + commentId);
+        if (!textEl || !formWrap) return;
+        var editing = btn.classList.contains('comment-edit-btn');
+        textEl.style.display = editing ? 'none' : '';
+        formWrap.style.display = editing ? 'block' : 'none';
+        return;
+      }
 
-  // 수정 취소
-  document.querySelectorAll('.comment-edit-cancel').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const commentId = this.dataset.commentId;
-      const textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
-      const formWrap = document.getElementById('edit-form-' + commentId);
-      if (textEl) textEl.style.display = '';
-      if (formWrap) formWrap.style.display = 'none';
+      // 댓글·답글 더보기 – 다음 페이지 HTML 조각으로 버튼 자리를 채움 (조각 끝에 다음 더보기 버튼 포함)
+      if (btn.classList.contains('comments-more')) {
+        if (btn.disabled) return;
+        btn.disabled = true;
+        fetch(btn.dataset.url, { credentials: 'same-origin' })
+          .then(function (r) {
+            if (!r.ok) throw new Error('HTTP ' + r.status);
+            return r.text();
+          })
+          .then(function (html) {
+            btn.insertAdjacentHTML('beforebegin', html);
+            btn.remove();
+          })
+          .catch(function () { btn.disabled = false; alert('댓글을 불러오지 못했습니다.'); });
+      }
     });
-  });
+  }
 
   // 정렬 버튼
   const sortBtns = document.querySelectorAll('.sort-btn');
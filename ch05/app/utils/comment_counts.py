@@ -0,0 +1,98 @@
+"""
+댓글 수 집계 컬럼 유지 – videos.comment_count.
+
+기능: 시청 페이지·댓글 API 의 댓글 수(답글 포함), 스튜디오 대시보드·관리자 대시보드의 댓글 총계를
+      comments 를 세는 대신 videos 행에 저장된 값(채널·전체는 그 합계)으로 읽습니다.
+
+유지 방식: Comment 행이 추가·삭제되면 같은 flush(트랜잭션) 안에서
+      "UPDATE videos SET comment_count = comment_count + 1" 처럼 SQL 쪽에서 증감
+      (읽고-더하고-쓰기 없음, rollback 되면 함께 취소).
+  - comments.create / reply 는 ORM 을 거치므로 자동 반영
+  - comments.delete, admin.comment_delete 는 comment_tree.delete_subtree 로 하위 트리를 한 번에 지우고
+    지운 행 수만큼 차감 (Comment.replies 의 ORM cascade 는 세션에서 직접 지울 때의 경로)
+  - comments 를 SQL 로 직접 고치는 코드는 apply_delta() 를 같은 트랜잭션에서 호출해야 함
+
+검증: check_comment_counts() 가 comments 집계와 비교해 어긋난 비디오 목록 반환,
+      repair=True 면 다시 셈. (DB 의 ON DELETE CASCADE 등 ORM 을 거치지 않은 변경 복구용)
+      실행: python scripts/check_comment_counts.py [--repair]
+"""
+
+from sqlalchemy import event, func, inspect, select, text, update
+
+from app import db
+from app.models import Comment, Video
+
+# repair 시 UPDATE 1번에 넣는 video_id 수
+REPAIR_BATCH = 500
+
+# ---------------------------------------------------------------------------
+# 증감 반영·합계
+# ---------------------------------------------------------------------------
+def apply_delta(connection, video_id, delta):
+    """비디오 video_id 의 댓글 수를 delta 만큼 증감 (connection 의 트랜잭션 안에서)."""
+    videos = Video.__table__
+    connection.execute(
+        update(videos).where(videos.c.id == video_id).values(comment_count=videos.c.comment_count + delta)
+    )
+
+
+def site_comment_total():
+    """전체 댓글 수 (videos.comment_count 합)."""
+    return int(db.session.execute(select(func.coalesce(func.sum(Video.comment_count), 0))).scalar())
+
+
+# ---------------------------------------------------------------------------
+# 검증·재계산
+# ---------------------------------------------------------------------------
+def check_comment_counts(repair=False):
+    """
+    videos.comment_count 와 comments 비교.
+    반환: 어긋난 비디오 [(video_id, 저장된 댓글 수, 실제 댓글 수), ...].
+    repair=True 면 어긋난 비디오 행만 SQL 로 다시 셈 (UPDATE 시점의 comments 기준 –
+    검사와 수정 사이에 달린 댓글도 반영).
+    """
+    actual = dict(db.session.execute(select(Comment.video_id, func.count()).group_by(Comment.video_id)).all())
+    mismatches = [
+        (video_id, stored, actual.get(video_id, 0))
+        for video_id, stored in db.session.execute(select(Video.id, Video.comment_count).order_by(Video.id))
+        if stored != actual.get(video_id, 0)
+    ]
+    if repair and mismatches:
+        videos, comments = Video.__table__, Comment.__table__
+        counted = select(func.count()).where(comments.c.video_id == videos.c.id).scalar_subquery()
+        ids = [video_id for video_id, _, _ in mismatches]
+        for i in range(0, len(ids), REPAIR_BATCH):
+            db.session.execute(
+                update(videos).where(videos.c.id.in_(ids[i:i + REPAIR_BATCH])).values(comment_count=counted)
+            )
+        db.session.commit()
+    return mismatches
+
+
+def ensure_comment_counts(app):
+    """
+    create_app() 에서 create_all() 직후 (videos 를 조회하기 전) 호출.
+    기존 DB 에 집계 컬럼이 없으면 추가하고 comments 로 한 번 채움. 댓글 페이지용 인덱스도 없으면 생성.
+    """
+    for index in Comment.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    columns = {column["name"] for column in inspect(db.engine).get_columns(Video.__tablename__)}
+    if "comment_count" in columns:
+        return
+    db.session.execute(text(f"ALTER TABLE {Video.__tablename__} ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0"))
+    db.session.commit()
+    fixed = check_comment_counts(repair=True)
+    app.logger.info("댓글 수 집계 컬럼 추가: videos.comment_count (비디오 %d개 채움)", len(fixed))
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 댓글 행 추가·삭제를 같은 flush(트랜잭션) 안에서 반영
+# ---------------------------------------------------------------------------
+@event.listens_for(Comment, "after_insert")
+def _after_insert(mapper, connection, target):
+    apply_delta(connection, target.video_id, 1)
+
+
+@event.listens_for(Comment, "after_delete")
+def _after_delete(mapper, connection, target):
+    apply_delta(connection, target.video_id, -1)
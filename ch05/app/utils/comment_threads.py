@@ -0,0 +1,110 @@
+"""
+댓글 스레드 페이지 – 시청 페이지 댓글 목록, GET /api/videos/<id>/comments, GET /api/comments/<id>/replies 용.
+
+기능: 비디오의 댓글을 한 번에 모두 읽지 않고, 최상위 댓글을 작성 시간 순으로 per_page 개씩
+      keyset(커서) 방식으로 읽습니다. 각 댓글에는 답글 수와 앞쪽 답글 preview 개를 붙이고,
+      나머지 답글은 댓글별 커서(reply_page)로 이어서 읽습니다.
+
+쿼리 (페이지 깊이·댓글 총량과 무관):
+  - thread_page: 최상위 댓글 1번 (작성자 joinedload) + 답글 수·앞쪽 답글 1번 (ROW_NUMBER/COUNT 윈도 함수)
+  - reply_page:  답글 1번
+
+커서: app.utils.pagination 의 불투명 커서 (종류 "comments" / "replies", 키 created_at·id).
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Comment
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_after
+
+CURSOR_KEYS = ("created_at", "id")
+
+
+def _cursor_for(kind, comment):
+    return encode_cursor(kind, [comment.created_at.isoformat(), comment.id])
+
+
+def _page_query(query, kind, cursor, per_page):
+    """created_at·id 오름차순으로 cursor 다음 per_page 개 (+1 개로 다음 페이지 여부 판단)."""
+    columns = [Comment.created_at, Comment.id]
+    if cursor:
+        values, _ = decode_cursor(cursor, kind, keys=CURSOR_KEYS)
+        query = query.where(keyset_after(columns, values, descending=False))
+    rows = db.session.execute(query.order_by(*columns).limit(per_page + 1)).scalars().unique().all()
+    return rows[:per_page], len(rows) > per_page
+
+
+class Thread:
+    """최상위 댓글 1개 + 답글 수 + 앞쪽 답글. replies_cursor 가 있으면 reply_page 로 나머지 조회."""
+
+    def __init__(self, comment, reply_count, replies):
+        self.comment = comment
+        self.reply_count = reply_count
+        self.replies = replies
+        has_more = reply_count > len(replies)
+        self.replies_cursor = _cursor_for("replies", replies[-1]) if has_more and replies else None
+        self.more_replies = reply_count - len(replies)
+
+
+class CommentPage:
+    """thread_page / reply_page 결과. next_cursor 가 None 이면 마지막 페이지."""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _reply_previews(parent_ids, preview):
+    """{부모 id: (답글 수, 앞쪽 답글 preview 개)}. 쿼리 1번."""
+    if not parent_ids:
+        return {}
+    ranked = (
+        select(
+            Comment.id.label("id"),
+            func.row_number()
+            .over(partition_by=Comment.parent_id, order_by=(Comment.created_at, Comment.id))
+            .label("position"),
+            func.count().over(partition_by=Comment.parent_id).label("total"),
+        )
+        .where(Comment.parent_id.in_(parent_ids))
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Comment, ranked.c.total)
+        .join(ranked, ranked.c.id == Comment.id)
+        .where(ranked.c.position <= max(preview, 1))  # preview=0 이어도 답글 수는 필요
+        .options(joinedload(Comment.user))
+        .order_by(Comment.parent_id, Comment.created_at, Comment.id)
+    ).all()
+    result = {}
+    for reply, total in rows:
+        _, replies = result.setdefault(reply.parent_id, (total, []))
+        if len(replies) < preview:
+            replies.append(reply)
+    return result
+
+
+def thread_page(video_id, cursor=None, per_page=20, preview=3):
+    """비디오 video_id 의 최상위 댓글 1페이지 (Thread 목록). 잘못된 커서면 InvalidCursor."""
+    query = (
+        select(Comment)
+        .where(Comment.video_id == video_id, Comment.parent_id.is_(None))
+        .options(joinedload(Comment.user))
+    )
+    comments, has_next = _page_query(query, "comments", cursor, per_page)
+    previews = _reply_previews([c.id for c in comments], preview)
+    threads = [Thread(c, *previews.get(c.id, (0, []))) for c in comments]
+    return CommentPage(threads, _cursor_for("comments", comments[-1]) if has_next else None)
+
+
+def reply_page(parent_id, cursor=None, per_page=20):
+    """댓글 parent_id 의 답글 1페이지 (Comment 목록). 잘못된 커서면 InvalidCursor."""
+    query = select(Comment).where(Comment.parent_id == parent_id).options(joinedload(Comment.user))
+    replies, has_next = _page_query(query, "replies", cursor, per_page)
+    return CommentPage(replies, _cursor_for("replies", replies[-1]) if has_next else None)
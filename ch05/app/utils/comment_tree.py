@@ -0,0 +1,143 @@
+"""
+댓글 하위 트리 연산 (WITH RECURSIVE) – comments.delete, admin.comment_delete, GET /api/comments/<id>/thread 용.
+
+기능: 답글이 깊게 달린 댓글을 다룰 때 ORM 처럼 답글을 한 단계씩 세션에 읽어 오지 않고,
+      재귀 CTE 로 하위 트리를 DB 안에서 펼쳐 문장 1번으로 처리합니다.
+  - count_descendants: 하위 답글 수 (SELECT 1번)
+  - delete_subtree:    댓글 + 모든 하위 답글 삭제 (DELETE 1번) + videos.comment_count 차감 (UPDATE 1번)
+  - fetch_thread:      댓글부터 depth 단계까지, 최대 limit 개 (id 목록 CTE 1번 + 댓글 로드 1번,
+                       잘렸으면 이어 읽을 댓글 조회 1번)
+
+주의: Core DELETE 라 Comment after_delete 이벤트가 불리지 않음 → 댓글 수 차감은 delete_subtree 가 직접,
+      실시간 카운트(live_events)는 호출한 라우트가 commit 후 발행.
+      MySQL 은 DELETE 대상 테이블을 같은 문장의 서브쿼리에서 읽을 수 없어 id 를 먼저 읽고
+      DELETE_BATCH 개씩 깊은 답글부터 지움 (IN 목록·잠금 범위를 일정하게).
+비교: python scripts/bench_comment_subtree.py
+"""
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Comment
+from app.utils.comment_counts import apply_delta
+
+# MySQL delete_subtree 의 DELETE 1번당 id 수
+DELETE_BATCH = 1000
+
+
+def subtree_cte(comment_id, max_depth=None):
+    """comment_id 와 하위 답글 (id, parent_id, depth) 재귀 CTE. 루트 depth=0, max_depth 가 있으면 그 단계까지."""
+    comments = Comment.__table__
+    tree = (
+        select(comments.c.id, comments.c.parent_id, literal(0).label("depth"))
+        .where(comments.c.id == comment_id)
+        # nesting: WITH 를 서브쿼리 안에 둠 → DELETE 문이 DELETE 로 시작해야 sqlite3 가 rowcount 를 알려 줌
+        .cte("subtree", recursive=True, nesting=True)
+    )
+    step = select(comments.c.id, comments.c.parent_id, (tree.c.depth + 1).label("depth")).where(
+        comments.c.parent_id == tree.c.id
+    )
+    if max_depth is not None:
+        step = step.where(tree.c.depth < max_depth)
+    return tree.union_all(step)
+
+
+def count_descendants(comment_id):
+    """댓글 comment_id 의 하위 답글 수 (모든 단계, 자기 자신 제외)."""
+    tree = subtree_cte(comment_id)
+    return db.session.execute(select(func.count()).select_from(tree).where(tree.c.depth > 0)).scalar()
+
+
+def delete_subtree(connection, comment_id, video_id):
+    """
+    댓글 comment_id 와 모든 하위 답글 삭제, 비디오 video_id 의 댓글 수를 지운 만큼 차감 (connection 의 트랜잭션 안에서).
+    반환: 지운 행 수.
+    """
+    comments = Comment.__table__
+    tree = subtree_cte(comment_id)
+    if connection.dialect.name in ("mysql", "mariadb"):
+        # 깊은 답글부터 → 앞 배치가 지운 부모를 가리키는 답글이 남지 않음 (FK CASCADE 에 기대지 않음)
+        ids = list(connection.execute(select(tree.c.id).order_by(tree.c.depth.desc(), tree.c.id)).scalars())
+        removed = 0
+        for start in range(0, len(ids), DELETE_BATCH):
+            batch = ids[start:start + DELETE_BATCH]
+            removed += connection.execute(delete(comments).where(comments.c.id.in_(batch))).rowcount
+    else:
+        removed = connection.execute(delete(comments).where(comments.c.id.in_(select(tree.c.id)))).rowcount
+    if removed:
+        apply_delta(connection, video_id, -removed)
+    return removed
+
+
+class ThreadSlice:
+    """
+    fetch_thread 결과. items: [(Comment, depth), ...] (화면 순서).
+    truncated 면 limit 에서 잘림 – continue_ids 의 댓글들은 답글 일부(또는 전부)가 빠져 있어 그 댓글부터 다시 조회.
+    """
+
+    def __init__(self, items, truncated=False, continue_ids=()):
+        self.items = items
+        self.truncated = truncated
+        self.continue_ids = list(continue_ids)
+
+
+def fetch_thread(comment_id, max_depth=None, limit=None):
+    """
+    댓글 comment_id 부터 max_depth 단계 아래까지 최대 limit 개를 화면 순서(전위 순회,
+    형제끼리는 작성 시간 순)로 반환 (ThreadSlice). 없는 댓글이면 items 가 빈 목록.
+    limit 은 CTE 조회의 LIMIT – 재귀는 부모를 자식보다 먼저 내보내므로 얕은 단계부터 채워지고,
+    DB 는 limit 개를 채우면 더 펼치지 않음 (큰 스레드라도 읽는 행 수가 limit 에 묶임).
+    """
+    tree = subtree_cte(comment_id, max_depth)
+    query = select(tree.c.id, tree.c.depth)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    depths = dict(db.session.execute(query).all())
+    if not depths:
+        return ThreadSlice([])
+    truncated = limit is not None and len(depths) > limit
+    if truncated:
+        # 남는 1개는 가장 깊은 것에서 버림
+        del depths[max(depths, key=lambda i: (depths[i], i))]
+    loaded = (
+        db.session.execute(
+            select(Comment)
+            .where(Comment.id.in_(list(depths)))
+            .options(joinedload(Comment.user))
+            .order_by(Comment.created_at, Comment.id)
+        )
+        .scalars()
+        .all()
+    )
+    children = {}
+    for comment in loaded:
+        children.setdefault(comment.parent_id, []).append(comment)
+    root = next((c for c in loaded if c.id == comment_id), None)
+    if root is None:
+        return ThreadSlice([])
+    result, stack = [], [root]
+    while stack:  # 깊은 답글 사슬도 재귀 한도 없이 순회
+        comment = stack.pop()
+        result.append((comment, depths[comment.id]))
+        stack.extend(reversed(children.get(comment.id, [])))
+    if not truncated:
+        return ThreadSlice(result)
+    return ThreadSlice(result, True, _continue_ids(result, max_depth))
+
+
+def _continue_ids(items, max_depth):
+    """items 중 답글이 빠진 댓글 id (화면 순서). max_depth 에 닿은 댓글은 깊이 제한이라 제외."""
+    comments = Comment.__table__
+    shown = [comment.id for comment, _ in items]
+    open_ids = [comment.id for comment, depth in items if max_depth is None or depth < max_depth]
+    if not open_ids:
+        return []
+    parents = set(
+        db.session.execute(
+            select(comments.c.parent_id)
+            .where(comments.c.parent_id.in_(open_ids), comments.c.id.not_in(shown))
+            .distinct()
+        ).scalars()
+    )
+    return [comment_id for comment_id in shown if comment_id in parents]
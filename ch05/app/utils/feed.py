@@ -0,0 +1,538 @@
+"""
+구독 피드 받은편지함 (fan-out-on-write) – main.subscriptions 용.
+
+기능: 비디오가 올라오면 채널 구독자마다 feed_inbox 에 (subscriber_id, video_id, created_at) 1행을 넣어 두고,
+      /subscriptions 는 "subscriber_id = ? ORDER BY created_at DESC" 인덱스 범위 스캔 1번으로 읽습니다.
+      (구독 채널 id 목록을 IN 으로 넘겨 videos 를 정렬하던 방식 대체)
+
+유지 방식:
+  - 비디오 추가: commit 후 백그라운드 스레드가 INSERT ... SELECT 1번으로 구독자 전체에 배포.
+                FEED_FANOUT_ASYNC=False 이거나 in-memory SQLite 면 같은 트랜잭션(flush 직후)에서 바로 배포.
+  - 구독: 그 채널의 기존 비디오를 받은편지함에 채움 (같은 트랜잭션)
+  - 구독 해제: 그 채널 행 삭제 (같은 트랜잭션)
+  - 비디오 삭제: 모든 받은편지함에서 삭제 (같은 트랜잭션)
+
+대형 채널: 구독자가 FEED_FANOUT_MAX_SUBSCRIBERS 명을 넘으면 feed_pull_channels 에 등록하고
+      받은편지함 행을 지움. 이런 채널의 비디오는 피드를 읽을 때 videos(user_id, created_at)에서 직접 가져옴.
+      (한 번 pull 로 바뀐 채널은 구독자가 줄어도 그대로 유지 – 경계에서 오가며 대량 INSERT/DELETE 반복 방지)
+
+복구: 받은편지함이 비었는데 구독이 있으면 create_app() 에서 한 번 다시 채움.
+      실행: python scripts/rebuild_feed_inbox.py
+
+읽기 전략 (FEED_STRATEGY, 받은편지함 유지는 전략과 무관하게 계속):
+  - "inbox":   feed_inbox 범위 스캔 (기본)
+  - "merge":   채널별 최신 비디오 커서를 힙으로 k-way 병합 (merge_page, 받은편지함 미사용)
+  - "in_list": 구독 채널 id 를 IN 으로 넘겨 videos 정렬 (기존 방식)
+  비교: python scripts/bench_feed.py
+"""
+
+import heapq
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import and_, delete, event, exists, func, insert, literal, or_, select
+from sqlalchemy.orm import Session, joinedload
+
+DEFAULT_MAX_SUBSCRIBERS = 5000
+STRATEGIES = ("inbox", "merge", "in_list")
+
+
+class _Fanout:
+    """앱 1개에 대응하는 배포 설정·작업 스레드. app.extensions["feed_inbox"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        self.max_subscribers = max(1, int(app.config.get("FEED_FANOUT_MAX_SUBSCRIBERS", DEFAULT_MAX_SUBSCRIBERS)))
+        uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+        # in-memory SQLite 는 다른 스레드의 연결에서 같은 DB 를 볼 수 없어 동기 배포
+        self.asynchronous = bool(app.config.get("FEED_FANOUT_ASYNC", True)) and ":memory:" not in uri
+        strategy = app.config.get("FEED_STRATEGY", "inbox")
+        self.strategy = strategy if strategy in STRATEGIES else "inbox"
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def submit(self, video_ids):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feed-fanout")
+        return self.executor.submit(self._run, list(video_ids))
+
+    def _run(self, video_ids):
+        from app import db
+
+        with self.app.app_context():
+            try:
+                fan_out(db.session.connection(), video_ids)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception("구독 피드 배포 실패: video_ids=%s", video_ids)
+
+
+def _max_subscribers():
+    from flask import current_app, has_app_context
+
+    if has_app_context() and "feed_inbox" in current_app.extensions:
+        return current_app.extensions["feed_inbox"].max_subscribers
+    return DEFAULT_MAX_SUBSCRIBERS
+
+
+# ---------------------------------------------------------------------------
+# 받은편지함 쓰기 (모두 connection 의 트랜잭션 안에서 실행)
+# ---------------------------------------------------------------------------
+def _insert_select(connection, source):
+    """source: (subscriber_id, video_id, author_id, created_at) SELECT. 이미 있는 행은 건너뜀."""
+    from app.models import FeedItem
+
+    inbox = FeedItem.__table__
+    rows = source.subquery("src")
+    stmt = insert(inbox).from_select(
+        ["subscriber_id", "video_id", "author_id", "created_at"],
+        select(rows.c.subscriber_id, rows.c.video_id, rows.c.author_id, rows.c.created_at).where(
+            ~exists().where(inbox.c.subscriber_id == rows.c.subscriber_id, inbox.c.video_id == rows.c.video_id)
+        ),
+    )
+    return connection.execute(stmt).rowcount
+
+
+def _subscriber_videos():
+    """(구독자, 비디오, 작성자, 업로드 시각) – pull 채널 비디오 제외."""
+    from app.models import FeedPullChannel, Subscription, Video
+
+    return (
+        select(
+            Subscription.subscriber_id,
+            Video.id.label("video_id"),
+            Video.user_id.label("author_id"),
+            Video.created_at,
+        )
+        .join(Subscription, Subscription.subscribed_to_id == Video.user_id)
+        .where(Video.user_id.not_in(select(FeedPullChannel.channel_id)))
+    )
+
+
+def fan_out(connection, video_ids):
+    """video_ids 를 작성자의 구독자 받은편지함 전체에 배포 (pull 채널 비디오 제외). 반환: 넣은 행 수."""
+    from app.models import Video
+
+    if not video_ids:
+        return 0
+    return _insert_select(connection, _subscriber_videos().where(Video.id.in_(list(video_ids))))
+
+
+def backfill(connection, subscriber_id, channel_id):
+    """구독 시작: channel_id 의 기존 비디오를 subscriber_id 받은편지함에 채움 (pull 채널이면 생략)."""
+    from app.models import Video
+
+    if _is_pull(connection, channel_id):
+        return 0
+    source = select(
+        literal(subscriber_id).label("subscriber_id"),
+        Video.id.label("video_id"),
+        Video.user_id.label("author_id"),
+        Video.created_at,
+    ).where(Video.user_id == channel_id)
+    return _insert_select(connection, source)
+
+
+def prune(connection, subscriber_id, channel_id):
+    """구독 해제: subscriber_id 받은편지함에서 channel_id 비디오 삭제."""
+    from app.models import FeedItem
+
+    inbox = FeedItem.__table__
+    connection.execute(
+        delete(inbox).where(inbox.c.author_id == channel_id, inbox.c.subscriber_id == subscriber_id)
+    )
+
+
+def _is_pull(connection, channel_id):
+    from app.models import FeedPullChannel
+
+    return connection.execute(
+        select(FeedPullChannel.channel_id).where(FeedPullChannel.channel_id == channel_id)
+    ).first() is not None
+
+
+def update_pull_mode(connection, channel_id, max_subscribers=None):
+    """
+    구독자가 max_subscribers 명을 넘은 채널을 pull 로 전환 (받은편지함 행 삭제).
+    센 행 수는 max_subscribers + 1 개까지만 (대형 채널도 구독 1건마다 전체를 세지 않음). 반환: 전환 여부.
+    """
+    from app.models import FeedItem, FeedPullChannel, Subscription
+
+    limit = max_subscribers or _max_subscribers()
+    if _is_pull(connection, channel_id):
+        return False
+    capped = (
+        select(literal(1)).where(Subscription.subscribed_to_id == channel_id).limit(limit + 1).subquery()
+    )
+    if connection.execute(select(func.count()).select_from(capped)).scalar() <= limit:
+        return False
+    connection.execute(insert(FeedPullChannel.__table__).values(channel_id=channel_id))
+    connection.execute(delete(FeedItem.__table__).where(FeedItem.__table__.c.author_id == channel_id))
+    return True
+
+
+def rebuild_inbox():
+    """
+    feed_pull_channels·feed_inbox 를 subscriptions·videos 기준으로 다시 채움.
+    반환: (받은편지함 행 수, pull 채널 수).
+    """
+    from app import db
+    from app.models import FeedItem, FeedPullChannel, Subscription
+
+    limit = _max_subscribers()
+    connection = db.session.connection()
+    connection.execute(delete(FeedItem.__table__))
+    connection.execute(delete(FeedPullChannel.__table__))
+    big = (
+        select(Subscription.subscribed_to_id)
+        .group_by(Subscription.subscribed_to_id)
+        .having(func.count() > limit)
+    )
+    connection.execute(insert(FeedPullChannel.__table__).from_select(["channel_id"], big))
+    connection.execute(
+        insert(FeedItem.__table__).from_select(
+            ["subscriber_id", "video_id", "author_id", "created_at"], _subscriber_videos()
+        )
+    )
+    db.session.commit()
+    return (
+        db.session.execute(select(func.count()).select_from(FeedItem)).scalar(),
+        db.session.execute(select(func.count()).select_from(FeedPullChannel)).scalar(),
+    )
+
+
+def ensure_feed_inbox(app):
+    """
+    create_app() 에서 create_all() 직후 호출. 기존 DB 에 채널별 구독·비디오 인덱스가 없으면 만들고,
+    받은편지함이 새로 생긴 경우 (구독은 있는데 행이 없음) 한 번 채움.
+    """
+    from app import db
+    from app.models import FeedItem, FeedPullChannel, Subscription, Video
+
+    for index in (*Subscription.__table__.indexes, *Video.__table__.indexes):
+        index.create(db.engine, checkfirst=True)
+    has_subs = db.session.execute(select(Subscription.subscriber_id).limit(1)).first() is not None
+    has_inbox = db.session.execute(select(FeedItem.video_id).limit(1)).first() is not None
+    has_pull = db.session.execute(select(FeedPullChannel.channel_id).limit(1)).first() is not None
+    if has_subs and not has_inbox and not has_pull:
+        rows, pulls = rebuild_inbox()
+        if rows or pulls:
+            app.logger.info("구독 피드 받은편지함 초기화: %d행, pull 채널 %d개", rows, pulls)
+
+
+# ---------------------------------------------------------------------------
+# 읽기
+# ---------------------------------------------------------------------------
+def _pull_channel_ids(subscriber_id):
+    """subscriber_id 가 구독 중인 pull 채널 id 목록."""
+    from app import db
+    from app.models import FeedPullChannel, Subscription
+
+    return list(
+        db.session.execute(
+            select(FeedPullChannel.channel_id).join(
+                Subscription,
+                and_(
+                    Subscription.subscribed_to_id == FeedPullChannel.channel_id,
+                    Subscription.subscriber_id == subscriber_id,
+                ),
+            )
+        ).scalars()
+    )
+
+
+def feed_query(subscriber_id, pull_ids=None):
+    """
+    subscriber_id 의 구독 피드 (Video 쿼리, 최신순). paginate() 해서 사용.
+    pull 채널을 구독하지 않으면 받은편지함 범위 스캔만, 구독하면 해당 채널 비디오를 함께 합침.
+    """
+    from app.models import FeedItem, Video
+
+    if pull_ids is None:
+        pull_ids = _pull_channel_ids(subscriber_id)
+    query = Video.query.options(joinedload(Video.user))
+    if not pull_ids:
+        return (
+            query.join(FeedItem, FeedItem.video_id == Video.id)
+            .filter(FeedItem.subscriber_id == subscriber_id)
+            .order_by(FeedItem.created_at.desc(), FeedItem.video_id.desc())
+        )
+    inbox_ids = select(FeedItem.video_id).where(FeedItem.subscriber_id == subscriber_id)
+    return query.filter(or_(Video.id.in_(inbox_ids), Video.user_id.in_(pull_ids))).order_by(
+        Video.created_at.desc(), Video.id.desc()
+    )
+
+
+def inbox_page(subscriber_id, page=1, per_page=12):
+    """
+    받은편지함 피드 1페이지 (Pagination). pull 채널이 없으면 전체 개수도 feed_inbox 인덱스로만 셈
+    (paginate 기본 COUNT 는 videos 조인 결과 전체를 세서 구독이 많을수록 느림).
+    """
+    from app import db
+    from app.models import FeedItem
+
+    pull_ids = _pull_channel_ids(subscriber_id)
+    query = feed_query(subscriber_id, pull_ids)
+    if pull_ids:
+        return query.paginate(page=page, per_page=per_page)
+    pagination = query.paginate(page=page, per_page=per_page, count=False)
+    pagination.total = db.session.execute(
+        select(func.count()).select_from(FeedItem).where(FeedItem.subscriber_id == subscriber_id)
+    ).scalar()
+    return pagination
+
+
+def in_list_query(subscriber_id):
+    """기존 방식: 구독 채널 id 목록을 IN 으로 넘겨 videos 정렬 (비교·벤치마크용)."""
+    from app import db
+    from app.models import Subscription, Video
+
+    channel_ids = list(
+        db.session.execute(
+            select(Subscription.subscribed_to_id).where(Subscription.subscriber_id == subscriber_id)
+        ).scalars()
+    )
+    return (
+        Video.query.options(joinedload(Video.user))
+        .filter(Video.user_id.in_(channel_ids))
+        .order_by(Video.created_at.desc(), Video.id.desc())
+    )
+
+
+class FeedPage:
+    """
+    merge_page 결과. 템플릿에서 Flask-SQLAlchemy Pagination 처럼 사용 (items, page, has_prev/next ...).
+    전체 개수를 세지 않으므로 total·pages 는 None.
+    """
+
+    total = None
+    pages = None
+
+    def __init__(self, items, page, per_page, has_next):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _sort_time(dt):
+    """created_at → 초 (naive 는 UTC 로 간주, 서버 시간대·DST 와 무관)."""
+    return dt.timestamp() if dt.tzinfo is not None else (dt - _EPOCH).total_seconds()
+
+
+def _merge_key(row):
+    """(created_at, id) 내림차순을 최소 힙 순서로."""
+    return (-_sort_time(row.created_at), -row.id)
+
+
+class _ChannelCursor:
+    """채널 1개의 최신순 스트림: 읽어 둔 (id, created_at) slice 와 다음 slice 키셋 위치."""
+
+    def __init__(self, channel_id, slice_size):
+        self.channel_id = channel_id
+        self.slice_size = slice_size
+        self.buffer = deque()
+        self.last = None  # 마지막으로 읽은 행 (키셋 기준)
+        self.more = True
+
+    def load(self):
+        """
+        다음 slice 를 videos(user_id, created_at, id) 인덱스만으로 읽음 (커버링, ORM 객체 생성 없음).
+        읽은 게 없으면 False.
+        """
+        from app import db
+        from app.models import Video
+
+        stmt = select(Video.id, Video.created_at).where(
+            Video.user_id == self.channel_id, Video.created_at.isnot(None)
+        )
+        if self.last is not None:
+            stmt = stmt.where(
+                or_(
+                    Video.created_at < self.last.created_at,
+                    and_(Video.created_at == self.last.created_at, Video.id < self.last.id),
+                )
+            )
+        rows = db.session.execute(
+            stmt.order_by(Video.created_at.desc(), Video.id.desc()).limit(self.slice_size)
+        ).all()
+        self.buffer.extend(rows)
+        self.more = len(rows) == self.slice_size
+        if rows:
+            self.last = rows[-1]
+        return bool(rows)
+
+
+def merge_page(subscriber_id, page=1, per_page=12):
+    """
+    pull 방식 구독 피드: 채널별 "최신 비디오" 커서를 힙으로 k-way 병합.
+
+    1) 구독 채널마다 최신 업로드 시각을 상관 서브쿼리(videos(user_id, created_at) 인덱스 MAX)로 한 번에 조회
+    2) 힙에는 채널 머리를 넣되, 아직 안 읽은 채널은 최신 시각을 상한 키로 넣어 두고
+       꺼냈을 때만 created_at·id 키셋으로 per_page 개씩 (id, created_at) 만 읽음
+    3) 해당 페이지 비디오만 작성자와 함께 "id IN (...)" 으로 로드
+    → 페이지 N 비용은 (N × per_page) 와 구독 채널 수에 비례하고, 채널 비디오 총량과 무관.
+    """
+    from app import db
+    from app.models import Subscription, Video
+
+    latest = (
+        select(func.max(Video.created_at))
+        .where(Video.user_id == Subscription.subscribed_to_id)
+        .correlate(Subscription)
+        .scalar_subquery()
+    )
+    heads = db.session.execute(
+        select(Subscription.subscribed_to_id, latest).where(Subscription.subscriber_id == subscriber_id)
+    ).all()
+    # 힙 원소: (-시각, -id, 채널 id). 안 읽은 채널은 id 자리를 -inf 로 (같은 시각의 어떤 비디오보다 앞)
+    heap = [(-_sort_time(head), float("-inf"), channel_id) for channel_id, head in heads if head is not None]
+    heapq.heapify(heap)
+
+    need = page * per_page + 1  # 다음 페이지 유무 확인용 1개 더
+    cursors = {}
+    merged = []
+    while heap and len(merged) < need:
+        channel_id = heapq.heappop(heap)[2]
+        cursor = cursors.setdefault(channel_id, _ChannelCursor(channel_id, per_page))
+        if not cursor.buffer:
+            if cursor.load():
+                heapq.heappush(heap, (*_merge_key(cursor.buffer[0]), channel_id))
+            continue
+        row = cursor.buffer.popleft()
+        merged.append(row.id)
+        if cursor.buffer:
+            heapq.heappush(heap, (*_merge_key(cursor.buffer[0]), channel_id))
+        elif cursor.more:
+            heapq.heappush(heap, (*_merge_key(row), channel_id))  # 다음 slice 의 상한 키
+
+    start = (page - 1) * per_page
+    ids = merged[start:start + per_page]
+    by_id = {}
+    if ids:
+        by_id = {v.id: v for v in Video.query.options(joinedload(Video.user)).filter(Video.id.in_(ids))}
+    items = [by_id[vid] for vid in ids if vid in by_id]
+    return FeedPage(items, page, per_page, has_next=len(merged) > page * per_page)
+
+
+class FeedInbox:
+    """
+    구독 피드 확장. db, view_counter 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    라우트에서는 feed_inbox.page(user_id, page, per_page) 만 호출하면 됩니다.
+    """
+
+    def init_app(self, app):
+        app.extensions["feed_inbox"] = _Fanout(app)
+        _register_events()
+
+    def page(self, subscriber_id, page=1, per_page=12, strategy=None):
+        """
+        구독 피드 1페이지. strategy 생략 시 FEED_STRATEGY.
+        inbox·in_list 는 Flask-SQLAlchemy Pagination, merge 는 FeedPage (total·pages 없음).
+        """
+        from flask import current_app
+
+        strategy = strategy or current_app.extensions["feed_inbox"].strategy
+        if strategy == "merge":
+            return merge_page(subscriber_id, page=page, per_page=per_page)
+        if strategy == "in_list":
+            return in_list_query(subscriber_id).paginate(page=page, per_page=per_page)
+        return inbox_page(subscriber_id, page=page, per_page=per_page)
+
+    def wait(self):
+        """비동기 배포 작업이 모두 끝날 때까지 대기 (스크립트·테스트용)."""
+        from flask import current_app
+
+        fanout = current_app.extensions["feed_inbox"]
+        with fanout.lock:
+            executor, fanout.executor = fanout.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트
+# ---------------------------------------------------------------------------
+def _video_after_insert(mapper, connection, target):
+    from sqlalchemy import inspect
+
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault("feed_new_videos", []).append(target.id)
+
+
+def _video_after_delete(mapper, connection, target):
+    from app.models import FeedItem
+
+    connection.execute(delete(FeedItem.__table__).where(FeedItem.__table__.c.video_id == target.id))
+
+
+def _subscription_after_insert(mapper, connection, target):
+    if not update_pull_mode(connection, target.subscribed_to_id):
+        backfill(connection, target.subscriber_id, target.subscribed_to_id)
+
+
+def _subscription_after_delete(mapper, connection, target):
+    prune(connection, target.subscriber_id, target.subscribed_to_id)
+
+
+def _fanout_state():
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.extensions.get("feed_inbox")
+    return None
+
+
+def _after_flush(session, flush_context):
+    fanout = _fanout_state()
+    if fanout is not None and fanout.asynchronous:
+        return  # commit 후 배포
+    video_ids = session.info.pop("feed_new_videos", None)
+    if video_ids:
+        fan_out(session.connection(), video_ids)
+
+
+def _after_commit(session):
+    video_ids = session.info.pop("feed_new_videos", None)
+    fanout = _fanout_state()
+    if video_ids and fanout is not None:
+        fanout.submit(video_ids)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("feed_new_videos", None)
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from app.models import Subscription, Video
+
+    if event.contains(Video, "after_insert", _video_after_insert):
+        return
+    event.listen(Video, "after_insert", _video_after_insert)
+    event.listen(Video, "after_delete", _video_after_delete)
+    event.listen(Subscription, "after_insert", _subscription_after_insert)
+    event.listen(Subscription, "after_delete", _subscription_after_delete)
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
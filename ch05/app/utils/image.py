@@ -1,11 +1,19 @@
 """
 이미지 파일 검증 유틸 – 프로필 이미지 업로드용.
+파일을 메모리에 읽지 않고 크기(seek/tell)·매직 바이트·헤더만 확인 (app.utils.ingest 와 같은 형식 판별).
 """
 
-from io import BytesIO
+import os
 
 from PIL import Image
 
+from app.utils.ingest import EXTENSION_KINDS, sniff
+
+# 매직 바이트 판별에 필요한 앞부분 크기 (WEBP: RIFF....WEBP 12바이트)
+_HEAD_SIZE = 32
+
+_INVALID_IMAGE = "유효하지 않은 이미지 파일입니다. 손상되었거나 이미지 형식이 아닐 수 있습니다."
+
 
 def validate_image_file(file_storage, allowed_extensions, max_size_bytes):
     """
@@ -13,9 +21,11 @@ def validate_image_file(file_storage, allowed_extensions, max_size_bytes):
 
     검사 항목:
     1. 파일 확장자 (allowed_extensions)
-    2. 파일 크기 (max_size_bytes)
-    3. Pillow Image.verify()로 실제 이미지 파일 여부 확인
+    2. 파일 크기 (max_size_bytes) – 스트림 끝 위치로 확인
+    3. 앞부분 매직 바이트가 확장자 형식과 일치하는지
+    4. Pillow Image.open()으로 헤더(형식·가로세로) 해석 – 픽셀 데이터는 읽지 않음
 
+    검사 후 스트림 위치는 처음으로 되돌림 (이어서 save 가능).
     반환: (True, None) 성공 시, (False, 에러메시지) 실패 시
     """
     if not file_storage or not file_storage.filename:
@@ -29,19 +39,28 @@ def validate_image_file(file_storage, allowed_extensions, max_size_bytes):
     if ext not in allowed_extensions:
         return False, f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(allowed_extensions))}"
 
-    file_storage.seek(0)
-    data = file_storage.read()
-    file_storage.seek(0)
+    stream = file_storage.stream
+    try:
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        if size > max_size_bytes:
+            max_mb = max_size_bytes // (1024 * 1024)
+            return False, f"파일 크기가 너무 큽니다. 최대 {max_mb}MB까지 업로드할 수 있습니다."
 
-    if len(data) > max_size_bytes:
-        max_mb = max_size_bytes // (1024 * 1024)
-        return False, f"파일 크기가 너무 큽니다. 최대 {max_mb}MB까지 업로드할 수 있습니다."
+        stream.seek(0)
+        if sniff(stream.read(_HEAD_SIZE)) != EXTENSION_KINDS.get(ext):
+            return False, _INVALID_IMAGE
 
-    # Pillow로 실제 이미지 파일 여부 검증
-    try:
-        img = Image.open(BytesIO(data))
-        img.verify()
-    except Exception:
-        return False, "유효하지 않은 이미지 파일입니다. 손상되었거나 이미지 형식이 아닐 수 있습니다."
+        # Pillow 로 헤더 확인 (Image.open 은 지연 로드 – 크기·형식만 읽음, 지나치게 큰 픽셀 수는 예외)
+        stream.seek(0)
+        try:
+            with Image.open(stream) as img:
+                width, height = img.size
+        except Exception:
+            return False, _INVALID_IMAGE
+        if not width or not height:
+            return False, _INVALID_IMAGE
+    finally:
+        stream.seek(0)
 
     return True, None
@@ -0,0 +1,320 @@
+"""
+프로필 이미지 크기 조절 – /media/profiles/<파일>?w=64 (main.media_profile).
+
+기능: 댓글 목록의 40px 아바타에 업로드 원본(최대 5MB)을 그대로 보내지 않도록 Pillow 로 줄여서 응답합니다.
+  - w 는 PROFILE_IMAGE_WIDTHS 중 요청 이상인 가장 작은 값으로 올림 (임의 크기 요청으로 캐시를 채우지 못하게),
+    가로·세로 모두 w 이하로 축소 (확대 없음). GIF 는 첫 프레임을 PNG 로.
+  - 결과는 디스크 캐시 PROFILE_IMAGE_CACHE_FOLDER/<너비>/<파일명>.<형식> 에 저장, 폴더 전체 크기가
+    PROFILE_IMAGE_CACHE_MAX_BYTES 를 넘으면 가장 오래 쓰지 않은 파일부터 삭제 (LRU, 모든 워커 합계 기준)
+      사용 순서: 적중 시 파일 mtime 갱신 → 워커 프로세스 간에 공유되고 재시작 후에도 유지.
+      정리(sweep): 이 프로세스가 아는 합계가 상한을 넘었거나 마지막 정리 후 PROFILE_IMAGE_CACHE_SWEEP_INTERVAL 초가
+      지난 뒤 파일을 새로 쓰면, 잠금 파일(.sweep.lock)을 잡은 워커 1개가 폴더를 스캔(st_size·st_mtime)해 오래된 순으로 삭제.
+      → 다른 워커가 쓴 양까지 합쳐 상한 유지 (정리 사이 간격 동안만 상한을 넘을 수 있음).
+      프로세스 안 OrderedDict 는 스캔 결과로 다시 맞추는 사본 (ETag 보관·적중 판정용).
+  - 같은 변형을 동시에 요청하면 1번만 만들고 나머지는 그 결과를 기다림 (프로세스 안).
+    다른 워커 프로세스와 겹치면 각자 만들지만 임시 파일 + os.replace 라 깨진 파일을 내보내지 않음.
+  - 응답 ETag 는 변환 결과 내용의 SHA-256 (strong) → If-None-Match 면 304
+  - 원본이 삭제되면(media_store 참조 수 0 – auth.profile 에서 이미지를 바꾸거나 지운 뒤 commit) 캐시 변형도 삭제
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from PIL import Image, ImageOps
+
+DEFAULT_WIDTHS = (32, 48, 64, 96, 128, 256)
+# 원본 확장자 → (캐시 파일 확장자, Pillow 형식)
+_OUTPUT = {
+    "jpg": ("jpg", "JPEG"),
+    "jpeg": ("jpg", "JPEG"),
+    "png": ("png", "PNG"),
+    "gif": ("png", "PNG"),
+    "webp": ("webp", "WEBP"),
+}
+MIMETYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+# 정리 잠금 파일 (캐시 폴더 안). 이보다 오래된 잠금은 죽은 워커가 남긴 것으로 보고 지움
+SWEEP_LOCK = ".sweep.lock"
+_LOCK_STALE = 60
+
+
+class CachedImage:
+    """캐시 파일 1개: 경로, 크기(바이트), strong ETag (내용 SHA-256), mimetype."""
+
+    __slots__ = ("path", "size", "etag", "mimetype")
+
+    def __init__(self, path, size, etag):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.mimetype = MIMETYPES[path.rsplit(".", 1)[-1]]
+
+
+def snap_width(width, widths):
+    """허용 너비 중 width 이상인 가장 작은 값 (모두 작으면 가장 큰 값)."""
+    for allowed in widths:
+        if allowed >= width:
+            return allowed
+    return widths[-1]
+
+
+def resize_image(source, width, quality=85):
+    """source 를 width×width 안에 들어가게 축소한 (바이트, 캐시 확장자). 지원하지 않는 형식이면 ValueError."""
+    ext = source.rsplit(".", 1)[-1].lower()
+    if ext not in _OUTPUT:
+        raise ValueError(ext)
+    out_ext, pil_format = _OUTPUT[ext]
+    with Image.open(source) as img:
+        img.draft("RGB", (width, width))
+        img = ImageOps.exif_transpose(img)
+        if pil_format == "JPEG":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        img.thumbnail((width, width), Image.LANCZOS)
+        buf = io.BytesIO()
+        options = {"optimize": True} if pil_format in ("JPEG", "PNG") else {}
+        img.save(buf, pil_format, quality=quality, **options)
+    return buf.getvalue(), out_ext
+
+
+def _is_local(filename):
+    return bool(filename) and "/" not in filename and "\\" not in filename and not filename.startswith(".")
+
+
+class _Cache:
+    """앱 1개에 대응하는 크기 조절 캐시 (LRU 목록·진행 중 작업). app.extensions["image_cache"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        self.widths = tuple(sorted(int(w) for w in (app.config.get("PROFILE_IMAGE_WIDTHS") or DEFAULT_WIDTHS)))
+        self.max_bytes = int(app.config.get("PROFILE_IMAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        self.sweep_interval = float(app.config.get("PROFILE_IMAGE_CACHE_SWEEP_INTERVAL", 30))
+        self.quality = int(app.config.get("PROFILE_IMAGE_QUALITY", 85))
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # 캐시 파일 경로 → CachedImage (앞쪽이 오래 안 쓴 것)
+        self.total = 0
+        self.inflight = {}  # 캐시 파일 경로 → Future (만드는 중)
+        self.loaded_folder = None
+        self.last_sweep = time.monotonic()
+
+    @property
+    def folder(self):
+        return self.app.config["PROFILE_IMAGE_CACHE_FOLDER"]
+
+    def path(self, filename, width):
+        ext = filename.rsplit(".", 1)[-1].lower()
+        out_ext = _OUTPUT[ext][0] if ext in _OUTPUT else ext
+        return os.path.join(self.folder, str(width), f"{filename}.{out_ext}")
+
+    # ----- LRU 목록 (self.lock 안에서 호출) -----
+    def _scan(self):
+        """디스크의 캐시 파일 [(mtime, 경로, 크기), ...] 오래 안 쓴 순. 쓰는 중인 .part 는 제외."""
+        found = []
+        for width in self.widths:
+            directory = os.path.join(self.folder, str(width))
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    try:
+                        st = entry.stat()
+                    except OSError:  # 스캔 중 다른 워커가 지움
+                        continue
+                    found.append((st.st_mtime, entry.path, st.st_size))
+        # mtime 이 같으면(파일 시스템 시각 단위 안에서 연달아 쓰거나 적중) 이 프로세스의 사용 순서로
+        rank = {path: i for i, path in enumerate(self.entries)}
+        found.sort(key=lambda f: (f[0], rank.get(f[1], -1)))
+        return found
+
+    def _sync(self, found):
+        """스캔 결과로 LRU 목록을 다시 맞춤. 이미 알던 파일은 ETag 유지."""
+        old, self.entries = self.entries, OrderedDict()
+        self.total = 0
+        for _, path, size in found:
+            item = old.get(path)
+            self.entries[path] = item if item is not None and item.size == size else CachedImage(path, size, None)
+            self.total += size
+
+    def _load(self):
+        """처음 사용할 때(또는 폴더 설정이 바뀌면) 디스크의 캐시 파일을 mtime 순으로 읽음. ETag 는 쓸 때 계산."""
+        if self.loaded_folder == self.folder:
+            return
+        self.entries.clear()
+        self._sync(self._scan())
+        self.loaded_folder = self.folder
+        if self.total > self.max_bytes:
+            self._sweep()
+
+    def _add(self, item):
+        self._forget(item.path)
+        self.entries[item.path] = item
+        self.total += item.size
+        if self.total > self.max_bytes or time.monotonic() - self.last_sweep >= self.sweep_interval:
+            self._sweep(keep=item.path)
+
+    def _forget(self, path):
+        item = self.entries.pop(path, None)
+        if item is not None:
+            self.total -= item.size
+
+    def _sweep(self, keep=None):
+        """
+        폴더 전체(모든 워커가 쓴 파일)를 스캔해 상한을 넘는 만큼 오래된 파일부터 삭제.
+        다른 워커가 정리 중이면 건너뜀. keep: 방금 추가한 파일 – 상한보다 커도 남김.
+        """
+        self.last_sweep = time.monotonic()
+        lock_path = os.path.join(self.folder, SWEEP_LOCK)
+        try:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if time.time() - os.path.getmtime(lock_path) < _LOCK_STALE:
+                    return
+                os.remove(lock_path)
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError:  # 잠금 경쟁에서 짐·폴더 없음 → 다음 정리 때
+            return
+        os.close(fd)
+        try:
+            found = self._scan()
+            total = sum(size for _, _, size in found)
+            kept = []
+            for mtime, path, size in found:
+                if total > self.max_bytes and path != keep:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    total -= size
+                else:
+                    kept.append((mtime, path, size))
+            self._sync(kept)
+        finally:
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
+    # ----- 조회 -----
+    def get(self, filename, width):
+        """원본 filename 의 width 변형 (CachedImage). 원본이 없거나 읽을 수 없으면 None."""
+        path = self.path(filename, width)
+        with self.lock:
+            self._load()
+            item = self.entries.get(path)
+            if item is not None and item.etag is not None:
+                try:
+                    os.utime(path)
+                except OSError:  # 다른 워커가 지움 → 다시 만듦
+                    self._forget(path)
+                else:
+                    self.entries.move_to_end(path)
+                    return item
+            future = self.inflight.get(path)
+            owner = future is None
+            if owner:
+                future = self.inflight[path] = Future()
+        if not owner:
+            return future.result()
+        try:
+            item = self._fill(filename, width, path)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(item)
+        finally:
+            with self.lock:
+                self.inflight.pop(path, None)
+        return item
+
+    def _fill(self, filename, width, path):
+        """캐시 파일이 있으면(다른 워커·이전 실행) ETag 만 계산, 없으면 원본에서 만들어 저장."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            source = os.path.join(self.app.config["PROFILE_IMAGE_FOLDER"], filename)
+            try:
+                data, _ = resize_image(source, width, self.quality)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                self.app.logger.warning("프로필 이미지 크기 조절 실패 %s: %s", filename, e)
+                return None
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{uuid.uuid4().hex}.part"
+            with open(temp, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)
+        item = CachedImage(path, len(data), hashlib.sha256(data).hexdigest())
+        with self.lock:
+            self._add(item)
+        return item
+
+    def invalidate(self, filename):
+        """원본 filename 의 모든 너비 변형 삭제. 반환: 삭제한 파일 수."""
+        removed = 0
+        with self.lock:
+            for width in self.widths:
+                path = self.path(filename, width)
+                self._forget(path)
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def _state():
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.extensions.get("image_cache")
+    return None
+
+
+class ImageCache:
+    """
+    프로필 이미지 크기 조절 확장. db, thumbnails 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    라우트는 resized(filename, w), 템플릿은 User.get_profile_image_url(size)·srcset 사용.
+    """
+
+    def init_app(self, app):
+        from app.utils import media_store
+
+        app.extensions["image_cache"] = _Cache(app)
+        media_store.on_release("profile", _release)
+
+    def widths(self):
+        state = _state()
+        return state.widths if state is not None else DEFAULT_WIDTHS
+
+    def resized(self, filename, width):
+        """main.media_profile?w= 용 CachedImage. 경로가 섞인 이름·원본 없음 → None."""
+        from flask import current_app
+
+        if not _is_local(filename):
+            return None
+        state = current_app.extensions["image_cache"]
+        return state.get(filename, snap_width(width, state.widths))
+
+    def invalidate(self, filename):
+        from flask import current_app
+
+        return current_app.extensions["image_cache"].invalidate(filename)
+
+
+def _release(filename):
+    """media_store.on_release("profile") – 원본 삭제 후 캐시 변형도 삭제."""
+    state = _state()
+    if state is not None:
+        state.invalidate(filename)
@@ -0,0 +1,108 @@
+"""
+업로드 파일 스트리밍 저장 – studio._save_upload_file, auth.profile, 조각 업로드(app.utils.uploads) 용.
+
+기능: 업로드 스트림을 고정 크기 블록(BLOCK_SIZE)으로 읽으며
+  - 크기 상한을 읽는 도중에 검사 (넘는 순간 중단, 쓰던 파일 삭제)
+  - 첫 블록의 매직 바이트로 실제 형식 확인 (확장자만 바꾼 파일 거부)
+  - SHA-256 을 블록마다 누적 계산
+  - 저장 폴더의 임시 파일(<이름>.part)에 블록 단위로 쓰고, 끝나면 os.replace 로 최종 이름에 원자적으로 교체
+메모리 사용은 파일 크기와 무관하게 블록 1개.
+
+요청 본문 전체 크기는 Flask MAX_CONTENT_LENGTH 로 Werkzeug 가 본문을 읽는 중에 413 으로 끊음
+(create_app 설정: MAX_VIDEO_SIZE + 여유분). 파일별 상한은 ingest() 가 검사.
+"""
+
+import hashlib
+import os
+from collections import namedtuple
+
+# 스트림에서 한 번에 읽어 쓰는 크기
+BLOCK_SIZE = 256 * 1024
+
+# 확장자 → 내용 형식 (sniff() 결과)
+EXTENSION_KINDS = {
+    "mp4": "isobmff",
+    "mov": "isobmff",
+    "webm": "ebml",
+    "jpg": "jpeg",
+    "jpeg": "jpeg",
+    "png": "png",
+    "gif": "gif",
+    "webp": "webp",
+}
+
+# ISO BMFF(mp4/mov) 첫 box 종류. 보통 ftyp, 오래된 QuickTime 은 moov/mdat/wide/free 로 시작하기도 함
+_BMFF_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip"}
+
+# 저장 결과: 파일 경로, 크기(바이트), SHA-256 (hex)
+Ingested = namedtuple("Ingested", "path size sha256")
+
+
+class IngestError(ValueError):
+    """업로드 거부 (크기 초과·형식 불일치 등). 메시지는 사용자에게 그대로 보여줌."""
+
+
+def sniff(head):
+    """파일 앞부분 바이트로 형식 판별. 반환: EXTENSION_KINDS 의 값 또는 None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "ebml"
+    if head[4:8] in _BMFF_BOXES:
+        return "isobmff"
+    return None
+
+
+def check_kind(head, ext):
+    """첫 블록 head 가 확장자 ext 의 형식인지 검사. 아니면 IngestError."""
+    if sniff(head) != EXTENSION_KINDS.get(ext):
+        raise IngestError(f"파일 내용이 확장자(.{ext})와 맞지 않습니다. 손상되었거나 다른 형식의 파일일 수 있습니다.")
+
+
+def too_large_message(max_size):
+    return f"파일 크기가 너무 큽니다. 최대 {max_size // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+
+
+def ingest(stream, path, ext, max_size, block_size=BLOCK_SIZE):
+    """
+    stream 을 끝까지 읽어 path 에 저장. 반환: Ingested(path, size, sha256).
+    max_size 초과·형식 불일치면 IngestError (쓰던 파일 삭제), 디스크 오류는 OSError.
+    """
+    temp = path + ".part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp, "wb") as out:
+            head = stream.read(block_size)
+            check_kind(head, ext)
+            block = head
+            while block:
+                size += len(block)
+                if size > max_size:
+                    raise IngestError(too_large_message(max_size))
+                digest.update(block)
+                out.write(block)
+                block = stream.read(block_size)
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+    return Ingested(path, size, digest.hexdigest())
+
+
+def hash_file(path, block_size=BLOCK_SIZE):
+    """이미 저장된 파일의 SHA-256 (블록 단위로 읽음)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,354 @@
+"""
+실시간 카운트 푸시 (Server-Sent Events) – GET /video/<id>/events 용.
+
+기능: 좋아요 토글·댓글 작성/삭제·조회수 기록이 일어나면 그 비디오를 보고 있는 연결에
+      "event: counts / data: {"likes": 1, "views": 3}" 형태의 증감분을 보냅니다.
+      시청 페이지(watch-page.js)는 EventSource 로 받아 화면의 숫자에 더합니다.
+
+발행:
+  - 좋아요: likes.toggle_like 가 commit 후 publish(video_id, likes=delta)
+  - 댓글:   Comment 추가·삭제를 세션에 모았다가 commit 후 발행 (rollback 되면 버림)
+  - 조회수: view_counter.record 가 1회마다 publish(video_id, views=1) (DB 반영 전 버퍼 기준)
+
+연결별 메모리 상한: 연결마다 큐 대신 필드(likes/comments/views)별 합계 dict 하나만 둠.
+      느린 클라이언트가 못 읽는 동안 들어온 증감분은 같은 dict 에 더해지므로 (coalescing)
+      쌓이는 양과 무관하게 연결당 최대 3개 값. 발행하는 쪽은 대기 없이 더하기만 함.
+      전송 후 LIVE_EVENTS_MIN_INTERVAL 초 동안은 보내지 않고 모아서 다음에 한 번에 보냄.
+연결 수 상한: LIVE_EVENTS_MAX_CONNECTIONS 초과 시 503 (SSE 연결은 워커 스레드를 점유)
+      연결은 LIVE_EVENTS_MAX_AGE 초 후 끊고 EventSource 가 retry 간격 뒤 다시 연결.
+
+워커 간 전달 (LIVE_EVENTS_BACKEND):
+  - "memory": 프로세스 안에서만 전달 (워커 1개·개발용)
+  - "db":     live_events 테이블을 우편함으로 쓰는 polling stand-in. 발행분을 LIVE_EVENTS_POLL_INTERVAL 초마다
+              비디오별 1행으로 모아 쓰고, 같은 주기로 다른 워커가 쓴 행을 읽어 자기 연결에 전달.
+              전달 스레드는 이 프로세스에 SSE 연결이 있거나 보낼 발행분이 있는 동안만 돌고
+              유휴가 되면 끝남 (다음 구독·발행 때 다시 시작, 종료 시 atexit 에서 멈춤).
+              (Redis pub/sub 등으로 바꿀 때는 _DatabaseRelay 와 같은 send/start 를 가진 객체로 교체)
+"""
+
+import atexit
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+FIELDS = ("likes", "comments", "views")
+BACKENDS = ("memory", "db")
+
+
+# ---------------------------------------------------------------------------
+# 연결 1개
+# ---------------------------------------------------------------------------
+class _Subscriber:
+    """SSE 연결 1개의 미전송 증감분. 필드별 합계만 들고 있어 메모리 상한이 고정."""
+
+    def __init__(self, video_id):
+        self.video_id = video_id
+        self.pending = {}
+        self.coalesced = 0  # 미전송분에 합쳐진 발행 횟수 (느린 클라이언트 지표)
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def push(self, deltas):
+        with self.cond:
+            if self.pending:
+                self.coalesced += 1
+            for key, value in deltas.items():
+                self.pending[key] = self.pending.get(key, 0) + value
+            self.cond.notify()
+
+    def take(self, timeout):
+        """미전송분을 꺼냄. 없으면 timeout 초까지 대기. 합계가 0 인 필드는 제외."""
+        with self.cond:
+            if not self.pending and not self.closed:
+                self.cond.wait(timeout)
+            deltas, self.pending = self.pending, {}
+        return {key: value for key, value in deltas.items() if value}
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+
+
+# ---------------------------------------------------------------------------
+# 워커 간 전달: DB polling stand-in
+# ---------------------------------------------------------------------------
+class _DatabaseRelay:
+    """live_events 테이블로 다른 워커 프로세스와 증감분을 주고받는 백그라운드 스레드."""
+
+    def __init__(self, hub):
+        config = hub.app.config
+        self.hub = hub
+        self.origin = uuid.uuid4().hex
+        self.interval = float(config.get("LIVE_EVENTS_POLL_INTERVAL", 1.0))
+        self.retention = float(config.get("LIVE_EVENTS_RETENTION", 60))
+        self.outbox = {}  # video_id -> 다음 주기에 쓸 증감분 합계
+        self.last_id = None
+        self.last_prune = time.monotonic()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def send(self, video_id, deltas):
+        with self.lock:
+            merged = self.outbox.setdefault(video_id, {})
+            for key, value in deltas.items():
+                merged[key] = merged.get(key, 0) + value
+        self.start()
+
+    def start(self):
+        """스레드가 없으면 시작. 연결이 없고 보낼 것도 없으면 스레드가 스스로 끝나므로 구독·발행 때마다 호출."""
+        with self.lock:
+            if self.thread is None:
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self._loop, name="live-events-relay", daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        """스레드 종료 (남은 발행분은 한 번 더 쓰고 끝냄). 이후 구독·발행이 있으면 다시 시작."""
+        self.stopped.set()
+        with self.lock:
+            thread = self.thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 5)
+
+    def _loop(self):
+        while True:
+            stopping = self.stopped.wait(self.interval)
+            with self.hub.app.app_context():
+                try:
+                    self.poll()
+                except Exception:
+                    self.hub.app.logger.exception("실시간 이벤트 전달 실패")
+            with self.lock:
+                # 이 프로세스에 연결이 없고 쓸 발행분도 없으면 DB 를 건드리지 않도록 종료
+                if stopping or (self.hub.connections == 0 and not self.outbox):
+                    self.thread = None
+                    self.last_id = None  # 다시 시작하면 그 사이 행은 건너뜀 (받을 연결이 없었음)
+                    return
+
+    def poll(self):
+        """쌓인 발행분 쓰기 → 다른 워커가 쓴 새 행 읽어 전달 → 보관 기간 지난 행 정리. 전달한 행 수 반환."""
+        from app import db
+        from app.models import LiveEvent
+
+        table = LiveEvent.__table__
+        with self.lock:
+            outbox, self.outbox = self.outbox, {}
+        now = datetime.now(timezone.utc)
+        delivered = 0
+        with db.engine.begin() as connection:
+            if self.last_id is None:
+                # 시작 전에 쓰인 행은 이미 지난 이벤트
+                self.last_id = connection.execute(select(func.max(table.c.id))).scalar() or 0
+            rows = [
+                {"video_id": video_id, "origin": self.origin, "payload": json.dumps(deltas), "created_at": now}
+                for video_id, deltas in outbox.items()
+                if any(deltas.values())
+            ]
+            if rows:
+                connection.execute(insert(table), rows)
+            result = connection.execute(
+                select(table.c.id, table.c.video_id, table.c.origin, table.c.payload)
+                .where(table.c.id > self.last_id)
+                .order_by(table.c.id)
+            )
+            for row_id, video_id, origin, payload in result:
+                self.last_id = row_id
+                if origin != self.origin:
+                    self.hub.dispatch(video_id, json.loads(payload))
+                    delivered += 1
+            if time.monotonic() - self.last_prune >= self.retention:
+                connection.execute(delete(table).where(table.c.created_at < now - timedelta(seconds=self.retention)))
+                self.last_prune = time.monotonic()
+        return delivered
+
+
+# ---------------------------------------------------------------------------
+# 앱 1개의 pub/sub
+# ---------------------------------------------------------------------------
+class _Hub:
+    """앱 1개에 대응하는 구독 연결 목록·설정. app.extensions["live_events"] 에 저장."""
+
+    def __init__(self, app):
+        config = app.config
+        self.app = app
+        self.max_connections = max(1, int(config.get("LIVE_EVENTS_MAX_CONNECTIONS", 100)))
+        self.heartbeat = float(config.get("LIVE_EVENTS_HEARTBEAT", 15))
+        self.max_age = float(config.get("LIVE_EVENTS_MAX_AGE", 300))
+        self.min_interval = float(config.get("LIVE_EVENTS_MIN_INTERVAL", 1.0))
+        self.retry_ms = int(config.get("LIVE_EVENTS_RETRY_MS", 3000))
+        backend = config.get("LIVE_EVENTS_BACKEND", "memory")
+        self.backend = backend if backend in BACKENDS else "memory"
+        self.relay = _DatabaseRelay(self) if self.backend == "db" else None
+        self.channels = {}  # video_id -> {_Subscriber, ...}
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def subscribe(self, video_id):
+        """연결 등록. 상한 초과면 None."""
+        with self.lock:
+            if self.connections >= self.max_connections:
+                return None
+            subscriber = _Subscriber(video_id)
+            self.channels.setdefault(video_id, set()).add(subscriber)
+            self.connections += 1
+        if self.relay is not None:
+            self.relay.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            members = self.channels.get(subscriber.video_id)
+            if members is None or subscriber not in members:
+                return
+            members.discard(subscriber)
+            if not members:
+                del self.channels[subscriber.video_id]
+            self.connections -= 1
+        subscriber.close()
+
+    def dispatch(self, video_id, deltas):
+        """이 프로세스의 연결에만 전달."""
+        with self.lock:
+            members = list(self.channels.get(video_id, ()))
+        for subscriber in members:
+            subscriber.push(deltas)
+
+    def publish(self, video_id, deltas):
+        deltas = {key: int(value) for key, value in deltas.items() if key in FIELDS and value}
+        if not deltas:
+            return
+        self.dispatch(video_id, deltas)
+        if self.relay is not None:
+            self.relay.send(video_id, deltas)
+
+    def stop(self):
+        if self.relay is not None:
+            self.relay.stop()
+
+
+class _EventStream:
+    """
+    SSE 응답 본문. 응답이 닫히면(클라이언트 연결 끊김 포함) WSGI 서버가 close() 를 불러 연결 해제.
+    제너레이터가 시작되기 전에 닫혀도 해제되도록 close 를 직접 구현.
+    """
+
+    def __init__(self, hub, subscriber):
+        self.hub = hub
+        self.subscriber = subscriber
+        self._events = self._generate()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._events)
+
+    def close(self):
+        self._events.close()
+        self.hub.unsubscribe(self.subscriber)
+
+    def _generate(self):
+        hub, subscriber = self.hub, self.subscriber
+        try:
+            yield f"retry: {hub.retry_ms}\n\n"
+            deadline = time.monotonic() + hub.max_age
+            while not subscriber.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                deltas = subscriber.take(min(hub.heartbeat, remaining))
+                if deltas:
+                    yield f"event: counts\ndata: {json.dumps(deltas)}\n\n"
+                    if hub.min_interval > 0:
+                        time.sleep(hub.min_interval)  # 그동안 들어온 증감분은 다음 이벤트 1개로 합쳐짐
+                else:
+                    yield ": ping\n\n"  # 프록시 유휴 타임아웃 방지
+        finally:
+            hub.unsubscribe(subscriber)
+
+
+class LiveEvents:
+    """
+    실시간 카운트 확장. db, view_counter 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    발행은 live_events.publish(video_id, likes=1), 구독은 live_events.subscribe(video_id) → stream(...).
+    """
+
+    def init_app(self, app):
+        hub = _Hub(app)
+        app.extensions["live_events"] = hub
+        _register_events()
+        atexit.register(hub.stop)
+
+    @staticmethod
+    def _hub():
+        from flask import current_app, has_app_context
+
+        if has_app_context():
+            return current_app.extensions.get("live_events")
+        return None
+
+    def publish(self, video_id, **deltas):
+        """비디오 video_id 의 증감분 발행 (예: likes=-1). commit 후에 호출."""
+        hub = self._hub()
+        if hub is not None:
+            hub.publish(video_id, deltas)
+
+    def subscribe(self, video_id):
+        """SSE 연결 등록. 연결 수 상한이면 None."""
+        return self._hub().subscribe(video_id)
+
+    def stream(self, subscriber):
+        """subscribe() 로 받은 연결의 응답 본문 (이벤트 문자열 iterable)."""
+        return _EventStream(self._hub(), subscriber)
+
+    def connections(self):
+        """이 프로세스의 현재 SSE 연결 수."""
+        return self._hub().connections
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 댓글 수 증감
+# ---------------------------------------------------------------------------
+def _comment_changed(delta):
+    def listener(mapper, connection, target):
+        session = inspect(target).session
+        if session is not None:
+            pending = session.info.setdefault("live_comment_deltas", {})
+            pending[target.video_id] = pending.get(target.video_id, 0) + delta
+
+    return listener
+
+
+_comment_after_insert = _comment_changed(1)
+_comment_after_delete = _comment_changed(-1)
+
+
+def _after_commit(session):
+    pending = session.info.pop("live_comment_deltas", None)
+    hub = LiveEvents._hub()
+    if pending and hub is not None:
+        for video_id, delta in pending.items():
+            hub.publish(video_id, {"comments": delta})
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("live_comment_deltas", None)
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from app.models import Comment
+
+    if event.contains(Comment, "after_insert", _comment_after_insert):
+        return
+    event.listen(Comment, "after_insert", _comment_after_insert)
+    event.listen(Comment, "after_delete", _comment_after_delete)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,225 @@
+"""
+미디어 파일 서빙 – HTTP Range(206 Partial Content) 지원.
+
+기능: main.media_video 용. 플레이어 탐색(seek) 시 필요한 구간만 전송합니다.
+  - 단일 Range: 206 + Content-Range
+  - 다중 Range: 206 multipart/byteranges (겹치는 구간은 병합)
+  - 범위 밖 요청: 416 + Content-Range: bytes */<size>
+  - If-None-Match / If-Modified-Since: 304
+  - If-Range: ETag 또는 Last-Modified 가 일치할 때만 Range 적용, 아니면 전체 200
+
+전송 방식 (zero-copy):
+  - 파일 끝까지 보내는 경우(전체 또는 "bytes=N-")는 WSGI 서버의 wsgi.file_wrapper 사용.
+    gunicorn 등은 이 경로에서 os.sendfile 로 커널 → 소켓 직접 전송.
+  - 중간 구간·다중 구간은 mmap 으로 매핑한 뒤 memoryview 슬라이스를 그대로 내보냄
+    (read() 로 파이썬 버퍼에 복사하지 않음).
+"""
+
+import mimetypes
+import mmap
+import os
+import uuid
+from datetime import datetime, timezone
+
+from flask import abort, request
+from werkzeug.http import http_date, is_resource_modified, parse_if_range_header
+from werkzeug.security import safe_join
+from werkzeug.wrappers import Response
+
+# mmap 슬라이스 한 번에 내보낼 크기
+CHUNK_SIZE = 256 * 1024
+# 이보다 많은 구간을 요청하면 Range 를 무시하고 전체 전송 (과도한 multipart 방지)
+MAX_RANGES = 16
+
+
+def _make_etag(st):
+    """크기·수정시각·inode 기반 strong ETag (따옴표 없이)."""
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}-{st.st_ino:x}"
+
+
+def _parse_ranges(header):
+    """
+    Range 헤더 "bytes=0-99,200-,-500" → [(0, 100), (200, None), (-500, None)].
+    werkzeug.parse_range_header 는 순서가 뒤섞이거나 겹친 구간을 거부하므로 직접 파싱.
+    형식이 잘못되었거나 bytes 단위가 아니면 None (→ Range 무시, 전체 전송).
+    """
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes" or not spec:
+        return None
+    ranges = []
+    for item in spec.split(","):
+        first, sep, last = item.strip().partition("-")
+        first, last = first.strip(), last.strip()
+        if not sep or not (first.isdigit() or last.isdigit()):
+            return None
+        if not first:
+            if not last.isdigit() or int(last) == 0:
+                return None
+            ranges.append((-int(last), None))
+            continue
+        if not first.isdigit() or (last and not last.isdigit()):
+            return None
+        start = int(first)
+        stop = int(last) + 1 if last else None
+        if stop is not None and stop <= start:
+            return None
+        ranges.append((start, stop))
+    return ranges
+
+
+def _resolve_ranges(ranges, size):
+    """
+    _parse_ranges 결과 [(start, stop|None), ...] 를 파일 크기 기준 [(start, stop), ...] 로 변환.
+    stop 은 exclusive. 만족 가능한 구간이 없으면 빈 리스트. 겹치거나 붙은 구간은 병합.
+    """
+    resolved = []
+    for start, stop in ranges:
+        if start < 0:
+            start, stop = max(0, size + start), size
+        elif stop is None or stop > size:
+            stop = size
+        if start < size and start < stop:
+            resolved.append((start, stop))
+    resolved.sort()
+    merged = []
+    for start, stop in resolved:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _if_range_matches(etag, last_modified):
+    """If-Range 헤더가 없거나 현재 파일과 일치하면 True."""
+    header = request.headers.get("If-Range")
+    if not header:
+        return True
+    if_range = parse_if_range_header(header)
+    if if_range.etag is not None:
+        # If-Range 는 strong 비교만 허용 (weak ETag 는 불일치)
+        return not header.strip().startswith("W/") and if_range.etag == etag
+    if if_range.date is not None:
+        return if_range.date == last_modified
+    return False
+
+
+def _iter_mmap(path, ranges, parts=None):
+    """mmap 으로 구간들을 memoryview 슬라이스로 내보냄. parts 가 있으면 구간 앞뒤에 헤더 바이트 삽입."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            for i, (start, stop) in enumerate(ranges):
+                if parts is not None:
+                    yield parts[i]
+                pos = start
+                while pos < stop:
+                    end = min(pos + CHUNK_SIZE, stop)
+                    yield view[pos:end]
+                    pos = end
+            if parts is not None:
+                yield parts[-1]
+        finally:
+            # 소비 측이 아직 슬라이스를 참조 중이면 close 불가 → 참조 해제 시 GC 가 닫음
+            try:
+                view.release()
+                mm.close()
+            except BufferError:
+                pass
+
+
+def _file_to_end(path, start):
+    """start 부터 파일 끝까지 보내는 iterable. wsgi.file_wrapper 가 있으면 사용 (sendfile)."""
+    f = open(path, "rb")
+    f.seek(start)
+    file_wrapper = request.environ.get("wsgi.file_wrapper")
+    if file_wrapper is not None:
+        return file_wrapper(f, CHUNK_SIZE)
+
+    def _gen():
+        try:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+
+    return _gen()
+
+
+def send_media_file(directory, filename):
+    """
+    directory/filename 을 Range·조건부 요청을 지원하며 응답.
+    경로 탈출·없는 파일은 404.
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    st = os.stat(path)
+    size = st.st_size
+    etag = _make_etag(st)
+    last_modified = datetime.fromtimestamp(int(st.st_mtime), tz=timezone.utc)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{etag}"',
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "public, max-age=0",
+    }
+
+    # 조건부 GET: 변경 없으면 304 (본문 없음)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return Response(status=304, headers=headers)
+
+    range_header = request.headers.get("Range")
+    parsed = _parse_ranges(range_header) if range_header and size else None
+    if parsed is None or not _if_range_matches(etag, last_modified):
+        headers["Content-Length"] = str(size)
+        return Response(
+            _file_to_end(path, 0), status=200, headers=headers, mimetype=mimetype, direct_passthrough=True
+        )
+
+    ranges = _resolve_ranges(parsed, size)
+    if not ranges:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status=416, headers=headers)
+    if len(ranges) > MAX_RANGES:
+        headers["Content-Length"] = str(size)
+        return Response(
+            _file_to_end(path, 0), status=200, headers=headers, mimetype=mimetype, direct_passthrough=True
+        )
+
+    # 단일 구간
+    if len(ranges) == 1:
+        start, stop = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        headers["Content-Length"] = str(stop - start)
+        body = _file_to_end(path, start) if stop == size else _iter_mmap(path, ranges)
+        return Response(body, status=206, headers=headers, mimetype=mimetype, direct_passthrough=True)
+
+    # 다중 구간: multipart/byteranges
+    boundary = uuid.uuid4().hex
+    parts = []
+    for i, (start, stop) in enumerate(ranges):
+        prefix = "\r\n" if i else ""
+        parts.append(
+            (
+                f"{prefix}--{boundary}\r\n"
+                f"Content-Type: {mimetype}\r\n"
+                f"Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n"
+            ).encode("ascii")
+        )
+    parts.append(f"\r\n--{boundary}--\r\n".encode("ascii"))
+    length = sum(len(p) for p in parts) + sum(stop - start for start, stop in ranges)
+    headers["Content-Length"] = str(length)
+    return Response(
+        _iter_mmap(path, ranges, parts),
+        status=206,
+        headers=headers,
+        content_type=f"multipart/byteranges; boundary={boundary}",
+        direct_passthrough=True,
+    )
@@ -0,0 +1,335 @@
+"""
+내용 주소 방식(content-addressed) 미디어 저장소 – 동영상·썸네일·프로필 이미지 업로드 중복 제거.
+
+기능: 업로드 파일을 uuid 이름 대신 내용의 SHA-256 으로 이름 붙여(<sha256>.<확장자>) 저장합니다.
+  - 같은 폴더에 같은 파일이 이미 있으면 새로 받은 파일은 버리고 기존 파일 이름을 그대로 사용
+  - 다른 폴더(예: 썸네일로 올린 이미지를 프로필로)에 있으면 하드 링크로 연결 (디스크 추가 사용 없음)
+  - 파일마다 가리키는 행 수를 media_blobs.ref_count 로 유지
+      video     ← videos.video_path
+      thumbnail ← videos.thumbnail_path
+      profile   ← users.profile_image
+    Video·User 행이 추가·변경·삭제되면 같은 flush(트랜잭션) 안에서 SQL 로 증감하고,
+    0 이 된 파일은 commit 후에 행과 함께 삭제 (rollback 되면 아무것도 지우지 않음)
+  - studio.delete, auth.profile 은 파일을 직접 지우지 않음 – 행을 지우거나 바꾸면 여기서 정리
+  - 파일에서 만든 파생 파일(썸네일 크기별 이미지 등)은 on_release(kind, 콜백) 으로 함께 정리
+
+업로드 고정(pin): adopt 는 파일을 넣기 전에 참조 수를 +1 해서 바로 commit (별도 트랜잭션) 하고 세션에 기록
+  → 행이 commit 되기 전에 마지막 주인이 삭제되거나 다른 업로드가 discard() 해도 파일이 지워지지 않음.
+  그 파일명을 Video·User 에 넣는 flush 는 기록된 고정을 가져다 쓰고 +1 을 하지 않음 (rollback 되면 고정으로 되돌림).
+  쓰지 않게 된 파일은 discard() 가 고정을 풀고, 끝까지 쓰지 않은 고정은 앱 컨텍스트 종료 시 release_pins() 가 풂.
+  삭제는 ref_count <= 0 인 행을 지운 트랜잭션 안에서 파일까지 지움 – 같은 행을 +1 하려는 adopt 는
+  그 commit 을 기다린 뒤 파일이 없으면 받은 파일을 그대로 씀.
+
+주의: SQL 로 직접 고친 행·프로세스가 죽어 풀리지 않은 고정은 check_media_refs() 로 검사·복구.
+      실행: python scripts/check_media_refs.py [--repair]  (업로드가 진행 중인 파일의 고정도 실제 값으로 맞춤)
+"""
+
+import os
+import re
+import uuid
+
+from flask import current_app
+from sqlalchemy import delete, event, func, inspect, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import MediaBlob, User, Video
+from app.utils.ingest import ingest
+from app.utils.sql import insert_ignore
+
+# kind → 저장 폴더 설정 키
+FOLDERS = {
+    "video": "VIDEO_FOLDER",
+    "thumbnail": "THUMBNAIL_FOLDER",
+    "profile": "PROFILE_IMAGE_FOLDER",
+}
+
+# (kind, 모델, 컬럼 이름)
+_REFERENCES = (
+    ("video", Video, "video_path"),
+    ("thumbnail", Video, "thumbnail_path"),
+    ("profile", User, "profile_image"),
+)
+
+_CONTENT_NAME = re.compile(r"^([0-9a-f]{64})\.[0-9a-z]+$")
+
+# kind → 파일 삭제 후 호출할 콜백 [callback(filename), ...] (on_release 로 등록)
+_RELEASE_HOOKS = {}
+
+
+def _folder(kind):
+    return current_app.config[FOLDERS[kind]]
+
+
+def _is_local(filename):
+    """폴더 안 파일명인지 (빈 값·URL·경로는 참조 수 대상 아님)."""
+    return bool(filename) and "/" not in filename and "\\" not in filename
+
+
+def content_name(sha256, ext):
+    return f"{sha256}.{ext}"
+
+
+# ---------------------------------------------------------------------------
+# 저장
+# ---------------------------------------------------------------------------
+def adopt(path, kind, ext, sha256):
+    """
+    내용 해시가 sha256 인 임시 파일 path 를 kind 폴더에 내용 주소 이름으로 넣음.
+    반환: (파일명, 중복 여부). 이미 있으면 path 는 삭제하고 기존 파일 사용.
+    파일은 고정된 상태로 반환 – 행에 넣어 commit 하거나 discard() 로 풀어야 함.
+    """
+    name = content_name(sha256, ext)
+    _pin(kind, name)
+    try:
+        return _place(path, kind, name)
+    except BaseException:
+        discard(kind, name)
+        raise
+
+
+def _place(path, kind, name):
+    target = os.path.join(_folder(kind), name)
+    if os.path.exists(target):
+        os.remove(path)
+        return name, True
+    for other in FOLDERS:
+        source = os.path.join(_folder(other), name)
+        if other != kind and os.path.exists(source):
+            try:
+                os.link(source, target)
+            except FileExistsError:
+                pass  # 동시에 같은 파일을 넣음
+            except OSError:
+                break  # 하드 링크 불가(다른 파일시스템 등) → 받은 파일을 그대로 사용
+            os.remove(path)
+            return name, True
+    os.replace(path, target)
+    return name, False
+
+
+def store_upload(stream, kind, ext, max_size):
+    """
+    업로드 스트림을 kind 폴더에 저장 (app.utils.ingest 로 검사·해시 후 adopt).
+    반환: (파일명, Ingested, 중복 여부). IngestError / OSError 는 호출자가 처리.
+    파일은 고정된 상태(참조 수 +1) – Video·User 에 넣어 commit 하면 그 참조가 되고, 쓰지 않게 되면 discard() 호출.
+    """
+    temp = os.path.join(_folder(kind), f".{uuid.uuid4().hex}.{ext}")
+    saved = ingest(stream, temp, ext, max_size)
+    name, deduped = adopt(temp, kind, ext, saved.sha256)
+    return name, saved, deduped
+
+
+def on_release(kind, callback):
+    """kind 파일이 삭제될 때(참조 수 0) callback(filename) 호출 – 파생 파일 정리용. 같은 콜백은 1번만 등록."""
+    hooks = _RELEASE_HOOKS.setdefault(kind, [])
+    if callback not in hooks:
+        hooks.append(callback)
+
+
+def discard(kind, filename):
+    """저장했지만 쓰지 않게 된 파일 정리 – 고정을 풀고, 다른 행·업로드가 쓰고 있지 않으면 삭제."""
+    if _take(db.session.info.get("media_pins"), (kind, filename)):
+        with db.engine.begin() as connection:
+            apply_ref(connection, kind, filename, -1)
+    _release([(kind, filename)])
+
+
+def release_pins(exc=None):
+    """
+    세션에 남은 고정(adopt 했지만 행에 쓰지도 discard 하지도 않은 파일)을 모두 풂.
+    create_app() 이 teardown_appcontext 로 등록 – 요청·작업 중 예외로 빠져나가도 파일이 영구히 남지 않게.
+    """
+    pins = db.session.info.pop("media_pins", None)
+    db.session.info.pop("media_pins_used", None)
+    for (kind, filename), count in (pins or {}).items():
+        if count > 0:
+            with db.engine.begin() as connection:
+                apply_ref(connection, kind, filename, -count)
+            _release([(kind, filename)])
+
+
+def _pin(kind, filename):
+    """참조 수 +1 을 바로 commit (별도 트랜잭션) 하고 세션에 고정으로 기록."""
+    with db.engine.begin() as connection:
+        apply_ref(connection, kind, filename, 1)
+    pins = db.session.info.setdefault("media_pins", {})
+    pins[(kind, filename)] = pins.get((kind, filename), 0) + 1
+
+
+def _take(counts, key):
+    """counts[key] 가 있으면 1 줄이고 True."""
+    if not counts or counts.get(key, 0) <= 0:
+        return False
+    counts[key] -= 1
+    if not counts[key]:
+        del counts[key]
+    return True
+
+
+# ---------------------------------------------------------------------------
+# 참조 수
+# ---------------------------------------------------------------------------
+def apply_ref(connection, kind, filename, delta):
+    """kind 폴더 파일 filename 의 참조 수를 delta 만큼 증감 (connection 의 트랜잭션 안에서)."""
+    if not _is_local(filename):
+        return
+    blobs = MediaBlob.__table__
+    if delta > 0:
+        match = _CONTENT_NAME.match(filename)
+        insert_ignore(
+            connection,
+            blobs,
+            [{"kind": kind, "filename": filename, "sha256": match.group(1) if match else None, "ref_count": 0}],
+            ("kind", "filename"),
+        )
+    connection.execute(
+        update(blobs)
+        .where(blobs.c.kind == kind, blobs.c.filename == filename)
+        .values(ref_count=blobs.c.ref_count + delta)
+    )
+
+
+def _release(candidates):
+    """
+    참조 수가 0 이하인 후보의 행·파일 삭제 (commit 후 별도 트랜잭션). 반환: 삭제한 파일 수.
+    파일은 행을 지운 트랜잭션 안에서 지움 – 그 사이 같은 행을 +1 하려는 adopt(_pin) 는 commit 까지 기다림.
+    """
+    blobs = MediaBlob.__table__
+    removed = 0
+    for kind, filename in candidates:
+        if not _is_local(filename):
+            continue
+        with db.engine.begin() as connection:
+            deleted = connection.execute(
+                delete(blobs).where(blobs.c.kind == kind, blobs.c.filename == filename, blobs.c.ref_count <= 0)
+            ).rowcount
+            if deleted:
+                try:
+                    os.remove(os.path.join(_folder(kind), filename))
+                    removed += 1
+                except OSError:
+                    pass
+        if deleted:
+            for callback in _RELEASE_HOOKS.get(kind, ()):
+                callback(filename)
+    return removed
+
+
+def _actual_refs():
+    """videos·users 기준 실제 참조 수 {(kind, filename): 개수}."""
+    queries = [
+        select(literal(kind, MediaBlob.kind.type).label("kind"), getattr(model, column).label("filename"))
+        .where(getattr(model, column).isnot(None))
+        for kind, model, column in _REFERENCES
+    ]
+    rows = union_all(*queries).subquery()
+    counts = db.session.execute(select(rows.c.kind, rows.c.filename, func.count()).group_by(rows.c.kind, rows.c.filename))
+    return {(kind, filename): count for kind, filename, count in counts if _is_local(filename)}
+
+
+def check_media_refs(repair=False):
+    """
+    media_blobs.ref_count 와 videos·users 비교.
+    반환: 어긋난 파일 [(kind, filename, 저장된 참조 수, 실제 참조 수), ...].
+    repair=True 면 실제 값으로 고치고, 아무도 가리키지 않는 파일은 행·파일 삭제.
+    """
+    actual = _actual_refs()
+    stored = {(blob.kind, blob.filename): blob.ref_count for blob in db.session.execute(select(MediaBlob)).scalars()}
+    mismatches = sorted(
+        (kind, filename, stored.get((kind, filename), 0), actual.get((kind, filename), 0))
+        for kind, filename in set(actual) | set(stored)
+        if stored.get((kind, filename), 0) != actual.get((kind, filename), 0)
+    )
+    if repair and mismatches:
+        connection = db.session.connection()
+        for kind, filename, before, after in mismatches:
+            apply_ref(connection, kind, filename, after - before)
+        db.session.commit()
+        _release([(kind, filename) for kind, filename, _, after in mismatches if after <= 0])
+    return mismatches
+
+
+def ensure_media_blobs(app):
+    """create_app() 에서 호출. 참조 수 테이블이 비어 있으면 기존 videos·users 로 한 번 채움."""
+    if db.session.execute(select(MediaBlob.kind).limit(1)).first() is not None:
+        return
+    filled = check_media_refs(repair=True)
+    if filled:
+        app.logger.info("미디어 참조 수 테이블 채움: 파일 %d개", len(filled))
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 참조 컬럼 변경을 같은 flush 안에서 반영, 0 이 된 파일은 commit 후 삭제
+# ---------------------------------------------------------------------------
+def _releases(target):
+    session = Session.object_session(target)
+    return session.info.setdefault("media_release", set()) if session is not None else set()
+
+
+def _add_ref(connection, target, kind, filename):
+    """새로 가리키게 된 파일 +1. adopt 가 고정해 둔 파일이면 그 고정을 참조로 씀 (rollback 되면 되돌림)."""
+    session = Session.object_session(target)
+    if session is not None and _take(session.info.get("media_pins"), (kind, filename)):
+        used = session.info.setdefault("media_pins_used", {})
+        used[(kind, filename)] = used.get((kind, filename), 0) + 1
+        return
+    apply_ref(connection, kind, filename, 1)
+
+
+def _listen(model, refs):
+    def after_insert(mapper, connection, target):
+        for kind, column in refs:
+            _add_ref(connection, target, kind, getattr(target, column))
+
+    def after_update(mapper, connection, target):
+        state = inspect(target)
+        for kind, column in refs:
+            history = state.attrs[column].history
+            if not history.has_changes():
+                continue
+            for old in history.deleted:
+                apply_ref(connection, kind, old, -1)
+                _releases(target).add((kind, old))
+            for new in history.added:
+                _add_ref(connection, target, kind, new)
+
+    def after_delete(mapper, connection, target):
+        for kind, column in refs:
+            filename = getattr(target, column)
+            apply_ref(connection, kind, filename, -1)
+            _releases(target).add((kind, filename))
+
+    event.listen(model, "after_insert", after_insert)
+    event.listen(model, "after_update", after_update)
+    event.listen(model, "after_delete", after_delete)
+    for _, column in refs:
+        # 만료된(commit 후) 객체에 새 값을 넣을 때도 이전 값을 읽어 두도록 – after_update 의 history.deleted 용
+        event.listen(getattr(model, column), "set", _keep_old_value, active_history=True)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+_listen(Video, [("video", "video_path"), ("thumbnail", "thumbnail_path")])
+_listen(User, [("profile", "profile_image")])
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    session.info.pop("media_pins_used", None)
+    candidates = session.info.pop("media_release", None)
+    if candidates:
+        _release(candidates)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    session.info.pop("media_release", None)
+    # flush 에서 참조로 쓴 고정은 다시 고정으로 (DB 의 +1 은 별도 트랜잭션이라 그대로 남아 있음)
+    used = session.info.pop("media_pins_used", None)
+    if used:
+        pins = session.info.setdefault("media_pins", {})
+        for key, count in used.items():
+            pins[key] = pins.get(key, 0) + count
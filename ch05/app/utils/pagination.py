@@ -0,0 +1,149 @@
+"""
+Keyset(커서) 페이지네이션 – 목록 API·홈 화면용.
+
+기능: query.paginate() 는 COUNT(*) + OFFSET 스캔이라 뒤쪽 페이지일수록 느려짐.
+      정렬 컬럼 + id 를 키로 "마지막으로 본 행 다음부터" 가져오므로 페이지 깊이와 무관하게 일정.
+
+정렬별 키 (모두 내림차순, id 로 동률 해소):
+  - latest : created_at, id
+  - views  : views, id
+  - popular: likes, views, id
+
+커서: {"s": 정렬, "k": 키 값 목록, "d": "next" | "prev"} 를 base64url 로 인코딩한 불투명 문자열.
+      클라이언트는 내용을 해석하지 말고 next_cursor / prev_cursor 를 그대로 넘기면 됨.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.models import Video
+
+SORT_KEYS = {
+    "latest": ("created_at", "id"),
+    "views": ("views", "id"),
+    "popular": ("likes", "views", "id"),
+}
+
+
+class InvalidCursor(ValueError):
+    """해석할 수 없거나 정렬이 맞지 않는 커서."""
+
+
+def _sort_name(sort):
+    return sort if sort in SORT_KEYS else "latest"
+
+
+def _key_values(video, sort):
+    """비디오 객체에서 커서 키 값 추출 (datetime 은 isoformat 문자열)."""
+    values = []
+    for name in SORT_KEYS[sort]:
+        value = getattr(video, name)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    return values
+
+
+def encode_cursor(sort, values, direction="next"):
+    """키 값 목록 → 불투명 커서 문자열."""
+    raw = json.dumps({"s": sort, "k": values, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, sort, keys=None):
+    """
+    커서 문자열 → (키 값 목록, 방향). 잘못된 커서면 InvalidCursor.
+    keys 를 주면 SORT_KEYS 대신 그 키 목록 기준 (댓글 등 비디오 외 목록용, sort 는 커서 종류 이름).
+    """
+    if keys is None:
+        sort = _sort_name(sort)
+        keys = SORT_KEYS[sort]
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        values, direction = data["k"], data.get("d", "next")
+    except (ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursor("잘못된 커서입니다.")
+    if data.get("s") != sort:
+        raise InvalidCursor("커서의 정렬 기준이 요청과 다릅니다.")
+    if direction not in ("next", "prev") or not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor("잘못된 커서입니다.")
+    if keys[0] == "created_at":
+        try:
+            values = [datetime.fromisoformat(values[0])] + values[1:]
+        except (TypeError, ValueError):
+            raise InvalidCursor("잘못된 커서입니다.")
+    return values, direction
+
+
+def keyset_after(columns, values, descending):
+    """
+    (c1, c2, ...) 가 (v1, v2, ...) 보다 "뒤"인 행 조건. 튜플 비교를 OR 체인으로 풀어 씀
+    (모든 백엔드에서 동작, 선두 컬럼 인덱스 사용 가능).
+    """
+    clauses = []
+    for i, (col, value) in enumerate(zip(columns, values)):
+        cmp = col < value if descending else col > value
+        eqs = [c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*eqs, cmp) if eqs else cmp)
+    return or_(*clauses)
+
+
+class KeysetPage:
+    """keyset_paginate 결과. 템플릿에서 Pagination 처럼 items / has_next 사용 가능."""
+
+    def __init__(self, items, per_page, sort, has_next, has_prev, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.sort = sort
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.total = total
+        self.next_cursor = encode_cursor(sort, _key_values(items[-1], sort), "next") if has_next and items else None
+        self.prev_cursor = encode_cursor(sort, _key_values(items[0], sort), "prev") if has_prev and items else None
+
+
+def keyset_paginate(query, sort, cursor=None, per_page=12, with_total=False):
+    """
+    query(Video 조회, 필터 적용·정렬 미적용)를 keyset 방식으로 한 페이지 조회.
+    cursor 가 비어 있으면 첫 페이지. with_total=True 일 때만 COUNT(*) 실행.
+    """
+    sort = _sort_name(sort)
+    columns = [getattr(Video, name) for name in SORT_KEYS[sort]]
+    direction = "next"
+    q = query
+    if cursor:
+        values, direction = decode_cursor(cursor, sort)
+        q = q.filter(keyset_after(columns, values, descending=(direction == "next")))
+
+    if direction == "next":
+        q = q.order_by(*[c.desc() for c in columns])
+    else:
+        q = q.order_by(*[c.asc() for c in columns])
+    rows = q.limit(per_page + 1).all()
+    extra = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == "next":
+        has_next, has_prev = extra, bool(cursor)
+    else:
+        rows.reverse()
+        has_next, has_prev = True, extra
+
+    total = query.order_by(None).count() if with_total else None
+    return KeysetPage(rows, per_page, sort, has_next, has_prev, total)
+
+
+def keyset_meta(page):
+    """KeysetPage → API meta 딕셔너리 (_pagination_meta 의 커서 버전)."""
+    meta = {
+        "per_page": page.per_page,
+        "has_next": page.has_next,
+        "has_prev": page.has_prev,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+    if page.total is not None:
+        meta["total_items"] = page.total
+    return meta
@@ -0,0 +1,302 @@
+"""
+관련 동영상 추천 엔진 – api.video_detail(related_videos), main.watch(사이드바) 공용.
+
+기능: 후보 전체를 쿼리 1번으로 점수화해 상위 N개를 고릅니다.
+      score = 공유 태그 수 × 4 + 같은 카테고리 2 + 같은 작성자 1 + 인기도(0~1 미만)
+      가중치 덕분에 기존 우선순위(같은 태그 > 같은 카테고리 > 같은 작성자 > 인기순)가 그대로 유지되고,
+      같은 단계 안에서는 여러 조건을 함께 만족할수록·공유 태그가 많을수록 앞에 옵니다.
+
+후보 테이블: 비디오별 점수 상위 RELATED_CANDIDATES 개를 related_candidates 에 순위대로 저장
+      (모든 워커 프로세스가 공유). 계산한 지 RELATED_CACHE_TTL 초 안이면 상세 페이지는
+      후보 ⨝ videos 조회 1번만 실행하고, 없거나 오래됐으면 그 비디오 1개만 다시 점수화해 저장합니다.
+  - 무효화: 비디오 추가·삭제, 카테고리·작성자·태그 변경이 commit 되면 영향받는 목록만 삭제
+           – 바뀐 비디오 자신, 추가·삭제된 태그가 달린 비디오(태그 이웃),
+             삭제·카테고리·작성자 변경이면 그 비디오를 후보로 가진 목록과 현재 태그 이웃까지.
+           조회수·좋아요 변화(인기도)와, 태그를 공유하지 않는 같은 카테고리·작성자 비디오 목록에
+           새로 들어갈 차례는 TTL 이 지나면 반영.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, case, event, func, inspect, select, true
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
+
+# 점수 가중치 (인기도는 0~1 미만이라 작성자 가중치보다 항상 작음)
+TAG_WEIGHT = 4
+CATEGORY_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+# 인기도 = p / (p + POPULARITY_SCALE), p = 조회수 + 좋아요 × LIKE_WEIGHT
+POPULARITY_SCALE = 1000.0
+LIKE_WEIGHT = 10
+# 무효화 DELETE 1번에 넣는 video_id 수
+INVALIDATE_BATCH = 500
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class _Settings:
+    """앱 1개에 대응하는 후보 테이블 설정. app.extensions["related_videos"] 에 저장."""
+
+    def __init__(self, app):
+        self.ttl = float(app.config.get("RELATED_CACHE_TTL", 300))
+        self.candidates = max(1, int(app.config.get("RELATED_CANDIDATES", 20)))
+
+
+def score_related(video_id, limit):
+    """
+    video_id 기준 관련 비디오 [(id, score), ...] 를 점수 내림차순으로 최대 limit 개.
+    현재 비디오 정보·공유 태그 수·점수 계산·정렬을 쿼리 1번으로 처리. 비디오가 없으면 [].
+    """
+    from app import db
+    from app.models import Video
+    from app.models.video import video_tags
+
+    cur = select(Video.category, Video.user_id).where(Video.id == video_id).cte("cur")
+    cur_tags = select(video_tags.c.tag_id).where(video_tags.c.video_id == video_id)
+    shared = (
+        select(video_tags.c.video_id, func.count().label("shared"))
+        .where(video_tags.c.tag_id.in_(cur_tags), video_tags.c.video_id != video_id)
+        .group_by(video_tags.c.video_id)
+        .subquery("shared")
+    )
+    popularity = Video.views + Video.likes * LIKE_WEIGHT
+    score = (
+        func.coalesce(shared.c.shared, 0) * TAG_WEIGHT
+        + case(
+            (and_(cur.c.category.isnot(None), cur.c.category != "", Video.category == cur.c.category), CATEGORY_WEIGHT),
+            else_=0,
+        )
+        + case((Video.user_id == cur.c.user_id, AUTHOR_WEIGHT), else_=0)
+        + popularity * 1.0 / (popularity + POPULARITY_SCALE)
+    ).label("score")
+    stmt = (
+        select(Video.id, score)
+        .join(cur, true())
+        .outerjoin(shared, shared.c.video_id == Video.id)
+        .where(Video.id != video_id)
+        .order_by(score.desc(), Video.created_at.desc(), Video.id.desc())
+        .limit(limit)
+    )
+    return [(row.id, row.score) for row in db.session.execute(stmt)]
+
+
+def store_candidates(video_id, ids, computed_at=None):
+    """video_id 의 후보 목록을 ids 순서로 교체 (별도 트랜잭션). 동시에 같은 비디오를 저장하면 먼저 쓴 쪽 유지."""
+    from app import db
+    from app.models import RelatedCandidate
+
+    table = RelatedCandidate.__table__
+    computed_at = computed_at or _utc_now()
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.video_id == video_id))
+            if ids:
+                connection.execute(
+                    table.insert(),
+                    [
+                        {"video_id": video_id, "position": i, "related_id": related_id, "computed_at": computed_at}
+                        for i, related_id in enumerate(ids)
+                    ],
+                )
+    except SQLAlchemyError:
+        # 저장 실패(동시 저장의 PK 충돌·잠금)는 다음 조회 때 다시 계산하면 되므로 응답은 그대로
+        from flask import current_app
+
+        current_app.logger.debug("관련 동영상 후보 저장 실패 (video_id=%s)", video_id, exc_info=True)
+
+
+def invalidate_videos(video_ids, tag_ids=(), listed_ids=()):
+    """
+    후보 목록 삭제 (별도 트랜잭션). 대상: video_ids 자신의 목록, tag_ids 가 달린 비디오의 목록,
+    listed_ids 를 후보로 가진 목록 (그 비디오의 점수가 내려갔거나 삭제된 경우).
+    반환: 삭제 대상 비디오 수.
+    """
+    from app import db
+    from app.models import RelatedCandidate
+    from app.models.video import video_tags
+
+    table = RelatedCandidate.__table__
+    affected = set(video_ids)
+    with db.engine.begin() as connection:
+        if listed_ids:
+            affected.update(
+                connection.execute(select(table.c.video_id).where(table.c.related_id.in_(list(listed_ids)))).scalars()
+            )
+        if tag_ids:
+            affected.update(
+                connection.execute(
+                    select(video_tags.c.video_id).where(video_tags.c.tag_id.in_(list(tag_ids))).distinct()
+                ).scalars()
+            )
+        affected = sorted(affected)
+        for i in range(0, len(affected), INVALIDATE_BATCH):
+            connection.execute(table.delete().where(table.c.video_id.in_(affected[i:i + INVALIDATE_BATCH])))
+    return len(affected)
+
+
+class RelatedVideos:
+    """
+    관련 동영상 확장. db, view_counter 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    라우트에서는 related_videos.for_video(video_id, limit) 만 호출하면 됩니다.
+    """
+
+    def init_app(self, app):
+        app.extensions["related_videos"] = _Settings(app)
+        _register_events()
+
+    @staticmethod
+    def _settings():
+        from flask import current_app
+
+        return current_app.extensions["related_videos"]
+
+    @staticmethod
+    def _options(with_tags):
+        from app.models import Video
+
+        options = [joinedload(Video.user)]
+        if with_tags:
+            options.append(joinedload(Video.tags))
+        return options
+
+    def _stored(self, video_id, limit, with_tags):
+        """TTL 안에 저장된 후보를 순위대로 최대 limit 개 (videos 와 조인 – 쿼리 1번). 없거나 오래됐으면 None."""
+        from app import db
+        from app.models import RelatedCandidate, Video
+
+        settings = self._settings()
+        cutoff = _utc_now() - timedelta(seconds=settings.ttl)
+        stmt = (
+            select(Video)
+            .join(RelatedCandidate, RelatedCandidate.related_id == Video.id)
+            .where(RelatedCandidate.video_id == video_id, RelatedCandidate.computed_at >= cutoff)
+            .order_by(RelatedCandidate.position)
+            .limit(limit)
+            .options(*self._options(with_tags))
+        )
+        videos = db.session.execute(stmt).unique().scalars().all()
+        # 저장 목록은 최대 candidates 개 – 그보다 많이 요청했는데 모자라면 다시 계산
+        if not videos or (len(videos) < limit and limit > settings.candidates):
+            return None
+        return videos
+
+    def related_ids(self, video_id, limit):
+        """관련 비디오 id 목록을 새로 점수화하고 후보 테이블에 저장."""
+        take = max(limit, self._settings().candidates)
+        ids = [vid for vid, _ in score_related(video_id, take)]
+        store_candidates(video_id, ids)
+        return ids[:limit]
+
+    def for_video(self, video_id, limit=5, with_tags=False):
+        """
+        관련 비디오 객체 목록 (점수순, 현재 비디오 제외, 중복 없음).
+        작성자(user)는 함께 로드, with_tags=True 면 태그도 함께 로드 (API 직렬화용).
+        """
+        from app.models import Video
+
+        videos = self._stored(video_id, limit, with_tags)
+        if videos is not None:
+            return videos
+        ids = self.related_ids(video_id, limit)
+        if not ids:
+            return []
+        by_id = {v.id: v for v in Video.query.options(*self._options(with_tags)).filter(Video.id.in_(ids))}
+        return [by_id[vid] for vid in ids if vid in by_id]
+
+    def invalidate(self):
+        """저장된 후보 목록 전체 삭제 (모든 워커 공유)."""
+        from app import db
+        from app.models import RelatedCandidate
+
+        with db.engine.begin() as connection:
+            connection.execute(RelatedCandidate.__table__.delete())
+
+
+# ---------------------------------------------------------------------------
+# 무효화: 점수에 영향을 주는 변경이 flush 되면 비디오·태그 id 를 모아 두었다가 commit 직후 해당 목록 삭제
+# (commit 전에 지우면 다른 요청이 옛 데이터로 다시 채울 수 있음)
+# ---------------------------------------------------------------------------
+def invalidate_on_commit(session, video_id, tag_ids=(), listed=False):
+    """
+    session 의 트랜잭션이 commit 되면 video_id 와 관련된 후보 목록을 지우도록 표시 (Core SQL 로 태그 등을 바꾼 경우).
+    tag_ids: 점수가 바뀌는 태그 이웃 (추가·삭제된 태그). listed=True: video_id 를 후보로 가진 목록도 삭제.
+    """
+    changes = session.info.setdefault("related_changes", {"videos": set(), "tags": set(), "listed": set()})
+    changes["videos"].add(video_id)
+    changes["tags"].update(tag_ids)
+    if listed:
+        changes["listed"].add(video_id)
+
+
+def _mark_dirty(target, tag_ids=(), listed=False):
+    session = inspect(target).session
+    if session is not None:
+        invalidate_on_commit(session, target.id, tag_ids, listed)
+
+
+def _current_tag_ids(target, connection):
+    from app.models.video import video_tags
+
+    if "tags" not in inspect(target).unloaded:
+        return [t.id for t in target.tags]
+    return list(connection.execute(select(video_tags.c.tag_id).where(video_tags.c.video_id == target.id)).scalars())
+
+
+def _after_insert(mapper, connection, target):
+    _mark_dirty(target, _current_tag_ids(target, connection))
+
+
+def _after_update(mapper, connection, target):
+    state = inspect(target)
+    tags = state.attrs.tags.history
+    changed_tags = [t.id for t in (tags.added or ())] + [t.id for t in (tags.deleted or ())]
+    if any(state.attrs[name].history.has_changes() for name in ("category", "user_id")):
+        # 카테고리·작성자가 바뀌면 이 비디오를 점수화한 모든 목록의 점수가 바뀜
+        _mark_dirty(target, changed_tags + _current_tag_ids(target, connection), listed=True)
+    elif changed_tags:
+        _mark_dirty(target, changed_tags)
+
+
+def _after_delete(mapper, connection, target):
+    _mark_dirty(target, listed=True)
+
+
+def _tags_changed(session, connection, video, added, removed):
+    invalidate_on_commit(session, video.id, added | removed)
+
+
+def _after_commit(session):
+    changes = session.info.pop("related_changes", None)
+    if not changes:
+        return
+    from flask import current_app, has_app_context
+
+    if not has_app_context() or "related_videos" not in current_app.extensions:
+        return
+    try:
+        invalidate_videos(changes["videos"], changes["tags"], changes["listed"])
+    except SQLAlchemyError:
+        # 이미 commit 된 요청은 그대로 두고, 남은 목록은 TTL 이 지나면 다시 계산
+        current_app.logger.warning("관련 동영상 후보 무효화 실패", exc_info=True)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("related_changes", None)
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from app.models import Video
+    from app.models.video import on_tags_changed
+
+    if event.contains(Video, "after_insert", _after_insert):
+        return
+    on_tags_changed(_tags_changed)
+    event.listen(Video, "after_insert", _after_insert)
+    event.listen(Video, "after_update", _after_update)
+    event.listen(Video, "after_delete", _after_delete)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,245 @@
+"""
+비디오 전문 검색 인덱스 – SQLite FTS5 (main.search, /api/videos?search=).
+
+기능: title·description·태그 이름을 FTS5 가상 테이블 video_search 에 색인하고
+      MATCH + bm25() 로 관련도 순위를 매깁니다. rowid = videos.id.
+
+  - 토크나이저: SEARCH_TOKENIZER 설정 (app.utils.search_tokenizers). 기본 hangul_bigram 은
+    한글을 2-gram 으로 색인해 "튜토" 처럼 짧은 검색어도 부분 일치로 인덱스 조회.
+    설정을 바꾸거나 토크나이저 version 이 오르면 다음 기동 시 인덱스를 새 방식으로 다시 만듦.
+  - 동기화: Video insert/update(제목·설명·태그 변경 시)/delete 때 같은 트랜잭션에서 인덱스 행 갱신.
+  - 폴백: SQLite 가 아니거나 FTS5 를 쓸 수 없거나, 토크나이저가 검색어를 인덱스 식으로 만들 수 없으면
+    (예: trigram 에서 3글자 미만) ilike 검색 – 인덱스와 같이 제목·설명·태그 이름 대상.
+  - 재구축: rebuild_index() / python scripts/rebuild_search_index.py
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy import and_, event, func, inspect, literal_column, or_, select, text
+
+from app import db
+from app.models import Tag, Video
+from app.models.video import on_tags_changed, video_tags
+from app.utils.search_tokenizers import get_tokenizer
+
+INDEX_TABLE = "video_search"
+# bm25 컬럼 가중치: title, description, tags
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+REBUILD_BATCH_SIZE = 500
+
+
+def _enabled():
+    """현재 앱에서 FTS 인덱스를 사용할 수 있는지."""
+    return has_app_context() and bool(current_app.extensions.get("search_index"))
+
+
+def _tokenizer():
+    return get_tokenizer(current_app.config.get("SEARCH_TOKENIZER"))
+
+
+def _create_sql(tokenizer):
+    # 주석의 이름·버전도 sqlite_master 에 그대로 남음 → 같은 FTS5 토크나이저라도 색인 방식이 바뀌면 재생성
+    return (
+        f"CREATE VIRTUAL TABLE {INDEX_TABLE} USING fts5("
+        f"title, description, tags, tokenize = '{tokenizer.fts_tokenize}' /* {tokenizer.name} v{tokenizer.version} */)"
+    )
+
+
+def ensure_index(app):
+    """
+    create_app() 에서 create_all() 직후 호출. SQLite + FTS5 가능하면 가상 테이블 생성.
+    새로 만들었거나 토크나이저 설정이 바뀌었으면 기존 videos 로 다시 채움.
+    결과는 app.extensions["search_index"] (bool).
+    """
+    app.extensions["search_index"] = False
+    if db.engine.dialect.name != "sqlite":
+        return False
+    tokenizer = get_tokenizer(app.config.get("SEARCH_TOKENIZER"))
+    create_sql = _create_sql(tokenizer)
+    existing_sql = db.session.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": INDEX_TABLE},
+    ).scalar()
+    fresh = existing_sql != create_sql
+    if fresh:
+        try:
+            if existing_sql:
+                app.logger.info("검색 토크나이저 변경 → %s 로 인덱스 재생성", tokenizer.name)
+                db.session.execute(text(f"DROP TABLE {INDEX_TABLE}"))
+            db.session.execute(text(create_sql))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning("FTS5 검색 인덱스를 만들 수 없어 LIKE 검색을 사용합니다: %s", e)
+            return False
+    app.extensions["search_index"] = True
+    if fresh:
+        rebuild_index()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# 색인 문서 생성·반영
+# ---------------------------------------------------------------------------
+def _document(title, description, tag_names):
+    """인덱스에 넣을 (title, description, tags) 값. 토크나이저가 미리 토큰화한 문자열."""
+    tokenizer = _tokenizer()
+    return (
+        tokenizer.index_text(title),
+        tokenizer.index_text(description),
+        " ".join(tokenizer.index_text(name) for name in tag_names),
+    )
+
+
+def _write_rows(connection, rows):
+    """rows: [(video_id, title, description, tags), ...] 를 인덱스에 upsert."""
+    if not rows:
+        return
+    connection.execute(
+        text(f"DELETE FROM {INDEX_TABLE} WHERE rowid = :id"),
+        [{"id": r[0]} for r in rows],
+    )
+    connection.execute(
+        text(f"INSERT INTO {INDEX_TABLE} (rowid, title, description, tags) VALUES (:id, :t, :d, :g)"),
+        [{"id": r[0], "t": r[1], "d": r[2], "g": r[3]} for r in rows],
+    )
+
+
+def _tag_names(video, connection):
+    """비디오의 태그 이름 목록. flush 중 lazy load 를 피하려고 미로딩이면 connection 으로 직접 조회."""
+    from app.models import Tag
+
+    if "tags" not in inspect(video).unloaded:
+        return [t.name for t in video.tags]
+    return list(
+        connection.execute(
+            select(Tag.name)
+            .join(video_tags, Tag.id == video_tags.c.tag_id)
+            .where(video_tags.c.video_id == video.id)
+        ).scalars()
+    )
+
+
+def index_video(video, connection=None):
+    """비디오 1건 색인 (현재 title·description·tags 기준)."""
+    if not _enabled():
+        return
+    connection = connection or db.session.connection()
+    doc = _document(video.title, video.description, _tag_names(video, connection))
+    _write_rows(connection, [(video.id, *doc)])
+
+
+def remove_video(video_id, connection=None):
+    """비디오 1건 인덱스에서 제거."""
+    if not _enabled():
+        return
+    connection = connection or db.session.connection()
+    connection.execute(text(f"DELETE FROM {INDEX_TABLE} WHERE rowid = :id"), {"id": video_id})
+
+
+def rebuild_index():
+    """
+    인덱스를 비우고 videos·video_tags 전체로 다시 채움 (기존 DB 이관·불일치 복구용).
+    반환: 색인한 비디오 수.
+    """
+    if not _enabled():
+        return 0
+    from app.models import Tag
+
+    db.session.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+    count = 0
+    last_id = 0
+    while True:
+        batch = db.session.execute(
+            select(Video.id, Video.title, Video.description)
+            .where(Video.id > last_id)
+            .order_by(Video.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        ids = [r.id for r in batch]
+        names = {}
+        for vid, name in db.session.execute(
+            select(video_tags.c.video_id, Tag.name)
+            .join(Tag, Tag.id == video_tags.c.tag_id)
+            .where(video_tags.c.video_id.in_(ids))
+        ):
+            names.setdefault(vid, []).append(name)
+        _write_rows(
+            db.session.connection(),
+            [(r.id, *_document(r.title, r.description, names.get(r.id, []))) for r in batch],
+        )
+        count += len(batch)
+        last_id = ids[-1]
+    db.session.commit()
+    return count
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 업로드·studio.edit·save_tags·삭제 시 같은 트랜잭션에서 인덱스 동기화
+# ---------------------------------------------------------------------------
+@event.listens_for(Video, "after_insert")
+def _after_insert(mapper, connection, target):
+    index_video(target, connection)
+
+
+@event.listens_for(Video, "after_update")
+def _after_update(mapper, connection, target):
+    # 좋아요·조회수 등 색인과 무관한 변경은 건너뜀
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("title", "description", "tags")):
+        index_video(target, connection)
+
+
+@event.listens_for(Video, "after_delete")
+def _after_delete(mapper, connection, target):
+    remove_video(target.id, connection)
+
+
+def _tags_changed(session, connection, video, added, removed):
+    index_video(video, connection)
+
+
+on_tags_changed(_tags_changed)
+
+
+# ---------------------------------------------------------------------------
+# 검색
+# ---------------------------------------------------------------------------
+def _like_filter(q):
+    """LIKE 검색 조건 (제목·설명·태그 이름에 검색어 포함 – FTS 인덱스와 같은 대상)."""
+    pattern = f"%{q}%"
+    tagged = (
+        select(video_tags.c.video_id)
+        .join(Tag, Tag.id == video_tags.c.tag_id)
+        .where(video_tags.c.video_id == Video.id, Tag.name.ilike(pattern))
+        .exists()
+    )
+    return or_(
+        Video.title.ilike(pattern),
+        and_(Video.description.isnot(None), Video.description.ilike(pattern)),
+        tagged,
+    )
+
+
+def apply_search(query, q):
+    """
+    Video 조회 query 에 검색 조건 적용.
+    반환: (query, rank). 인덱스를 사용했으면 rank 는 bm25 점수 컬럼(작을수록 관련도 높음 → asc 정렬),
+    LIKE 폴백이면 None (관련도순 정렬 불가 → 호출 측에서 최신순 등 기존 정렬 사용).
+    """
+    expression = _tokenizer().match_expression(q) if _enabled() else None
+    if expression is None:
+        return query.filter(_like_filter(q)), None
+
+    fts = literal_column(INDEX_TABLE)
+    hits = (
+        select(
+            literal_column("rowid").label("video_id"),
+            func.bm25(fts, *BM25_WEIGHTS).label("score"),
+        )
+        .select_from(text(INDEX_TABLE))
+        .where(fts.op("MATCH")(expression))
+        .subquery("fts_hits")
+    )
+    return query.join(hits, hits.c.video_id == Video.id), hits.c.score
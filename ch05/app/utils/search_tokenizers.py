@@ -0,0 +1,113 @@
+"""
+검색 인덱스 토크나이저 – app.utils.search_index 에서 SEARCH_TOKENIZER 설정으로 선택.
+
+토크나이저는 세 가지를 정합니다.
+  - fts_tokenize: FTS5 가상 테이블의 tokenize 옵션
+  - index_text(text): 인덱스에 저장할 문자열 (미리 토큰화해 공백으로 이어 붙임)
+  - match_expression(q): 검색어 → FTS5 MATCH 식. None 이면 인덱스로 찾을 수 없음 (LIKE 폴백)
+  - version: 색인 방식이 바뀌면 올림 → 다음 기동 시 인덱스 재생성 (app.utils.search_index.ensure_index)
+
+등록된 토크나이저:
+  - "trigram":        FTS5 내장 trigram. 3글자 이상만 인덱스 검색.
+  - "hangul_bigram":  한글(CJK) 구간은 2-gram, 영문·숫자 단어는 3-gram. "튜토" 같은 2글자도 인덱스 검색 (기본값).
+  - "hangul_trigram": 한글(CJK) 구간도 3-gram. 토큰 종류가 많아 긴 검색어의 후보가 적음 (2글자는 접두 일치).
+  두 n-gram 토크나이저 모두 영문 단어 중간("ython", "gramming")을 trigram 토크나이저·LIKE 검색처럼 찾음.
+"""
+
+import re
+import unicodedata
+
+# 한글 음절·자모, 히라가나·가타카나, CJK 통합 한자 → n-gram 대상 (공백 없이 붙여 쓰는 문자)
+_NGRAM_CHARS = "\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7a3"
+_RUN_RE = re.compile(rf"([{_NGRAM_CHARS}]+)|([^\W_{_NGRAM_CHARS}]+)")
+
+
+def _quote(term):
+    """FTS5 문자열 리터럴 (큰따옴표 이스케이프)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class TrigramTokenizer:
+    """FTS5 내장 trigram 토크나이저. 검색어 전체를 구문으로 넘기면 부분 문자열 검색과 같음."""
+
+    name = "trigram"
+    fts_tokenize = "trigram"
+    version = 1
+    min_query_length = 3
+
+    def index_text(self, text):
+        return text or ""
+
+    def match_expression(self, q):
+        if len(q) < self.min_query_length:
+            return None
+        return _quote(q)
+
+
+class HangulNgramTokenizer:
+    """
+    한글 n-gram 토크나이저.
+
+    색인: 한글 구간 "튜토리얼" (n=2) → 튜토 토리 리얼 얼
+          구간 끝의 n 글자 미만 조각(얼)도 넣어 두어, 구간 끝에서 끝나는 검색어·구간을 넘는 검색어도
+          인접 구문으로 찾음. 영문·숫자 단어는 소문자로 같은 방식의 latin_n-gram
+          ("python" → pyt yth tho hon on n) – 단어 중간 검색("ython")도 인덱스로.
+    검색: 검색어를 같은 방식으로 토큰화해 전체를 인접 구문(a + b + c)으로 묶음.
+          - 중간 구간: 끝 조각까지 정확히 일치 (문서에서도 그 위치에서 구간이 끝나야 함)
+          - 마지막 구간: gram 길이 이상이면 gram 만, 미만이면 구간 전체를 접두 일치(*)
+          예) "튜토" → "튜토"        "썬 튜토" → "썬" + "튜토"        "얼" → "얼"*
+              "ython" → "yth" + "tho" + "hon"        "py" → "py"*
+    """
+
+    fts_tokenize = "unicode61"
+    version = 2  # 2: 영문·숫자 단어도 n-gram (1 은 단어 단위)
+
+    def __init__(self, n=2, latin_n=3):
+        self.n = n
+        self.latin_n = latin_n
+        self.name = f"hangul_{'bigram' if n == 2 else 'trigram' if n == 3 else f'{n}gram'}"
+
+    def _runs(self, text):
+        """(구간 문자열, gram 길이) 목록 – 한글(CJK) 구간은 n, 영문·숫자 단어는 latin_n."""
+        text = unicodedata.normalize("NFC", text or "").lower()
+        return [
+            (m.group(1), self.n) if m.group(1) else (m.group(2), self.latin_n) for m in _RUN_RE.finditer(text)
+        ]
+
+    @staticmethod
+    def _grams(run, n):
+        """구간의 n-gram + 끝 조각 (색인용)."""
+        return [run[j:j + n] for j in range(len(run))]
+
+    def index_text(self, text):
+        tokens = []
+        for run, n in self._runs(text):
+            tokens.extend(self._grams(run, n))
+        return " ".join(tokens)
+
+    def match_expression(self, q):
+        runs = self._runs(q)
+        if not runs:
+            return None
+        terms = []
+        for i, (run, n) in enumerate(runs):
+            if i < len(runs) - 1:
+                terms.extend(_quote(g) for g in self._grams(run, n))
+            elif len(run) >= n:
+                terms.extend(_quote(run[j:j + n]) for j in range(len(run) - n + 1))
+            else:
+                terms.append(_quote(run) + "*")
+        return " + ".join(terms)
+
+
+TOKENIZERS = {
+    "trigram": TrigramTokenizer(),
+    "hangul_bigram": HangulNgramTokenizer(n=2),
+    "hangul_trigram": HangulNgramTokenizer(n=3),
+}
+DEFAULT_TOKENIZER = "hangul_bigram"
+
+
+def get_tokenizer(name):
+    """이름으로 토크나이저 조회. 모르는 이름이면 기본값."""
+    return TOKENIZERS.get(name) or TOKENIZERS[DEFAULT_TOKENIZER]
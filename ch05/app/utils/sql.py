@@ -0,0 +1,43 @@
+"""
+SQL 헬퍼 – 여러 백엔드(SQLite·PostgreSQL·MySQL)에서 같은 의미로 동작하는 Core 문장.
+"""
+
+from sqlalchemy.exc import IntegrityError
+
+
+def insert_ignore(connection, table, rows, conflict_columns):
+    """
+    rows 를 INSERT 하되 conflict_columns(UNIQUE/PK)가 이미 있는 행은 건너뜀.
+    동시에 같은 값을 넣는 다른 트랜잭션과 경쟁해도 UNIQUE 위반 없이 끝남.
+      - SQLite / PostgreSQL: INSERT ... ON CONFLICT (cols) DO NOTHING
+      - MySQL:               INSERT IGNORE
+      - 그 외:               행마다 SAVEPOINT 안에서 INSERT, 중복이면 무시
+    executemany 로 실행 (행 수가 달라도 컴파일된 문장 캐시 재사용, 드라이버가 multi-row VALUES 로 묶음).
+    반환: 실제로 들어간 행 수. 여러 행일 때 드라이버가 알려 주지 않으면 -1 (1행이면 항상 정확).
+    """
+    if not rows:
+        return 0
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).on_conflict_do_nothing(index_elements=list(conflict_columns))
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table).on_conflict_do_nothing(index_elements=list(conflict_columns))
+    elif dialect in ("mysql", "mariadb"):
+        stmt = table.insert().prefix_with("IGNORE")
+    else:
+        inserted = 0
+        for row in rows:
+            try:
+                with connection.begin_nested():
+                    connection.execute(table.insert(), row)
+                inserted += 1
+            except IntegrityError:
+                pass
+        return inserted
+    if len(rows) == 1:
+        return connection.execute(stmt, rows[0]).rowcount
+    return connection.execute(stmt, rows).rowcount
@@ -0,0 +1,227 @@
+"""
+요청별 SQL 계측 – 쿼리 수·DB 시간·느린 문장·N+1 의심 패턴.
+
+기능: SQLAlchemy 엔진 이벤트(before/after_cursor_execute)로 요청마다 실행된 SQL 을 기록합니다.
+  - 응답 헤더: 디버그 모드(또는 SQL_METRICS_SERVER_TIMING=True)면
+        Server-Timing: db;dur=<ms>;desc="<n> queries"
+    브라우저 개발자 도구 Network → Timing 탭에서 바로 확인.
+  - N+1 의심: 한 요청 안에서 같은 모양의 문장(파라미터·IN 목록 길이 무시)이
+    SQL_METRICS_N_PLUS_ONE 번 이상 실행되면 경고 로그 + 엔드포인트 통계에 기록.
+  - 엔드포인트별 누적 통계: 요청 수, 평균·최대 쿼리 수, DB 시간, 가장 느린 문장 상위 N개.
+    관리자 전용 GET /admin/metrics/sql (JSON) 로 조회. 프로세스별 집계.
+  - 테스트: count_queries() 컨텍스트 매니저 / conftest 의 assert_max_queries 픽스처.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# 문장 모양 정규화: 공백 압축, 리터럴 → ?, IN (?, ?, ...) → IN (?)
+_WS_RE = re.compile(r"\s+")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def statement_shape(statement):
+    """파라미터 값·IN 목록 길이가 달라도 같은 쿼리면 같은 문자열."""
+    shape = _WS_RE.sub(" ", statement).strip()
+    shape = _LITERAL_RE.sub("?", shape)
+    shape = re.sub(r"%\(\w+\)s|:\w+|\$\d+|%s", "?", shape)
+    return _IN_LIST_RE.sub("(?)", shape)
+
+
+class _RequestQueries:
+    """요청 1건(또는 count_queries 블록 1개)에서 실행된 문장 기록."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []  # (모양, 소요 초)
+
+    def add(self, statement, elapsed):
+        self.count += 1
+        self.duration += elapsed
+        self.statements.append((statement_shape(statement), elapsed))
+
+    def repeated(self, threshold):
+        """threshold 번 이상 반복된 문장 모양 {모양: 횟수}."""
+        counts = Counter(shape for shape, _ in self.statements)
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+    @property
+    def shapes(self):
+        return [shape for shape, _ in self.statements]
+
+
+class _EndpointStats:
+    """엔드포인트 1개의 누적 통계."""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.duration = 0.0
+        self.slowest = []  # (소요 초, 모양) 내림차순 상위 N개
+        self.n_plus_one = Counter()  # 모양 -> 의심으로 잡힌 요청 수
+
+    def add(self, recorded, slow_top, repeated):
+        self.requests += 1
+        self.queries += recorded.count
+        self.max_queries = max(self.max_queries, recorded.count)
+        self.duration += recorded.duration
+        merged = {shape: elapsed for elapsed, shape in self.slowest}
+        for shape, elapsed in recorded.statements:
+            if elapsed > merged.get(shape, -1):
+                merged[shape] = elapsed
+        self.slowest = sorted(((e, s) for s, e in merged.items()), reverse=True)[:slow_top]
+        self.n_plus_one.update(repeated.keys())
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "queries_total": self.queries,
+            "queries_avg": round(self.queries / self.requests, 2) if self.requests else 0,
+            "queries_max": self.max_queries,
+            "db_ms_total": round(self.duration * 1000, 2),
+            "db_ms_avg": round(self.duration * 1000 / self.requests, 2) if self.requests else 0,
+            "slowest": [{"ms": round(e * 1000, 3), "statement": s} for e, s in self.slowest],
+            "n_plus_one": [{"statement": s, "requests": n} for s, n in self.n_plus_one.most_common()],
+        }
+
+
+class _Metrics:
+    """앱 1개에 대응하는 계측 상태. app.extensions["sql_metrics"] 에 저장."""
+
+    def __init__(self, app):
+        self.enabled = bool(app.config.get("SQL_METRICS_ENABLED", True))
+        self.slow_top = max(1, int(app.config.get("SQL_METRICS_SLOW_TOP", 5)))
+        self.n_plus_one = max(2, int(app.config.get("SQL_METRICS_N_PLUS_ONE", 5)))
+        self.server_timing = app.config.get("SQL_METRICS_SERVER_TIMING")
+        self.endpoints = {}
+        self.lock = threading.Lock()
+        self.active = []  # count_queries 블록 스택
+
+    def snapshot(self):
+        with self.lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())}
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+class SQLMetrics:
+    """
+    요청별 SQL 계측 확장. db, view_counter 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    db.init_app(app) 이후에 호출해야 함 (엔진 이벤트 등록).
+    """
+
+    def init_app(self, app):
+        from app import db
+
+        metrics = _Metrics(app)
+        app.extensions["sql_metrics"] = metrics
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        if metrics.enabled:
+            app.before_request(_start_request)
+            app.after_request(_finish_request)
+
+    @staticmethod
+    def _metrics():
+        return current_app.extensions["sql_metrics"]
+
+    def snapshot(self):
+        """엔드포인트별 누적 통계 딕셔너리."""
+        return self._metrics().snapshot()
+
+    def reset(self):
+        self._metrics().reset()
+
+    def current(self):
+        """현재 요청의 기록 (_RequestQueries). 요청 밖이면 None."""
+        return g.get("sql_queries") if has_request_context() else None
+
+    @contextmanager
+    def count_queries(self):
+        """
+        블록 안에서 실행된 SQL 기록 (요청 안팎 모두).
+            with sql_metrics.count_queries() as q:
+                client.get("/watch/1")
+            assert q.count <= 10
+        """
+        recorded = _RequestQueries()
+        stack = self._metrics().active
+        stack.append(recorded)
+        try:
+            yield recorded
+        finally:
+            stack.remove(recorded)
+
+
+# ---------------------------------------------------------------------------
+# 엔진 이벤트
+# ---------------------------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_metrics_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    targets = []
+    if has_request_context():
+        recorded = g.get("sql_queries")
+        if recorded is not None:
+            targets.append(recorded)
+    try:
+        targets.extend(current_app.extensions["sql_metrics"].active)
+    except (RuntimeError, KeyError):
+        pass
+    for recorded in targets:
+        recorded.add(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # 실패한 문장은 after_cursor_execute 가 호출되지 않으므로 시작 시각만 버림
+    conn = exception_context.connection
+    starts = conn.info.get("sql_metrics_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+# ---------------------------------------------------------------------------
+# 요청 훅
+# ---------------------------------------------------------------------------
+def _start_request():
+    g.sql_queries = _RequestQueries()
+
+
+def _finish_request(response):
+    recorded = g.pop("sql_queries", None)
+    if recorded is None:
+        return response
+    metrics = current_app.extensions["sql_metrics"]
+    endpoint = request.endpoint or "<unmatched>"
+    repeated = recorded.repeated(metrics.n_plus_one)
+    for shape, n in repeated.items():
+        current_app.logger.warning("N+1 의심 (%s): 같은 문장 %d회 – %s", endpoint, n, shape[:200])
+    with metrics.lock:
+        metrics.endpoints.setdefault(endpoint, _EndpointStats()).add(recorded, metrics.slow_top, repeated)
+
+    show = metrics.server_timing if metrics.server_timing is not None else current_app.debug
+    if show:
+        timing = f'db;dur={recorded.duration * 1000:.2f};desc="{recorded.count} queries"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+    return response
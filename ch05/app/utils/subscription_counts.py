@@ -0,0 +1,108 @@
+"""
+구독 집계 컬럼 유지 – users.subscriber_count / users.subscription_count.
+
+기능: 채널 페이지·시청 페이지·프로필 API·구독 토글 응답의 구독자 수를
+      subscriptions COUNT 대신 users 행에 저장된 값으로 읽습니다.
+
+유지 방식: Subscription 행이 추가·삭제되면 같은 flush(트랜잭션) 안에서
+      "UPDATE users SET subscriber_count = subscriber_count + 1" 처럼 SQL 쪽에서 증감
+      (읽고-더하고-쓰기 없음 → 동시에 구독해도 증가분이 사라지지 않음, rollback 되면 함께 취소).
+  - subscriptions 를 SQL 로 직접 고치는 코드는 apply_delta() 를 같은 트랜잭션에서 호출해야 함
+
+검증: check_subscription_counts() 가 subscriptions 집계와 비교해 어긋난 사용자 목록 반환,
+      repair=True 면 다시 셈. (DB 의 ON DELETE CASCADE 등 ORM 을 거치지 않은 변경 복구용)
+      실행: python scripts/check_subscription_counts.py [--repair]
+"""
+
+from sqlalchemy import event, func, inspect, select, text, update
+
+from app import db
+from app.models import Subscription, User
+
+
+# ---------------------------------------------------------------------------
+# 증감 반영
+# ---------------------------------------------------------------------------
+def apply_delta(connection, subscriber_id, channel_id, delta):
+    """구독 1건 추가(delta=1)·삭제(delta=-1)를 두 사용자 행에 반영 (connection 의 트랜잭션 안에서)."""
+    users = User.__table__
+    connection.execute(
+        update(users).where(users.c.id == channel_id).values(subscriber_count=users.c.subscriber_count + delta)
+    )
+    connection.execute(
+        update(users)
+        .where(users.c.id == subscriber_id)
+        .values(subscription_count=users.c.subscription_count + delta)
+    )
+
+
+# ---------------------------------------------------------------------------
+# 검증·재계산
+# ---------------------------------------------------------------------------
+def _actual_counts():
+    """subscriptions 기준 실제 ({채널 id: 구독자 수}, {사용자 id: 구독 수})."""
+    subscribers = dict(
+        db.session.execute(
+            select(Subscription.subscribed_to_id, func.count()).group_by(Subscription.subscribed_to_id)
+        ).all()
+    )
+    subscriptions = dict(
+        db.session.execute(
+            select(Subscription.subscriber_id, func.count()).group_by(Subscription.subscriber_id)
+        ).all()
+    )
+    return subscribers, subscriptions
+
+
+def check_subscription_counts(repair=False):
+    """
+    users 의 구독 집계와 subscriptions 비교.
+    반환: 어긋난 사용자 [(user_id, (저장된 구독자 수, 구독 수), (실제 구독자 수, 구독 수)), ...].
+    repair=True 면 어긋난 사용자 행을 실제 값으로 고침.
+    """
+    subscribers, subscriptions = _actual_counts()
+    mismatches = []
+    rows = db.session.execute(select(User.id, User.subscriber_count, User.subscription_count).order_by(User.id))
+    for user_id, stored_subscribers, stored_subscriptions in rows:
+        actual = (subscribers.get(user_id, 0), subscriptions.get(user_id, 0))
+        if (stored_subscribers, stored_subscriptions) != actual:
+            mismatches.append((user_id, (stored_subscribers, stored_subscriptions), actual))
+    if repair and mismatches:
+        db.session.execute(
+            update(User),
+            [
+                {"id": user_id, "subscriber_count": actual[0], "subscription_count": actual[1]}
+                for user_id, _, actual in mismatches
+            ],
+        )
+        db.session.commit()
+    return mismatches
+
+
+def ensure_subscription_counts(app):
+    """
+    create_app() 에서 create_all() 직후 (users 를 조회하기 전) 호출.
+    기존 DB 에 집계 컬럼이 없으면 추가하고 subscriptions 로 한 번 채움.
+    """
+    columns = {column["name"] for column in inspect(db.engine).get_columns(User.__tablename__)}
+    missing = [name for name in ("subscriber_count", "subscription_count") if name not in columns]
+    if not missing:
+        return
+    for name in missing:
+        db.session.execute(text(f"ALTER TABLE {User.__tablename__} ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    db.session.commit()
+    fixed = check_subscription_counts(repair=True)
+    app.logger.info("구독 집계 컬럼 추가: %s (사용자 %d명 채움)", ", ".join(missing), len(fixed))
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 구독 행 추가·삭제를 같은 flush(트랜잭션) 안에서 반영
+# ---------------------------------------------------------------------------
+@event.listens_for(Subscription, "after_insert")
+def _after_insert(mapper, connection, target):
+    apply_delta(connection, target.subscriber_id, target.subscribed_to_id, 1)
+
+
+@event.listens_for(Subscription, "after_delete")
+def _after_delete(mapper, connection, target):
+    apply_delta(connection, target.subscriber_id, target.subscribed_to_id, -1)
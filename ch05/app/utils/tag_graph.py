@@ -0,0 +1,590 @@
+"""
+태그 동시 출현(co-occurrence) 행렬 – main.tag "관련 태그", GET /api/tags/<name>/related 용.
+
+기능: video_tags 전체로 태그×태그 동시 출현 횟수(희소 행렬, CSR)와 태그→비디오 postings,
+      비디오→태그 목록을 만들어 파일 1개(TAG_GRAPH_PATH)에 저장하고 mmap 으로 읽습니다.
+      여러 워커 프로세스가 같은 파일을 매핑하므로 페이지 캐시를 공유하고, 요청 처리 중 DB 조회가 없습니다.
+
+파일 형식 (호스트 바이트 순서, 모든 배열 int32 – numpy.frombuffer / np.memmap 으로도 그대로 읽힘):
+  헤더 | tag_ids | tag_counts | name_offsets | id_order |
+  cooc_indptr | cooc_indices | cooc_data |          ← 태그×태그 CSR (행 안은 횟수 내림차순)
+  post_indptr | post_indices |                       ← 태그 → video_id (내림차순)
+  video_ids | video_indptr | video_tag_indices | 태그 이름(UTF-8)
+  태그 인덱스는 이름(UTF-8 바이트) 순으로 정렬 → 이름 조회는 이진 탐색. id_order 는 id 순 조회용.
+
+증분 반영: Video 의 태그가 바뀐 트랜잭션이 commit 되면 "비디오의 새 태그 목록"을 델타 로그
+      (TAG_GRAPH_PATH + ".delta", JSON 한 줄씩 append)에 기록합니다. 읽는 쪽은 로그의 새 줄을
+      메모리 보정값(overlay)에 반영해 행렬 값에 더합니다. 기록이 "상태"라 같은 줄을 다시 적용해도 안전.
+압축(재구축): 델타가 TAG_GRAPH_COMPACT_EVERY 건을 넘거나 행렬이 TAG_GRAPH_MAX_AGE 초보다 오래되면
+      백그라운드 스레드가 DB 에서 전체를 다시 만들어 파일을 원자적으로 교체하고 델타를 정리합니다.
+      (수동: python scripts/build_tag_graph.py) 재구축은 항상 DB 기준이라 오차가 누적되지 않음.
+
+in-memory SQLite(테스트) 처럼 프로세스 간에 DB 를 공유하지 않으면 파일 없이 메모리에서만 동작.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+MAGIC = b"WTTAGGR1"
+# magic, n_tags, n_videos, nnz_cooc, nnz_post, names_size, built_at
+_HEADER = struct.Struct("=8sIIIIId")
+_HEADER_SIZE = (_HEADER.size + 7) // 8 * 8
+# 재구축 잠금 파일이 이 초보다 오래되면 죽은 프로세스가 남긴 것으로 보고 무시
+_LOCK_STALE = 600
+
+
+# ---------------------------------------------------------------------------
+# 행렬 파일 생성
+# ---------------------------------------------------------------------------
+def build_matrix(pairs, tag_names, built_at):
+    """
+    pairs: [(video_id, tag_id), ...], tag_names: {tag_id: name}.
+    반환: 행렬 파일 내용 (bytes).
+    """
+    video_tags = defaultdict(list)
+    for video_id, tag_id in pairs:
+        if tag_id in tag_names:
+            video_tags[video_id].append(tag_id)
+
+    used = {tid for tids in video_tags.values() for tid in tids}
+    encoded = {tid: tag_names[tid].encode("utf-8") for tid in used}
+    order = sorted(used, key=lambda tid: encoded[tid])
+    index = {tid: i for i, tid in enumerate(order)}
+    n = len(order)
+
+    postings = [[] for _ in range(n)]
+    cooc = [Counter() for _ in range(n)]
+    video_ids = sorted(video_tags)
+    video_indptr = array("i", [0])
+    video_tag_indices = array("i")
+    for video_id in video_ids:
+        idx = sorted({index[tid] for tid in video_tags[video_id]})
+        video_tag_indices.extend(idx)
+        video_indptr.append(len(video_tag_indices))
+        for a in idx:
+            postings[a].append(video_id)
+            row = cooc[a]
+            for b in idx:
+                if a != b:
+                    row[b] += 1
+
+    tag_ids = array("i", order)
+    tag_counts = array("i", (len(p) for p in postings))
+    names = b"".join(encoded[tid] for tid in order)
+    name_offsets = array("i", [0])
+    for tid in order:
+        name_offsets.append(name_offsets[-1] + len(encoded[tid]))
+    id_order = array("i", sorted(range(n), key=lambda i: order[i]))
+
+    cooc_indptr, cooc_indices, cooc_data = array("i", [0]), array("i"), array("i")
+    for row in cooc:
+        for b, count in sorted(row.items(), key=lambda item: (-item[1], item[0])):
+            cooc_indices.append(b)
+            cooc_data.append(count)
+        cooc_indptr.append(len(cooc_indices))
+
+    post_indptr, post_indices = array("i", [0]), array("i")
+    for videos in postings:
+        post_indices.extend(sorted(videos, reverse=True))
+        post_indptr.append(len(post_indices))
+
+    header = _HEADER.pack(MAGIC, n, len(video_ids), len(cooc_indices), len(post_indices), len(names), built_at)
+    parts = [header.ljust(_HEADER_SIZE, b"\0")]
+    for arr in (tag_ids, tag_counts, name_offsets, id_order, cooc_indptr, cooc_indices, cooc_data,
+                post_indptr, post_indices, array("i", video_ids), video_indptr, video_tag_indices):
+        parts.append(arr.tobytes())
+    parts.append(names)
+    return b"".join(parts)
+
+
+class _Matrix:
+    """행렬 파일(bytes 또는 mmap) 위의 읽기 전용 뷰. 배열은 memoryview.cast("i") 라 복사 없음."""
+
+    def __init__(self, buf, source=None):
+        self.source = source  # mmap 이면 close 용
+        view = memoryview(buf)
+        magic, n, n_videos, nnz_cooc, nnz_post, names_size, self.built_at = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("태그 행렬 파일 형식이 아닙니다.")
+        self.n = n
+        pos = _HEADER_SIZE
+
+        def take(count):
+            nonlocal pos
+            arr = view[pos:pos + 4 * count].cast("i")
+            pos += 4 * count
+            return arr
+
+        self.tag_ids = take(n)
+        self.tag_counts = take(n)
+        self.name_offsets = take(n + 1)
+        self.id_order = take(n)
+        self.cooc_indptr = take(n + 1)
+        self.cooc_indices = take(nnz_cooc)
+        self.cooc_data = take(nnz_cooc)
+        self.post_indptr = take(n + 1)
+        self.post_indices = take(nnz_post)
+        self.video_ids = take(n_videos)
+        self.video_indptr = take(n_videos + 1)
+        self.video_tag_indices = take(nnz_post)
+        self.names = view[pos:pos + names_size]
+
+    def name(self, i):
+        return bytes(self.names[self.name_offsets[i]:self.name_offsets[i + 1]]).decode("utf-8")
+
+    def find_name(self, name):
+        """이름 → 태그 인덱스 (이진 탐색). 없으면 None."""
+        key = name.encode("utf-8")
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self.names[self.name_offsets[mid]:self.name_offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n and self.name(lo) == name:
+            return lo
+        return None
+
+    def find_id(self, tag_id):
+        """tag_id → 태그 인덱스. 없으면 None."""
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.tag_ids[self.id_order[mid]] < tag_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n and self.tag_ids[self.id_order[lo]] == tag_id:
+            return self.id_order[lo]
+        return None
+
+    def neighbors(self, i):
+        """태그 i 와 함께 쓰인 (태그 인덱스, 횟수) – 횟수 내림차순."""
+        start, stop = self.cooc_indptr[i], self.cooc_indptr[i + 1]
+        return zip(self.cooc_indices[start:stop], self.cooc_data[start:stop])
+
+    def postings(self, i):
+        return self.post_indices[self.post_indptr[i]:self.post_indptr[i + 1]]
+
+    def video_tag_ids(self, video_id):
+        """비디오의 태그 id 목록 (행렬 생성 시점 기준)."""
+        pos = bisect_left(self.video_ids, video_id)
+        if pos >= len(self.video_ids) or self.video_ids[pos] != video_id:
+            return []
+        start, stop = self.video_indptr[pos], self.video_indptr[pos + 1]
+        return [self.tag_ids[j] for j in self.video_tag_indices[start:stop]]
+
+    def close(self):
+        for name in ("tag_ids", "tag_counts", "name_offsets", "id_order", "cooc_indptr", "cooc_indices",
+                     "cooc_data", "post_indptr", "post_indices", "video_ids", "video_indptr",
+                     "video_tag_indices", "names"):
+            getattr(self, name).release()
+        if self.source is not None:
+            try:
+                self.source.close()
+            except BufferError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# 앱별 상태: 행렬 + 델타 보정값
+# ---------------------------------------------------------------------------
+class _GraphState:
+    """앱 1개에 대응하는 태그 행렬 상태. app.extensions["tag_graph"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+        shared_db = not (uri in ("sqlite://", "sqlite:///") or ":memory:" in uri)
+        self.path = app.config.get("TAG_GRAPH_PATH") if shared_db else None
+        self.delta_path = f"{self.path}.delta" if self.path else None
+        self.compact_every = max(1, int(app.config.get("TAG_GRAPH_COMPACT_EVERY", 500)))
+        self.max_age = float(app.config.get("TAG_GRAPH_MAX_AGE", 3600))
+        self.lock = threading.RLock()
+        self.matrix = None
+        self.matrix_key = None
+        self.memory_log = []  # 파일 없이 동작할 때의 델타 로그
+        self.rebuilding = False
+        self._reset_overlay()
+
+    def _reset_overlay(self):
+        self.delta_key = None
+        self.delta_offset = 0
+        self.applied = 0
+        self.video_override = {}  # video_id -> 현재 태그 id 목록
+        self.count_adj = Counter()  # tag_id -> 비디오 수 보정
+        self.cooc_adj = defaultdict(Counter)  # tag_id -> {tag_id: 동시 출현 보정}
+        self.post_add = defaultdict(set)
+        self.post_remove = defaultdict(set)
+        self.extra_names = {}  # 행렬에 없는 (새) 태그 id -> 이름
+
+    # ----- 델타 적용 -----
+    def _apply(self, entry):
+        if entry["t"] < self.matrix.built_at:
+            return  # 이미 행렬에 포함된 변경
+        video_id = entry["v"]
+        new = {tid: name for tid, name in entry["g"]}
+        prev = self.video_override.get(video_id)
+        if prev is None:
+            prev = self.matrix.video_tag_ids(video_id)
+        for sign, tids in ((-1, prev), (1, list(new))):
+            for a in tids:
+                self.count_adj[a] += sign
+                (self.post_add if sign > 0 else self.post_remove)[a].add(video_id)
+                (self.post_remove if sign > 0 else self.post_add)[a].discard(video_id)
+                for b in tids:
+                    if a != b:
+                        self.cooc_adj[a][b] += sign
+        for tid, name in new.items():
+            if self.matrix.find_id(tid) is None:
+                self.extra_names[tid] = name
+        self.video_override[video_id] = list(new)
+        self.applied += 1
+
+    def _read_delta(self):
+        if self.path is None:
+            for entry in self.memory_log[self.delta_offset:]:
+                self._apply(entry)
+            self.delta_offset = len(self.memory_log)
+            return
+        try:
+            with open(self.delta_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                key = (st.st_ino, st.st_dev)
+                if key != self.delta_key:
+                    # 압축으로 델타 파일이 교체됨 → 보정값을 처음부터 다시 계산
+                    self._reset_overlay()
+                    self.delta_key = key
+                f.seek(self.delta_offset)
+                data = f.read()
+        except FileNotFoundError:
+            if self.delta_key is not None:
+                self._reset_overlay()
+            return
+        end = data.rfind(b"\n") + 1  # 쓰는 중인 마지막 줄은 다음에 처리
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue
+        self.delta_offset += end
+
+    # ----- 행렬 로드·재구축 -----
+    def _load(self):
+        if self.path is None:
+            if self.matrix is None:
+                self.rebuild()
+            return
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.rebuild()
+            st = os.stat(self.path)
+        key = (st.st_ino, st.st_dev, st.st_mtime_ns)
+        if key == self.matrix_key:
+            return
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        old, self.matrix, self.matrix_key = self.matrix, _Matrix(mm, mm), key
+        if old is not None:
+            old.close()
+        self._reset_overlay()
+
+    def current(self):
+        """최신 행렬 + 델타 반영. 필요하면 백그라운드 재구축 시작."""
+        with self.lock:
+            self._load()
+            self._read_delta()
+            stale = self.applied >= self.compact_every or time.time() - self.matrix.built_at > self.max_age
+        if stale:
+            self.schedule_rebuild()
+        return self
+
+    def rebuild(self):
+        """DB 전체로 행렬을 다시 만들어 교체. 반환: 태그 수."""
+        from sqlalchemy import select
+
+        from app import db
+        from app.models import Tag
+        from app.models.video import video_tags
+
+        built_at = time.time()
+        pairs = db.session.execute(select(video_tags.c.video_id, video_tags.c.tag_id)).all()
+        names = dict(db.session.execute(select(Tag.id, Tag.name)).all())
+        data = build_matrix(pairs, names, built_at)
+        with self.lock:
+            if self.path is None:
+                if self.matrix is not None:
+                    self.matrix.close()
+                self.matrix, self.memory_log = _Matrix(bytearray(data)), []
+                self._reset_overlay()
+            else:
+                _atomic_write(self.path, data)
+                self._compact_delta(built_at)
+                self._load()
+        return len(names)
+
+    def _compact_delta(self, built_at):
+        """델타 로그에서 새 행렬에 포함된 줄(built_at 이전)을 제거."""
+        try:
+            src = open(self.delta_path, "rb")
+        except FileNotFoundError:
+            return
+        with src:
+            data = src.read()
+            keep = [line for line in data.splitlines(keepends=True)
+                    if line.endswith(b"\n") and _entry_time(line) >= built_at]
+            _atomic_write(self.delta_path, b"".join(keep))
+            # 교체 직전에 옛 파일에 붙은 줄도 옮겨 담음
+            tail = src.read()
+            if tail:
+                _append(self.delta_path, tail)
+
+    def schedule_rebuild(self):
+        """다른 스레드·프로세스가 재구축 중이 아니면 백그라운드로 재구축."""
+        with self.lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+        if self.path is None:
+            # 메모리 DB 는 다른 스레드에서 보이지 않으므로 그 자리에서 재구축
+            try:
+                self.rebuild()
+            finally:
+                self.rebuilding = False
+            return
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self):
+        lock_path = f"{self.path}.lock"
+        try:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if time.time() - os.path.getmtime(lock_path) < _LOCK_STALE:
+                    return
+                os.remove(lock_path)
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.close(fd)
+            try:
+                with self.app.app_context():
+                    self.rebuild()
+            finally:
+                os.remove(lock_path)
+        except Exception as e:
+            self.app.logger.warning("태그 행렬 재구축 실패: %s", e)
+        finally:
+            self.rebuilding = False
+
+    def record(self, entries):
+        """commit 된 태그 변경 [(video_id, [(tag_id, name), ...]), ...] 을 델타 로그에 기록."""
+        now = time.time()
+        rows = [{"t": now, "v": video_id, "g": tags} for video_id, tags in entries]
+        if self.path is None:
+            with self.lock:
+                self.memory_log.extend(rows)
+            return
+        data = "".join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows)
+        _append(self.delta_path, data.encode("utf-8"))
+
+
+def _entry_time(line):
+    try:
+        return json.loads(line)["t"]
+    except (ValueError, KeyError, TypeError):
+        return 0
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _append(path, data):
+    # O_APPEND 단일 write → 여러 프로세스가 동시에 써도 줄이 섞이지 않음 (view_counter spool 과 같은 방식)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------------
+# 확장 객체
+# ---------------------------------------------------------------------------
+class TagGraph:
+    """
+    태그 동시 출현 행렬 확장. db, view_counter 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    라우트에서는 tag_graph.related(name) 등 조회 메서드만 호출하면 됩니다.
+    """
+
+    def init_app(self, app):
+        if app.config.get("TAG_GRAPH_PATH"):
+            os.makedirs(os.path.dirname(app.config["TAG_GRAPH_PATH"]), exist_ok=True)
+        app.extensions["tag_graph"] = _GraphState(app)
+        _register_events()
+
+    @staticmethod
+    def _state():
+        from flask import current_app
+
+        return current_app.extensions["tag_graph"].current()
+
+    def tag_info(self, name):
+        """태그 이름 → {"id", "name", "count"}. 비디오가 달린 적 없는 태그면 None."""
+        state = self._state()
+        with state.lock:
+            tag_id = _lookup(state, name)
+            if tag_id is None:
+                return None
+            count = _count(state, tag_id)
+        return {"id": tag_id, "name": name, "count": count} if count > 0 else None
+
+    def related(self, name, limit=10):
+        """
+        함께 자주 쓰인 태그 목록 (점수 내림차순).
+        score = 동시 출현 수 / sqrt(두 태그 비디오 수 곱) (코사인 유사도) → 흔한 태그가 항상 앞서지 않음.
+        반환: [{"id", "name", "count"(동시 출현 수), "video_count", "score"}, ...]
+        """
+        state = self._state()
+        with state.lock:
+            tag_id = _lookup(state, name)
+            if tag_id is None:
+                return []
+            matrix = state.matrix
+            counts = Counter()
+            i = matrix.find_id(tag_id)
+            if i is not None:
+                for j, count in matrix.neighbors(i):
+                    counts[matrix.tag_ids[j]] = count
+            counts.update(state.cooc_adj.get(tag_id, {}))
+            own = _count(state, tag_id)
+            items = []
+            for other, count in counts.items():
+                other_count = _count(state, other)
+                if count <= 0 or other_count <= 0 or own <= 0:
+                    continue
+                items.append({
+                    "id": other,
+                    "name": _name(state, other),
+                    "count": count,
+                    "video_count": other_count,
+                    "score": round(count / math.sqrt(own * other_count), 4),
+                })
+        items.sort(key=lambda item: (-item["score"], -item["count"], item["name"]))
+        return items[:limit]
+
+    def video_ids(self, name):
+        """태그가 달린 video_id 목록 (내림차순)."""
+        state = self._state()
+        with state.lock:
+            tag_id = _lookup(state, name)
+            if tag_id is None:
+                return []
+            i = state.matrix.find_id(tag_id)
+            ids = set(state.matrix.postings(i)) if i is not None else set()
+            ids -= state.post_remove.get(tag_id, set())
+            ids |= state.post_add.get(tag_id, set())
+        return sorted(ids, reverse=True)
+
+    def rebuild(self):
+        """DB 전체로 즉시 재구축 (스크립트·테스트용). 반환: 태그 수."""
+        from flask import current_app
+
+        return current_app.extensions["tag_graph"].rebuild()
+
+
+def _lookup(state, name):
+    i = state.matrix.find_name(name)
+    if i is not None:
+        return state.matrix.tag_ids[i]
+    for tag_id, extra in state.extra_names.items():
+        if extra == name:
+            return tag_id
+    return None
+
+
+def _count(state, tag_id):
+    i = state.matrix.find_id(tag_id)
+    base = state.matrix.tag_counts[i] if i is not None else 0
+    return base + state.count_adj.get(tag_id, 0)
+
+
+def _name(state, tag_id):
+    i = state.matrix.find_id(tag_id)
+    return state.matrix.name(i) if i is not None else state.extra_names.get(tag_id, "")
+
+
+# ---------------------------------------------------------------------------
+# 변경 감지: flush 시 태그가 바뀐 비디오의 새 태그 목록을 모았다가 commit 직후 델타 로그에 기록
+# ---------------------------------------------------------------------------
+def note_video_tags(session, video_id, tags):
+    """
+    Core SQL 로 video_tags 를 바꾼 경우 직접 호출. tags: [(tag_id, name), ...] (변경 후 전체).
+    session 의 트랜잭션이 commit 되면 델타 로그에 기록됨.
+    """
+    session.info.setdefault("tag_graph_changes", {})[video_id] = list(tags)
+
+
+def _after_flush(session, flush_context):
+    from sqlalchemy import inspect
+
+    from app.models import Video
+
+    changes = session.info.setdefault("tag_graph_changes", {})
+    for obj in session.new:
+        # 태그 없이 추가된 비디오는 행렬에 영향 없음 (lazy load 도 피함)
+        if isinstance(obj, Video) and "tags" not in inspect(obj).unloaded and obj.tags:
+            changes[obj.id] = [(t.id, t.name) for t in obj.tags]
+    for obj in session.dirty:
+        if isinstance(obj, Video) and inspect(obj).attrs.tags.history.has_changes():
+            changes[obj.id] = [(t.id, t.name) for t in obj.tags]
+    for obj in session.deleted:
+        if isinstance(obj, Video):
+            changes[obj.id] = []
+
+
+def _after_commit(session):
+    changes = session.info.pop("tag_graph_changes", None)
+    if not changes:
+        return
+    from flask import current_app, has_app_context
+
+    if has_app_context() and "tag_graph" in current_app.extensions:
+        current_app.extensions["tag_graph"].record(list(changes.items()))
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("tag_graph_changes", None)
+
+
+def _tags_changed(session, connection, video, added, removed):
+    note_video_tags(session, video.id, [(t.id, t.name) for t in video.tags])
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from app.models.video import on_tags_changed
+
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    on_tags_changed(_tags_changed)
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,188 @@
+"""
+인기 태그 집계 테이블(tag_stats) 유지 – main 인덱스·태그 페이지, GET /api/tags/popular 용.
+
+기능: 태그별 비디오 수를 tag_stats 에 저장해 두고, 인기 태그는
+      "video_count 내림차순 LIMIT N" 인덱스 조회로 가져옵니다 (video_tags GROUP BY 없음).
+
+유지 방식 (모두 비디오 태그를 바꾼 트랜잭션 안에서 실행 → commit/rollback 이 함께 적용):
+  - Tag 생성 시 tag_stats 행(video_count=0) 생성
+  - Video.tags 변경(save_tags)·태그가 달린 비디오 추가: 추가된 태그 +1, 빠진 태그 -1
+  - Video 삭제: 달려 있던 태그 -1
+  - video_tags 를 SQL 로 직접 고치는 코드는 apply_deltas() 를 같은 트랜잭션에서 호출해야 함
+
+검증: check_tag_stats() 가 video_tags 집계와 비교해 어긋난 태그 목록 반환, repair=True 면 다시 채움.
+      (DB 의 ON DELETE CASCADE 로 지워진 행 등 ORM 을 거치지 않은 변경 복구용)
+      실행: python scripts/check_tag_stats.py [--repair]
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Tag, TagStat, Video
+from app.models.video import on_tags_changed, video_tags
+from app.utils.sql import insert_ignore
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# 조회
+# ---------------------------------------------------------------------------
+def popular_tags(limit=12):
+    """비디오 수 기준 상위 태그 (Tag 객체 목록). 비디오가 없는 태그는 제외."""
+    return (
+        db.session.query(Tag)
+        .join(TagStat, TagStat.tag_id == Tag.id)
+        .filter(TagStat.video_count > 0)
+        .order_by(TagStat.video_count.desc(), TagStat.tag_id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+# ---------------------------------------------------------------------------
+# 증감 반영
+# ---------------------------------------------------------------------------
+def apply_deltas(connection, deltas, used_at=None):
+    """
+    deltas: {tag_id: 증감} 를 tag_stats 에 반영 (connection 의 트랜잭션 안에서).
+    증가한 태그는 last_used_at 갱신. tag_stats 행이 없는 태그는 먼저 만든 뒤 반영
+    (INSERT ... ON CONFLICT DO NOTHING – 동시 업로드가 같은 새 태그의 행을 만들어도 PK 위반 없음).
+    """
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = TagStat.__table__
+    insert_ignore(
+        connection, table,
+        [{"tag_id": tag_id, "video_count": 0, "last_used_at": None} for tag_id in sorted(deltas)], ["tag_id"],
+    )
+    used_at = used_at or _utc_now()
+    up = [{"b_id": tag_id, "b_delta": delta} for tag_id, delta in deltas.items() if delta > 0]
+    down = [{"b_id": tag_id, "b_delta": delta} for tag_id, delta in deltas.items() if delta < 0]
+    if up:
+        connection.execute(
+            update(table)
+            .where(table.c.tag_id == bindparam("b_id"))
+            .values(video_count=table.c.video_count + bindparam("b_delta"), last_used_at=used_at),
+            up,
+        )
+    if down:
+        connection.execute(
+            update(table)
+            .where(table.c.tag_id == bindparam("b_id"))
+            .values(video_count=table.c.video_count + bindparam("b_delta")),
+            down,
+        )
+
+
+# ---------------------------------------------------------------------------
+# 검증·재구축
+# ---------------------------------------------------------------------------
+def _actual_counts():
+    """video_tags 기준 실제 {tag_id: (비디오 수, 마지막 연결 시각)}."""
+    rows = db.session.execute(
+        select(video_tags.c.tag_id, func.count(), func.max(video_tags.c.created_at)).group_by(video_tags.c.tag_id)
+    )
+    return {tag_id: (count, last) for tag_id, count, last in rows}
+
+
+def check_tag_stats(repair=False):
+    """
+    tag_stats 와 video_tags 집계 비교.
+    반환: 어긋난 태그 [(tag_id, 저장된 값, 실제 값), ...]. repair=True 면 전체를 실제 값으로 다시 채움.
+    """
+    actual = _actual_counts()
+    stored = dict(db.session.execute(select(TagStat.tag_id, TagStat.video_count)).all())
+    tag_ids = set(db.session.execute(select(Tag.id)).scalars())
+    mismatches = []
+    for tag_id in sorted(tag_ids | set(stored)):
+        expected = actual.get(tag_id, (0, None))[0] if tag_id in tag_ids else None
+        if stored.get(tag_id) != expected:
+            mismatches.append((tag_id, stored.get(tag_id), expected))
+    if repair and mismatches:
+        rebuild_tag_stats(actual)
+    return mismatches
+
+
+def rebuild_tag_stats(actual=None):
+    """tag_stats 를 비우고 모든 태그에 대해 video_tags 집계로 다시 채움. 반환: 태그 수."""
+    actual = _actual_counts() if actual is None else actual
+    tag_ids = list(db.session.execute(select(Tag.id)).scalars())
+    db.session.execute(TagStat.__table__.delete())
+    if tag_ids:
+        db.session.execute(
+            TagStat.__table__.insert(),
+            [
+                {"tag_id": tag_id, "video_count": actual.get(tag_id, (0, None))[0],
+                 "last_used_at": actual.get(tag_id, (0, None))[1]}
+                for tag_id in tag_ids
+            ],
+        )
+    db.session.commit()
+    return len(tag_ids)
+
+
+def ensure_tag_stats(app):
+    """
+    create_app() 에서 create_all() 직후 호출. 기존 DB 에 tag_stats 가 새로 생긴 경우
+    (태그는 있는데 통계 행이 없음) video_tags 로 한 번 채움.
+    """
+    has_tags = db.session.execute(select(Tag.id).limit(1)).first() is not None
+    has_stats = db.session.execute(select(TagStat.tag_id).limit(1)).first() is not None
+    if has_tags and not has_stats:
+        count = rebuild_tag_stats()
+        app.logger.info("tag_stats 초기화: 태그 %d개", count)
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 비디오 태그 변경을 같은 flush(트랜잭션) 안에서 tag_stats 에 반영
+# ---------------------------------------------------------------------------
+@event.listens_for(Tag, "after_insert")
+def _tag_after_insert(mapper, connection, target):
+    insert_ignore(connection, TagStat.__table__, [{"tag_id": target.id, "video_count": 0}], ["tag_id"])
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session, flush_context, instances):
+    # 삭제할 비디오의 태그는 flush 중 video_tags 행이 지워지기 전에 읽어 둠
+    removed = session.info.setdefault("tag_stats_removed", [])
+    for obj in session.deleted:
+        if isinstance(obj, Video):
+            removed.extend(obj.tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    deltas = {}
+    for tag in session.info.pop("tag_stats_removed", []):
+        deltas[tag.id] = deltas.get(tag.id, 0) - 1
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Video) or "tags" in inspect(obj).unloaded:
+            continue
+        history = inspect(obj).attrs.tags.history
+        for tag in history.added or ():
+            deltas[tag.id] = deltas.get(tag.id, 0) + 1
+        for tag in history.deleted or ():
+            deltas[tag.id] = deltas.get(tag.id, 0) - 1
+    apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    session.info.pop("tag_stats_removed", None)
+
+
+def _tags_changed(session, connection, video, added, removed):
+    # save_tags 는 video_tags 를 Core SQL 로 바꿔 위 flush 이벤트에 잡히지 않음
+    deltas = {tag_id: 1 for tag_id in added}
+    deltas.update({tag_id: -1 for tag_id in removed})
+    apply_deltas(connection, deltas)
+
+
+on_tags_changed(_tags_changed)
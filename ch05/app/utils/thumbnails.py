@@ -0,0 +1,280 @@
+"""
+썸네일 파생 이미지 – 목록 카드용 고정 너비 WebP/JPEG, 썸네일 없이 올린 동영상의 포스터 프레임.
+
+기능: 카드에 원본 썸네일(수 MB 일 수도 있는 업로드 이미지)을 그대로 내려보내지 않도록
+  - 썸네일이 저장되면(Video 추가·썸네일 변경 commit 후) 작업 풀에서 THUMBNAIL_WIDTHS 너비마다 WebP·JPEG 생성
+      THUMBNAIL_VARIANT_FOLDER/<너비>/<썸네일 파일명>.webp|jpg
+    원본 보다 큰 너비는 확대하지 않고 원본 크기로 저장. JPEG 원본은 draft 로 축소 디코딩.
+  - 아직 없으면(예전 썸네일, 작업 대기 중) 요청 시 그 너비만 바로 생성 (main.media_thumbnail_variant)
+  - 썸네일은 내용 해시 이름이라 파생 이미지도 바뀌지 않음 → 1년 immutable 캐시
+  - 원본 썸네일이 삭제되면(media_store 참조 수 0) 파생 이미지도 삭제
+  - 썸네일 없이 올린 동영상: 변환 파이프라인(app.utils.transcode)이 프레임 1장을 뽑아 adopt_poster() 로 썸네일 지정
+템플릿: main/_thumbnail.html 의 thumbnail(video, ...) 매크로 – <picture> WebP srcset + JPEG 폴백.
+효과 비교: python scripts/bench_thumbnails.py
+"""
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+DEFAULT_WIDTHS = (160, 320, 640)
+# 파생 이미지 형식 → (Pillow 형식, 저장 옵션)
+FORMATS = {
+    "webp": ("WEBP", {"method": 4}),
+    "jpg": ("JPEG", {"optimize": True, "progressive": True}),
+}
+
+
+def variant_name(filename, fmt):
+    """원본 파일명 뒤에 형식 확장자 (abc.png → abc.png.webp) – 원본 이름을 그대로 되찾을 수 있음."""
+    return f"{filename}.{fmt}"
+
+
+def source_name(name):
+    """variant_name 의 역. 지원하지 않는 형식·경로가 섞인 이름이면 (None, None)."""
+    if "/" in name or "\\" in name or "." not in name:
+        return None, None
+    filename, fmt = name.rsplit(".", 1)
+    if fmt not in FORMATS or "." not in filename or filename.startswith("."):
+        return None, None
+    return filename, fmt
+
+
+def render_variants(source, folder, filename, widths, quality=80):
+    """
+    원본 이미지 source 를 widths 너비마다 FORMATS 형식으로 저장 (folder/<너비>/<filename>.<형식>).
+    이미 있는 파일은 건너뜀. 임시 파일에 쓰고 os.replace. 반환: 새로 만든 파일 수.
+    """
+    targets = [
+        (width, fmt, os.path.join(folder, str(width), variant_name(filename, fmt)))
+        for width in sorted(set(widths), reverse=True)
+        for fmt in FORMATS
+    ]
+    targets = [t for t in targets if not os.path.exists(t[2])]
+    if not targets:
+        return 0
+    largest = max(width for width, _, _ in targets)
+    with Image.open(source) as img:
+        # JPEG 은 디코딩 단계에서 1/2·1/4·1/8 로 줄여 읽음 (요청 크기 이상 유지)
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        resized = {}
+        for width, fmt, path in targets:
+            if width not in resized:
+                w = min(width, img.width)
+                h = max(1, round(img.height * w / img.width))
+                resized[width] = img if w == img.width else img.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+            out = resized[width]
+            pil_format, options = FORMATS[fmt]
+            if pil_format == "JPEG" and out.mode != "RGB":
+                out = out.convert("RGB")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{uuid.uuid4().hex}.part"
+            try:
+                out.save(temp, pil_format, quality=quality, **options)
+                os.replace(temp, path)
+            except BaseException:
+                if os.path.exists(temp):
+                    os.remove(temp)
+                raise
+    return len(targets)
+
+
+# ---------------------------------------------------------------------------
+# 앱별 작업 풀
+# ---------------------------------------------------------------------------
+class _Derivatives:
+    """앱 1개에 대응하는 파생 이미지 설정·작업 풀. app.extensions["thumbnails"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        self.widths = tuple(sorted(int(w) for w in (app.config.get("THUMBNAIL_WIDTHS") or DEFAULT_WIDTHS)))
+        self.quality = int(app.config.get("THUMBNAIL_QUALITY", 80))
+        self.workers = max(1, int(app.config.get("THUMBNAIL_WORKERS", 2)))
+        self.executor = None
+        self.lock = threading.Lock()
+
+    @property
+    def folder(self):
+        return self.app.config["THUMBNAIL_VARIANT_FOLDER"]
+
+    def source_path(self, filename):
+        return os.path.join(self.app.config["THUMBNAIL_FOLDER"], filename)
+
+    def submit(self, filenames):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+        return [self.executor.submit(self._run, filename) for filename in filenames]
+
+    def _run(self, filename):
+        try:
+            self.render(filename, self.widths)
+        except Exception:
+            self.app.logger.exception("썸네일 파생 이미지 생성 실패: %s", filename)
+
+    def render(self, filename, widths):
+        """반환: 새로 만든 파일 수. 원본이 없으면(이미 삭제됨) 0."""
+        try:
+            return render_variants(self.source_path(filename), self.folder, filename, widths, self.quality)
+        except FileNotFoundError:
+            return 0
+
+    def remove(self, filename):
+        """원본 썸네일 삭제 시 (media_store.on_release) 파생 이미지 삭제."""
+        for width in self.widths:
+            for fmt in FORMATS:
+                try:
+                    os.remove(os.path.join(self.folder, str(width), variant_name(filename, fmt)))
+                except OSError:
+                    pass
+
+    def wait(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def _state():
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.extensions.get("thumbnails")
+    return None
+
+
+def _is_local(filename):
+    return bool(filename) and "/" not in filename and "\\" not in filename
+
+
+class Thumbnails:
+    """
+    썸네일 파생 이미지 확장. db, transcoder 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    생성은 썸네일이 commit 되면 자동 – 라우트·템플릿은 variant() 와 Video.get_thumbnail_url(size)·srcset 사용.
+    """
+
+    def init_app(self, app):
+        app.extensions["thumbnails"] = _Derivatives(app)
+        _register_events()
+
+    @property
+    def widths(self):
+        state = _state()
+        return state.widths if state is not None else DEFAULT_WIDTHS
+
+    def variant(self, width, name):
+        """
+        main.media_thumbnail_variant 용: (폴더, 파일명). 아직 없으면 그 너비만 바로 생성.
+        지원하지 않는 너비·형식, 원본 없음 → None.
+        """
+        from flask import current_app
+
+        state = current_app.extensions["thumbnails"]
+        filename, fmt = source_name(name)
+        if filename is None or width not in state.widths:
+            return None
+        folder = os.path.join(state.folder, str(width))
+        if not os.path.exists(os.path.join(folder, name)):
+            try:
+                state.render(filename, [width])
+            except OSError:  # Pillow 가 읽을 수 없는 이미지 (UnidentifiedImageError 포함)
+                return None
+            if not os.path.exists(os.path.join(folder, name)):
+                return None
+        return folder, name
+
+    def srcset(self, video, fmt="webp"):
+        """Video 썸네일의 "<url> 160w, <url> 320w, ..." (썸네일이 없거나 외부 URL 이면 빈 문자열)."""
+        from flask import url_for
+
+        if not _is_local(video.thumbnail_path):
+            return ""
+        name = variant_name(video.thumbnail_path, fmt)
+        return ", ".join(
+            f"{url_for('main.media_thumbnail_variant', width=width, filename=name)} {width}w" for width in self.widths
+        )
+
+    def adopt_poster(self, video_id, path):
+        """
+        변환 파이프라인이 뽑은 포스터 프레임(THUMBNAIL_FOLDER 의 임시 JPEG) 을 썸네일로 저장·지정.
+        그 사이 사용자가 썸네일을 올렸으면 버림. 반환: 썸네일 파일명 | None.
+        """
+        from app import db
+        from app.models import Video
+        from app.utils import media_store
+        from app.utils.ingest import hash_file
+
+        name, _ = media_store.adopt(path, "thumbnail", "jpg", hash_file(path))
+        video = db.session.get(Video, video_id)
+        if video is None or video.thumbnail_path:
+            db.session.rollback()
+            media_store.discard("thumbnail", name)
+            return None
+        video.thumbnail_path = name
+        db.session.commit()
+        return name
+
+    def wait(self):
+        """예약된 생성 작업이 모두 끝날 때까지 대기 (스크립트·테스트용)."""
+        from flask import current_app
+
+        current_app.extensions["thumbnails"].wait()
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 썸네일이 추가·변경된 Video 를 모아 두었다가 commit 후 생성 예약
+# ---------------------------------------------------------------------------
+def _pending(target):
+    session = Session.object_session(target)
+    return session.info.setdefault("thumbnail_new", set()) if session is not None else set()
+
+
+def _video_after_insert(mapper, connection, target):
+    if _is_local(target.thumbnail_path):
+        _pending(target).add(target.thumbnail_path)
+
+
+def _video_after_update(mapper, connection, target):
+    history = inspect(target).attrs.thumbnail_path.history
+    for filename in history.added:
+        if _is_local(filename):
+            _pending(target).add(filename)
+
+
+def _after_commit(session):
+    filenames = session.info.pop("thumbnail_new", None)
+    state = _state()
+    if filenames and state is not None:
+        state.submit(sorted(filenames))
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("thumbnail_new", None)
+
+
+def _release(filename):
+    state = _state()
+    if state is not None:
+        state.remove(filename)
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from app.models import Video
+    from app.utils import media_store
+
+    media_store.on_release("thumbnail", _release)
+    if event.contains(Video, "after_insert", _video_after_insert):
+        return
+    event.listen(Video, "after_insert", _video_after_insert)
+    event.listen(Video, "after_update", _video_after_update)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
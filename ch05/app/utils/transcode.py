@@ -0,0 +1,653 @@
+"""
+업로드 후 백그라운드 변환 – faststart MP4 + HLS 화질별 세그먼트 (ffmpeg).
+
+기능: 비디오가 올라오면(commit 후) 작업 풀에 넣어 차례로
+  1) ffprobe 로 길이·해상도 확인 → Video.duration 채움
+  2) faststart MP4 (moov 를 앞으로 – 다 받기 전에 재생 시작). mp4/mov 는 스트림 복사, 실패하거나 webm 이면 H.264/AAC 인코딩
+  3) HLS_RENDITIONS 화질마다 HLS 세그먼트 (원본보다 높은 화질은 skipped, 가장 낮은 화질은 원본 높이로 맞춰 항상 생성)
+  4) 화질이 하나 끝날 때마다 master.m3u8 다시 씀 → 시청 페이지는 master 가 있으면 HLS 로 재생
+  썸네일 없이 올린 동영상은 2) 다음에 프레임 1장(poster_time 지점)을 JPEG 로 뽑아 썸네일로 지정 (app.utils.thumbnails)
+  상태는 video_renditions 행(queued → running → ready | failed | skipped)에 기록, 스튜디오에서 확인.
+
+결과 배치: TRANSCODE_FOLDER/<video_id>/
+    faststart.mp4
+    master.m3u8
+    hls_720p/index.m3u8, hls_720p/seg_00000.ts ...
+  main.media_transcoded 로 서빙. 비디오를 지우면 행은 같은 트랜잭션에서, 폴더는 commit 후 삭제.
+
+작업 큐: video_renditions 행이 곧 큐 – 예약은 status=queued 로 남고, 작업은 실행 직전에
+  "UPDATE ... SET status='running' WHERE status='queued'" 로 가져감 (1행 갱신에 성공한 워커만 실행).
+  → 여러 gunicorn 워커·스크립트가 같은 작업을 예약해도 한 번만 실행.
+  재시작: 각 워커 프로세스가 첫 요청 때 queued 행과, TRANSCODE_STALE_AFTER 초 넘게 running 으로 남은 행
+  (변환 중 죽은 프로세스)을 다시 예약 → 메모리 큐가 사라져도 작업을 잃지 않음.
+동시 실행 수: TRANSCODE_WORKERS 는 노드 전체 동시 ffmpeg 수. 작업 스레드는 TRANSCODE_FOLDER/.slots/<번호>.lock
+  중 하나에 flock 을 잡은 동안만 ffmpeg 을 실행 (프로세스가 죽으면 OS 가 잠금을 풂).
+  flock 이 없는 플랫폼(Windows)에서는 프로세스마다 TRANSCODE_WORKERS 개.
+  인코딩은 ffmpeg 프로세스가 하므로 파이썬 워커 프로세스를 따로 띄우지 않음.
+  ffmpeg 이 없거나 TRANSCODE_ENABLED 가 꺼져 있으면 아무 작업도 하지 않고 원본 파일을 그대로 재생.
+
+실패한 화질 다시 만들기·기능 이전 업로드 변환: python scripts/transcode_pending.py [--stale] [--backfill]
+"""
+
+import json
+import mimetypes
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # Windows – 노드 전체 상한 없이 프로세스 안에서만 제한
+    fcntl = None
+
+# (높이, 영상 kbps) – HLS_RENDITIONS 기본값
+DEFAULT_RENDITIONS = ((360, 800), (720, 2800), (1080, 5000))
+AUDIO_BITRATE = 128  # kbps
+FASTSTART_NAME = "faststart.mp4"
+MASTER_PLAYLIST = "master.m3u8"
+PENDING = ("queued", "running")
+# 스트림 복사로 faststart 만 적용할 수 있는 컨테이너
+_COPY_EXTENSIONS = {"mp4", "mov"}
+# 에러 메시지로 남길 ffmpeg stderr 끝부분
+_ERROR_TAIL = 500
+# 동시 실행 슬롯 잠금 파일 폴더 (TRANSCODE_FOLDER 안), 빈 슬롯을 다시 찾기까지 대기(초)
+SLOT_FOLDER = ".slots"
+SLOT_POLL = 1.0
+
+# HLS 세그먼트 (.ts 는 환경에 따라 text/vnd.trolltech.linguist 로 잡힘)
+mimetypes.add_type("video/mp2t", ".ts")
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+
+
+class TranscodeError(RuntimeError):
+    """ffprobe / ffmpeg 실패 (메시지는 stderr 끝부분)."""
+
+
+def rendition_name(height):
+    return f"hls_{height}p"
+
+
+def scaled_width(width, height, target_height):
+    """scale=-2:<높이> 와 같은 짝수 너비."""
+    if not width or not height:
+        return None
+    return max(2, int(round(width * target_height / height / 2)) * 2)
+
+
+# ---------------------------------------------------------------------------
+# ffprobe / ffmpeg 명령
+# ---------------------------------------------------------------------------
+def probe_command(ffprobe, source):
+    return [
+        ffprobe, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=width,height:format=duration",
+        "-of", "json", source,
+    ]
+
+
+def faststart_command(ffmpeg, source, target, copy):
+    """faststart MP4. copy=True 면 재인코딩 없이 컨테이너만 다시 씀."""
+    command = [ffmpeg, "-hide_banner", "-nostdin", "-y", "-v", "error", "-i", source]
+    if copy:
+        command += ["-map", "0", "-c", "copy"]
+    else:
+        command += [
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", f"{AUDIO_BITRATE}k",
+        ]
+    return command + ["-movflags", "+faststart", "-f", "mp4", target]
+
+
+def poster_time(duration):
+    """포스터 프레임 위치(초): 길이의 10% (시작 화면·검은 화면 회피), 최대 30초."""
+    if not duration:
+        return 0.0
+    return round(min(duration * 0.1, 30.0), 3)
+
+
+def poster_command(ffmpeg, source, target, at):
+    """프레임 1장 JPEG (-ss 를 -i 앞에 두어 키프레임 탐색). 가로 1280 초과면 축소."""
+    return [
+        ffmpeg, "-hide_banner", "-nostdin", "-y", "-v", "error", "-ss", str(at), "-i", source,
+        "-frames:v", "1", "-vf", "scale='min(1280,iw)':-2", "-q:v", "3", "-f", "image2", target,
+    ]
+
+
+def hls_command(ffmpeg, source, out_dir, height, bitrate, segment_seconds):
+    """HLS VOD 1개 화질. 키프레임을 세그먼트 경계에 맞춰 화질 간 전환이 매끄럽게."""
+    return [
+        ffmpeg, "-hide_banner", "-nostdin", "-y", "-v", "error", "-i", source,
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-vf", f"scale=-2:{height}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        "-b:v", f"{bitrate}k", "-maxrate", f"{bitrate}k", "-bufsize", f"{bitrate * 2}k",
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})", "-sc_threshold", "0",
+        "-c:a", "aac", "-b:a", f"{AUDIO_BITRATE}k", "-ac", "2",
+        "-f", "hls", "-hls_time", str(segment_seconds), "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(out_dir, "seg_%05d.ts"),
+        os.path.join(out_dir, "index.m3u8"),
+    ]
+
+
+def master_playlist(renditions):
+    """renditions: [(name, width, height, 영상 kbps), ...] → master.m3u8 내용 (낮은 화질부터)."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for name, width, height, bitrate in sorted(renditions, key=lambda r: (r[2] or 0, r[3] or 0)):
+        attrs = f"BANDWIDTH={((bitrate or 0) + AUDIO_BITRATE) * 1000}"
+        if width and height:
+            attrs += f",RESOLUTION={width}x{height}"
+        lines += [f"#EXT-X-STREAM-INF:{attrs}", f"{name}/index.m3u8"]
+    return "\n".join(lines) + "\n"
+
+
+def _run(command, timeout):
+    try:
+        result = subprocess.run(
+            command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        raise TranscodeError(f"{os.path.basename(command[0])}: {timeout}초 안에 끝나지 않았습니다.") from None
+    except OSError as e:
+        raise TranscodeError(f"{os.path.basename(command[0])} 실행 실패: {e}") from None
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip()[-_ERROR_TAIL:]
+        raise TranscodeError(message or f"{os.path.basename(command[0])} 종료 코드 {result.returncode}")
+    return result.stdout
+
+
+def probe(ffprobe, source, timeout=60):
+    """반환: (길이 초 float | None, 너비, 높이)."""
+    info = json.loads(_run(probe_command(ffprobe, source), timeout) or b"{}")
+    streams = info.get("streams") or []
+    if not streams or not streams[0].get("height"):
+        raise TranscodeError("영상 스트림을 찾을 수 없습니다.")
+    duration = (info.get("format") or {}).get("duration")
+    try:
+        duration = float(duration) if duration not in (None, "N/A") else None
+    except ValueError:
+        duration = None
+    return duration, int(streams[0].get("width") or 0), int(streams[0]["height"])
+
+
+# ---------------------------------------------------------------------------
+# 앱별 작업 풀
+# ---------------------------------------------------------------------------
+class _Pipeline:
+    """앱 1개에 대응하는 변환 설정·작업 풀. app.extensions["transcoder"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        self.ffmpeg = shutil.which(app.config.get("FFMPEG_PATH") or "ffmpeg")
+        self.ffprobe = shutil.which(app.config.get("FFPROBE_PATH") or "ffprobe")
+        self.enabled = bool(app.config.get("TRANSCODE_ENABLED", True)) and bool(self.ffmpeg and self.ffprobe)
+        self.workers = max(1, int(app.config.get("TRANSCODE_WORKERS", 2)))
+        self.folder = app.config["TRANSCODE_FOLDER"]
+        self.renditions = tuple(
+            (int(h), int(b)) for h, b in (app.config.get("HLS_RENDITIONS") or DEFAULT_RENDITIONS)
+        )
+        self.segment_seconds = int(app.config.get("HLS_SEGMENT_SECONDS", 6))
+        self.timeout = int(app.config.get("TRANSCODE_TIMEOUT", 3600))
+        self.stale_after = int(app.config.get("TRANSCODE_STALE_AFTER", 3 * self.timeout))
+        self.executor = None
+        self.resumed = False
+        self.lock = threading.Lock()
+        self.master_lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transcode")
+        return self.executor.submit(self._job, fn, *args)
+
+    def _job(self, fn, *args):
+        from app import db
+
+        slot = self._acquire_slot()
+        try:
+            with self.app.app_context():
+                try:
+                    fn(*args)
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("변환 작업 실패: %s%s", fn.__name__, args)
+        finally:
+            if slot is not None:
+                slot.close()  # 잠금 해제
+
+    def _acquire_slot(self):
+        """노드 전체 동시 실행 슬롯 1개를 잡을 때까지 대기. 반환: 잠금을 잡은 파일 (닫으면 해제) | None (flock 없음)."""
+        if fcntl is None:
+            return None
+        folder = os.path.join(self.folder, SLOT_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        while True:
+            for i in range(self.workers):
+                f = open(os.path.join(folder, f"{i}.lock"), "a")
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:  # 다른 프로세스·스레드가 사용 중
+                    f.close()
+                    continue
+                return f
+            time.sleep(SLOT_POLL)
+
+    def resume(self):
+        """
+        재시작 전에 예약됐던 작업 다시 예약 (queued 행 + TRANSCODE_STALE_AFTER 초 넘게 running 인 행).
+        프로세스마다 1번. 여러 워커가 함께 예약해도 실행 직전 claim 으로 한 번만 실행. 반환: 예약한 작업 수.
+        """
+        from app import db
+        from app.models import Rendition
+
+        with self.lock:
+            if self.resumed or not self.enabled:
+                return 0
+            self.resumed = True
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+        db.session.execute(
+            update(Rendition)
+            .where(Rendition.status == "running", Rendition.updated_at < cutoff)
+            .values(status="queued")
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return self.submit_pending()
+
+    def submit_pending(self):
+        """queued 행이 있는 작업 예약 (faststart 가 안 끝났으면 처음부터, 끝났으면 해당 화질만). 반환: 예약 수."""
+        from app import db
+        from app.models import Rendition
+
+        rows = db.session.execute(
+            select(Rendition.video_id, Rendition.name, Rendition.status).order_by(Rendition.video_id)
+        ).all()
+        by_video = {}
+        for video_id, name, status in rows:
+            by_video.setdefault(video_id, {})[name] = status
+        submitted = 0
+        for video_id, names in by_video.items():
+            if names.get("mp4") != "ready":
+                if names.get("mp4") == "queued":
+                    self.submit(self.process, video_id)
+                    submitted += 1
+                continue
+            for name, status in names.items():
+                if name != "mp4" and status == "queued":
+                    self.submit(self.segment, video_id, name)
+                    submitted += 1
+        return submitted
+
+    def video_dir(self, video_id):
+        return os.path.join(self.folder, str(video_id))
+
+    # ----- 상태 기록 -----
+    def _set(self, video_id, names, **values):
+        """video_id 의 names 행 갱신 후 commit. 반환: 갱신 행 수 (0 이면 비디오가 삭제됨)."""
+        from app import db
+        from app.models import Rendition
+
+        if isinstance(names, str):
+            names = [names]
+        result = db.session.execute(
+            update(Rendition)
+            .where(Rendition.video_id == video_id, Rendition.name.in_(names))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def _claim(self, video_id, name):
+        """queued 인 작업을 running 으로 가져감. 반환: 성공 여부 (다른 워커가 가져갔거나 비디오가 삭제되면 False)."""
+        from app import db
+        from app.models import Rendition
+
+        result = db.session.execute(
+            update(Rendition)
+            .where(Rendition.video_id == video_id, Rendition.name == name, Rendition.status == "queued")
+            .values(status="running", error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _abandon(self, video_id):
+        """작업 중 비디오가 삭제됨 – 만들던 결과 정리."""
+        shutil.rmtree(self.video_dir(video_id), ignore_errors=True)
+
+    # ----- 1단계: 길이·해상도 확인 + faststart MP4 -----
+    def process(self, video_id):
+        from app import db
+        from app.models import Video
+
+        video = db.session.get(Video, video_id)
+        if video is None:
+            return
+        source = os.path.join(self.app.config["VIDEO_FOLDER"], video.video_path)
+        ext = video.video_path.rsplit(".", 1)[-1].lower()
+        if not self._claim(video_id, "mp4"):
+            return
+        try:
+            duration, width, height = probe(self.ffprobe, source)
+            os.makedirs(self.video_dir(video_id), exist_ok=True)
+            target = os.path.join(self.video_dir(video_id), FASTSTART_NAME)
+            temp = target + ".part"
+            try:
+                _run(faststart_command(self.ffmpeg, source, temp, copy=ext in _COPY_EXTENSIONS), self.timeout)
+            except TranscodeError:
+                if ext not in _COPY_EXTENSIONS:
+                    raise
+                # 복사할 수 없는 코덱 → 인코딩
+                _run(faststart_command(self.ffmpeg, source, temp, copy=False), self.timeout)
+            os.replace(temp, target)
+        except (TranscodeError, OSError) as e:
+            self._failed(video_id, str(e))
+            return
+        if not video.thumbnail_path:
+            self._poster(video_id, source, duration)
+        self.prepared(video_id, duration, width, height)
+
+    def _poster(self, video_id, source, duration):
+        """썸네일 없는 동영상: 프레임 1장을 썸네일로 (실패해도 변환은 계속)."""
+        from app import thumbnails
+
+        temp = os.path.join(self.app.config["THUMBNAIL_FOLDER"], f".poster-{video_id}-{os.getpid()}.jpg")
+        try:
+            _run(poster_command(self.ffmpeg, source, temp, poster_time(duration)), self.timeout)
+            thumbnails.adopt_poster(video_id, temp)
+        except (TranscodeError, OSError) as e:
+            self.app.logger.warning("포스터 프레임 추출 실패 video_id=%s: %s", video_id, e)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    def _failed(self, video_id, message):
+        """faststart 단계 실패 – HLS 도 만들 수 없음."""
+        names = ["mp4"] + [rendition_name(h) for h, _ in self.renditions]
+        self._set(video_id, names[:1], status="failed", error=message)
+        self._set(video_id, names[1:], status="failed", error="원본 변환 실패")
+        self.app.logger.warning("변환 실패 video_id=%s: %s", video_id, message)
+
+    def prepared(self, video_id, duration, width, height):
+        """faststart 완료 후: 길이 기록, 화질별 HLS 작업 예약 (원본보다 높은 화질은 skipped)."""
+        from app import db
+        from app.models import Rendition, Video
+
+        if duration is not None:
+            db.session.execute(
+                update(Video).where(Video.id == video_id).values(duration=int(round(duration)))
+                .execution_options(synchronize_session=False)
+            )
+        if not self._set(video_id, "mp4", status="ready", path=f"{video_id}/{FASTSTART_NAME}", height=height):
+            self._abandon(video_id)
+            return
+        rows = db.session.execute(
+            select(Rendition.name, Rendition.status).where(Rendition.video_id == video_id, Rendition.name != "mp4")
+        ).all()
+        wanted = {name for name, status in rows if status != "ready"}
+        lowest = min(h for h, _ in self.renditions)
+        for target_height, bitrate in self.renditions:
+            name = rendition_name(target_height)
+            if name not in wanted:
+                continue
+            if target_height > height and target_height != lowest:
+                self._set(video_id, name, status="skipped", error=None)
+                continue
+            out_height = min(target_height, height - height % 2)
+            self._set(
+                video_id, name, status="queued", error=None,
+                height=out_height, width=scaled_width(width, height, out_height), bitrate=bitrate,
+            )
+            self.submit(self.segment, video_id, name)
+
+    # ----- 2단계: HLS 화질 1개 -----
+    def segment(self, video_id, name):
+        from app import db
+        from app.models import Rendition, Video
+
+        row = db.session.execute(
+            select(Video.video_path, Rendition.height, Rendition.bitrate)
+            .join(Rendition, Rendition.video_id == Video.id)
+            .where(Video.id == video_id, Rendition.name == name)
+        ).first()
+        if row is None:
+            return
+        video_path, height, bitrate = row
+        if not self._claim(video_id, name):
+            return
+        out_dir = os.path.join(self.video_dir(video_id), name)
+        temp_dir = os.path.join(self.video_dir(video_id), f".{name}.tmp")
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            source = os.path.join(self.app.config["VIDEO_FOLDER"], video_path)
+            _run(hls_command(self.ffmpeg, source, temp_dir, height, bitrate, self.segment_seconds), self.timeout)
+            shutil.rmtree(out_dir, ignore_errors=True)
+            os.replace(temp_dir, out_dir)
+        except (TranscodeError, OSError) as e:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            self._set(video_id, name, status="failed", error=str(e))
+            self.app.logger.warning("HLS 변환 실패 video_id=%s %s: %s", video_id, name, e)
+            return
+        self.segmented(video_id, name)
+
+    def segmented(self, video_id, name):
+        """화질 1개 완료: ready 기록 후 master.m3u8 다시 씀."""
+        if not self._set(video_id, name, status="ready", path=f"{video_id}/{name}/index.m3u8"):
+            self._abandon(video_id)
+            return
+        self.write_master(video_id)
+
+    def write_master(self, video_id):
+        """ready 인 HLS 화질로 master.m3u8 작성 (임시 파일 후 교체). 반환: 포함한 화질 수."""
+        from app import db
+        from app.models import Rendition
+
+        with self.master_lock:
+            rows = db.session.execute(
+                select(Rendition.name, Rendition.width, Rendition.height, Rendition.bitrate).where(
+                    Rendition.video_id == video_id, Rendition.name != "mp4", Rendition.status == "ready"
+                )
+            ).all()
+            path = os.path.join(self.video_dir(video_id), MASTER_PLAYLIST)
+            if not rows:
+                return 0
+            os.makedirs(self.video_dir(video_id), exist_ok=True)
+            with open(path + ".part", "w", encoding="utf-8") as f:
+                f.write(master_playlist([tuple(r) for r in rows]))
+            os.replace(path + ".part", path)
+            return len(rows)
+
+    def wait(self):
+        # 작업이 다음 단계(HLS)를 예약하면 새 풀이 생기므로 더 이상 없을 때까지 반복
+        while True:
+            with self.lock:
+                executor, self.executor = self.executor, None
+            if executor is None:
+                return
+            executor.shutdown(wait=True)
+
+
+def _state():
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.extensions.get("transcoder")
+    return None
+
+
+def _initial_rows(state, video_id):
+    rows = [{"video_id": video_id, "name": "mp4", "status": "queued"}]
+    rows += [
+        {"video_id": video_id, "name": rendition_name(h), "status": "queued", "height": h, "bitrate": b}
+        for h, b in state.renditions
+    ]
+    return rows
+
+
+class Transcoder:
+    """
+    변환 파이프라인 확장. db, feed_inbox 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    업로드는 Video 가 commit 되면 자동으로 예약됨 – 라우트는 playback()·summary() 만 사용.
+    """
+
+    def init_app(self, app):
+        state = _Pipeline(app)
+        app.extensions["transcoder"] = state
+        _register_events()
+
+        # 워커 프로세스마다 첫 요청 때 남은 작업 다시 예약 (앱을 import 만 하는 스크립트에서는 실행 안 함)
+        @app.before_request
+        def _resume_transcodes():
+            if not state.resumed:
+                state.resume()
+
+    @property
+    def enabled(self):
+        state = _state()
+        return bool(state and state.enabled)
+
+    def playback(self, video):
+        """시청 페이지용 {"mp4_url": faststart MP4 | 원본, "hls_url": master.m3u8 | None} (조회 1번)."""
+        from flask import url_for
+
+        from app import db
+        from app.models import Rendition
+
+        ready = set(
+            db.session.execute(
+                select(Rendition.name).where(Rendition.video_id == video.id, Rendition.status == "ready")
+            ).scalars()
+        )
+        mp4_url = video.get_video_url()
+        if "mp4" in ready:
+            mp4_url = url_for("main.media_transcoded", video_id=video.id, filename=FASTSTART_NAME)
+        hls_url = None
+        if any(name.startswith("hls_") for name in ready):
+            hls_url = url_for("main.media_transcoded", video_id=video.id, filename=MASTER_PLAYLIST)
+        return {"mp4_url": mp4_url, "hls_url": hls_url}
+
+    def summary(self, video_ids):
+        """
+        스튜디오 목록용 {video_id: {"status": processing|ready|failed, "ready": n, "total": n}} (GROUP BY 조회 1번).
+        변환 행이 없는 비디오(변환 꺼짐·기능 이전 업로드)는 빠짐. skipped 화질은 total 에서 제외.
+        """
+        from app import db
+        from app.models import Rendition
+
+        if not video_ids:
+            return {}
+        rows = db.session.execute(
+            select(Rendition.video_id, Rendition.status, func.count())
+            .where(Rendition.video_id.in_(list(video_ids)))
+            .group_by(Rendition.video_id, Rendition.status)
+        )
+        counts = {}
+        for video_id, status, count in rows:
+            counts.setdefault(video_id, {})[status] = count
+        result = {}
+        for video_id, by_status in counts.items():
+            total = sum(n for status, n in by_status.items() if status != "skipped")
+            if any(by_status.get(s) for s in PENDING):
+                status = "processing"
+            elif by_status.get("failed"):
+                status = "failed"
+            else:
+                status = "ready"
+            result[video_id] = {"status": status, "ready": by_status.get("ready", 0), "total": total}
+        return result
+
+    def requeue(self, statuses=("queued", "failed"), backfill=False):
+        """
+        statuses 상태 행을 queued 로 되돌려 다시 예약 (faststart 가 안 끝났으면 처음부터, 끝났으면 해당 화질만).
+        backfill=True 면 변환 행이 없는 비디오(기능 이전 업로드)도 행을 만들어 예약. 반환: 예약한 작업 수.
+        """
+        from app import db
+        from app.models import Rendition, Video
+
+        state = _state()
+        if state is None or not state.enabled:
+            return 0
+        if backfill:
+            missing = db.session.execute(
+                select(Video.id).where(~select(Rendition.id).where(Rendition.video_id == Video.id).exists())
+            ).scalars().all()
+            for video_id in missing:
+                db.session.execute(insert(Rendition), _initial_rows(state, video_id))
+        again = [status for status in statuses if status != "queued"]
+        if again:
+            db.session.execute(
+                update(Rendition)
+                .where(Rendition.status.in_(again))
+                .values(status="queued")
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        return state.submit_pending()
+
+    def wait(self):
+        """예약된 변환 작업이 모두 끝날 때까지 대기 (스크립트·테스트용)."""
+        from flask import current_app
+
+        current_app.extensions["transcoder"].wait()
+
+
+# ---------------------------------------------------------------------------
+# ORM 이벤트: 비디오 추가 시 같은 트랜잭션에서 queued 행 생성 → commit 후 예약, 삭제 시 행·폴더 정리
+# ---------------------------------------------------------------------------
+def _video_after_insert(mapper, connection, target):
+    from app.models import Rendition
+
+    state = _state()
+    if state is None or not state.enabled:
+        return
+    connection.execute(insert(Rendition.__table__), _initial_rows(state, target.id))
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("transcode_new_videos", []).append(target.id)
+
+
+def _video_after_delete(mapper, connection, target):
+    from app.models import Rendition
+
+    connection.execute(delete(Rendition.__table__).where(Rendition.__table__.c.video_id == target.id))
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("transcode_removed", []).append(target.id)
+
+
+def _after_commit(session):
+    new_ids = session.info.pop("transcode_new_videos", None)
+    removed = session.info.pop("transcode_removed", None)
+    state = _state()
+    if state is None:
+        return
+    for video_id in removed or ():
+        shutil.rmtree(state.video_dir(video_id), ignore_errors=True)
+    for video_id in new_ids or ():
+        state.submit(state.process, video_id)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("transcode_new_videos", None)
+    session.info.pop("transcode_removed", None)
+
+
+def _register_events():
+    """모델 import 순환을 피하려고 init_app 시점에 1번만 등록."""
+    from app.models import Video
+
+    if event.contains(Video, "after_insert", _video_after_insert):
+        return
+    event.listen(Video, "after_insert", _video_after_insert)
+    event.listen(Video, "after_delete", _video_after_delete)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,276 @@
+"""
+이어 올리기(resumable) 조각 업로드 – studio.upload_* API 용.
+
+기능: 동영상을 한 번의 multipart POST 로 받지 않고, 세션을 만든 뒤 조각(chunk)을 offset 과 함께 PUT 으로 받습니다.
+      연결이 끊기면 GET 으로 받은 위치(offset)를 확인해 거기서부터 다시 보내면 됨.
+  1. POST   /studio/uploads                 세션 생성 (파일명·크기·제목 등) → upload_id
+  2. PUT    /studio/uploads/<id>?offset=N   본문 = 조각 바이트 → 새 offset
+  3. GET    /studio/uploads/<id>            진행 상태 (offset, size)
+  4. POST   /studio/uploads/<id>/complete   (선택: thumbnail) → Video 생성
+     DELETE /studio/uploads/<id>            업로드 취소
+
+저장 방식:
+  - 세션 생성 시 UPLOAD_SESSION_FOLDER/<uuid.ext>.part 를 size 만큼 미리 할당하고 조각은 그 위치에 바로 기록
+    (Werkzeug 임시 파일 → VIDEO_FOLDER 복사 같은 이중 쓰기 없음, 요청 본문도 블록 단위로 읽어 메모리 일정)
+  - 첫 조각의 매직 바이트가 확장자 형식과 다르면 거부 (app.utils.ingest.check_kind)
+  - 조각은 앞에서부터 빈틈없이만 받음 (offset 이 received 와 다르면 409 + 현재 offset).
+    조각 도중 연결이 끊겨도 실제로 받은 만큼은 진행으로 기록
+  - 완료 시 SHA-256 이름으로 VIDEO_FOLDER 에 원자적으로 옮김 (같은 파일시스템이어야 함, app.utils.media_store)
+  - 진행 상태는 upload_sessions 테이블에 있어 어느 워커가 조각을 받아도 됨.
+    received 는 "WHERE received = :offset" 조건부 UPDATE 로 올려 같은 구간을 두 번 인정하지 않음
+
+만료: 조각을 받을 때마다 expires_at = 지금 + UPLOAD_SESSION_TTL.
+      만료된 세션은 새 세션을 만들 때, 또는 python scripts/purge_upload_sessions.py 로 조각 파일과 함께 삭제.
+상한: 미리 할당은 실제 디스크를 잡으므로 진행 중 세션 수(사용자당 UPLOAD_SESSION_MAX_PER_USER)와
+      전체 예약 바이트(UPLOAD_SESSION_MAX_RESERVED_BYTES)를 넘는 세션은 할당 전에 거부 (UploadLimitExceeded).
+완료: claim_session() 이 세션 행을 조건부 DELETE 로 먼저 가져간 요청만 조각 파일을 옮김
+      → 같은 세션에 /complete 가 동시에 와도 한 번만 처리.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm.exc import ObjectDeletedError
+
+from app import db
+from app.models import UploadSession
+from app.utils import media_store
+from app.utils.ingest import check_kind, hash_file
+
+# 요청 본문을 조각 파일로 옮길 때 한 번에 읽는 크기
+COPY_BLOCK = 1024 * 1024
+
+
+class UploadConflict(ValueError):
+    """조각 offset 이 세션이 받은 위치와 다름. offset: 서버가 받은 위치 (여기서부터 다시 보내야 함)."""
+
+    def __init__(self, offset):
+        super().__init__(f"offset mismatch (expected {offset})")
+        self.offset = offset
+
+
+class UploadLimitExceeded(Exception):
+    """세션 상한 초과. status: 429 (사용자당 세션 수) | 507 (전체 예약 바이트)."""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+def _expires_at():
+    return _utc_now() + timedelta(seconds=current_app.config["UPLOAD_SESSION_TTL"])
+
+
+def part_path(upload):
+    """세션의 조각 파일 경로 (UPLOAD_SESSION_FOLDER/<filename>.part)."""
+    return os.path.join(current_app.config["UPLOAD_SESSION_FOLDER"], upload.filename + ".part")
+
+
+def _preallocate(path, size):
+    """size 바이트 파일 생성. posix_fallocate 가 있으면 디스크 블록까지 확보 (공간 부족을 세션 생성 시점에 알 수 있음)."""
+    with open(path, "wb") as f:
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass  # 지원하지 않는 파일시스템 → truncate (sparse)
+        f.truncate(size)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# 세션 생성·조회·삭제
+# ---------------------------------------------------------------------------
+def create_session(user_id, original_name, ext, size, title, description=None, category=None, tags=None):
+    """
+    업로드 세션 생성 + 조각 파일 미리 할당. 만료된 세션도 이때 정리.
+    상한을 넘으면 UploadLimitExceeded (할당 전), OSError(공간 부족 등)는 호출자가 처리.
+    """
+    purge_expired()
+    upload = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        filename=f"{uuid.uuid4().hex}.{ext}",
+        original_name=original_name[:255],
+        size=size,
+        received=0,
+        title=title,
+        description=description,
+        category=category,
+        tags=tags,
+        expires_at=_expires_at(),
+    )
+    db.session.add(upload)
+    try:
+        # 행을 먼저 넣고(flush) 자기 세션까지 포함해 셈 – 확인과 추가 사이에 끼어든 세션도 잡힘
+        db.session.flush()
+        _check_limits(user_id)
+        _preallocate(part_path(upload), size)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _remove(part_path(upload))
+        raise
+    return upload
+
+
+def _check_limits(user_id):
+    config = current_app.config
+    active = db.session.execute(
+        select(func.count()).select_from(UploadSession).where(UploadSession.user_id == user_id)
+    ).scalar()
+    if active > config["UPLOAD_SESSION_MAX_PER_USER"]:
+        raise UploadLimitExceeded(
+            f"진행 중인 업로드가 너무 많습니다 (최대 {config['UPLOAD_SESSION_MAX_PER_USER']}개). "
+            "끝내거나 취소한 뒤 다시 시도해 주세요.",
+            429,
+        )
+    reserved = db.session.execute(select(func.coalesce(func.sum(UploadSession.size), 0))).scalar()
+    if reserved > config["UPLOAD_SESSION_MAX_RESERVED_BYTES"]:
+        raise UploadLimitExceeded("업로드 저장 공간이 부족합니다. 잠시 후 다시 시도해 주세요.", 507)
+
+
+def get_session(upload_id, user_id):
+    """user_id 의 만료되지 않은 세션. 없으면 None."""
+    return db.session.execute(
+        select(UploadSession).where(
+            UploadSession.id == upload_id,
+            UploadSession.user_id == user_id,
+            UploadSession.expires_at > _utc_now(),
+        )
+    ).scalar_one_or_none()
+
+
+def discard_session(upload):
+    """세션 행과 조각 파일 삭제 (업로드 취소)."""
+    path = part_path(upload)
+    db.session.delete(upload)
+    db.session.commit()
+    _remove(path)
+
+
+def purge_expired(now=None):
+    """expires_at 이 지난 세션 행·조각 파일 삭제. 반환: 삭제한 세션 수."""
+    now = now or _utc_now()
+    expired = db.session.execute(select(UploadSession).where(UploadSession.expires_at <= now)).scalars().all()
+    if not expired:
+        return 0
+    paths = [part_path(upload) for upload in expired]
+    db.session.execute(
+        delete(UploadSession).where(UploadSession.id.in_([upload.id for upload in expired])),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.commit()
+    for path in paths:
+        _remove(path)
+    return len(paths)
+
+
+# ---------------------------------------------------------------------------
+# 조각 기록·완료
+# ---------------------------------------------------------------------------
+def write_chunk(upload, offset, stream, length):
+    """
+    stream 에서 length 바이트를 읽어 조각 파일 offset 위치에 기록. 반환: 새 offset (다음 조각 위치).
+    offset 이 받은 위치와 다르면 UploadConflict, 첫 조각 형식이 확장자와 다르면 IngestError, 크기를 넘으면 ValueError.
+    본문이 도중에 끊기면 받은 만큼만 진행으로 기록.
+    """
+    if offset != upload.received:
+        raise UploadConflict(upload.received)
+    if length < 0 or offset + length > upload.size:
+        raise ValueError("chunk exceeds upload size")
+
+    written = 0
+    with open(part_path(upload), "r+b") as f:
+        f.seek(offset)
+        while written < length:
+            block = stream.read(min(COPY_BLOCK, length - written))
+            if not block:
+                break
+            if offset == 0 and written == 0:
+                # 첫 조각의 매직 바이트로 형식 확인 (확장자만 바꾼 파일은 더 받지 않음)
+                check_kind(block, upload.filename.rsplit(".", 1)[-1])
+            f.write(block)
+            written += len(block)
+
+    new_offset = offset + written
+    result = db.session.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload.id, UploadSession.received == offset)
+        .values(received=new_offset, expires_at=_expires_at()),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount != 1:
+        # 다른 요청이 같은 구간을 먼저 인정함 → 현재 위치를 알려 줌
+        db.session.rollback()
+        raise UploadConflict(upload.received)
+    db.session.commit()
+    return new_offset
+
+
+def claim_session(upload):
+    """
+    다 받은 세션의 완료 처리를 맡음: 세션 행을 조건부 DELETE 로 지우고 commit.
+    다른 요청이 먼저 가져갔으면(행 없음) False. True 면 upload 는 세션에서 분리된 채 값만 남고,
+    조각 파일은 호출자가 finalize_file 로 옮김.
+    """
+    if upload in db.session:
+        try:
+            upload_id = upload.id  # 만료된 값이면 여기서 다시 읽음 (분리 후에도 값이 남도록)
+        except ObjectDeletedError:
+            return False
+        db.session.expunge(upload)
+    else:
+        upload_id = upload.id
+    result = db.session.execute(
+        delete(UploadSession).where(UploadSession.id == upload_id, UploadSession.received == UploadSession.size),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return False
+    db.session.commit()
+    return True
+
+
+def finalize_file(upload):
+    """
+    다 받은 조각 파일의 SHA-256 을 블록 단위로 계산해 VIDEO_FOLDER 에 내용 주소 이름으로 원자적으로 이동
+    (app.utils.media_store.adopt – 같은 파일이 이미 있으면 그 파일 사용). 반환: 저장 파일명.
+    claim_session 으로 가져간 세션에만 호출.
+    """
+    path = part_path(upload)
+    ext = upload.filename.rsplit(".", 1)[-1]
+    filename, _ = media_store.adopt(path, "video", ext, hash_file(path))
+    return filename
+
+
+def purge_orphan_parts(min_age=None):
+    """
+    세션 행이 없는 조각 파일 삭제 (세션 생성 도중 프로세스가 죽은 경우 등).
+    방금 만들어져 아직 commit 전일 수 있으므로 min_age 초(기본 UPLOAD_SESSION_TTL)보다 오래된 파일만. 반환: 삭제한 파일 수.
+    """
+    folder = current_app.config["UPLOAD_SESSION_FOLDER"]
+    min_age = current_app.config["UPLOAD_SESSION_TTL"] if min_age is None else min_age
+    known = {filename + ".part" for filename in db.session.execute(select(UploadSession.filename)).scalars()}
+    cutoff = _utc_now().timestamp() - min_age
+    removed = 0
+    for entry in os.scandir(folder):
+        if entry.name.endswith(".part") and entry.name not in known and entry.stat().st_mtime < cutoff:
+            _remove(entry.path)
+            removed += 1
+    return removed
@@ -0,0 +1,255 @@
+"""
+조회수 write-behind 버퍼 – main.watch, api.video_detail 용.
+
+기능: 시청 1회마다 videos 행에 UPDATE + COMMIT 하지 않고, 증가분을 버퍼에 모았다가
+      건수(VIEW_COUNTER_FLUSH_THRESHOLD) 또는 시간(VIEW_COUNTER_FLUSH_INTERVAL) 기준으로
+      "UPDATE videos SET views = views + :delta" 를 한 번에 반영합니다.
+
+백엔드 (VIEW_COUNTER_BACKEND):
+  - "memory": 프로세스 내 dict. 크래시 시 최대 threshold건 / interval초 만큼 유실 가능.
+  - "file":   spool 파일(VIEW_COUNTER_SPOOL_PATH)에 한 줄씩 append. 여러 워커 프로세스가
+              같은 파일을 공유하고, flush 한 프로세스가 파일을 통째로 가져가 합산 반영.
+              크래시해도 spool에 남은 기록은 다음 flush 때 반영됨.
+
+주기 flush: 첫 기록 때 데몬 스레드(view-counter-flush)를 띄워 interval 초마다 남은 증가분을 반영
+      → 시청이 끊겨도 버퍼가 다음 시청까지 남아 있지 않음. VIEW_COUNTER_TIMER=False 면 기록 시에만 flush.
+실패: 요청 중 flush 가 DB 오류(잠금·일시 장애)로 실패하면 로그만 남기고 시청 응답은 그대로 –
+      증가분은 버퍼(또는 claim 파일)에 남아 다음 flush 에서 다시 반영.
+읽기: apply_pending(video)로 아직 반영 안 된 증가분을 객체 값에 더해 보여줌 (DB 쓰기 없음).
+종료: atexit 에서 타이머를 멈추고 남은 증가분을 flush (정상 종료 시 유실 없음).
+"""
+
+import atexit
+import glob
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+
+
+class _ViewBuffer:
+    """앱 1개에 대응하는 조회수 버퍼. app.extensions["view_counter"] 에 저장."""
+
+    def __init__(self, app):
+        self.app = app
+        self.backend = app.config.get("VIEW_COUNTER_BACKEND", "memory")
+        self.threshold = max(1, int(app.config.get("VIEW_COUNTER_FLUSH_THRESHOLD", 50)))
+        self.interval = float(app.config.get("VIEW_COUNTER_FLUSH_INTERVAL", 5.0))
+        self.spool_path = app.config.get("VIEW_COUNTER_SPOOL_PATH")
+        self.pending = Counter()  # video_id -> 아직 DB에 반영 안 된 증가분 (이 프로세스 기준)
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.timer = None
+        self.stopped = threading.Event()
+
+    # ----- 주기 flush -----
+    def start_timer(self):
+        """interval 초마다 flush 하는 데몬 스레드 (한 번만 시작). VIEW_COUNTER_TIMER 가 꺼져 있으면 시작하지 않음."""
+        if self.timer is not None or self.interval <= 0 or not self.app.config.get("VIEW_COUNTER_TIMER", True):
+            return
+        with self.lock:
+            if self.timer is not None:
+                return
+            self.timer = threading.Thread(target=self._run_timer, name="view-counter-flush", daemon=True)
+        self.timer.start()
+
+    def _run_timer(self):
+        while not self.stopped.wait(self.interval):
+            if not self.has_pending():
+                continue
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception:
+                self.app.logger.warning("조회수 주기 flush 실패 – 다음 주기에 다시 시도", exc_info=True)
+
+    def stop_timer(self):
+        self.stopped.set()
+        timer, self.timer = self.timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.join(timeout=self.interval + 1)
+
+    def has_pending(self):
+        if self.backend == "file" and self.spool_path:
+            return bool(self.pending) or os.path.exists(self.spool_path) or bool(
+                glob.glob(f"{glob.escape(self.spool_path)}.*.claim")
+            )
+        return bool(self.pending)
+
+    # ----- 기록 -----
+    def record(self, video_id):
+        """증가분 1 기록. flush가 필요하면 True 반환."""
+        with self.lock:
+            self.pending[video_id] += 1
+            if self.backend == "file" and self.spool_path:
+                # O_APPEND 단일 write 는 POSIX 에서 원자적 → 여러 프로세스가 동시에 써도 줄이 섞이지 않음
+                with open(self.spool_path, "a", encoding="utf-8") as f:
+                    f.write(f"{video_id}\n")
+            total = sum(self.pending.values())
+            return total >= self.threshold or (time.monotonic() - self.last_flush) >= self.interval
+
+    # ----- 반영 대상 수집 -----
+    def _take_memory(self):
+        with self.lock:
+            deltas = dict(self.pending)
+            self.pending.clear()
+            self.last_flush = time.monotonic()
+        return deltas
+
+    def _take_file(self):
+        """spool 파일을 claim 파일로 원자적으로 옮긴 뒤 합산. 죽은 프로세스의 claim도 회수."""
+        with self.lock:
+            self.pending.clear()
+            self.last_flush = time.monotonic()
+            claim = f"{self.spool_path}.{os.getpid()}.{uuid.uuid4().hex}.claim"
+            try:
+                os.replace(self.spool_path, claim)
+            except FileNotFoundError:
+                claim = None
+        claims = [claim] if claim else []
+        for orphan in glob.glob(f"{glob.escape(self.spool_path)}.*.claim"):
+            if orphan != claim and not _owner_alive(orphan):
+                claims.append(orphan)
+
+        deltas = Counter()
+        for path in claims:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line.isdigit():
+                            deltas[int(line)] += 1
+            except OSError:
+                continue
+        return dict(deltas), claims
+
+    # ----- DB 반영 -----
+    def flush(self):
+        """버퍼의 증가분을 videos.views 에 일괄 반영. 반영한 video 수 반환."""
+        from sqlalchemy import bindparam, update
+
+        from app import db
+        from app.models import Video
+
+        claims = []
+        if self.backend == "file" and self.spool_path:
+            deltas, claims = self._take_file()
+        else:
+            deltas = self._take_memory()
+        if not deltas:
+            return 0
+
+        table = Video.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(views=table.c.views + bindparam("b_delta"))
+        )
+        rows = [{"b_id": vid, "b_delta": delta} for vid, delta in deltas.items()]
+        try:
+            db.session.execute(stmt, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # 반영 실패 시 메모리 버퍼로 되돌림 (claim 파일은 남겨 두어 다음 flush에서 재시도)
+            if not claims:
+                with self.lock:
+                    self.pending.update(deltas)
+            raise
+        db.session.info.pop("view_overlay", None)
+        for path in claims:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(rows)
+
+
+def _owner_alive(claim_path):
+    """claim 파일명에 기록된 pid 프로세스가 살아 있는지 확인."""
+    try:
+        pid = int(os.path.basename(claim_path).rsplit(".", 3)[-3])
+    except (ValueError, IndexError):
+        return False
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ViewCounter:
+    """
+    조회수 write-behind 확장. db, login_manager 처럼 모듈 레벨에서 만들고 init_app(app)으로 연결.
+    라우트에서는 view_counter.record(video) 만 호출하면 됩니다.
+    """
+
+    def init_app(self, app):
+        buffer = _ViewBuffer(app)
+        app.extensions["view_counter"] = buffer
+
+        def _flush_at_exit():
+            buffer.stop_timer()
+            if not buffer.pending and buffer.backend != "file":
+                return
+            try:
+                with app.app_context():
+                    buffer.flush()
+            except Exception:
+                pass
+
+        atexit.register(_flush_at_exit)
+
+    @staticmethod
+    def _buffer():
+        from flask import current_app
+
+        return current_app.extensions["view_counter"]
+
+    def record(self, video):
+        """
+        시청 1회 기록. 임계치·주기 도달 시 즉시 flush (실패해도 시청 요청은 계속 – 로그만 남김).
+        반영 전 증가분은 apply_pending 으로 video.views 에 더해 반환값도 최신에 가깝게 유지.
+        보고 있는 시청 페이지에는 실시간 이벤트(views=1)로 알림.
+        """
+        from app import live_events
+
+        buffer = self._buffer()
+        buffer.start_timer()
+        if buffer.record(video.id):
+            try:
+                buffer.flush()
+            except Exception:
+                # flush 가 rollback 하고 증가분을 버퍼로 되돌려 둠 → 다음 flush 에서 재시도
+                buffer.app.logger.warning("조회수 flush 실패 – 버퍼에 두고 다시 시도", exc_info=True)
+        self.apply_pending(video)
+        live_events.publish(video.id, views=1)
+
+    def pending(self, video_id):
+        """아직 DB에 반영되지 않은 조회수 증가분 (이 프로세스 기준)."""
+        return self._buffer().pending.get(video_id, 0)
+
+    def apply_pending(self, video):
+        """
+        video.views 에 미반영 증가분을 더함. set_committed_value 로 설정하므로 dirty 가 되지 않아
+        commit 시 UPDATE 가 나가지 않음. 같은 세션에서 중복 가산되지 않도록 세션 info 에 기록.
+        """
+        from sqlalchemy.orm.attributes import set_committed_value
+
+        from app import db
+
+        overlay = db.session.info.setdefault("view_overlay", {})
+        shown, applied = overlay.get(video.id, (None, 0))
+        base = video.views - applied if video.views == shown else video.views
+        pending = self.pending(video.id)
+        set_committed_value(video, "views", base + pending)
+        overlay[video.id] = (base + pending, pending)
+
+    def flush(self):
+        """현재 앱 버퍼를 즉시 반영 (테스트·관리 명령·종료 처리용)."""
+        return self._buffer().flush()
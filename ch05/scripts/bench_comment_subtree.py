@@ -0,0 +1,153 @@
+"""
+벤치마크 – 댓글 하위 트리 연산: orm(Comment.replies 를 한 단계씩 로드) vs cte(app.utils.comment_tree, WITH RECURSIVE).
+
+임시 SQLite 파일 DB 에 댓글 1개 아래로 답글이 달린 합성 스레드(기본 100,000개)를 만들고,
+하위 답글 수 세기 / depth 단계까지 가져오기 / 하위 트리 삭제를 방식별로 실행해 시간과 SQL 문장 수를 출력합니다.
+각 답글의 부모는 바로 앞 --window 개 댓글 중에서 고름 (1 이면 한 줄 사슬, 클수록 얕고 넓은 트리).
+삭제는 한 번 하면 스레드가 사라지므로 방식마다 스레드를 새로 만듦.
+
+사용법:
+  python scripts/bench_comment_subtree.py
+  python scripts/bench_comment_subtree.py --nodes 20000 --window 1 --depth 10
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+def _seed(rng, nodes, window):
+    """비디오 1개 + 합성 스레드 nodes 개 (루트 포함). (비디오 id, 루트 댓글 id, 최대 깊이) 반환."""
+    from app import db
+    from app.models import Comment, User, Video
+
+    user_id = db.session.execute(db.select(User.id).limit(1)).scalar()
+    start = datetime(2024, 1, 1)
+    video_id = db.session.execute(
+        Video.__table__.insert().values(
+            title="bench", video_path="b.mp4", user_id=user_id, views=0, likes=0, comment_count=nodes,
+            created_at=start, updated_at=start,
+        )
+    ).inserted_primary_key[0]
+    first = (db.session.execute(db.select(db.func.max(Comment.id))).scalar() or 0) + 1
+
+    depth = [0]
+    batch = [{"id": first, "content": "root", "user_id": user_id, "video_id": video_id, "parent_id": None,
+              "likes": 0, "dislikes": 0, "created_at": start, "updated_at": start}]
+    for n in range(1, nodes):
+        parent = rng.randrange(max(0, n - window), n)
+        depth.append(depth[parent] + 1)
+        at = start + timedelta(seconds=n)
+        batch.append({"id": first + n, "content": "bench", "user_id": user_id, "video_id": video_id,
+                      "parent_id": first + parent, "likes": 0, "dislikes": 0, "created_at": at, "updated_at": at})
+        if len(batch) >= 20000:
+            db.session.execute(Comment.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Comment.__table__.insert(), batch)
+    db.session.commit()
+    return video_id, first, max(depth)
+
+
+def _orm_walk(root_id, max_depth=None):
+    """Comment.replies 를 단계마다 lazy load 하며 너비 우선 순회. [(Comment, depth), ...] 반환."""
+    from app import db
+    from app.models import Comment
+
+    root = db.session.get(Comment, root_id)
+    result, level = [], [root]
+    depth = 0
+    while level and (max_depth is None or depth <= max_depth):
+        result.extend((comment, depth) for comment in level)
+        level = [reply for comment in level for reply in comment.replies]
+        depth += 1
+    return result
+
+
+def _orm_delete(root_id):
+    """session.delete → Comment.replies cascade 로 행마다 삭제 (after_delete 로 댓글 수도 행마다 차감)."""
+    from app import db
+    from app.models import Comment
+
+    db.session.delete(db.session.get(Comment, root_id))
+    db.session.commit()
+
+
+def _cte_delete(root_id, video_id):
+    from app import db
+    from app.utils.comment_tree import delete_subtree
+
+    delete_subtree(db.session.connection(), root_id, video_id)
+    db.session.commit()
+
+
+def _measure(fn, *args):
+    """fn(*args) 1번 실행. (결과, 초, SQL 문장 수) 반환."""
+    from app import db, sql_metrics
+
+    db.session.expunge_all()
+    with sql_metrics.count_queries() as recorded:
+        t0 = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - t0
+    return result, elapsed, recorded.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="댓글 하위 트리 연산 벤치마크 (ORM vs 재귀 CTE)")
+    parser.add_argument("--nodes", type=int, default=100000, help="스레드 댓글 수 (루트 포함)")
+    parser.add_argument("--window", type=int, default=50, help="부모를 고르는 직전 댓글 수 (1 이면 한 줄 사슬)")
+    parser.add_argument("--depth", type=int, default=5, help="가져오기 연산의 depth")
+    parser.add_argument("--skip-orm-delete", action="store_true", help="ORM 삭제 생략 (행마다 SELECT·DELETE·UPDATE 라 느림)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tmp, "bench.db").replace("\\", "/")
+        os.environ["TAG_GRAPH_PATH"] = os.path.join(tmp, "tag_graph.bin")
+        from app import create_app, db
+        from app.utils.comment_counts import check_comment_counts
+        from app.utils.comment_tree import count_descendants, fetch_thread
+
+        app = create_app()
+        with app.app_context():
+            rng = random.Random(args.seed)
+            t0 = time.perf_counter()
+            video_id, root_id, max_depth = _seed(rng, args.nodes, args.window)
+            print(f"스레드 댓글 {args.nodes}개, 최대 깊이 {max_depth} (준비 {time.perf_counter() - t0:.1f}s)")
+            print(f"{'연산':<16}{'방식':<6}{'결과':>10}{'시간(ms)':>12}{'SQL 문장':>10}")
+
+            def report(op, name, result, elapsed, statements):
+                print(f"{op:<16}{name:<6}{result:>10}{elapsed * 1000:>12.1f}{statements:>10}")
+
+            report("count", "orm", *_measure(lambda: len(_orm_walk(root_id)) - 1))
+            report("count", "cte", *_measure(count_descendants, root_id))
+
+            label = f"fetch depth={args.depth}"
+            report(label, "orm", *_measure(lambda: len(_orm_walk(root_id, args.depth))))
+            report(label, "cte", *_measure(lambda: len(fetch_thread(root_id, args.depth).items)))
+
+            if not args.skip_orm_delete:
+                _, elapsed, statements = _measure(_orm_delete, root_id)
+                report("delete", "orm", args.nodes, elapsed, statements)
+                video_id, root_id, _ = _seed(random.Random(args.seed), args.nodes, args.window)
+            _, elapsed, statements = _measure(_cte_delete, root_id, video_id)
+            report("delete", "cte", args.nodes, elapsed, statements)
+
+            mismatches = check_comment_counts()
+            print("댓글 수 집계:", "일치" if not mismatches else f"불일치 {mismatches}")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
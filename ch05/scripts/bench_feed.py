@@ -0,0 +1,126 @@
+"""
+벤치마크 – 구독 피드 읽기 전략: in_list(기존 IN 쿼리) vs merge(채널별 k-way 병합) vs inbox(받은편지함).
+
+임시 SQLite 파일 DB 에 채널·비디오를 만들고, 구독 채널 수가 다른 사용자(기본 10 / 1,000 / 10,000 개)의
+피드 1페이지·깊은 페이지를 전략별로 반복 조회해 지연 p50/p99 와 요청당 SQL 문장 수를 출력합니다.
+
+사용법:
+  python scripts/bench_feed.py
+  python scripts/bench_feed.py --subs 10 1000 --videos-per-channel 50 --repeat 50
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+def _percentile(values, pct):
+    """정렬된 값 목록에서 백분위 값."""
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+def _seed(rng, channels, videos_per_channel, subs):
+    """채널 channels 개 × 비디오 videos_per_channel 개, 구독자 1명당 구독 채널 수 subs[i]. 구독자 id 목록 반환."""
+    from app import db
+    from app.models import Subscription, User, Video
+
+    start = datetime(2024, 1, 1)
+    users = [{"username": f"ch{i}", "email": f"ch{i}@example.com", "password_hash": ""} for i in range(channels)]
+    users += [{"username": f"fan{n}", "email": f"fan{n}@example.com", "password_hash": ""} for n in subs]
+    db.session.execute(User.__table__.insert(), users)
+    ids = dict(db.session.execute(db.select(User.username, User.id)).all())
+    channel_ids = [ids[f"ch{i}"] for i in range(channels)]
+
+    batch = []
+    for channel_id in channel_ids:
+        for _ in range(videos_per_channel):
+            at = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            batch.append({"title": "bench", "video_path": "b.mp4", "user_id": channel_id, "views": 0, "likes": 0,
+                          "created_at": at, "updated_at": at})
+            if len(batch) >= 20000:
+                db.session.execute(Video.__table__.insert(), batch)
+                batch = []
+    if batch:
+        db.session.execute(Video.__table__.insert(), batch)
+
+    fans = []
+    for n in subs:
+        fan_id = ids[f"fan{n}"]
+        db.session.execute(
+            Subscription.__table__.insert(),
+            [{"subscriber_id": fan_id, "subscribed_to_id": c, "created_at": start} for c in rng.sample(channel_ids, n)],
+        )
+        fans.append(fan_id)
+    db.session.commit()
+    return fans
+
+
+def _run(fan_id, strategy, page, per_page, repeat):
+    """같은 페이지를 repeat 번 조회. (지연 목록, 요청당 SQL 문장 수) 반환."""
+    from app import db, feed_inbox, sql_metrics
+
+    latencies = []
+    statements = 0
+    for _ in range(repeat):
+        db.session.expunge_all()
+        with sql_metrics.count_queries() as recorded:
+            t0 = time.perf_counter()
+            feed_inbox.page(fan_id, page=page, per_page=per_page, strategy=strategy)
+            latencies.append(time.perf_counter() - t0)
+        statements = recorded.count
+    latencies.sort()
+    return latencies, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구독 피드 읽기 전략 벤치마크")
+    parser.add_argument("--subs", type=int, nargs="+", default=[10, 1000, 10000], help="구독 채널 수 목록")
+    parser.add_argument("--videos-per-channel", type=int, default=20, help="채널당 비디오 수")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10], help="조회할 페이지 번호")
+    parser.add_argument("--per-page", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=30, help="조합별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tmp, "bench.db").replace("\\", "/")
+        os.environ["TAG_GRAPH_PATH"] = os.path.join(tmp, "tag_graph.bin")
+        from app import create_app, db
+        from app.utils.feed import rebuild_inbox
+
+        app = create_app()
+        app.config["FEED_FANOUT_MAX_SUBSCRIBERS"] = 10**9
+        app.extensions["feed_inbox"].max_subscribers = 10**9
+        channels = max(args.subs)
+        with app.app_context():
+            t0 = time.perf_counter()
+            fans = _seed(random.Random(args.seed), channels, args.videos_per_channel, args.subs)
+            rows, _ = rebuild_inbox()
+            print(f"채널 {channels}개 × 비디오 {args.videos_per_channel}개, 받은편지함 {rows}행 "
+                  f"(준비 {time.perf_counter() - t0:.1f}s)")
+            print(f"{'구독 수':>8}{'페이지':>8}  {'전략':<10}{'p50(ms)':>10}{'p99(ms)':>10}{'SQL/요청':>10}")
+            for subs, fan_id in zip(args.subs, fans):
+                for page in args.pages:
+                    for strategy in ("in_list", "merge", "inbox"):
+                        _run(fan_id, strategy, page, args.per_page, 2)  # 워밍업
+                        latencies, statements = _run(fan_id, strategy, page, args.per_page, args.repeat)
+                        print(f"{subs:>8}{page:>8}  {strategy:<10}{_percentile(latencies, 50) * 1000:>10.2f}"
+                              f"{_percentile(latencies, 99) * 1000:>10.2f}{statements:>10}")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+벤치마크 – 비디오 랜덤 탐색(Range) 워크로드: send_from_directory vs send_media_file.
+
+플레이어 탐색을 흉내 내어 임의 위치에서 고정 크기 구간(bytes=X-Y)을 반복 요청하고,
+구현별 처리량(MB/s)과 지연 p50/p99 를 출력합니다.
+
+사용법:
+  python scripts/bench_media_range.py
+  python scripts/bench_media_range.py --size-mb 256 --requests 500 --window-kb 1024
+  python scripts/bench_media_range.py --open-ended   # bytes=X- 요청 후 첫 window 만 읽고 끊기
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+def _percentile(values, pct):
+    """정렬된 값 목록에서 백분위 값."""
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+def _run(client, url, offsets, window, open_ended):
+    """offsets 위치마다 Range 요청. (경과 시간 목록, 받은 바이트 수) 반환."""
+    latencies = []
+    received = 0
+    for start in offsets:
+        if open_ended:
+            header = f"bytes={start}-"
+        else:
+            header = f"bytes={start}-{start + window - 1}"
+        t0 = time.perf_counter()
+        resp = client.get(url, headers={"Range": header}, buffered=False)
+        got = 0
+        for chunk in resp.response:
+            got += len(chunk)
+            if got >= window:
+                break
+        resp.close()
+        latencies.append(time.perf_counter() - t0)
+        received += min(got, window)
+    return latencies, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비디오 Range 요청 벤치마크")
+    parser.add_argument("--size-mb", type=int, default=128, help="테스트 파일 크기(MB)")
+    parser.add_argument("--requests", type=int, default=300, help="구현별 요청 수")
+    parser.add_argument("--window-kb", type=int, default=512, help="요청 구간 크기(KB)")
+    parser.add_argument("--open-ended", action="store_true", help="bytes=X- 형태로 요청")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from flask import send_from_directory
+
+    from app import create_app
+    from app.utils.media import send_media_file
+
+    app = create_app()
+    size = args.size_mb * 1024 * 1024
+    window = args.window_kb * 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.mp4")
+        with open(path, "wb") as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        # 비교 대상 두 구현을 같은 앱에 임시 라우트로 등록
+        app.add_url_rule("/bench/legacy/<path:filename>", "bench_legacy",
+                         lambda filename: send_from_directory(tmp, filename))
+        app.add_url_rule("/bench/range/<path:filename>", "bench_range",
+                         lambda filename: send_media_file(tmp, filename))
+        client = app.test_client()
+
+        rng = random.Random(args.seed)
+        offsets = [rng.randrange(0, max(1, size - window)) for _ in range(args.requests)]
+
+        print(f"파일 {args.size_mb}MB, 요청 {args.requests}회, 구간 {args.window_kb}KB, "
+              f"{'open-ended' if args.open_ended else 'bounded'}")
+        print(f"{'구현':<22}{'MB/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}")
+        for name, url in (("send_from_directory", "/bench/legacy/bench.mp4"),
+                          ("send_media_file", "/bench/range/bench.mp4")):
+            _run(client, url, offsets[:10], window, args.open_ended)  # 워밍업
+            t0 = time.perf_counter()
+            latencies, received = _run(client, url, offsets, window, args.open_ended)
+            elapsed = time.perf_counter() - t0
+            latencies.sort()
+            print(f"{name:<22}{received / elapsed / (1024 * 1024):>10.1f}"
+                  f"{statistics.median(latencies) * 1000:>10.2f}"
+                  f"{_percentile(latencies, 99) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
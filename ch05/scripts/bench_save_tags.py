@@ -0,0 +1,118 @@
+"""
+벤치마크 – Video.save_tags: 태그별 조회·INSERT(기존 방식) vs 일괄 처리(IN 조회 + insert-or-ignore + diff).
+
+임시 SQLite 파일 DB 에 비디오를 만들고 모두 한 번 태그를 단 뒤, 전체 비디오를 새 태그 목록으로
+다시 태깅(일부 유지·일부 교체·일부 신규)하는 시간과 비디오당 SQL 문장 수를 구현별로 출력합니다.
+
+사용법:
+  python scripts/bench_save_tags.py                  # 비디오 10,000개
+  python scripts/bench_save_tags.py --videos 2000 --tags 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+def legacy_save_tags(video, tag_string, commit=True):
+    """변경 전 save_tags (태그 이름마다 SELECT, 새 태그는 하나씩 INSERT, 컬렉션 통째로 교체)."""
+    from app import db
+    from app.models import Tag
+
+    tag_names = [name.strip() for name in tag_string.split(",") if name.strip()]
+    tag_objects = []
+    for name in tag_names:
+        if len(name) > 50:
+            continue
+        tag = Tag.query.filter_by(name=name).first()
+        if tag is None:
+            tag = Tag(name=name)
+            db.session.add(tag)
+        tag_objects.append(tag)
+    video.tags = tag_objects
+    if commit:
+        db.session.commit()
+
+
+def _tag_strings(rng, n_videos, per_video, vocab, new_share):
+    """비디오별 태그 문자열. new_share 비율만큼은 처음 보는 태그 이름."""
+    result = []
+    for i in range(n_videos):
+        names = rng.sample(vocab, per_video)
+        for j in range(int(per_video * new_share)):
+            names[j] = f"new-{i}-{j}-{rng.randrange(10**6)}"
+        result.append(", ".join(names))
+    return result
+
+
+def _run(label, save, video_ids, strings):
+    """요청 1건처럼 비디오를 새로 읽어 태깅·commit (세션에 객체가 쌓이지 않게)."""
+    from sqlalchemy import event
+
+    from app import db
+    from app.models import Video
+
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    t0 = time.perf_counter()
+    try:
+        for video_id, tag_string in zip(video_ids, strings):
+            save(db.session.get(Video, video_id), tag_string)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    elapsed = time.perf_counter() - t0
+    n = len(video_ids)
+    print(f"{label:<12}{elapsed:>10.2f}{n / elapsed:>12.0f}{statements[0] / n:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="save_tags 벤치마크")
+    parser.add_argument("--videos", type=int, default=10000, help="다시 태깅할 비디오 수")
+    parser.add_argument("--tags", type=int, default=12, help="비디오당 태그 수")
+    parser.add_argument("--vocab", type=int, default=3000, help="기존 태그 어휘 크기")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app import create_app, db
+    from app.models import Video
+
+    print(f"비디오 {args.videos}개, 비디오당 태그 {args.tags}개, 어휘 {args.vocab}개 (다시 태깅 시 25% 신규 태그)")
+    print(f"{'구현':<12}{'시간(s)':>10}{'비디오/s':>12}{'SQL/비디오':>14}")
+    for label, save in (("기존", legacy_save_tags), ("일괄", Video.save_tags)):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tmp, "bench.db").replace("\\", "/")
+            os.environ["TAG_GRAPH_PATH"] = os.path.join(tmp, "tag_graph.bin")
+            app = create_app()
+            with app.app_context():
+                rng = random.Random(args.seed)
+                vocab = [f"tag{i}" for i in range(args.vocab)]
+                videos = [Video(title=f"bench {i}", video_path=f"b{i}.mp4", user_id=1) for i in range(args.videos)]
+                db.session.add_all(videos)
+                db.session.commit()
+                # 초기 태그 (측정 제외)
+                for video, tag_string in zip(videos, _tag_strings(rng, args.videos, args.tags, vocab, 0.0)):
+                    Video.save_tags(video, tag_string, commit=False)
+                db.session.commit()
+                video_ids = [v.id for v in videos]
+                del videos
+                db.session.expunge_all()
+                retag = _tag_strings(rng, args.videos, args.tags, vocab, 0.25)
+                _run(label, save, video_ids, retag)
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+벤치마크 – 검색 토크나이저별 인덱스 크기·검색 지연 (합성 코퍼스).
+
+한국어 단어 + 조사·어미를 붙인 제목/설명과 태그로 합성 비디오 N개를 만들고,
+토크나이저(trigram, hangul_bigram, hangul_trigram)마다 별도 SQLite 파일에 FTS5 인덱스를 만든 뒤
+  - 구축 시간, DB 파일 크기
+  - 검색어별 지연 p50/p99 (COUNT + bm25 상위 12개 = 검색 페이지 1회와 같은 작업)
+을 출력합니다. 기준선은 인덱스 없는 LIKE '%q%' (기존 구현).
+
+사용법:
+  python scripts/bench_search_tokenizer.py                 # 1,000,000개 (수 분~수십 분 소요)
+  python scripts/bench_search_tokenizer.py --videos 50000 --repeat 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가 (app 패키지 import 시 앱이 생성되므로 메모리 DB 사용)
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+WORDS = ["튜토리얼", "강의", "파이썬", "플라스크", "데이터베이스", "요리", "여행", "게임", "음악", "운동",
+         "브이로그", "리뷰", "공부", "프로그래밍", "개발", "영상", "기초", "입문", "정리", "방법"]
+SUFFIXES = ["", "", "입니다", "하기", "의", "를", "에서", "까지", "으로"]
+ENGLISH = ["Python", "Flask", "WeTube", "SQL", "vlog", "review", "tutorial", "live"]
+TAGS = ["Python", "Flask", "튜토리얼", "WeTube", "동영상", "요리", "여행", "게임", "음악", "공부"]
+QUERIES = ["튜토", "강의", "튜토리얼", "리얼입", "데이터베이스를", "파이썬 강의", "flask", "tutorial"]
+
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처고노도로모보소오조초구누두루무부수우주추"
+
+
+def _vocabulary(rng, size):
+    """자주 쓰는 실제 단어 + 음절 조합 가상 단어 (현실적인 어휘 분포용)."""
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return words
+
+
+def _phrase(rng, vocab, lo, hi):
+    parts = []
+    for _ in range(rng.randint(lo, hi)):
+        if rng.random() < 0.15:
+            parts.append(rng.choice(ENGLISH))
+        else:
+            # 앞쪽(실제 단어)이 더 자주 나오도록 치우친 분포
+            word = vocab[min(len(vocab) - 1, int(rng.paretovariate(1.2)) - 1)]
+            parts.append(word + rng.choice(SUFFIXES))
+    return " ".join(parts)
+
+
+def _corpus(n, seed):
+    """(id, title, description, tags) 생성기."""
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng, 5000)
+    rng.shuffle(vocab[len(WORDS):])
+    for i in range(1, n + 1):
+        yield (i, _phrase(rng, vocab, 2, 5), _phrase(rng, vocab, 6, 20),
+               " ".join(rng.sample(TAGS, rng.randint(0, 3))))
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, _percentile(samples, 99) * 1000
+
+
+def _build_like(path, args):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE videos (id INTEGER PRIMARY KEY, title TEXT, description TEXT, tags TEXT)")
+    conn.executemany("INSERT INTO videos VALUES (?, ?, ?, ?)", _corpus(args.videos, args.seed))
+    conn.commit()
+    return conn
+
+
+def _build_fts(path, tokenizer, args):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE VIRTUAL TABLE video_search USING fts5("
+        f"title, description, tags, tokenize = '{tokenizer.fts_tokenize}')"
+    )
+    rows = (
+        (i, tokenizer.index_text(t), tokenizer.index_text(d),
+         " ".join(tokenizer.index_text(g) for g in tags.split()))
+        for i, t, d, tags in _corpus(args.videos, args.seed)
+    )
+    conn.executemany("INSERT INTO video_search (rowid, title, description, tags) VALUES (?, ?, ?, ?)", rows)
+    conn.execute("INSERT INTO video_search (video_search) VALUES ('optimize')")
+    conn.commit()
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 토크나이저 벤치마크")
+    parser.add_argument("--videos", type=int, default=1_000_000, help="합성 비디오 수")
+    parser.add_argument("--repeat", type=int, default=10, help="검색어별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.utils.search_tokenizers import TOKENIZERS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"합성 비디오 {args.videos:,}개, 검색어별 {args.repeat}회 반복")
+        print(f"{'방식':<16}{'구축(s)':>10}{'크기(MB)':>10}")
+        results = {}
+
+        path = os.path.join(tmp, "like.db")
+        t0 = time.perf_counter()
+        like = _build_like(path, args)
+        print(f"{'like(기준)':<16}{time.perf_counter() - t0:>10.1f}{os.path.getsize(path) / 2**20:>10.1f}")
+        for q in QUERIES:
+            pattern = f"%{q}%"
+
+            def run(pattern=pattern):
+                like.execute("SELECT count(*) FROM videos WHERE title LIKE ? OR description LIKE ?",
+                             (pattern, pattern)).fetchone()
+                like.execute("SELECT id FROM videos WHERE title LIKE ? OR description LIKE ? "
+                             "ORDER BY id DESC LIMIT 12", (pattern, pattern)).fetchall()
+
+            results[("like", q)] = _timed(run, args.repeat)
+
+        for name, tokenizer in TOKENIZERS.items():
+            path = os.path.join(tmp, f"{name}.db")
+            t0 = time.perf_counter()
+            conn = _build_fts(path, tokenizer, args)
+            print(f"{name:<16}{time.perf_counter() - t0:>10.1f}{os.path.getsize(path) / 2**20:>10.1f}")
+            for q in QUERIES:
+                expr = tokenizer.match_expression(q)
+                if expr is None:
+                    results[(name, q)] = None  # LIKE 폴백
+                    continue
+
+                def run(expr=expr, conn=conn):
+                    conn.execute("SELECT count(*) FROM video_search WHERE video_search MATCH ?", (expr,)).fetchone()
+                    conn.execute("SELECT rowid FROM video_search WHERE video_search MATCH ? "
+                                 "ORDER BY bm25(video_search, 10.0, 1.0, 5.0) LIMIT 12", (expr,)).fetchall()
+
+                results[(name, q)] = _timed(run, args.repeat)
+            conn.close()
+        like.close()
+
+        names = ["like"] + list(TOKENIZERS)
+        print()
+        print("검색 지연 p50 / p99 (ms)")
+        print(f"{'검색어':<14}" + "".join(f"{n:>22}" for n in names))
+        for q in QUERIES:
+            cells = []
+            for n in names:
+                r = results[(n, q)]
+                cells.append(f"{'LIKE 폴백':>22}" if r is None else f"{r[0]:>12.2f} / {r[1]:>7.2f}")
+            print(f"{q:<14}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+벤치마크 – 목록 1페이지(카드 12개)의 썸네일 전송량: 원본 썸네일 vs 크기별 파생 이미지 (app.utils.thumbnails).
+
+업로드 썸네일과 비슷한 1280x720 JPEG 를 만들어 카드마다 쓰고,
+원본을 그대로 보낼 때와 srcset 이 고르는 파생 이미지(1x → 320px, 2x → 640px)를 보낼 때의 바이트 수,
+파생 이미지 생성 시간을 출력합니다.
+
+사용법:
+  python scripts/bench_thumbnails.py
+  python scripts/bench_thumbnails.py --cards 24 --width 1920 --height 1080 --quality 95
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from PIL import Image  # noqa: E402
+
+from app.utils.thumbnails import DEFAULT_WIDTHS, FORMATS, render_variants, variant_name  # noqa: E402
+
+
+def _photo(index, size, quality):
+    """카드마다 다른 사진 같은 이미지 (망델브로 집합 구간을 옮겨 가며)."""
+    x = -2.2 + (index % 6) * 0.1
+    gray = Image.effect_mandelbrot(size, (x, -1.2, x + 3.2, 1.2), 64 + index)
+    img = Image.merge("RGB", (gray, gray.rotate(180), gray.transpose(Image.FLIP_LEFT_RIGHT)))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="썸네일 파생 이미지 전송량 벤치마크")
+    parser.add_argument("--cards", type=int, default=12, help="목록 1페이지 카드 수")
+    parser.add_argument("--width", type=int, default=1280, help="원본 썸네일 너비")
+    parser.add_argument("--height", type=int, default=720, help="원본 썸네일 높이")
+    parser.add_argument("--quality", type=int, default=92, help="원본 JPEG 품질")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        originals = 0
+        elapsed = 0.0
+        for i in range(args.cards):
+            data = _photo(i, (args.width, args.height), args.quality)
+            originals += len(data)
+            name = f"thumb{i}.jpg"
+            with open(os.path.join(tmp, name), "wb") as f:
+                f.write(data)
+            t0 = time.perf_counter()
+            render_variants(os.path.join(tmp, name), os.path.join(tmp, "derived"), name, DEFAULT_WIDTHS)
+            elapsed += time.perf_counter() - t0
+
+        print(f"카드 {args.cards}개, 원본 {args.width}x{args.height} JPEG q{args.quality}")
+        print(f"  원본 썸네일          : {originals / 1024:10.1f} KiB")
+        for width in DEFAULT_WIDTHS:
+            for fmt in FORMATS:
+                total = sum(
+                    os.path.getsize(os.path.join(tmp, "derived", str(width), variant_name(f"thumb{i}.jpg", fmt)))
+                    for i in range(args.cards)
+                )
+                print(f"  {width:4d}px {fmt:4s}         : {total / 1024:10.1f} KiB  (원본의 1/{originals / total:.1f})")
+        print(f"  생성 시간            : {elapsed * 1000 / args.cards:.1f} ms/장 (너비 {len(DEFAULT_WIDTHS)}개 × 형식 {len(FORMATS)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""
+태그 동시 출현 행렬(instance/tag_graph.bin)을 video_tags 전체로 다시 만듦.
+앱이 델타 건수·경과 시간 기준으로 백그라운드 재구축하지만, cron 등으로 주기 실행하거나
+태그를 SQL 로 직접 고친 뒤 바로 반영하고 싶을 때 실행.
+실행: python scripts/build_tag_graph.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, tag_graph
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        count = tag_graph.rebuild()
+        elapsed = time.perf_counter() - started
+        state = app.extensions["tag_graph"]
+        where = state.path or "(메모리 – 공유 DB 가 아니라 파일을 만들지 않음)"
+        print(f"[완료] 태그 {count}개로 동시 출현 행렬을 다시 만들었습니다: {where} ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""
+videos.comment_count 가 comments 와 일치하는지 검사.
+어긋난 비디오를 출력하고, --repair 를 주면 comments 기준으로 다시 셈.
+실행: python scripts/check_comment_counts.py [--repair]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.comment_counts import check_comment_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="댓글 수 집계 일관성 검사")
+    parser.add_argument("--repair", action="store_true", help="어긋나면 comments 기준으로 다시 셈")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        mismatches = check_comment_counts(repair=args.repair)
+        if not mismatches:
+            print("[정상] 댓글 수 집계가 comments 와 일치합니다.")
+            return
+        for video_id, stored, actual in mismatches:
+            print(f"  video_id={video_id}: 저장={stored} 실제={actual}")
+        if args.repair:
+            print(f"[복구] 비디오 {len(mismatches)}개의 댓글 수를 다시 셌습니다.")
+        else:
+            print(f"[불일치] 비디오 {len(mismatches)}개. --repair 로 복구하세요.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""
+media_blobs.ref_count 가 videos·users 의 파일 참조와 일치하는지 검사.
+어긋난 파일을 출력하고, --repair 를 주면 실제 참조 수로 고치고 아무도 가리키지 않는 파일은 삭제.
+실행: python scripts/check_media_refs.py [--repair]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.media_store import check_media_refs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 파일 참조 수 일관성 검사")
+    parser.add_argument("--repair", action="store_true", help="어긋나면 실제 참조 수로 고치고 미사용 파일 삭제")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        mismatches = check_media_refs(repair=args.repair)
+        if not mismatches:
+            print("[정상] 파일 참조 수가 videos·users 와 일치합니다.")
+            return
+        for kind, filename, stored, actual in mismatches:
+            print(f"  {kind}/{filename}: 저장={stored} 실제={actual}")
+        if args.repair:
+            print(f"[복구] 파일 {len(mismatches)}개의 참조 수를 고쳤습니다.")
+        else:
+            print(f"[불일치] 파일 {len(mismatches)}개. --repair 로 복구하세요.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
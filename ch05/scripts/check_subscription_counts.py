@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""
+users.subscriber_count / subscription_count 가 subscriptions 와 일치하는지 검사.
+어긋난 사용자를 출력하고, --repair 를 주면 subscriptions 기준으로 다시 셈.
+실행: python scripts/check_subscription_counts.py [--repair]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.subscription_counts import check_subscription_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구독 집계 일관성 검사")
+    parser.add_argument("--repair", action="store_true", help="어긋나면 subscriptions 기준으로 다시 셈")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        mismatches = check_subscription_counts(repair=args.repair)
+        if not mismatches:
+            print("[정상] 구독 집계가 subscriptions 와 일치합니다.")
+            return
+        for user_id, stored, actual in mismatches:
+            print(f"  user_id={user_id}: 저장(구독자, 구독)={stored} 실제={actual}")
+        if args.repair:
+            print(f"[복구] 사용자 {len(mismatches)}명의 구독 집계를 다시 셌습니다.")
+        else:
+            print(f"[불일치] 사용자 {len(mismatches)}명. --repair 로 복구하세요.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""
+인기 태그 집계 테이블(tag_stats)이 video_tags 와 일치하는지 검사.
+어긋난 태그를 출력하고, --repair 를 주면 video_tags 기준으로 다시 채움.
+실행: python scripts/check_tag_stats.py [--repair]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.tag_stats import check_tag_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tag_stats 일관성 검사")
+    parser.add_argument("--repair", action="store_true", help="어긋나면 video_tags 기준으로 다시 채움")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        mismatches = check_tag_stats(repair=args.repair)
+        if not mismatches:
+            print("[정상] tag_stats 가 video_tags 와 일치합니다.")
+            return
+        for tag_id, stored, actual in mismatches:
+            print(f"  tag_id={tag_id}: 저장={stored} 실제={actual}")
+        if args.repair:
+            print(f"[복구] 태그 {len(mismatches)}개가 어긋나 tag_stats 를 다시 채웠습니다.")
+        else:
+            print(f"[불일치] 태그 {len(mismatches)}개. --repair 로 복구하세요.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+"""
+만료된 조각 업로드 세션 정리 (upload_sessions 행 + UPLOAD_SESSION_FOLDER 의 .part 파일).
+세션 행이 없는 오래된 .part 파일도 함께 삭제. cron 등으로 주기 실행.
+실행: python scripts/purge_upload_sessions.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.uploads import purge_expired, purge_orphan_parts
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        sessions = purge_expired()
+        orphans = purge_orphan_parts()
+        print(f"[정리] 만료 세션 {sessions}개, 세션 없는 조각 파일 {orphans}개 삭제")
+
+
+if __name__ == "__main__":
+    main()
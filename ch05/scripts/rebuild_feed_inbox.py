@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""
+구독 피드 받은편지함(feed_inbox)·pull 채널 목록을 subscriptions·videos 기준으로 다시 만듦.
+FEED_FANOUT_MAX_SUBSCRIBERS 를 바꾼 뒤, 또는 배포 실패 등으로 피드가 어긋났을 때 실행.
+실행: python scripts/rebuild_feed_inbox.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.feed import rebuild_inbox
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        rows, pulls = rebuild_inbox()
+        print(f"[완료] 받은편지함 {rows}행, pull 채널 {pulls}개로 다시 채웠습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+"""
+검색 인덱스(video_search, SQLite FTS5)를 videos·video_tags 기준으로 다시 만듦.
+기존 DB 이관 후, 또는 인덱스가 실제 데이터와 어긋났을 때 실행.
+실행: python scripts/rebuild_search_index.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.utils.search_index import rebuild_index
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        if not app.extensions.get("search_index"):
+            print("[건너뜀] SQLite FTS5 를 사용할 수 없는 DB입니다. 검색은 LIKE 방식으로 동작합니다.")
+            sys.exit(0)
+        count = rebuild_index()
+        print(f"[완료] 비디오 {count}개를 검색 인덱스에 다시 등록했습니다.")
+
+
+if __name__ == "__main__":
+    main()
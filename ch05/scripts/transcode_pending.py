@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+변환 작업 다시 예약 (app.utils.transcode).
+실패한 화질을 다시 만들거나, 요청이 없어 서버 워커가 남은 작업을 아직 다시 예약하지 않았을 때 사용.
+서버 워커와 같은 동시 실행 슬롯을 나눠 쓰고, 이미 다른 프로세스가 가져간 작업은 건너뜀. 모든 작업이 끝날 때까지 대기.
+실행: python scripts/transcode_pending.py [--stale] [--backfill] [--workers N]
+  --stale     running 상태로 남은 행도 다시 예약 (이 노드에서 변환 중인 프로세스가 없을 때만)
+  --backfill  변환 행이 없는 기존 비디오도 변환
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대기·실패한 변환 작업 다시 예약")
+    parser.add_argument("--stale", action="store_true", help="running 으로 남은 행도 다시 예약")
+    parser.add_argument("--backfill", action="store_true", help="변환 행이 없는 기존 비디오도 변환")
+    parser.add_argument("--workers", type=int, default=None, help="노드 전체 동시 ffmpeg 수 (기본: TRANSCODE_WORKERS)")
+    args = parser.parse_args()
+    if args.workers:
+        os.environ["TRANSCODE_WORKERS"] = str(args.workers)
+
+    from sqlalchemy import select
+
+    from app import create_app, db, transcoder
+    from app.models import Rendition
+
+    app = create_app()
+    with app.app_context():
+        if not transcoder.enabled:
+            print("[변환] ffmpeg·ffprobe 를 찾을 수 없거나 TRANSCODE_ENABLED=0 – 건너뜀")
+            return
+        statuses = ("queued", "failed", "running") if args.stale else ("queued", "failed")
+        submitted = transcoder.requeue(statuses=statuses, backfill=args.backfill)
+        print(f"[변환] 작업 {submitted}개 예약 – 완료 대기 중...")
+        transcoder.wait()
+        video_ids = db.session.execute(select(Rendition.video_id).distinct()).scalars().all()
+        summary = transcoder.summary(video_ids)
+        failed = sum(1 for s in summary.values() if s["status"] == "failed")
+        print(f"[변환] 완료: 비디오 {len(summary)}개 중 실패 {failed}개")
+
+
+if __name__ == "__main__":
+    main()
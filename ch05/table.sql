@@ -12,6 +12,8 @@ CREATE TABLE IF NOT EXISTS users (
     nickname VARCHAR(80) NULL,
     profile_image VARCHAR(255) NULL,
     profile_image_public_id VARCHAR(255) NULL,
+    subscriber_count INTEGER NOT NULL DEFAULT 0,    -- 구독자 수 (subscriptions 변경 시 같은 트랜잭션에서 증감)
+    subscription_count INTEGER NOT NULL DEFAULT 0,  -- 구독한 채널 수
     is_admin BOOLEAN NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -46,6 +48,7 @@ CREATE TABLE IF NOT EXISTS videos (
     duration INTEGER NULL,
     views INTEGER NOT NULL DEFAULT 0,
     likes INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
     user_id INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -58,6 +61,8 @@ CREATE TABLE IF NOT EXISTS videos (
 CREATE INDEX IF NOT EXISTS idx_videos_category ON videos (category);
 CREATE INDEX IF NOT EXISTS idx_videos_created_at ON videos (created_at);
 CREATE INDEX IF NOT EXISTS idx_videos_user_id ON videos (user_id);
+-- 채널별 최신 비디오 (구독 피드 k-way 병합)
+CREATE INDEX IF NOT EXISTS idx_videos_user_created ON videos (user_id, created_at, id);
 
 -- ============================================
 -- 4. 댓글 테이블 (comments)
@@ -82,6 +87,9 @@ CREATE INDEX IF NOT EXISTS idx_comments_created_at ON comments (created_at);
 CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments (user_id);
 CREATE INDEX IF NOT EXISTS idx_comments_video_id ON comments (video_id);
 CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments (parent_id);
+-- 비디오별 최상위 댓글 페이지 (커서), 댓글별 답글 페이지·답글 수
+CREATE INDEX IF NOT EXISTS idx_comments_video_thread ON comments (video_id, parent_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_comments_parent_created ON comments (parent_id, created_at, id);
 
 -- ============================================
 -- 5. 비디오 좋아요 중간 테이블 (video_likes)
@@ -143,3 +151,139 @@ CREATE TABLE IF NOT EXISTS video_tags (
     FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
     FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
 );
+
+-- ============================================
+-- 10. 태그 사용 통계 (tag_stats) – 인기 태그 집계 테이블
+--     video_tags 변경 시 같은 트랜잭션에서 video_count 증감 (app.utils.tag_stats)
+-- ============================================
+CREATE TABLE IF NOT EXISTS tag_stats (
+    tag_id INTEGER PRIMARY KEY,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    last_used_at TIMESTAMP NULL,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- 인기 태그 상위 N개 조회용
+CREATE INDEX IF NOT EXISTS idx_tag_stats_popular ON tag_stats (video_count, tag_id);
+
+-- 채널별 구독자 조회·집계용 (PK 는 subscriber_id 가 앞)
+CREATE INDEX IF NOT EXISTS idx_subscriptions_channel ON subscriptions (subscribed_to_id, subscriber_id);
+
+-- ============================================
+-- 11. 구독 피드 받은편지함 (feed_inbox) – fan-out-on-write
+--     업로드 시 구독자마다 1행, 구독/해제 시 채널 비디오 채움/정리 (app.utils.feed)
+-- ============================================
+CREATE TABLE IF NOT EXISTS feed_inbox (
+    subscriber_id INTEGER NOT NULL,
+    video_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    created_at TIMESTAMP NULL,
+    PRIMARY KEY (subscriber_id, video_id),
+    FOREIGN KEY (subscriber_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+    FOREIGN KEY (author_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- 피드 페이지 (구독자별 최신순 범위 스캔)
+CREATE INDEX IF NOT EXISTS idx_feed_inbox_subscriber ON feed_inbox (subscriber_id, created_at, video_id);
+-- 구독 해제·pull 전환 시 채널 행 정리
+CREATE INDEX IF NOT EXISTS idx_feed_inbox_author ON feed_inbox (author_id, subscriber_id);
+
+-- ============================================
+-- 12. pull-on-read 채널 (feed_pull_channels)
+--     구독자 수가 FEED_FANOUT_MAX_SUBSCRIBERS 초과 → 받은편지함 대신 읽을 때 videos 에서 조회
+-- ============================================
+CREATE TABLE IF NOT EXISTS feed_pull_channels (
+    channel_id INTEGER PRIMARY KEY,
+    FOREIGN KEY (channel_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- 13. 실시간 카운트 이벤트 (live_events)
+--     LIVE_EVENTS_BACKEND=db 일 때 워커 간 좋아요·댓글·조회수 증감분 전달 (app.utils.live_events)
+-- ============================================
+CREATE TABLE IF NOT EXISTS live_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id INTEGER NOT NULL,
+    origin VARCHAR(32) NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
+-- 보관 기간 지난 행 정리
+CREATE INDEX IF NOT EXISTS idx_live_events_created ON live_events (created_at);
+
+-- ============================================
+-- 14. 이어 올리기 업로드 세션 (upload_sessions)
+--     studio 조각 업로드 진행 상태, 완료 시 videos 행 생성 후 삭제 (app.utils.uploads)
+-- ============================================
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id VARCHAR(32) PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    original_name VARCHAR(255) NOT NULL,
+    size BIGINT NOT NULL,
+    received BIGINT NOT NULL DEFAULT 0,
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    category VARCHAR(50),
+    tags TEXT,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- 만료 세션 정리
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_expires ON upload_sessions (expires_at);
+
+-- ============================================
+-- 15. 업로드 파일 참조 수 (media_blobs)
+--     내용 해시 이름(<sha256>.ext) 파일을 가리키는 videos·users 행 수, 0 이 되면 파일 삭제 (app.utils.media_store)
+--     kind: video(videos.video_path) | thumbnail(videos.thumbnail_path) | profile(users.profile_image)
+-- ============================================
+CREATE TABLE IF NOT EXISTS media_blobs (
+    kind VARCHAR(16) NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    sha256 VARCHAR(64),
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (kind, filename)
+);
+
+-- ============================================
+-- 16. 변환본 (video_renditions)
+--     업로드 후 백그라운드 ffmpeg 변환 상태, 비디오당 faststart MP4 1행 + HLS 화질별 1행 (app.utils.transcode)
+--     status: queued | running | ready | failed | skipped (원본보다 높은 화질)
+-- ============================================
+CREATE TABLE IF NOT EXISTS video_renditions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id INTEGER NOT NULL,
+    name VARCHAR(32) NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    bitrate INTEGER,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    path VARCHAR(255),
+    error TEXT,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+    CONSTRAINT uq_video_renditions_video_name UNIQUE (video_id, name)
+);
+
+-- ============================================
+-- 17. 관련 동영상 후보 (related_candidates)
+--     비디오별 점수 상위 RELATED_CANDIDATES 개를 순위대로 저장, 바뀐 비디오·태그 이웃의 목록만 삭제 후 다시 계산 (app.utils.related)
+-- ============================================
+CREATE TABLE IF NOT EXISTS related_candidates (
+    video_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    related_id INTEGER NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (video_id, position),
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+    FOREIGN KEY (related_id) REFERENCES videos(id) ON DELETE CASCADE
+);
+
+-- 이 비디오를 후보로 가진 목록 찾기 (비디오 변경·삭제 시 무효화)
+CREATE INDEX IF NOT EXISTS idx_related_candidates_related ON related_candidates (related_id);
@@ -19,6 +19,9 @@ def app():
     USE_TEST_DB_FILE=1 이면 instance/test_pytest.db 사용 → 테스트 후 sqlite3/DB Browser로 검증 가능.
     """
     prev = os.environ.get("DATABASE_URL")
+    prev_transcode = os.environ.get("TRANSCODE_ENABLED")
+    # ffmpeg 이 설치된 환경에서도 테스트용 가짜 동영상을 변환하지 않도록 (test_transcode 는 직접 켬)
+    os.environ["TRANSCODE_ENABLED"] = "0"
     use_file = os.environ.get("USE_TEST_DB_FILE", "").strip() == "1"
     if use_file:
         TEST_DB_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -33,12 +36,18 @@ def app():
         app = create_app()
         app.config["TESTING"] = True
         app.config["WTF_CSRF_ENABLED"] = False  # 테스트 시 CSRF 검증 비활성화
+        # 조회수는 테스트가 직접 flush (주기 flush 스레드가 테스트 도중 같은 in-memory DB 에 commit 하지 않도록)
+        app.config["VIEW_COUNTER_TIMER"] = False
         yield app
     finally:
         if prev is not None:
             os.environ["DATABASE_URL"] = prev
         elif "DATABASE_URL" in os.environ:
             del os.environ["DATABASE_URL"]
+        if prev_transcode is not None:
+            os.environ["TRANSCODE_ENABLED"] = prev_transcode
+        else:
+            os.environ.pop("TRANSCODE_ENABLED", None)
 
 
 @pytest.fixture
@@ -70,6 +79,7 @@ def real_app():
     """실제 DB 사용 (instance/wetube.db) – 시드 데이터 삽입용."""
     app = create_app()
     app.config["TESTING"] = True
+    app.config["VIEW_COUNTER_TIMER"] = False
     return app
 
 
@@ -84,3 +94,26 @@ def real_app_ctx(real_app):
     """실제 DB 앱 컨텍스트."""
     with real_app.app_context():
         yield real_app
+
+
+@pytest.fixture
+def assert_max_queries(app):
+    """
+    블록 안 SQL 문장 수 상한 검사.
+        with assert_max_queries(5):
+            client.get("/watch/1")
+    초과하면 실행된 문장 모양 목록과 함께 실패.
+    """
+    from contextlib import contextmanager
+
+    from app import sql_metrics
+
+    @contextmanager
+    def _assert(limit):
+        with app.app_context(), sql_metrics.count_queries() as recorded:
+            yield recorded
+        assert recorded.count <= limit, (
+            f"쿼리 {recorded.count}개 실행 (상한 {limit}):\n" + "\n".join(recorded.shapes)
+        )
+
+    return _assert
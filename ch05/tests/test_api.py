@@ -298,6 +298,102 @@ def test_get_related_videos_no_duplicates(app_ctx, user):
     assert len(ids) == len(set(ids))
 
 
+def test_get_related_videos_scores_shared_tags_and_popularity(app_ctx, user, other_user):
+    """공유 태그가 많을수록, 같은 단계에서는 인기도가 높을수록 앞."""
+    v1 = Video(title="현재", video_path="v1.mp4", user_id=user.id)
+    one_tag = Video(title="태그1개", video_path="v2.mp4", user_id=other_user.id)
+    two_tags = Video(title="태그2개", video_path="v3.mp4", user_id=other_user.id)
+    popular = Video(title="인기", video_path="v4.mp4", user_id=other_user.id, views=5000)
+    quiet = Video(title="조용", video_path="v5.mp4", user_id=other_user.id, views=1)
+    db.session.add_all([v1, one_tag, two_tags, popular, quiet])
+    db.session.commit()
+    v1.save_tags("가,나", commit=False)
+    one_tag.save_tags("가", commit=False)
+    two_tags.save_tags("가,나", commit=False)
+    db.session.commit()
+
+    ids = [x.id for x in get_related_videos(v1.id, limit=5)]
+    assert ids == [two_tags.id, one_tag.id, popular.id, quiet.id]
+
+
+def test_related_videos_cached_single_lookup(app, app_ctx, user):
+    """후보 인덱스 적중 시 관련 동영상 조회는 쿼리 1번."""
+    from sqlalchemy import event
+
+    v1 = Video(title="현재", video_path="v1.mp4", user_id=user.id)
+    db.session.add_all([v1] + [Video(title=f"r{i}", video_path=f"r{i}.mp4", user_id=user.id) for i in range(3)])
+    db.session.commit()
+    first = [x.id for x in get_related_videos(v1.id)]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        second = [x.id for x in get_related_videos(v1.id)]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert second == first
+    assert len(statements) == 1
+
+
+def test_related_videos_invalidated_on_tag_change(app_ctx, user, other_user):
+    """태그 변경 commit 후에는 새 점수로 다시 계산."""
+    v1 = Video(title="현재", video_path="v1.mp4", user_id=user.id)
+    v2 = Video(title="나중에 태그", video_path="v2.mp4", user_id=other_user.id)
+    v3 = Video(title="인기", video_path="v3.mp4", user_id=other_user.id, views=100)
+    db.session.add_all([v1, v2, v3])
+    db.session.commit()
+    v1.save_tags("공통")
+    assert [x.id for x in get_related_videos(v1.id)] == [v3.id, v2.id]
+
+    v2.save_tags("공통")
+    assert [x.id for x in get_related_videos(v1.id)] == [v2.id, v3.id]
+
+
+def test_related_videos_invalidates_only_affected_lists(app, app_ctx, user):
+    """태그 변경은 태그 이웃의 후보 목록만, 비디오 삭제는 그 비디오를 후보로 가진 목록만 지움."""
+    from app.models import RelatedCandidate
+
+    app.extensions["related_videos"].candidates = 1
+    v1, v2, v3, v4 = (Video(title=f"v{i}", video_path=f"v{i}.mp4", user_id=user.id) for i in range(1, 5))
+    db.session.add_all([v1, v2, v3, v4])
+    db.session.commit()
+    v1.save_tags("가")
+    v2.save_tags("가")
+    v3.save_tags("나")
+    v4.save_tags("나")
+    assert [x.id for x in get_related_videos(v1.id, limit=1)] == [v2.id]
+    assert [x.id for x in get_related_videos(v3.id, limit=1)] == [v4.id]
+
+    def stored():
+        return set(db.session.execute(db.select(RelatedCandidate.video_id).distinct()).scalars())
+
+    assert stored() == {v1.id, v3.id}
+    v2.save_tags("가, 다")  # 새 태그 "다" 는 다른 비디오 점수에 영향 없음 → v2 자신의 목록만
+    assert stored() == {v1.id, v3.id}
+    v4.save_tags("")  # "나" 가 빠짐 → 태그 이웃 v3 의 목록 삭제
+    assert stored() == {v1.id}
+
+    db.session.delete(v2)  # v2 를 후보로 가진 v1 의 목록 삭제
+    db.session.commit()
+    assert stored() == set()
+    assert v2.id not in [x.id for x in get_related_videos(v1.id, limit=1)]
+
+
+def test_watch_and_api_related_agree(client, app_ctx, user, other_user):
+    """시청 페이지 사이드바와 상세 API 가 같은 추천 순서."""
+    v1 = Video(title="현재", video_path="v1.mp4", user_id=user.id, category="edu")
+    same_cat = Video(title="같은카테고리영상", video_path="v2.mp4", user_id=other_user.id, category="edu")
+    other = Video(title="무관한영상", video_path="v3.mp4", user_id=other_user.id, views=50)
+    db.session.add_all([v1, same_cat, other])
+    db.session.commit()
+
+    api_titles = [x["title"] for x in client.get(f"/api/videos/{v1.id}").get_json()["related_videos"]]
+    assert api_titles == ["같은카테고리영상", "무관한영상"]
+    html = client.get(f"/watch/{v1.id}").data.decode("utf-8")
+    assert html.index("같은카테고리영상") < html.index("무관한영상")
+
+
 # ===========================================================================
 # 4. 태그 API – GET /api/tags/popular
 # ===========================================================================
@@ -480,3 +576,120 @@ def test_api_user_videos_pagination(client, app_ctx, user):
     data = resp.get_json()
     assert len(data["items"]) <= 2
     assert data["meta"]["current_page"] == 1
+
+
+# ===========================================================================
+# 8. 커서(keyset) 페이지네이션 – cursor= 파라미터
+# ===========================================================================
+
+
+@pytest.fixture
+def many_videos(app_ctx, user):
+    """created_at·views 가 서로 다른 비디오 7개 (id 1~7 순서대로 오래된 것부터)."""
+    from datetime import datetime, timedelta
+
+    base = datetime(2025, 1, 1)
+    vids = []
+    for i in range(7):
+        v = Video(
+            title=f"cur{i}",
+            video_path=f"cur{i}.mp4",
+            user_id=user.id,
+            views=i % 3,
+            likes=i % 2,
+            created_at=base + timedelta(hours=i),
+        )
+        db.session.add(v)
+        vids.append(v)
+    db.session.commit()
+    return vids
+
+
+def _walk_cursor(client, url, per_page=3):
+    """next_cursor 를 따라 끝까지 조회해 제목 목록 반환."""
+    titles = []
+    sep = "&" if "?" in url else "?"
+    resp = client.get(f"{url}{sep}cursor=&per_page={per_page}").get_json()
+    titles += [x["title"] for x in resp["items"]]
+    while resp["meta"]["has_next"]:
+        resp = client.get(f"{url}{sep}cursor={resp['meta']['next_cursor']}&per_page={per_page}").get_json()
+        titles += [x["title"] for x in resp["items"]]
+    return titles
+
+
+def test_api_videos_cursor_latest_walks_all(client, app_ctx, many_videos):
+    """cursor 모드 latest → 최신순으로 중복·누락 없이 전체 순회, total 미포함."""
+    resp = client.get("/api/videos?cursor=&per_page=3")
+    data = resp.get_json()
+    assert data["success"] is True
+    assert "total_items" not in data["meta"]
+    assert data["meta"]["has_prev"] is False
+    assert _walk_cursor(client, "/api/videos") == [f"cur{i}" for i in range(6, -1, -1)]
+
+
+@pytest.mark.parametrize("sort", ["views", "popular"])
+def test_api_videos_cursor_matches_offset_order(client, app_ctx, many_videos, sort):
+    """views/popular 정렬도 동률(id 기준)까지 포함해 중복 없이 전체 순회."""
+    titles = _walk_cursor(client, f"/api/videos?sort={sort}", per_page=2)
+    assert sorted(titles) == sorted(v.title for v in many_videos)
+    assert len(titles) == len(set(titles))
+    by_title = {v.title: v for v in many_videos}
+    if sort == "views":
+        keys = [(by_title[t].views, by_title[t].id) for t in titles]
+    else:
+        keys = [(by_title[t].likes, by_title[t].views, by_title[t].id) for t in titles]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_api_videos_cursor_prev_returns_previous_page(client, app_ctx, many_videos):
+    """두 번째 페이지의 prev_cursor → 첫 페이지와 동일."""
+    first = client.get("/api/videos?cursor=&per_page=3").get_json()
+    second = client.get(f"/api/videos?cursor={first['meta']['next_cursor']}&per_page=3").get_json()
+    assert second["meta"]["has_prev"] is True
+    back = client.get(f"/api/videos?cursor={second['meta']['prev_cursor']}&per_page=3").get_json()
+    assert [x["id"] for x in back["items"]] == [x["id"] for x in first["items"]]
+    assert back["meta"]["has_prev"] is False
+
+
+def test_api_videos_cursor_with_total(client, app_ctx, many_videos):
+    """with_total=1 일 때만 total_items 포함."""
+    data = client.get("/api/videos?cursor=&with_total=1").get_json()
+    assert data["meta"]["total_items"] == 7
+
+
+def test_api_videos_cursor_invalid_returns_400(client, app_ctx, many_videos):
+    """깨진 커서·정렬이 다른 커서 → 400."""
+    assert client.get("/api/videos?cursor=garbage").status_code == 400
+    first = client.get("/api/videos?cursor=&per_page=2").get_json()
+    resp = client.get(f"/api/videos?sort=views&cursor={first['meta']['next_cursor']}")
+    assert resp.status_code == 400
+    assert resp.get_json()["success"] is False
+
+
+def test_api_tag_and_user_videos_cursor(client, app_ctx, user, many_videos):
+    """태그별·사용자별 목록도 cursor 모드 지원."""
+    for v in many_videos[:4]:
+        v.save_tags("커서태그", commit=False)
+    db.session.commit()
+    assert _walk_cursor(client, "/api/tags/커서태그/videos", per_page=3) == ["cur3", "cur2", "cur1", "cur0"]
+    titles = _walk_cursor(client, f"/api/users/{user.username}/videos", per_page=3)
+    assert titles == [f"cur{i}" for i in range(6, -1, -1)]
+
+
+def test_index_cursor_mode_renders_next_cursor(client, app_ctx, many_videos):
+    """홈 화면 cursor 모드 → 더 보기 버튼에 data-next-cursor."""
+    for i in range(10):
+        db.session.add(Video(title=f"extra{i}", video_path=f"e{i}.mp4", user_id=1))
+    db.session.commit()
+    resp = client.get("/?cursor=")
+    assert resp.status_code == 200
+    assert b"data-next-cursor=" in resp.data
+
+
+def test_index_invalid_cursor_redirects_with_notice(client, app_ctx, many_videos):
+    """홈 화면 잘못된 커서 → 커서만 비운 주소로 redirect (다른 조건 유지) + 알림 표시."""
+    resp = client.get("/?cursor=garbage&sort=views")
+    assert resp.status_code == 302
+    assert resp.headers["Location"] == "/?cursor=&sort=views"
+    page = client.get(resp.headers["Location"]).get_data(as_text=True)
+    assert "목록 위치 정보가 올바르지 않아" in page
@@ -1,5 +1,6 @@
 # 단위 테스트 – 프로필 수정 기능 (lsy/1234 → lsy수정/1234수정)
 
+import hashlib
 import os
 from io import BytesIO
 
@@ -335,7 +336,8 @@ def test_profile_post_upload_image_success(logged_in_profile_client, app_ctx, pr
     u = db.session.get(User, profile_user.id)
     assert u.profile_image is not None
     assert u.profile_image.endswith(".png")
-    assert "profile" in u.profile_image or "_" in u.profile_image
+    # 내용 주소 이름: <sha256>.png
+    assert u.profile_image == hashlib.sha256(png_data).hexdigest() + ".png"
 
     # 실제 파일 저장 확인
     profile_dir = app.config["PROFILE_IMAGE_FOLDER"]
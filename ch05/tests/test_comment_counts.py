@@ -0,0 +1,112 @@
+# 단위 테스트 – 댓글 수 집계 컬럼 (videos.comment_count, 채널·전체 합계)
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import Comment, User, Video
+from app.routes.studio import _get_studio_dashboard_data
+from app.utils.comment_counts import check_comment_counts
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def video(user):
+    v = Video(title="counted", video_path="counted.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+@pytest.fixture
+def thread(user, video):
+    """댓글 1개 + 답글 2개 + 답글의 답글 1개."""
+    top = Comment(content="top", user_id=user.id, video_id=video.id)
+    db.session.add(top)
+    db.session.flush()
+    replies = [Comment(content=f"re{i}", user_id=user.id, video_id=video.id, parent_id=top.id) for i in range(2)]
+    db.session.add_all(replies)
+    db.session.flush()
+    db.session.add(Comment(content="deep", user_id=user.id, video_id=video.id, parent_id=replies[0].id))
+    db.session.commit()
+    return top
+
+
+def _count(video):
+    db.session.expire_all()
+    return db.session.get(Video, video.id).comment_count
+
+
+def test_delete_parent_cascades_replies_and_counter(logged_in_client, video, thread):
+    """답글 달린 댓글 삭제: 답글까지 지워지고 집계도 그만큼 차감."""
+    assert _count(video) == 4
+    logged_in_client.post(f"/comments/{thread.id}/delete")
+    assert _count(video) == 0
+    assert db.session.execute(text("SELECT COUNT(*) FROM comments")).scalar() == 0
+
+
+def test_admin_delete_adjusts_counter(client, user, video, thread):
+    """admin.comment_delete 도 같은 경로로 차감, 관리자 대시보드 전체 댓글 수는 집계 합."""
+    reply_id = thread.replies[1].id
+    user.is_admin = True
+    db.session.commit()
+    client.post("/auth/login", data={"login_id": "default", "password": "default"})
+    client.post(f"/admin/comments/{reply_id}/delete")
+    assert _count(video) == 3
+    assert '<div class="stat-value">3</div>' in client.get("/admin/").data.decode("utf-8")
+
+
+def test_channel_total_rolls_up_video_counters(user, video, thread, assert_max_queries):
+    """스튜디오 대시보드 댓글 총계는 videos.comment_count 합 (comments 를 세지 않음)."""
+    other = Video(title="second", video_path="second.mp4", user_id=user.id)
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(Comment(content="x", user_id=user.id, video_id=other.id))
+    db.session.commit()
+    with assert_max_queries(10) as recorded:
+        stats = _get_studio_dashboard_data(user.id)["stats"]
+    assert stats["total_comments"] == 5
+    assert not any("FROM comments" in shape for shape in recorded.shapes)
+
+
+def test_check_and_repair(user, video, thread):
+    """SQL 로 직접 지운 답글은 불일치로 잡히고 repair 로 복구."""
+    db.session.execute(text("DELETE FROM comments WHERE content = 'deep'"))
+    db.session.commit()
+    assert check_comment_counts() == [(video.id, 4, 3)]
+    assert check_comment_counts(repair=True) == [(video.id, 4, 3)]
+    assert check_comment_counts() == []
+
+
+def test_repair_counts_at_update_time(user, video, thread):
+    """검사 후 수정 전에 바뀐 댓글도 반영 – repair 는 어긋난 비디오만 UPDATE 시점의 comments 로 다시 셈."""
+    from sqlalchemy import event
+
+    other = Video(title="ok", video_path="ok.mp4", user_id=user.id)
+    db.session.add(other)
+    db.session.commit()
+    db.session.execute(text("DELETE FROM comments WHERE content = 'deep'"))
+    db.session.commit()
+
+    statements = []
+
+    def racing_delete(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE videos"):
+            statements.append((statement, parameters))
+            # 검사와 수정 사이에 다른 요청이 답글 1개를 더 지운 상황
+            cursor.execute("DELETE FROM comments WHERE content = 're1'")
+
+    event.listen(db.engine, "before_cursor_execute", racing_delete)
+    try:
+        assert check_comment_counts(repair=True) == [(video.id, 4, 3)]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", racing_delete)
+    assert len(statements) == 1 and other.id not in statements[0][1]
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 2
+    assert check_comment_counts() == []
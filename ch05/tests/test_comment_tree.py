@@ -0,0 +1,106 @@
+# 단위 테스트 – 재귀 CTE 댓글 하위 트리 연산 (app.utils.comment_tree)
+
+import pytest
+
+from app import db
+from app.models import Comment, User, Video
+from app.utils.comment_counts import check_comment_counts
+from app.utils.comment_tree import count_descendants, delete_subtree, fetch_thread
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def video(user):
+    v = Video(title="tree", video_path="tree.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _add(video, content, parent=None):
+    c = Comment(content=content, user_id=1, video_id=video.id, parent_id=parent.id if parent else None)
+    db.session.add(c)
+    db.session.flush()
+    return c
+
+
+@pytest.fixture
+def tree(video):
+    """
+    a ─ a1 ─ a1x
+      └ a2
+    b (다른 스레드)
+    """
+    a = _add(video, "a")
+    a1 = _add(video, "a1", a)
+    _add(video, "a1x", a1)
+    _add(video, "a2", a)
+    _add(video, "b")
+    db.session.commit()
+    return a
+
+
+def test_count_descendants(tree):
+    """하위 답글 수 (모든 단계, 자기 자신 제외)."""
+    assert count_descendants(tree.id) == 3
+    assert count_descendants(tree.replies[1].id) == 0
+
+
+def test_fetch_thread_preorder_and_depth_limit(tree):
+    """전위 순회 순서 + depth, max_depth 단계까지만."""
+    assert [(c.content, d) for c, d in fetch_thread(tree.id).items] == [("a", 0), ("a1", 1), ("a1x", 2), ("a2", 1)]
+    assert [c.content for c, _ in fetch_thread(tree.id, max_depth=1).items] == ["a", "a1", "a2"]
+    assert fetch_thread(9999).items == []
+
+
+def test_fetch_thread_limit_and_continue(app, client, tree):
+    """limit 에서 잘리면 얕은 단계부터 채우고, 답글이 빠진 댓글 id 를 continue 로 알려 줌."""
+    thread = fetch_thread(tree.id, limit=3)
+    assert [c.content for c, _ in thread.items] == ["a", "a1", "a2"]
+    assert thread.truncated
+    assert [db.session.get(Comment, i).content for i in thread.continue_ids] == ["a1"]
+    full = fetch_thread(tree.id, limit=4)
+    assert (len(full.items), full.truncated, full.continue_ids) == (4, False, [])
+    # depth 제한에 닿은 답글은 이어 읽을 대상이 아님
+    assert fetch_thread(tree.id, max_depth=1, limit=3).continue_ids == []
+
+    app.config["COMMENT_THREAD_MAX_NODES"] = 2
+    data = client.get(f"/api/comments/{tree.id}/thread").get_json()
+    assert [item["content"] for item in data["items"]] == ["a", "a1"]
+    assert data["truncated"] is True
+    assert data["continue"] == [tree.id, tree.replies[0].id]
+    more = client.get(f"/api/comments/{data['continue'][1]}/thread").get_json()
+    assert ([item["content"] for item in more["items"]], more["truncated"]) == (["a1", "a1x"], False)
+
+
+def test_delete_subtree_is_set_based(video, tree, assert_max_queries):
+    """하위 트리 DELETE 1번 + 댓글 수 UPDATE 1번, 다른 스레드·집계는 그대로 맞음."""
+    tree_id, video_id = tree.id, video.id
+    with assert_max_queries(2):
+        removed = delete_subtree(db.session.connection(), tree_id, video_id)
+        db.session.commit()
+    assert removed == 4
+    assert [c.content for c in Comment.query.all()] == ["b"]
+    assert check_comment_counts() == []
+
+
+def test_deep_chain_thread_api(client, video):
+    """재귀 한도를 넘는 깊은 답글 사슬도 CTE 로 세고 지움, thread API 는 depth 단계까지."""
+    root = parent = _add(video, "root")
+    for i in range(1500):
+        parent = _add(video, f"d{i}", parent)
+    db.session.commit()
+    assert count_descendants(root.id) == 1500
+
+    data = client.get(f"/api/comments/{root.id}/thread?depth=2").get_json()
+    assert [(item["content"], item["depth"]) for item in data["items"]] == [("root", 0), ("d0", 1), ("d1", 2)]
+    assert client.get("/api/comments/9999/thread").status_code == 404
+
+    assert delete_subtree(db.session.connection(), root.id, video.id) == 1501
+    db.session.commit()
+    assert check_comment_counts() == []
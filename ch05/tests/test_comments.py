@@ -382,3 +382,71 @@ def test_watch_no_comments_shows_empty(client, app_ctx, video):
     assert resp.status_code == 200
     text = resp.data.decode("utf-8")
     assert "댓글" in text or "comments" in text.lower()
+
+
+# ----- 댓글 페이지 (app.utils.comment_threads, 댓글 API·더보기) -----
+@pytest.fixture
+def many_comments(app, app_ctx, user, video):
+    """최상위 댓글 7개 (0번 댓글에 답글 5개), 페이지 크기 3·앞쪽 답글 2개."""
+    from datetime import datetime, timedelta
+
+    app.config.update(COMMENTS_PER_PAGE=3, COMMENT_REPLY_PREVIEW=2)
+    base = datetime(2024, 1, 1)
+    tops = [Comment(content=f"top{i}", user_id=user.id, video_id=video.id, created_at=base + timedelta(minutes=i))
+            for i in range(7)]
+    db.session.add_all(tops)
+    db.session.flush()
+    db.session.add_all([
+        Comment(content=f"re{i}", user_id=user.id, video_id=video.id, parent_id=tops[0].id,
+                created_at=base + timedelta(hours=1, minutes=i))
+        for i in range(5)
+    ])
+    db.session.commit()
+    return tops
+
+
+def test_api_comment_pages_follow_cursor(client, video, many_comments):
+    """API: 커서로 최상위 댓글을 작성 순서대로 끝까지, 답글 수·앞쪽 답글 포함."""
+    seen, cursor = [], None
+    while True:
+        url = f"/api/videos/{video.id}/comments" + (f"?cursor={cursor}" if cursor else "")
+        data = client.get(url).get_json()
+        assert data["total_comments"] == 12
+        seen += [item["content"] for item in data["items"]]
+        cursor = data["meta"]["next_cursor"]
+        if not data["meta"]["has_next"]:
+            break
+    assert seen == [f"top{i}" for i in range(7)]
+
+    first = client.get(f"/api/videos/{video.id}/comments").get_json()["items"][0]
+    assert first["reply_count"] == 5 and [r["content"] for r in first["replies"]] == ["re0", "re1"]
+    rest = client.get(f"/api/comments/{first['id']}/replies?cursor={first['replies_cursor']}").get_json()
+    assert [r["content"] for r in rest["items"]] == ["re2", "re3", "re4"]
+    assert client.get(f"/api/videos/{video.id}/comments?cursor=broken").status_code == 400
+
+
+def test_watch_renders_first_page_with_bounded_queries(client, video, many_comments, assert_max_queries):
+    """시청 페이지는 첫 페이지만 렌더, 더보기 조각이 다음 페이지. 댓글 조회는 2번 (댓글 수와 무관)."""
+    with assert_max_queries(30) as recorded:
+        text = client.get(f"/watch/{video.id}").data.decode("utf-8")
+    assert sum("FROM comments" in shape for shape in recorded.shapes) == 2
+    assert "top2" in text and "top3" not in text
+    assert "re1" in text and "re2" not in text and "답글 3개 더보기" in text
+    assert '<span id="comments-count">12</span>' in text
+
+    more = client.get(f"/watch/{video.id}/comments?cursor=").data.decode("utf-8")
+    assert "top0" in more  # 빈 커서는 첫 페이지
+    page = client.get(f"/api/videos/{video.id}/comments").get_json()
+    more = client.get(f"/watch/{video.id}/comments?cursor={page['meta']['next_cursor']}").data.decode("utf-8")
+    assert "top3" in more and "top5" in more and "top6" not in more and "댓글 더보기" in more
+
+
+def test_comment_count_follows_create_reply_delete(logged_in_client, video, comment):
+    """작성·답글·삭제마다 videos.comment_count 증감."""
+    logged_in_client.post("/comments/create", data={"video_id": video.id, "content": "새 댓글"})
+    logged_in_client.post(f"/comments/{comment.id}/reply", data={"content": "답글"})
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 3
+    logged_in_client.post(f"/comments/{comment.id}/delete")  # 답글도 함께 삭제
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 1
@@ -0,0 +1,165 @@
+# 단위 테스트 – 구독 피드 받은편지함 (app.utils.feed, fan-out-on-write)
+
+import pytest
+from sqlalchemy import select
+
+from app import create_app, db, feed_inbox
+from app.models import FeedItem, FeedPullChannel, Subscription, User, Video
+from app.utils.feed import rebuild_inbox
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+def _user(name):
+    u = User(username=name, email=f"{name}@example.com", password_hash="")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def _video(author, title):
+    v = Video(title=title, video_path=f"{title}.mp4", user_id=author.id)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _inbox(subscriber):
+    return set(
+        db.session.execute(select(FeedItem.video_id).where(FeedItem.subscriber_id == subscriber.id)).scalars()
+    )
+
+
+def test_upload_fans_out_to_subscribers(app_ctx, user):
+    """업로드한 비디오가 구독자 받은편지함에만 들어감."""
+    channel, stranger = _user("ch"), _user("stranger")
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+    db.session.commit()
+    v = _video(channel, "new")
+    assert _inbox(user) == {v.id}
+    assert _inbox(stranger) == set()
+
+
+def test_subscribe_backfills_and_unsubscribe_prunes(client, app_ctx, user):
+    """구독 토글: 기존 비디오 채움 → 해제 시 그 채널 행만 삭제."""
+    channel, other = _user("ch"), _user("other")
+    old = [_video(channel, f"old{i}") for i in range(3)]
+    kept = _video(other, "kept")
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=other.id))
+    db.session.commit()
+
+    assert client.post("/user/ch/subscribe").get_json()["is_subscribed"] is True
+    assert _inbox(user) == {v.id for v in old} | {kept.id}
+    assert client.post("/user/ch/subscribe").get_json()["is_subscribed"] is False
+    assert _inbox(user) == {kept.id}
+
+
+def test_feed_page_is_newest_first_and_drops_deleted(app_ctx, user):
+    """피드는 업로드 역순, 삭제된 비디오는 받은편지함에서도 사라짐."""
+    channel = _user("ch")
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+    db.session.commit()
+    videos = [_video(channel, f"v{i}") for i in range(3)]
+    db.session.delete(videos[1])
+    db.session.commit()
+
+    page = feed_inbox.page(user.id, page=1, per_page=12)
+    assert [v.title for v in page.items] == ["v2", "v0"]
+    assert page.total == 2
+
+
+def test_large_channel_switches_to_pull(app, app_ctx, user):
+    """구독자 수가 상한을 넘으면 pull 채널로 전환, 피드는 읽을 때 합쳐서 보여줌."""
+    app.extensions["feed_inbox"].max_subscribers = 2
+    big, small = _user("big"), _user("small")
+    fans = [user] + [_user(f"fan{i}") for i in range(2)]
+    for fan in fans:
+        db.session.add(Subscription(subscriber_id=fan.id, subscribed_to_id=big.id))
+        db.session.commit()
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=small.id))
+    db.session.commit()
+    assert db.session.get(FeedPullChannel, big.id) is not None
+
+    big_video, small_video = _video(big, "big"), _video(small, "small")
+    assert _inbox(user) == {small_video.id}  # pull 채널 비디오는 배포 안 함
+    page = feed_inbox.page(user.id)
+    assert [v.id for v in page.items] == [small_video.id, big_video.id]
+    assert [v.id for v in feed_inbox.page(fans[1].id).items] == [big_video.id]
+
+
+def test_rebuild_inbox_matches_incremental(app_ctx, user):
+    """rebuild_inbox 결과가 이벤트로 유지한 받은편지함과 같음."""
+    channel = _user("ch")
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+    db.session.commit()
+    ids = {_video(channel, f"v{i}").id for i in range(3)}
+    assert rebuild_inbox() == (3, 0)
+    assert _inbox(user) == ids
+
+
+def test_async_fanout_after_commit(tmp_path, monkeypatch):
+    """파일 DB 에서는 commit 후 백그라운드 스레드가 배포."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(tmp_path / "feed.db"))
+    monkeypatch.setenv("TAG_GRAPH_PATH", str(tmp_path / "tag_graph.bin"))
+    app = create_app()
+    with app.app_context():
+        assert app.extensions["feed_inbox"].asynchronous
+        fan, channel = _user("fan"), _user("ch")
+        db.session.add(Subscription(subscriber_id=fan.id, subscribed_to_id=channel.id))
+        db.session.commit()
+        v = _video(channel, "async")
+        feed_inbox.wait()
+        db.session.expire_all()
+        assert _inbox(fan) == {v.id}
+        db.session.remove()
+        db.engine.dispose()
+
+
+# ----- 읽기 전략: k-way 병합 (merge_page) -----
+@pytest.fixture
+def many_channels(user):
+    """채널 4개 × 비디오 7개, 일부는 같은 업로드 시각 (id 로 순서 결정)."""
+    from datetime import datetime, timedelta
+
+    base = datetime(2024, 1, 1)
+    for c in range(4):
+        channel = _user(f"ch{c}")
+        db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+        for i in range(7):
+            at = base + timedelta(hours=(i * 4 + c) // 2)
+            db.session.add(Video(title=f"c{c}v{i}", video_path=f"c{c}v{i}.mp4", user_id=channel.id, created_at=at))
+    db.session.add(Video(title="mine", video_path="mine.mp4", user_id=user.id))
+    db.session.commit()
+    return user
+
+
+@pytest.mark.parametrize("per_page", [3, 5, 12])
+def test_merge_page_matches_in_list_order(app_ctx, many_channels, per_page):
+    """모든 페이지에서 병합 결과가 기존 IN 쿼리(created_at, id 역순)와 같음."""
+    expected = [v.id for v in feed_inbox.page(many_channels.id, per_page=100, strategy="in_list").items]
+    assert len(expected) == 28
+    pages = (len(expected) + per_page - 1) // per_page
+    for page in range(1, pages + 1):
+        result = feed_inbox.page(many_channels.id, page=page, per_page=per_page, strategy="merge")
+        assert [v.id for v in result.items] == expected[(page - 1) * per_page:page * per_page]
+        assert result.has_next == (page < pages)
+        assert result.has_prev == (page > 1)
+
+
+def test_merge_page_query_count_bounded(app_ctx, many_channels, assert_max_queries):
+    """첫 페이지: 채널 머리 1번 + 채널별 slice(최대 4) + 페이지 비디오 로드 1번 (비디오 총량과 무관)."""
+    user_id = many_channels.id
+    with assert_max_queries(1 + 4 + 1):
+        feed_inbox.page(user_id, page=1, per_page=3, strategy="merge")
+
+
+def test_subscriptions_route_with_merge_strategy(app, client, app_ctx, many_channels):
+    """FEED_STRATEGY=merge 에서도 구독 피드 페이지·다음 링크 표시."""
+    app.extensions["feed_inbox"].strategy = "merge"
+    text = client.get("/subscriptions").data.decode("utf-8")
+    assert "c3v6" in text and "mine" not in text
+    assert "page=2" in text
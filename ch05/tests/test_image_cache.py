@@ -0,0 +1,155 @@
+# 단위 테스트 – 프로필 이미지 ?w= 크기 조절·디스크 LRU 캐시 (app.utils.image_cache)
+
+import io
+import os
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from app import db
+from app.models import User
+from app.utils import image_cache
+
+
+def _image(size=(800, 600), fmt="PNG", color=(200, 30, 30)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, fmt)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def cache(app, app_ctx, tmp_path):
+    """프로필·캐시 폴더를 임시 폴더로. 반환: 앱의 캐시 상태."""
+    app.config["PROFILE_IMAGE_FOLDER"] = str(tmp_path / "profiles")
+    app.config["PROFILE_IMAGE_CACHE_FOLDER"] = str(tmp_path / "cache")
+    os.makedirs(app.config["PROFILE_IMAGE_FOLDER"])
+    return app.extensions["image_cache"]
+
+
+def _put(app, name, data):
+    with open(os.path.join(app.config["PROFILE_IMAGE_FOLDER"], name), "wb") as f:
+        f.write(data)
+
+
+def test_resize_snap_and_etag(client, app, cache):
+    """?w=40 → 허용 너비 48 로 올려 축소, strong ETag, If-None-Match 304. w 없음 → 원본."""
+    _put(app, "a.png", _image())
+    resp = client.get("/media/profiles/a.png?w=40")
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/png"
+    assert Image.open(io.BytesIO(resp.data)).size == (48, 36)
+    etag = resp.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    again = client.get("/media/profiles/a.png?w=48", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert len(client.get("/media/profiles/a.png").data) == len(_image())
+    assert Image.open(io.BytesIO(client.get("/media/profiles/a.png?w=5000").data)).size == (256, 192)
+
+
+def test_bad_requests(client, app, cache):
+    _put(app, "a.png", _image())
+    assert client.get("/media/profiles/a.png?w=abc").status_code == 400
+    assert client.get("/media/profiles/a.png?w=0").status_code == 400
+    assert client.get("/media/profiles/missing.png?w=64").status_code == 404
+    _put(app, "broken.png", b"not an image")
+    assert client.get("/media/profiles/broken.png?w=64").status_code == 404
+
+
+def test_lru_eviction(client, app, cache):
+    """상한을 넘으면 가장 오래 안 쓴 변형부터 삭제 – 최근 적중한 변형은 유지."""
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        _put(app, name, _image(fmt="JPEG"))
+    first = image_cache.ImageCache().resized("a.jpg", 64)
+    cache.max_bytes = first.size * 2 + first.size // 2
+    image_cache.ImageCache().resized("b.jpg", 64)
+    image_cache.ImageCache().resized("a.jpg", 64)  # a 를 최근으로
+    image_cache.ImageCache().resized("c.jpg", 64)  # b 가 밀려남
+    names = sorted(os.listdir(os.path.join(app.config["PROFILE_IMAGE_CACHE_FOLDER"], "64")))
+    assert names == ["a.jpg.jpg", "c.jpg.jpg"]
+    assert cache.total <= cache.max_bytes
+
+
+def test_limit_is_shared_between_workers(app, cache):
+    """워커마다 상한 안이어도 폴더 전체가 넘으면 정리 – 다른 워커가 쓴 파일까지 오래된 순으로 삭제."""
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+        _put(app, name, _image(fmt="JPEG"))
+    other = image_cache._Cache(app)  # 같은 캐시 폴더를 쓰는 다른 워커 프로세스
+    first = cache.get("a.jpg", 64)
+    other.get("b.jpg", 64)
+    for state in (cache, other):
+        state.max_bytes = first.size * 2 + first.size // 2
+        state.sweep_interval = 3600
+    cache.get("c.jpg", 64)  # 이 워커 기준 2개 – 정리 없음
+    folder = os.path.join(app.config["PROFILE_IMAGE_CACHE_FOLDER"], "64")
+    assert len(os.listdir(folder)) == 3
+    for age, name in enumerate(("a.jpg.jpg", "b.jpg.jpg", "c.jpg.jpg")):  # 사용 순서를 분명히
+        os.utime(os.path.join(folder, name), (1000 + age, 1000 + age))
+
+    other.sweep_interval = 0  # 주기가 지난 뒤 새로 쓰면 폴더 전체를 스캔
+    other.get("d.jpg", 64)
+    assert sorted(os.listdir(folder)) == ["c.jpg.jpg", "d.jpg.jpg"]
+    assert other.total <= other.max_bytes
+    assert not os.path.exists(os.path.join(app.config["PROFILE_IMAGE_CACHE_FOLDER"], image_cache.SWEEP_LOCK))
+
+
+def test_cache_survives_restart(app, cache):
+    """다른 프로세스·재시작: 디스크 파일을 mtime 순으로 다시 읽고 ETag 는 같은 내용에서 같은 값."""
+    _put(app, "a.png", _image())
+    before = image_cache.ImageCache().resized("a.png", 64)
+    cache.entries.clear()
+    cache.loaded_folder = None
+    after = image_cache.ImageCache().resized("a.png", 64)
+    assert after.etag == before.etag
+    assert cache.total == after.size
+
+
+def test_concurrent_requests_coalesced(app, cache, monkeypatch):
+    """같은 변형을 동시에 요청하면 1번만 만들고 모두 같은 결과."""
+    _put(app, "a.png", _image())
+    calls = []
+    original = image_cache.resize_image
+
+    def slow_resize(*args, **kwargs):
+        calls.append(args)
+        time.sleep(0.2)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(image_cache, "resize_image", slow_resize)
+    results = []
+
+    def request():
+        with app.app_context():
+            results.append(image_cache.ImageCache().resized("a.png", 64))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and len({r.etag for r in results}) == 1
+
+
+def test_profile_change_invalidates_variants(logged_in_client, app, cache):
+    """auth.profile 로 이미지를 바꾸면 이전 원본이 삭제되면서 캐시 변형도 삭제."""
+    def upload(data):
+        logged_in_client.post(
+            "/auth/profile",
+            data={"nickname": "d", "email": "default@example.com", "profile_image": (io.BytesIO(data), "me.png")},
+            content_type="multipart/form-data",
+        )
+        db.session.expire_all()
+        return db.session.get(User, 1).profile_image
+
+    old = upload(_image(color=(1, 2, 3)))
+    assert logged_in_client.get(f"/media/profiles/{old}?w=64").status_code == 200
+    cached = os.path.join(app.config["PROFILE_IMAGE_CACHE_FOLDER"], "64", f"{old}.png")
+    assert os.path.exists(cached)
+
+    new = upload(_image(color=(9, 9, 9)))
+    assert new != old
+    assert not os.path.exists(cached)
+    assert cached not in cache.entries
@@ -0,0 +1,86 @@
+# 단위 테스트 – 업로드 스트리밍 저장 (app.utils.ingest)
+
+import hashlib
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.utils.image import validate_image_file
+from app.utils.ingest import BLOCK_SIZE, IngestError, ingest, sniff
+
+MP4_HEAD = b"\x00\x00\x00\x18ftypmp42"
+
+
+class _CountingStream(io.BytesIO):
+    """read() 호출별 요청 크기를 기록하는 스트림."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+def test_sniff_formats():
+    assert sniff(MP4_HEAD) == "isobmff"
+    assert sniff(b"\x1a\x45\xdf\xa3\x01") == "ebml"
+    assert sniff(b"\xff\xd8\xff\xe0") == "jpeg"
+    assert sniff(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff(b"plain text") is None
+
+
+def test_ingest_writes_blocks_and_hashes(tmp_path):
+    """블록 단위로 읽어 저장, 크기·SHA-256 반환, 임시 파일 없음."""
+    data = MP4_HEAD + os.urandom(3 * BLOCK_SIZE + 17)
+    stream = _CountingStream(data)
+    saved = ingest(stream, str(tmp_path / "v.mp4"), "mp4", len(data))
+    assert saved.size == len(data)
+    assert saved.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "v.mp4").read_bytes() == data
+    assert os.listdir(tmp_path) == ["v.mp4"]
+    assert all(0 < size <= BLOCK_SIZE for size in stream.reads)
+
+
+def test_ingest_stops_reading_at_size_limit(tmp_path):
+    """상한을 넘는 순간 중단 (나머지 본문은 읽지 않음), 쓰던 파일 삭제."""
+    stream = _CountingStream(MP4_HEAD + bytes(10 * BLOCK_SIZE))
+    with pytest.raises(IngestError):
+        ingest(stream, str(tmp_path / "v.mp4"), "mp4", BLOCK_SIZE + 1)
+    assert len(stream.reads) == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_ingest_rejects_mismatched_magic(tmp_path):
+    """확장자만 mp4 인 파일 거부."""
+    with pytest.raises(IngestError):
+        ingest(io.BytesIO(b"MZ\x90\x00 not a video"), str(tmp_path / "v.mp4"), "mp4", 1024)
+    assert os.listdir(tmp_path) == []
+
+
+def test_validate_image_reads_header_only():
+    """이미지 검증은 전체를 읽지 않음 (큰 PNG 도 앞부분만)."""
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.frombytes("RGB", (512, 512), os.urandom(512 * 512 * 3)).save(buf, format="PNG")
+    stream = _CountingStream(buf.getvalue())
+    ok, _ = validate_image_file(FileStorage(stream=stream, filename="a.png"), {"png"}, 5 * 1024 * 1024)
+    assert ok is True
+    assert -1 not in stream.reads
+    assert sum(stream.reads) < len(buf.getvalue()) // 4
+
+
+def test_studio_upload_rejects_renamed_file(logged_in_client, app, tmp_path):
+    """studio.upload: 내용이 동영상이 아니면 400, 저장 파일 없음."""
+    app.config["VIDEO_FOLDER"] = str(tmp_path)
+    res = logged_in_client.post(
+        "/studio/upload",
+        data={"title": "t", "video": (io.BytesIO(b"#!/bin/sh\necho hi\n"), "clip.mp4")},
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 400
+    assert os.listdir(tmp_path) == []
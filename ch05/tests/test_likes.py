@@ -85,11 +85,12 @@ def test_like_status_logged_in_not_liked(client, app_ctx, video, other_user):
 
 
 def test_like_status_logged_in_liked(client, app_ctx, video, other_user):
-    """로그인 후 좋아요 누른 상태 → is_liked True, likes_count 반영."""
-    # video_likes에 직접 추가 (로그인 전 좋아요 상태 시뮬레이션)
+    """로그인 후 좋아요 누른 상태 → is_liked True, likes_count 는 videos.likes 값."""
+    # video_likes에 직접 추가 (로그인 전 좋아요 상태 시뮬레이션, 토글과 같이 videos.likes 도 함께)
     db.session.execute(
         insert(video_likes).values(video_id=video.id, user_id=other_user.id)
     )
+    video.likes = 1
     db.session.commit()
 
     _login_client(client, "likes_other", "secret")
@@ -193,3 +194,89 @@ def test_toggle_like_multiple_users_count_correct(logged_in_client, app_ctx, vid
     assert data["success"] is True
     assert data["is_liked"] is True
     assert data["likes_count"] == 2
+
+
+def test_toggle_like_does_not_recount_video_likes(logged_in_client, app_ctx, video, assert_max_queries):
+    """토글·상태 조회 모두 video_likes COUNT 없이 videos.likes 를 SQL 에서 ±1."""
+    video_id = video.id
+    with assert_max_queries(20) as recorded:
+        logged_in_client.post(f"/video/{video_id}/like")
+        status = logged_in_client.get(f"/video/{video_id}/like/status").get_json()
+    assert status["likes_count"] == 1
+    assert not any("count(" in shape.lower() for shape in recorded.shapes)
+    assert any("SET likes=(videos.likes + ?)" in shape for shape in recorded.shapes)
+
+
+def test_toggle_like_concurrent_insert_keeps_count(logged_in_client, app_ctx, video, user, monkeypatch):
+    """다른 요청이 먼저 같은 좋아요를 넣은 경우: 중복 INSERT 무시, 카운트도 더하지 않음."""
+    from app.routes import likes
+
+    video_id = video.id
+    real = likes.delete
+
+    def racing_delete(*args, **kwargs):
+        # DELETE 직후 다른 요청이 같은 (user, video) 행을 넣고 likes 를 올린 상황
+        db.session.execute(insert(video_likes).values(video_id=video_id, user_id=user.id))
+        db.session.execute(
+            Video.__table__.update().where(Video.__table__.c.id == video_id).values(likes=Video.__table__.c.likes + 1)
+        )
+        return real(*args, **kwargs).where(video_likes.c.user_id == -1)
+
+    monkeypatch.setattr(likes, "delete", racing_delete)
+    data = logged_in_client.post(f"/video/{video_id}/like").get_json()
+    assert data["is_liked"] is True
+    assert data["likes_count"] == 1
+
+
+# ===========================================================================
+# POST /api/likes/status – 여러 비디오 좋아요 상태 일괄 조회
+# ===========================================================================
+
+
+@pytest.fixture
+def videos(app_ctx, user):
+    items = [Video(title=f"batch{i}", video_path=f"batch{i}.mp4", user_id=user.id, likes=i) for i in range(3)]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def test_batch_status_logged_in(client, app_ctx, videos, other_user, assert_max_queries):
+    """로그인: 누른 비디오만 is_liked, 좋아요 수는 videos.likes, 없는 id 는 제외. 쿼리 2번."""
+    ids = [v.id for v in videos]
+    db.session.execute(insert(video_likes).values(video_id=ids[1], user_id=other_user.id))
+    db.session.commit()
+    _login_client(client, "likes_other", "secret")
+    with assert_max_queries(4):  # 로그인 사용자 로드 + videos IN + video_likes IN (+ 여유 1)
+        resp = client.post("/api/likes/status", json={"video_ids": ids + [99999, ids[0]]})
+    assert resp.status_code == 200
+    assert resp.get_json()["items"] == {
+        str(ids[0]): {"is_liked": False, "likes_count": 0},
+        str(ids[1]): {"is_liked": True, "likes_count": 1},
+        str(ids[2]): {"is_liked": False, "likes_count": 2},
+    }
+
+
+def test_batch_status_anonymous_never_liked(client, app_ctx, videos, user):
+    """비로그인: like_status 와 같이 is_liked 는 항상 False."""
+    db.session.execute(insert(video_likes).values(video_id=videos[0].id, user_id=user.id))
+    db.session.commit()
+    items = client.post("/api/likes/status", json={"video_ids": [videos[0].id]}).get_json()["items"]
+    assert items == {str(videos[0].id): {"is_liked": False, "likes_count": 0}}
+
+
+@pytest.mark.parametrize("body", [{}, {"video_ids": "1,2"}, {"video_ids": [1, "2"]}, {"video_ids": list(range(101))}])
+def test_batch_status_rejects_bad_input(client, body):
+    """정수 목록이 아니거나 상한 초과 → 400."""
+    resp = client.post("/api/likes/status", json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()["success"] is False
+
+
+def test_batch_status_csrf_exempt(app, client, videos, monkeypatch):
+    """CSRF 를 켜도 읽기 전용 일괄 조회는 토큰 없이 200, 상태를 바꾸는 좋아요 토글은 여전히 400."""
+    monkeypatch.setitem(app.config, "WTF_CSRF_ENABLED", True)
+    resp = client.post("/api/likes/status", json={"video_ids": [videos[0].id]})
+    assert resp.status_code == 200
+    assert resp.get_json()["items"] == {str(videos[0].id): {"is_liked": False, "likes_count": 0}}
+    assert client.post(f"/video/{videos[0].id}/like").status_code == 400
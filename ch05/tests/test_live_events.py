@@ -0,0 +1,159 @@
+# 단위 테스트 – 실시간 카운트 SSE (app.utils.live_events, GET /video/<id>/events)
+
+import json
+
+import pytest
+
+from app import create_app, db, live_events
+from app.models import Video
+
+
+@pytest.fixture
+def app(app):
+    """이벤트를 바로 보내도록 최소 간격 0, 하트비트 짧게."""
+    app.config["LIVE_EVENTS_MIN_INTERVAL"] = 0
+    hub = app.extensions["live_events"]
+    hub.min_interval, hub.heartbeat = 0, 0.05
+    return app
+
+
+@pytest.fixture
+def video(app_ctx):
+    v = Video(title="live", video_path="live.mp4", user_id=1)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _open(client, video_id):
+    """스트림 열고 첫 청크(retry 안내) 소비. (응답, 청크 iterator) 반환."""
+    resp = client.get(f"/video/{video_id}/events", buffered=False)
+    assert resp.status_code == 200 and resp.mimetype == "text/event-stream"
+    chunks = iter(resp.response)
+    assert next(chunks).startswith(b"retry:")
+    return resp, chunks
+
+
+def _next_counts(chunks, limit=50):
+    """하트비트를 건너뛰고 다음 counts 이벤트의 data 반환."""
+    for _ in range(limit):
+        chunk = next(chunks).decode("utf-8")
+        if chunk.startswith("event: counts"):
+            return json.loads(chunk.split("data: ", 1)[1])
+    raise AssertionError("counts 이벤트 없음")
+
+
+def test_slow_subscriber_memory_is_bounded(app_ctx):
+    """읽지 않는 동안 발행이 쌓여도 필드별 합계 1개로 합쳐짐."""
+    subscriber = live_events.subscribe(7)
+    for _ in range(1000):
+        live_events.publish(7, likes=1, views=2, ignored=5)
+    live_events.publish(7, likes=-1)
+    assert len(subscriber.pending) == 2
+    assert subscriber.coalesced == 1000
+    assert subscriber.take(0) == {"likes": 999, "views": 2000}
+    live_events.stream(subscriber).close()
+    assert live_events.connections() == 0
+
+
+def test_stream_pushes_like_view_and_comment_deltas(logged_in_client, video):
+    """좋아요 토글·시청·댓글 작성이 각각 증감분 이벤트로 도착, 닫으면 연결 해제."""
+    resp, chunks = _open(logged_in_client, video.id)
+    assert live_events.connections() == 1
+
+    logged_in_client.post(f"/video/{video.id}/like")
+    assert _next_counts(chunks) == {"likes": 1}
+    logged_in_client.get(f"/watch/{video.id}")
+    assert _next_counts(chunks) == {"views": 1}
+    logged_in_client.post("/comments/create", data={"video_id": video.id, "content": "hi"})
+    assert _next_counts(chunks) == {"comments": 1}
+
+    resp.close()
+    assert live_events.connections() == 0
+
+
+def test_rolled_back_comment_is_not_published(app_ctx, video):
+    """rollback 된 댓글은 발행하지 않음."""
+    from app.models import Comment
+
+    subscriber = live_events.subscribe(video.id)
+    db.session.add(Comment(content="x", user_id=1, video_id=video.id))
+    db.session.flush()
+    db.session.rollback()
+    assert subscriber.take(0) == {}
+
+
+def test_connection_limit_returns_503(app, client, video):
+    """프로세스당 연결 상한 초과 시 503 + Retry-After, 없는 비디오는 404."""
+    app.extensions["live_events"].max_connections = 1
+    first = client.get(f"/video/{video.id}/events", buffered=False)
+    second = client.get(f"/video/{video.id}/events")
+    assert second.status_code == 503 and second.headers["Retry-After"]
+    first.close()
+    assert client.get("/video/9999/events").status_code == 404
+
+
+def test_db_backend_relays_between_workers(tmp_path, monkeypatch):
+    """db 백엔드: 워커 A 의 발행이 live_events 테이블을 거쳐 워커 B 연결에 도착 (자기 행은 건너뜀)."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(tmp_path / "live.db"))
+    monkeypatch.setenv("TAG_GRAPH_PATH", str(tmp_path / "tag_graph.bin"))
+    monkeypatch.setenv("LIVE_EVENTS_BACKEND", "db")
+    workers = [create_app(), create_app()]
+    hubs = [w.extensions["live_events"] for w in workers]
+    for hub in hubs:
+        hub.relay.interval = 3600  # 백그라운드 poll 대신 직접 poll
+    with workers[1].app_context():
+        hubs[1].relay.poll()  # 시작 위치 기록
+        remote = live_events.subscribe(3)
+    with workers[0].app_context():
+        local = live_events.subscribe(3)
+        live_events.publish(3, likes=1)
+        live_events.publish(3, likes=1, comments=1)
+        hubs[0].relay.poll()
+        assert hubs[0].relay.poll() == 0  # 자기 행은 다시 전달하지 않음
+    assert local.take(0) == {"likes": 2, "comments": 1}
+    with workers[1].app_context():
+        assert hubs[1].relay.poll() == 1  # 두 번 발행이 1행으로 합쳐짐
+        assert remote.take(0) == {"likes": 2, "comments": 1}
+    for worker in workers:
+        with worker.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def test_db_relay_runs_only_while_busy(tmp_path, monkeypatch):
+    """db 백엔드 전달 스레드: 연결·보낼 발행분이 없으면 끝나고, 구독하면 다시 시작, stop() 으로 멈춤."""
+    import time
+
+    from app.models import LiveEvent
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(tmp_path / "live.db"))
+    monkeypatch.setenv("TAG_GRAPH_PATH", str(tmp_path / "tag_graph.bin"))
+    monkeypatch.setenv("LIVE_EVENTS_BACKEND", "db")
+    worker = create_app()
+    relay = worker.extensions["live_events"].relay
+    relay.interval = 0.02
+
+    def wait_idle():
+        deadline = time.monotonic() + 5
+        while relay.thread is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return relay.thread is None
+
+    with worker.app_context():
+        assert relay.thread is None  # 발행·구독 전에는 스레드 없음
+        live_events.publish(3, likes=1)  # 연결이 없어도 다른 워커를 위해 1번 쓰고 끝남
+        assert wait_idle()
+        assert db.session.query(LiveEvent).count() == 1
+
+        subscriber = live_events.subscribe(3)
+        time.sleep(0.1)
+        assert relay.thread is not None  # 연결이 있는 동안은 계속 poll
+        worker.extensions["live_events"].unsubscribe(subscriber)
+        assert wait_idle()
+
+        live_events.subscribe(3)
+        relay.stop()
+        assert relay.thread is None
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,92 @@
+# 단위 테스트 – 비디오 미디어 Range 요청 (main.media_video, app.utils.media)
+
+import pytest
+
+DATA = bytes(range(256)) * 40  # 10240 바이트
+
+
+@pytest.fixture
+def media_file(app, tmp_path):
+    """VIDEO_FOLDER 를 임시 폴더로 바꾸고 테스트용 비디오 파일 생성."""
+    app.config["VIDEO_FOLDER"] = str(tmp_path)
+    (tmp_path / "clip.mp4").write_bytes(DATA)
+    return "/media/videos/clip.mp4"
+
+
+def test_full_response_advertises_ranges(client, media_file):
+    """Range 없음 → 200 전체, Accept-Ranges·ETag 포함."""
+    resp = client.get(media_file)
+    assert resp.status_code == 200
+    assert resp.data == DATA
+    assert resp.headers["Accept-Ranges"] == "bytes"
+    assert resp.headers["Content-Length"] == str(len(DATA))
+    assert resp.headers["ETag"]
+
+
+def test_single_range_returns_206(client, media_file):
+    """bytes=100-199 → 206, 정확히 100바이트, Content-Range."""
+    resp = client.get(media_file, headers={"Range": "bytes=100-199"})
+    assert resp.status_code == 206
+    assert resp.data == DATA[100:200]
+    assert resp.headers["Content-Range"] == f"bytes 100-199/{len(DATA)}"
+    assert resp.headers["Content-Length"] == "100"
+
+
+def test_open_ended_and_suffix_ranges(client, media_file):
+    """bytes=N- (끝까지), bytes=-N (마지막 N바이트)."""
+    resp = client.get(media_file, headers={"Range": "bytes=10000-"})
+    assert resp.status_code == 206
+    assert resp.data == DATA[10000:]
+    resp = client.get(media_file, headers={"Range": "bytes=-16"})
+    assert resp.status_code == 206
+    assert resp.data == DATA[-16:]
+
+
+def test_multi_range_returns_multipart(client, media_file):
+    """다중 구간 → multipart/byteranges, 각 파트에 Content-Range."""
+    resp = client.get(media_file, headers={"Range": "bytes=0-9,500-509"})
+    assert resp.status_code == 206
+    assert resp.mimetype == "multipart/byteranges"
+    body = resp.data
+    assert len(body) == int(resp.headers["Content-Length"])
+    assert f"Content-Range: bytes 0-9/{len(DATA)}".encode() in body
+    assert f"Content-Range: bytes 500-509/{len(DATA)}".encode() in body
+    assert DATA[500:510] in body
+
+
+def test_overlapping_ranges_are_merged(client, media_file):
+    """겹치는 구간은 하나로 병합 → 단일 206."""
+    resp = client.get(media_file, headers={"Range": "bytes=0-99,50-149"})
+    assert resp.status_code == 206
+    assert resp.data == DATA[0:150]
+
+
+def test_unsatisfiable_range_returns_416(client, media_file):
+    """파일 크기 밖 구간 → 416, Content-Range: bytes */size."""
+    resp = client.get(media_file, headers={"Range": "bytes=999999-"})
+    assert resp.status_code == 416
+    assert resp.headers["Content-Range"] == f"bytes */{len(DATA)}"
+
+
+def test_if_none_match_returns_304(client, media_file):
+    """ETag 일치 → 304."""
+    etag = client.get(media_file).headers["ETag"]
+    resp = client.get(media_file, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+
+def test_if_range_mismatch_sends_full_file(client, media_file):
+    """If-Range ETag 불일치(파일 변경) → Range 무시하고 200 전체."""
+    etag = client.get(media_file).headers["ETag"]
+    resp = client.get(media_file, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert resp.status_code == 206
+    resp = client.get(media_file, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert resp.status_code == 200
+    assert resp.data == DATA
+
+
+def test_missing_or_escaping_path_returns_404(client, media_file):
+    """없는 파일·경로 탈출 → 404."""
+    assert client.get("/media/videos/nope.mp4").status_code == 404
+    assert client.get("/media/videos/../secret.mp4").status_code == 404
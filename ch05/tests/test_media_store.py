@@ -0,0 +1,149 @@
+# 단위 테스트 – 내용 주소 미디어 저장소·참조 수 (app.utils.media_store)
+
+import hashlib
+import io
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import MediaBlob, User, Video
+from app.utils import media_store
+
+MP4 = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 8
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def folders(app, tmp_path):
+    """저장 폴더를 임시 폴더로."""
+    for kind, key in media_store.FOLDERS.items():
+        app.config[key] = str(tmp_path / kind)
+        os.makedirs(app.config[key])
+    return tmp_path
+
+
+def _refs(kind, filename):
+    blob = db.session.get(MediaBlob, (kind, filename))
+    return blob.ref_count if blob else None
+
+
+def _upload(client, title):
+    return client.post(
+        "/studio/upload",
+        data={"title": title, "video": (io.BytesIO(MP4), "clip.mp4")},
+        content_type="multipart/form-data",
+    )
+
+
+def test_duplicate_uploads_share_one_file(logged_in_client, user, folders):
+    """같은 동영상 두 번 업로드 → 파일 1개·참조 2, 하나 삭제해도 파일 유지, 마지막 삭제 시 파일 삭제."""
+    _upload(logged_in_client, "first")
+    _upload(logged_in_client, "second")
+    name = hashlib.sha256(MP4).hexdigest() + ".mp4"
+    assert [v.video_path for v in Video.query.order_by(Video.id)] == [name, name]
+    assert os.listdir(folders / "video") == [name]
+    assert _refs("video", name) == 2
+
+    first, second = Video.query.order_by(Video.id).all()
+    logged_in_client.post(f"/studio/delete/{first.id}")
+    db.session.expire_all()
+    assert _refs("video", name) == 1
+    assert os.listdir(folders / "video") == [name]
+
+    logged_in_client.post(f"/studio/delete/{second.id}")
+    db.session.expire_all()
+    assert _refs("video", name) is None
+    assert os.listdir(folders / "video") == []
+
+
+def test_rollback_keeps_file(user, folders):
+    """참조를 없앤 변경이 rollback 되면 파일·참조 수 그대로."""
+    name, _, _ = media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    video = Video(title="v", video_path=name, user_id=user.id)
+    db.session.add(video)
+    db.session.commit()
+    db.session.delete(video)
+    db.session.flush()
+    db.session.rollback()
+    assert _refs("video", name) == 1
+    assert os.path.exists(folders / "video" / name)
+
+
+def test_same_image_across_folders_is_linked(user, folders):
+    """썸네일로 올린 이미지를 프로필로 올리면 하드 링크 (inode 공유), 각 폴더 참조 수는 따로."""
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (4, 4), "blue").save(buf, format="PNG")
+    thumb, _, _ = media_store.store_upload(io.BytesIO(buf.getvalue()), "thumbnail", "png", 1 << 20)
+    profile, _, deduped = media_store.store_upload(io.BytesIO(buf.getvalue()), "profile", "png", 1 << 20)
+    assert thumb == profile and deduped is True
+    assert os.stat(folders / "thumbnail" / thumb).st_ino == os.stat(folders / "profile" / profile).st_ino
+
+    user.profile_image = profile
+    db.session.commit()
+    assert _refs("profile", profile) == 1
+    assert _refs("thumbnail", thumb) == 1  # 행에 쓰지 않은 업로드는 고정 상태
+    user.profile_image = None
+    db.session.commit()
+    assert not os.path.exists(folders / "profile" / profile)
+    assert os.path.exists(folders / "thumbnail" / thumb)
+    media_store.release_pins()
+    assert not os.path.exists(folders / "thumbnail" / thumb)
+
+
+def test_dedupe_hit_is_pinned_until_commit(user, folders):
+    """같은 파일을 가져간 업로드가 commit 하기 전에 마지막 주인이 삭제되어도 파일 유지, 참조 수는 1."""
+    name, _, _ = media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    owner = Video(title="owner", video_path=name, user_id=user.id)
+    db.session.add(owner)
+    db.session.commit()
+
+    again, _, deduped = media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    assert again == name and deduped
+    db.session.delete(owner)
+    db.session.commit()
+    assert os.path.exists(folders / "video" / name)
+
+    db.session.add(Video(title="new", video_path=name, user_id=user.id))
+    db.session.flush()
+    db.session.rollback()  # flush 에서 쓴 고정은 되돌아옴
+    assert _refs("video", name) == 1
+    db.session.add(Video(title="new", video_path=name, user_id=user.id))
+    db.session.commit()
+    assert _refs("video", name) == 1
+    media_store.release_pins()
+    assert os.path.exists(folders / "video" / name)
+    assert media_store.check_media_refs() == []
+
+
+def test_discard_keeps_file_pinned_by_other_upload(user, folders):
+    """실패한 업로드의 discard() 는 자기 고정만 풂 – 같은 파일을 막 가져간 다른 업로드의 파일은 유지."""
+    name, _, _ = media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    media_store.discard("video", name)
+    assert os.path.exists(folders / "video" / name)
+    assert _refs("video", name) == 1
+    media_store.discard("video", name)
+    assert not os.path.exists(folders / "video" / name)
+    assert _refs("video", name) is None
+
+
+def test_check_and_repair(user, folders):
+    """SQL 로 직접 바꾼 참조는 불일치로 잡히고 repair 로 복구, 아무도 안 쓰는 파일은 삭제."""
+    name, _, _ = media_store.store_upload(io.BytesIO(MP4), "video", "mp4", len(MP4))
+    db.session.add(Video(title="v", video_path=name, user_id=user.id))
+    db.session.commit()
+    db.session.execute(text("UPDATE videos SET video_path = 'legacy.mp4'"))
+    db.session.commit()
+    assert media_store.check_media_refs() == sorted([("video", "legacy.mp4", 0, 1), ("video", name, 1, 0)])
+    media_store.check_media_refs(repair=True)
+    assert media_store.check_media_refs() == []
+    assert not os.path.exists(folders / "video" / name)
@@ -5,7 +5,7 @@
 import pytest
 from sqlalchemy import text
 
-from app import db
+from app import db, view_counter
 from app.models import Subscription, User, Video
 
 
@@ -70,6 +70,7 @@ def test_watch_reflects_to_real_db(real_client, real_db_data):
     v = real_db_data["video1"]
     before = v.views
     real_client.get(f"/watch/{v.id}")
+    view_counter.flush()
     row = db.session.execute(text("SELECT views FROM videos WHERE id = :id"), {"id": v.id}).fetchone()
     assert row[0] == before + 1
 
@@ -206,3 +206,154 @@ def test_search_preserves_category_sort(client, app_ctx, video_with_keyword):
     # 카테고리/정렬 선택 옵션이 selected 되어 있음
     assert "education" in text
     assert "views" in text
+
+
+# ----- 전문 검색 인덱스 (FTS5) -----
+def _index_ids(q):
+    """video_search 인덱스에서 직접 MATCH 한 rowid 목록 (설정된 토크나이저로 검색식 생성)."""
+    from flask import current_app
+    from sqlalchemy import text
+
+    from app.utils.search_tokenizers import get_tokenizer
+
+    expr = get_tokenizer(current_app.config["SEARCH_TOKENIZER"]).match_expression(q)
+    rows = db.session.execute(
+        text("SELECT rowid FROM video_search WHERE video_search MATCH :q"), {"q": expr}
+    ).fetchall()
+    return sorted(r[0] for r in rows)
+
+
+def test_search_index_synced_on_edit_tags_and_delete(app_ctx, user):
+    """제목 수정·save_tags·삭제 시 인덱스가 같은 트랜잭션에서 갱신."""
+    v = Video(title="원래제목입니다", video_path="fts.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    assert _index_ids("원래제목") == [v.id]
+
+    v.title = "바뀐제목입니다"
+    db.session.commit()
+    assert _index_ids("원래제목") == []
+    assert _index_ids("바뀐제목") == [v.id]
+
+    v.save_tags("인덱스태그")
+    assert _index_ids("인덱스태그") == [v.id]
+
+    vid = v.id
+    db.session.delete(v)
+    db.session.commit()
+    assert _index_ids("바뀐제목") == []
+    assert vid not in _index_ids("인덱스태그")
+
+
+def test_search_matches_tag_name(client, app_ctx, user):
+    """태그 이름으로도 검색 (인덱스 사용 시)."""
+    v = Video(title="태그로만 찾기", video_path="t.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    v.save_tags("고유한태그명")
+    resp = client.get("/search?q=고유한태그명")
+    assert "태그로만 찾기" in resp.data.decode("utf-8")
+
+
+def test_like_fallback_matches_tag_name(app, client, app_ctx, user):
+    """인덱스를 쓸 수 없는 백엔드(LIKE 폴백)에서도 태그 이름 검색 결과가 같음."""
+    v = Video(title="태그로만 찾기", video_path="t.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    v.save_tags("고유한태그명")
+    app.extensions["search_index"] = False
+    items = client.get("/api/videos?search=유한태그").get_json()["items"]
+    assert [item["id"] for item in items] == [v.id]
+    assert client.get("/api/videos?search=없는태그").get_json()["items"] == []
+
+
+def test_search_sort_relevance(client, app_ctx, user):
+    """sort=relevance → 제목 일치(가중치 높음)가 설명 일치보다 먼저."""
+    desc_hit = Video(title="다른 영상", description="관련도테스트 설명", video_path="r1.mp4", user_id=user.id)
+    title_hit = Video(title="관련도테스트 제목", video_path="r2.mp4", user_id=user.id)
+    db.session.add_all([title_hit, desc_hit])
+    db.session.commit()
+    resp = client.get("/api/videos?search=관련도테스트&sort=relevance")
+    titles = [x["title"] for x in resp.get_json()["items"]]
+    assert titles == ["관련도테스트 제목", "다른 영상"]
+
+    resp = client.get("/search?q=관련도테스트&sort=relevance")
+    text = resp.data.decode("utf-8")
+    assert text.find("관련도테스트 제목") < text.find("다른 영상")
+
+
+def test_search_short_query_matches(client, app_ctx, video_title_only):
+    """2글자 검색어도 부분 일치 (hangul_bigram: 인덱스, trigram: LIKE 폴백)."""
+    resp = client.get("/search?q=플라")
+    assert "플라스크 튜토리얼" in resp.data.decode("utf-8")
+
+
+def test_rebuild_index_restores_rows(app_ctx, video_with_keyword):
+    """인덱스를 비운 뒤 rebuild_index() → 다시 검색됨."""
+    from sqlalchemy import text
+
+    from app.utils.search_index import rebuild_index
+
+    db.session.execute(text("DELETE FROM video_search"))
+    db.session.commit()
+    assert _index_ids("검색키워드") == []
+    assert rebuild_index() >= 1
+    assert _index_ids("검색키워드") == [video_with_keyword.id]
+
+
+# ----- 한글 n-gram 토크나이저 -----
+def test_hangul_bigram_tokenizer_index_text():
+    """한글 구간은 2-gram + 끝 조각, 영문은 소문자 3-gram + 끝 조각."""
+    from app.utils.search_tokenizers import HangulNgramTokenizer
+
+    tok = HangulNgramTokenizer(n=2)
+    assert tok.index_text("Flask튜토리얼") == "fla las ask sk k 튜토 토리 리얼 얼"
+    assert tok.match_expression("ython") == '"yth" + "tho" + "hon"'
+    assert tok.match_expression("py") == '"py"*'
+    assert tok.match_expression("튜토") == '"튜토"'
+    assert tok.match_expression("썬 튜토리") == '"썬" + "튜토" + "토리"'
+    assert tok.match_expression("얼") == '"얼"*'
+    assert tok.match_expression("!!!") is None
+
+
+def test_search_short_hangul_query_uses_index(app_ctx, user):
+    """교착어 "튜토리얼입니다" 를 2글자 "튜토"·중간 "리얼입" 으로 인덱스 검색."""
+    v = Video(title="파이썬 튜토리얼입니다", video_path="ko.mp4", user_id=user.id)
+    other = Video(title="토리 이야기", video_path="ko2.mp4", user_id=user.id)
+    db.session.add_all([v, other])
+    db.session.commit()
+    assert _index_ids("튜토") == [v.id]
+    assert _index_ids("리얼입") == [v.id]
+    assert _index_ids("썬 튜토") == [v.id]
+    assert _index_ids("토리") == sorted([v.id, other.id])
+    assert _index_ids("다") == [v.id]
+    assert _index_ids("토리 이") == [other.id]
+
+
+def test_search_latin_mid_word_matches(client, app_ctx, user):
+    """영문 단어 중간 검색 (LIKE·trigram 과 같은 결과): 제목 "Python", 태그 "programming", 설명 "... learning"."""
+    v = Video(title="Python", description="machine learning", video_path="en.mp4", user_id=user.id)
+    other = Video(title="Pythagoras", video_path="en2.mp4", user_id=user.id)
+    db.session.add_all([v, other])
+    db.session.commit()
+    v.save_tags("programming")
+    assert _index_ids("ython") == [v.id]
+    assert _index_ids("gramming") == [v.id]
+    assert _index_ids("earn") == [v.id]
+    assert _index_ids("pyth") == sorted([v.id, other.id])
+    assert _index_ids("ine lear") == [v.id]  # 단어 경계를 넘는 검색어
+    items = client.get("/api/videos?search=gramming").get_json()["items"]
+    assert [item["id"] for item in items] == [v.id]
+
+
+def test_tokenizer_change_rebuilds_index(app, app_ctx, video_with_keyword):
+    """SEARCH_TOKENIZER 변경 후 ensure_index → 새 토크나이저로 재생성·재색인."""
+    from sqlalchemy import text
+
+    from app.utils.search_index import ensure_index
+
+    app.config["SEARCH_TOKENIZER"] = "trigram"
+    assert ensure_index(app) is True
+    sql = db.session.execute(text("SELECT sql FROM sqlite_master WHERE name = 'video_search'")).scalar()
+    assert "trigram" in sql
+    assert _index_ids("검색키워드") == [video_with_keyword.id]
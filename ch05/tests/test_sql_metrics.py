@@ -0,0 +1,92 @@
+# 단위 테스트 – 요청별 SQL 계측 (app.utils.sql_metrics)
+
+import pytest
+
+from app import db, sql_metrics
+from app.models import User, Video
+from app.utils.sql_metrics import statement_shape
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def videos(user):
+    items = [Video(title=f"m{i}", video_path=f"m{i}.mp4", user_id=user.id) for i in range(6)]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def _login_admin(client, user):
+    user.is_admin = True
+    db.session.commit()
+    client.post("/auth/login", data={"login_id": "default", "password": "default"})
+    return client
+
+
+def test_statement_shape_ignores_values_and_in_list_length():
+    """파라미터 값·IN 목록 길이가 달라도 같은 모양."""
+    a = statement_shape("SELECT * FROM videos\n  WHERE id IN (?, ?, ?) AND title = 'x'")
+    b = statement_shape("SELECT * FROM videos WHERE id IN (?, ?) AND title = 'it''s'")
+    assert a == b == "SELECT * FROM videos WHERE id IN (?) AND title = ?"
+
+
+def test_server_timing_header_only_in_debug(app, client, videos):
+    """디버그 모드에서만 Server-Timing 헤더 (쿼리 수·DB 시간)."""
+    assert "Server-Timing" not in client.get("/api/videos").headers
+    app.debug = True
+    header = client.get("/api/videos").headers["Server-Timing"]
+    assert header.startswith("db;dur=") and 'queries"' in header
+
+
+def test_count_queries_records_statements(app_ctx, videos):
+    """count_queries 블록 안 문장 수·모양 기록."""
+    ids = [v.id for v in videos]
+    db.session.expunge_all()
+    with sql_metrics.count_queries() as q:
+        loaded = Video.query.filter(Video.id.in_(ids)).all()
+        assert db.session.get(Video, ids[0]) in loaded  # identity map 적중 → 쿼리 없음
+    assert q.count == 1
+    assert "IN (?)" in q.shapes[0]
+
+
+def test_assert_max_queries_fixture(app, client, videos, assert_max_queries):
+    """상한 이하면 통과, 초과하면 문장 목록과 함께 실패."""
+    with assert_max_queries(20):
+        client.get("/api/videos")
+    with pytest.raises(AssertionError, match="상한 0"):
+        with assert_max_queries(0):
+            client.get("/api/videos")
+
+
+def test_n_plus_one_reported_per_endpoint(app, client, user, videos, caplog):
+    """같은 모양의 문장이 반복되면 경고 로그 + 엔드포인트 통계에 N+1 의심으로 기록."""
+
+    ids = [v.id for v in videos]
+
+    def titles():
+        return ",".join(db.session.get(Video, vid).title for vid in ids)
+
+    app.add_url_rule("/_n_plus_one", "n_plus_one", titles)  # 첫 요청 전에 등록
+    admin_client = _login_admin(client, user)
+    reset = admin_client.post("/admin/metrics/sql")
+    assert reset.get_json()["success"] is True
+    db.session.expunge_all()
+    with caplog.at_level("WARNING"):
+        assert admin_client.get("/_n_plus_one").status_code == 200
+    assert "N+1 의심 (n_plus_one)" in caplog.text
+
+    stats = admin_client.get("/admin/metrics/sql").get_json()["endpoints"]["n_plus_one"]
+    assert stats["requests"] == 1
+    assert stats["queries_max"] >= len(videos)
+    assert stats["n_plus_one"][0]["statement"].startswith("SELECT videos.id")
+    assert len(stats["slowest"]) <= app.config["SQL_METRICS_SLOW_TOP"]
+
+
+def test_metrics_endpoint_requires_admin(logged_in_client):
+    """일반 유저는 403."""
+    assert logged_in_client.get("/admin/metrics/sql").status_code == 403
@@ -1,5 +1,6 @@
 # 단위 테스트 – Studio 업로드 확장자·검증 (화면 미사용)
 import io
+import os
 
 import pytest
 
@@ -42,3 +43,118 @@ def test_allowed_file_case_insensitive():
     allowed = {"mp4", "webm", "mov"}
     assert _allowed_file("v.MP4", allowed) is True
     assert _allowed_file("v.Mp4", allowed) is True
+
+
+# ----- 이어 올리기 조각 업로드 API (app.utils.uploads) -----
+@pytest.fixture
+def upload_dirs(app, tmp_path):
+    """조각·완료 파일을 임시 폴더에 저장."""
+    app.config["VIDEO_FOLDER"] = str(tmp_path / "videos")
+    app.config["UPLOAD_SESSION_FOLDER"] = str(tmp_path / "incoming")
+    os.makedirs(app.config["VIDEO_FOLDER"])
+    os.makedirs(app.config["UPLOAD_SESSION_FOLDER"])
+    return tmp_path
+
+
+def _start(client, size, **extra):
+    body = {"filename": "clip.mp4", "size": size, "title": "조각 업로드", "tags": "a, b", **extra}
+    return client.post("/studio/uploads", json=body)
+
+
+def test_chunked_upload_resume_and_complete(logged_in_client, upload_dirs):
+    """세션 생성 → 조각 PUT (어긋난 offset 은 409 + 현재 위치) → 진행 조회 → 완료 시 rename + Video 생성."""
+    from app import db
+    from app.models import UploadSession, Video
+
+    payload = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 40
+    res = _start(logged_in_client, len(payload))
+    assert res.status_code == 201
+    upload_id = res.get_json()["upload_id"]
+    part = upload_dirs / "incoming" / (db.session.get(UploadSession, upload_id).filename + ".part")
+    assert part.stat().st_size == len(payload)  # 미리 할당
+
+    url = f"/studio/uploads/{upload_id}"
+    assert logged_in_client.put(f"{url}?offset=0", data=payload[:4000]).get_json()["offset"] == 4000
+    # 같은 조각 재전송(응답 유실) → 409 + 받은 위치
+    res = logged_in_client.put(f"{url}?offset=0", data=payload[:4000])
+    assert res.status_code == 409 and res.get_json()["offset"] == 4000
+    assert logged_in_client.get(url).get_json()["offset"] == 4000
+    assert logged_in_client.post(f"{url}/complete").status_code == 409  # 덜 받음
+    assert logged_in_client.put(f"{url}?offset=4000", data=payload[4000:] + b"x").status_code == 400
+    assert logged_in_client.put(f"{url}?offset=4000", data=payload[4000:]).get_json()["offset"] == len(payload)
+
+    res = logged_in_client.post(f"{url}/complete")
+    assert res.status_code == 201
+    video = db.session.get(Video, res.get_json()["video_id"])
+    assert video.title == "조각 업로드" and sorted(t.name for t in video.tags) == ["a", "b"]
+    assert (upload_dirs / "videos" / video.video_path).read_bytes() == payload
+    assert not part.exists()
+    assert logged_in_client.get(url).status_code == 404  # 세션 삭제됨
+
+
+def test_chunked_upload_validation_and_cancel(logged_in_client, upload_dirs, app):
+    """확장자·크기 검증, 취소 시 조각 파일 삭제."""
+    assert _start(logged_in_client, 10, filename="clip.avi").status_code == 400
+    assert _start(logged_in_client, app.config["MAX_VIDEO_SIZE"] + 1).status_code == 400
+    assert _start(logged_in_client, 10, title="").status_code == 400
+
+    upload_id = _start(logged_in_client, 10).get_json()["upload_id"]
+    assert logged_in_client.delete(f"/studio/uploads/{upload_id}").get_json()["success"] is True
+    assert os.listdir(upload_dirs / "incoming") == []
+    assert logged_in_client.put(f"/studio/uploads/{upload_id}?offset=0", data=b"x").status_code == 404
+
+
+def test_expired_sessions_are_purged(logged_in_client, upload_dirs):
+    """만료된 세션은 조회되지 않고 purge_expired 가 행·조각 파일을 삭제."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.utils.uploads import purge_expired
+
+    upload_id = _start(logged_in_client, 10).get_json()["upload_id"]
+    assert logged_in_client.get(f"/studio/uploads/{upload_id}").status_code == 200
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+    assert purge_expired(now=later) == 1
+    assert os.listdir(upload_dirs / "incoming") == []
+    assert logged_in_client.get(f"/studio/uploads/{upload_id}").status_code == 404
+
+
+def test_chunked_upload_checks_first_chunk_magic(logged_in_client, upload_dirs):
+    """첫 조각 내용이 동영상 형식이 아니면 415, 진행 없음."""
+    upload_id = _start(logged_in_client, 64).get_json()["upload_id"]
+    res = logged_in_client.put(f"/studio/uploads/{upload_id}?offset=0", data=b"<html>" + bytes(58))
+    assert res.status_code == 415 and res.get_json()["offset"] == 0
+
+
+def test_session_limits(logged_in_client, upload_dirs, app):
+    """사용자당 진행 중 세션 수 초과 429, 전체 예약 바이트 초과 507 – 거부된 세션은 할당하지 않음."""
+    app.config["UPLOAD_SESSION_MAX_PER_USER"] = 2
+    assert _start(logged_in_client, 10).status_code == 201
+    assert _start(logged_in_client, 10).status_code == 201
+    res = _start(logged_in_client, 10)
+    assert res.status_code == 429 and res.get_json()["success"] is False
+    assert len(os.listdir(upload_dirs / "incoming")) == 2
+
+    app.config["UPLOAD_SESSION_MAX_PER_USER"] = 10
+    app.config["UPLOAD_SESSION_MAX_RESERVED_BYTES"] = 100
+    assert _start(logged_in_client, 81).status_code == 507
+    assert _start(logged_in_client, 80).status_code == 201
+    assert len(os.listdir(upload_dirs / "incoming")) == 3
+
+
+def test_complete_is_claimed_once(logged_in_client, upload_dirs):
+    """같은 세션을 두 요청이 완료하려 하면 세션 행을 먼저 지운 쪽만 처리, 다른 쪽은 409 (500 아님)."""
+    from app import db
+    from app.utils import uploads
+
+    payload = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256))
+    upload_id = _start(logged_in_client, len(payload)).get_json()["upload_id"]
+    logged_in_client.put(f"/studio/uploads/{upload_id}?offset=0", data=payload)
+
+    first = uploads.get_session(upload_id, 1)
+    db.session.expunge(first)
+    second = uploads.get_session(upload_id, 1)
+    assert uploads.claim_session(first) is True
+    assert uploads.claim_session(second) is False
+    assert uploads.get_session(upload_id, 1) is None
+    assert uploads.finalize_file(first)
+    assert logged_in_client.post(f"/studio/uploads/{upload_id}/complete").status_code == 404
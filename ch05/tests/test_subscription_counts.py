@@ -0,0 +1,96 @@
+# 단위 테스트 – 구독 집계 컬럼 (users.subscriber_count / subscription_count)
+
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app, db
+from app.models import Subscription, User
+from app.utils.subscription_counts import check_subscription_counts
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def channel(app_ctx):
+    u = User(username="channel", email="channel@example.com", password_hash="")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def test_toggle_updates_both_counts(client, user, channel):
+    """구독 토글마다 채널 구독자 수·사용자 구독 수가 함께 증감, 응답도 저장된 값."""
+    resp = client.post("/user/channel/subscribe").get_json()
+    assert resp["is_subscribed"] is True and resp["subscriber_count"] == 1
+    db.session.expire_all()
+    assert (channel.subscriber_count, user.subscription_count) == (1, 1)
+
+    resp = client.post("/user/channel/subscribe").get_json()
+    assert resp["is_subscribed"] is False and resp["subscriber_count"] == 0
+    db.session.expire_all()
+    assert (channel.subscriber_count, user.subscription_count) == (0, 0)
+    assert check_subscription_counts() == []
+
+
+def test_profile_reads_stored_count_without_count_query(client, user, channel, assert_max_queries):
+    """프로필 API 는 subscriptions COUNT 없이 저장된 값 반환."""
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+    db.session.commit()
+    with assert_max_queries(10) as recorded:
+        stats = client.get("/api/users/channel").get_json()["item"]["stats"]
+    assert stats["subscriber_count"] == 1 and stats["subscription_count"] == 0
+    assert not any("FROM subscriptions" in shape for shape in recorded.shapes)
+
+
+def test_rollback_discards_increment(user, channel):
+    """구독 추가가 rollback 되면 증가분도 함께 취소."""
+    db.session.add(Subscription(subscriber_id=user.id, subscribed_to_id=channel.id))
+    db.session.flush()
+    db.session.rollback()
+    assert db.session.get(User, channel.id).subscriber_count == 0
+
+
+def test_check_and_repair(user, channel):
+    """SQL 로 직접 넣은 구독은 불일치로 잡히고 repair 로 복구."""
+    db.session.execute(
+        text("INSERT INTO subscriptions (subscriber_id, subscribed_to_id) VALUES (:a, :b)"),
+        {"a": user.id, "b": channel.id},
+    )
+    db.session.commit()
+    assert check_subscription_counts() == [(user.id, (0, 0), (0, 1)), (channel.id, (0, 0), (1, 0))]
+    assert len(check_subscription_counts(repair=True)) == 2
+    assert check_subscription_counts() == []
+
+
+def test_existing_db_gets_columns_and_counts(tmp_path, monkeypatch):
+    """집계 컬럼이 없던 기존 DB: create_app 시 컬럼 추가 후 subscriptions 로 채움."""
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE,
+            email VARCHAR(120) NOT NULL UNIQUE, password_hash VARCHAR(255) NOT NULL, nickname VARCHAR(80),
+            profile_image VARCHAR(255), profile_image_public_id VARCHAR(255), is_admin BOOLEAN NOT NULL DEFAULT 0,
+            created_at DATETIME, updated_at DATETIME);
+        CREATE TABLE subscriptions (subscriber_id INTEGER NOT NULL, subscribed_to_id INTEGER NOT NULL,
+            created_at DATETIME, PRIMARY KEY (subscriber_id, subscribed_to_id));
+        INSERT INTO users (id, username, email, password_hash) VALUES (1, 'default', 'd@x', ''), (2, 'b', 'b@x', '');
+        INSERT INTO subscriptions (subscriber_id, subscribed_to_id) VALUES (1, 2);
+        """
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(path))
+    monkeypatch.setenv("TAG_GRAPH_PATH", str(tmp_path / "tag_graph.bin"))
+    app = create_app()
+    with app.app_context():
+        assert db.session.get(User, 2).subscriber_count == 1
+        assert db.session.get(User, 1).subscription_count == 1
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,137 @@
+# 단위 테스트 – 태그 동시 출현 행렬 (app.utils.tag_graph, 관련 태그 API·태그 페이지)
+
+import mmap
+
+import pytest
+
+from app import db, tag_graph
+from app.models import User, Video
+from app.utils.tag_graph import _Matrix, build_matrix
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def tagged(app_ctx, user):
+    """태그가 달린 비디오 4개: 파이썬+플라스크, 파이썬+플라스크+웹, 파이썬+장고, 태그 없음."""
+    videos = [Video(title=f"tg{i}", video_path=f"tg{i}.mp4", user_id=user.id) for i in range(4)]
+    db.session.add_all(videos)
+    db.session.commit()
+    videos[0].save_tags("파이썬,플라스크")
+    videos[1].save_tags("파이썬,플라스크,웹")
+    videos[2].save_tags("파이썬,장고")
+    return videos
+
+
+def _names(items):
+    return [item["name"] for item in items]
+
+
+def test_build_matrix_roundtrip_from_mmap(tmp_path):
+    """행렬 파일을 mmap 으로 읽어 CSR·postings·이름 조회."""
+    names = {1: "b", 2: "a", 3: "c"}
+    pairs = [(10, 1), (10, 2), (11, 1), (11, 2), (11, 3), (12, 3)]
+    path = tmp_path / "graph.bin"
+    path.write_bytes(build_matrix(pairs, names, built_at=123.0))
+
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    matrix = _Matrix(mm, mm)
+    try:
+        assert matrix.built_at == 123.0
+        assert [matrix.name(i) for i in range(matrix.n)] == ["a", "b", "c"]  # 이름순
+        b = matrix.find_name("b")
+        assert matrix.tag_ids[b] == 1 and matrix.find_id(1) == b
+        assert matrix.find_name("없음") is None and matrix.find_id(99) is None
+        assert [(matrix.name(j), c) for j, c in matrix.neighbors(b)] == [("a", 2), ("c", 1)]
+        assert list(matrix.postings(b)) == [11, 10]
+        assert sorted(matrix.video_tag_ids(11)) == [1, 2, 3]
+        assert matrix.video_tag_ids(99) == []
+    finally:
+        matrix.close()
+
+
+def test_related_tags_cosine_order(tagged):
+    """함께 쓰인 횟수를 두 태그의 비디오 수로 정규화한 점수순."""
+    items = tag_graph.related("파이썬")
+    assert _names(items) == ["플라스크", "웹", "장고"]
+    assert items[0]["count"] == 2 and items[0]["video_count"] == 2
+    assert tag_graph.related("없는태그") == []
+
+
+def test_related_tags_follow_save_tags_incrementally(tagged):
+    """행렬을 만든 뒤의 태그 변경·비디오 삭제도 재구축 없이 반영."""
+    tag_graph.related("파이썬")  # 행렬 생성
+    tagged[3].save_tags("플라스크,웹")
+    tagged[1].save_tags("파이썬")
+    db.session.delete(tagged[2])
+    db.session.commit()
+
+    assert _names(tag_graph.related("플라스크")) == ["웹", "파이썬"]
+    assert tag_graph.video_ids("파이썬") == [tagged[1].id, tagged[0].id]
+    assert tag_graph.tag_info("장고") is None
+
+    # 재구축 결과도 같아야 함
+    before = tag_graph.related("플라스크")
+    tag_graph.rebuild()
+    assert tag_graph.related("플라스크") == before
+
+
+def test_new_tag_after_build_is_visible(tagged):
+    """행렬에 없던 새 태그도 델타로 조회."""
+    tag_graph.related("파이썬")
+    tagged[3].save_tags("새태그,파이썬")
+    assert tag_graph.tag_info("새태그")["count"] == 1
+    assert _names(tag_graph.related("새태그")) == ["파이썬"]
+
+
+def test_file_backend_delta_log_and_compaction(app, tagged, tmp_path):
+    """파일 모드: 행렬 파일 mmap + 델타 로그 append, 재구축 시 반영된 델타 정리."""
+    state = app.extensions["tag_graph"]
+    state.path = str(tmp_path / "tag_graph.bin")
+    state.delta_path = state.path + ".delta"
+    state.matrix = None
+    state.matrix_key = None
+
+    assert _names(tag_graph.related("웹")) == ["플라스크", "파이썬"]
+    assert (tmp_path / "tag_graph.bin").exists()
+
+    tagged[3].save_tags("웹,장고")
+    assert (tmp_path / "tag_graph.bin.delta").read_text(encoding="utf-8").count("\n") == 1
+    assert "장고" in _names(tag_graph.related("웹"))
+
+    tag_graph.rebuild()
+    assert (tmp_path / "tag_graph.bin.delta").read_bytes() == b""
+    assert "장고" in _names(tag_graph.related("웹"))
+
+
+def test_api_related_tags(client, tagged):
+    """GET /api/tags/<name>/related → tag 정보 + 관련 태그 목록."""
+    resp = client.get("/api/tags/웹/related?limit=1")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["success"] is True
+    assert data["tag"]["name"] == "웹" and data["tag"]["count"] == 1
+    assert _names(data["items"]) == ["플라스크"]
+
+
+def test_api_related_tags_unknown_and_unused(client, app_ctx):
+    """없는 태그는 404, 비디오가 없는 태그는 빈 목록."""
+    from app.models import Tag
+
+    assert client.get("/api/tags/없는태그/related").status_code == 404
+    db.session.add(Tag(name="외톨이"))
+    db.session.commit()
+    data = client.get("/api/tags/외톨이/related").get_json()
+    assert data["items"] == [] and data["tag"]["count"] == 0
+
+
+def test_tag_page_shows_related_tags(client, tagged):
+    """태그 페이지에 관련 태그 링크."""
+    html = client.get("/tag/장고").data.decode("utf-8")
+    assert "관련 태그" in html
+    assert "#파이썬" in html
@@ -0,0 +1,119 @@
+# 단위 테스트 – 인기 태그 집계 테이블 (tag_stats, app.utils.tag_stats)
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import Tag, TagStat, User, Video
+from app.utils.tag_stats import check_tag_stats, popular_tags
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (id=1)."""
+    return db.session.get(User, 1)
+
+
+def _video(user, i):
+    v = Video(title=f"ts{i}", video_path=f"ts{i}.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _counts():
+    return {t.name: s.video_count for t, s in db.session.query(Tag, TagStat).join(TagStat, TagStat.tag_id == Tag.id)}
+
+
+def test_save_tags_updates_counts(app_ctx, user):
+    """save_tags 추가·교체 시 비디오 수 증감, 마지막 사용 시각 기록."""
+    v1, v2 = _video(user, 1), _video(user, 2)
+    v1.save_tags("A, B")
+    v2.save_tags("A")
+    assert _counts() == {"A": 2, "B": 1}
+    assert db.session.get(TagStat, Tag.query.filter_by(name="A").one().id).last_used_at is not None
+
+    v1.save_tags("B, C")
+    assert _counts() == {"A": 1, "B": 1, "C": 1}
+    assert check_tag_stats() == []
+
+
+def test_video_delete_decrements(app_ctx, user):
+    """비디오 삭제 시 달려 있던 태그 -1."""
+    v1, v2 = _video(user, 1), _video(user, 2)
+    v1.save_tags("A")
+    v2.save_tags("A, B")
+    db.session.delete(v2)
+    db.session.commit()
+    assert _counts() == {"A": 1, "B": 0}
+    assert check_tag_stats() == []
+
+
+def test_rollback_discards_counts(app_ctx, user):
+    """태그 변경을 rollback 하면 집계도 되돌아감 (같은 트랜잭션)."""
+    v = _video(user, 1)
+    v.save_tags("A")
+    v.save_tags("A, B", commit=False)
+    db.session.flush()
+    db.session.rollback()
+    assert _counts() == {"A": 1}
+
+
+def test_popular_tags_order_and_limit(app_ctx, user):
+    """비디오 수 내림차순, 비디오 없는 태그 제외."""
+    videos = [_video(user, i) for i in range(3)]
+    videos[0].save_tags("많음, 중간")
+    videos[1].save_tags("많음, 중간")
+    videos[2].save_tags("많음")
+    db.session.add(Tag(name="빈태그"))
+    db.session.commit()
+    assert [t.name for t in popular_tags()] == ["많음", "중간"]
+    assert [t.name for t in popular_tags(limit=1)] == ["많음"]
+
+
+def test_check_tag_stats_detects_and_repairs_drift(app_ctx, user):
+    """ORM 을 거치지 않은 video_tags 변경 → 검사에서 발견, repair 로 복구."""
+    v = _video(user, 1)
+    v.save_tags("A, B")
+    tag_a = Tag.query.filter_by(name="A").one()
+    db.session.execute(text("DELETE FROM video_tags WHERE tag_id = :t"), {"t": tag_a.id})
+    db.session.commit()
+
+    assert check_tag_stats() == [(tag_a.id, 1, 0)]
+    assert check_tag_stats(repair=True) == [(tag_a.id, 1, 0)]
+    assert check_tag_stats() == []
+    assert _counts() == {"A": 0, "B": 1}
+
+
+def test_api_popular_tags_uses_stats(client, app_ctx, user):
+    """GET /api/tags/popular → tag_stats 순서."""
+    v1, v2 = _video(user, 1), _video(user, 2)
+    v1.save_tags("둘, 하나")
+    v2.save_tags("둘")
+    data = client.get("/api/tags/popular").get_json()
+    assert [item["name"] for item in data["items"]] == ["둘", "하나"]
+
+
+def test_apply_deltas_same_new_tag_two_connections(tmp_path):
+    """두 업로드가 같은 새 태그를 동시에 처음 사용: 한쪽이 행을 만들고 commit 한 뒤 다른 쪽이 INSERT 해도 PK 위반 없음."""
+    from sqlalchemy import create_engine, event, select
+
+    from app.utils.tag_stats import apply_deltas
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    TagStat.__table__.create(engine)
+    with engine.connect() as first, engine.connect() as second:
+        raced = []
+
+        @event.listens_for(second, "before_cursor_execute")
+        def _other_upload_commits_first(conn, cursor, statement, parameters, context, executemany):
+            # second 의 첫 INSERT 직전에 first 가 같은 태그 행을 만들고 commit
+            if statement.lstrip().upper().startswith("INSERT") and not raced:
+                raced.append(statement)
+                apply_deltas(first, {7: 1})
+                first.commit()
+
+        apply_deltas(second, {7: 1})
+        second.commit()
+        assert raced
+        assert second.execute(select(TagStat.__table__.c.video_count)).scalar_one() == 2
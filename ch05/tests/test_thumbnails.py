@@ -0,0 +1,125 @@
+# 단위 테스트 – 썸네일 크기별 파생 이미지·포스터 지정 (app.utils.thumbnails)
+
+import hashlib
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app import db, thumbnails
+from app.models import Video
+from app.utils.thumbnails import render_variants
+
+MP4 = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 8
+
+
+def _photo(size=(1280, 720), fmt="JPEG", quality=92):
+    """사진처럼 세밀한 이미지 (망델브로 집합 + 색 채널)."""
+    gray = Image.effect_mandelbrot(size, (-2.2, -1.2, 1.0, 1.2), 64)
+    img = Image.merge("RGB", (gray, gray.rotate(180), gray.transpose(Image.FLIP_LEFT_RIGHT)))
+    buf = io.BytesIO()
+    img.save(buf, fmt, quality=quality)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def folders(app, app_ctx, tmp_path):
+    for key in ("VIDEO_FOLDER", "THUMBNAIL_FOLDER", "PROFILE_IMAGE_FOLDER", "THUMBNAIL_VARIANT_FOLDER"):
+        app.config[key] = str(tmp_path / key.lower())
+        os.makedirs(app.config[key])
+    return tmp_path
+
+
+def _upload(client, thumb=None, title="clip", ext="jpg"):
+    data = {"title": title, "video": (io.BytesIO(MP4), "clip.mp4")}
+    if thumb is not None:
+        data["thumbnail"] = (io.BytesIO(thumb), f"thumb.{ext}")
+    client.post("/studio/upload", data=data, content_type="multipart/form-data")
+    thumbnails.wait()
+    return Video.query.filter_by(title=title).one()
+
+
+def test_render_variants_sizes_and_bytes(tmp_path):
+    """너비별 WebP·JPEG, 원본보다 큰 너비는 확대하지 않음. 320px WebP 는 원본의 1/10 미만."""
+    original = _photo()
+    source = tmp_path / "a.jpg"
+    source.write_bytes(original)
+    out = tmp_path / "out"
+    assert render_variants(str(source), str(out), "a.jpg", (160, 320, 640, 2000)) == 8
+    for width in (160, 320, 640):
+        with Image.open(out / str(width) / "a.jpg.webp") as img:
+            assert img.size == (width, round(720 * width / 1280))
+    with Image.open(out / "2000" / "a.jpg.jpg") as img:
+        assert img.size == (1280, 720)
+    assert os.path.getsize(out / "320" / "a.jpg.webp") * 10 < len(original)
+    # 이미 있으면 건너뜀
+    assert render_variants(str(source), str(out), "a.jpg", (160, 320)) == 0
+
+
+def test_upload_generates_variants_and_srcset(logged_in_client, folders, app):
+    """썸네일 업로드 commit → 파생 이미지 생성, 목록은 srcset, 파생 이미지는 immutable 캐시."""
+    thumb = _photo()
+    video = _upload(logged_in_client, thumb)
+    name = hashlib.sha256(thumb).hexdigest() + ".jpg"
+    assert video.thumbnail_path == name
+    for width in (160, 320, 640):
+        assert (folders / "thumbnail_variant_folder" / str(width) / f"{name}.webp").exists()
+
+    html = logged_in_client.get("/").get_data(as_text=True)
+    assert f"/media/thumbnails/160/{name}.webp 160w" in html
+    assert f'src="/media/thumbnails/320/{name}.jpg"' in html
+    with app.test_request_context():
+        assert video.get_thumbnail_url(320, "webp") == f"/media/thumbnails/320/{name}.webp"
+
+    resp = logged_in_client.get(f"/media/thumbnails/320/{name}.webp")
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/webp"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert logged_in_client.get(f"/media/thumbnails/333/{name}.webp").status_code == 404
+    assert logged_in_client.get(f"/media/thumbnails/320/{name}.gif").status_code == 404
+
+
+def test_variant_generated_on_request(logged_in_client, folders, app):
+    """파생 이미지가 아직 없으면(예전 썸네일) 요청한 너비만 바로 생성."""
+    video = _upload(logged_in_client, _photo(fmt="PNG"), ext="png")
+    variant_root = folders / "thumbnail_variant_folder"
+    for width in os.listdir(variant_root):
+        for name in os.listdir(variant_root / width):
+            os.remove(variant_root / width / name)
+
+    with app.test_request_context():
+        url = video.get_thumbnail_url(160)
+    resp = logged_in_client.get(url)
+    assert resp.status_code == 200
+    assert Image.open(io.BytesIO(resp.data)).size == (160, 90)
+    assert os.listdir(variant_root / "320") == []
+
+
+def test_variants_removed_with_thumbnail(logged_in_client, folders):
+    """썸네일 파일이 삭제되면(참조 수 0) 파생 이미지도 삭제."""
+    video = _upload(logged_in_client, _photo())
+    logged_in_client.post(f"/studio/delete/{video.id}")
+    variant_root = folders / "thumbnail_variant_folder"
+    assert all(os.listdir(variant_root / width) == [] for width in os.listdir(variant_root))
+
+
+def test_adopt_poster(logged_in_client, folders, app):
+    """포스터 프레임은 썸네일 없는 동영상에만 지정 (내용 해시 이름), 이미 있으면 버림."""
+    video = _upload(logged_in_client)
+    poster = _photo(size=(640, 360))
+    temp = os.path.join(app.config["THUMBNAIL_FOLDER"], ".poster.jpg")
+    with open(temp, "wb") as f:
+        f.write(poster)
+    name = thumbnails.adopt_poster(video.id, temp)
+    assert name == hashlib.sha256(poster).hexdigest() + ".jpg"
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).thumbnail_path == name
+    thumbnails.wait()
+    assert (folders / "thumbnail_variant_folder" / "160" / f"{name}.webp").exists()
+
+    other = _photo(size=(320, 180))
+    with open(temp, "wb") as f:
+        f.write(other)
+    assert thumbnails.adopt_poster(video.id, temp) is None
+    assert not os.path.exists(os.path.join(app.config["THUMBNAIL_FOLDER"], hashlib.sha256(other).hexdigest() + ".jpg"))
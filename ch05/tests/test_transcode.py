@@ -0,0 +1,239 @@
+# 단위 테스트 – 업로드 후 변환 파이프라인 상태·HLS 서빙 (app.utils.transcode)
+# ffmpeg 실행 자체는 다루지 않음: 작업 예약은 기록만 하고, 단계별 완료 처리(prepared·segmented)를 직접 호출
+
+import io
+import os
+
+import pytest
+
+from app import db
+from app.models import Rendition, Video
+from app.utils import transcode
+
+MP4 = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 8
+
+
+@pytest.fixture
+def pipeline(app, app_ctx, tmp_path, monkeypatch):
+    """변환 켜기 + 결과 폴더를 임시 폴더로, 예약된 작업은 실행하지 않고 (함수 이름, 인자) 로 기록."""
+    for key in ("VIDEO_FOLDER", "THUMBNAIL_FOLDER", "PROFILE_IMAGE_FOLDER"):
+        app.config[key] = str(tmp_path / key.lower())
+        os.makedirs(app.config[key])
+    state = app.extensions["transcoder"]
+    state.enabled = True
+    app.config["TRANSCODE_FOLDER"] = state.folder = str(tmp_path / "transcoded")
+    state.calls = []
+    monkeypatch.setattr(state, "submit", lambda fn, *args: state.calls.append((fn.__name__, args)))
+    return state
+
+
+def _upload(client, title="clip"):
+    client.post(
+        "/studio/upload",
+        data={"title": title, "video": (io.BytesIO(MP4), "clip.mp4")},
+        content_type="multipart/form-data",
+    )
+    return Video.query.filter_by(title=title).one()
+
+
+def _statuses(video_id):
+    return {r.name: r.status for r in Rendition.query.filter_by(video_id=video_id)}
+
+
+def test_commands():
+    """faststart: mp4 는 스트림 복사 / HLS: 화질 높이·세그먼트 길이·키프레임 간격 / master: 낮은 화질부터."""
+    copy = transcode.faststart_command("ffmpeg", "in.mp4", "out.mp4", copy=True)
+    assert copy[copy.index("-c") + 1] == "copy"
+    assert copy[-5:] == ["-movflags", "+faststart", "-f", "mp4", "out.mp4"]
+    encode = transcode.faststart_command("ffmpeg", "in.webm", "out.mp4", copy=False)
+    assert "libx264" in encode and "+faststart" in encode
+
+    hls = transcode.hls_command("ffmpeg", "in.mp4", "/out", 720, 2800, 6)
+    assert hls[hls.index("-vf") + 1] == "scale=-2:720"
+    assert hls[hls.index("-hls_time") + 1] == "6"
+    assert "expr:gte(t,n_forced*6)" in hls
+    assert hls[-1] == os.path.join("/out", "index.m3u8")
+
+    master = transcode.master_playlist([("hls_720p", 1280, 720, 2800), ("hls_360p", 640, 360, 800)])
+    assert master.splitlines() == [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        "#EXT-X-STREAM-INF:BANDWIDTH=928000,RESOLUTION=640x360",
+        "hls_360p/index.m3u8",
+        "#EXT-X-STREAM-INF:BANDWIDTH=2928000,RESOLUTION=1280x720",
+        "hls_720p/index.m3u8",
+    ]
+
+
+def test_disabled_upload_creates_no_renditions(logged_in_client, app_ctx):
+    """ffmpeg 이 없거나 꺼져 있으면 변환 행·작업 없음, 시청 페이지는 원본 재생."""
+    video = _upload(logged_in_client)
+    assert Rendition.query.count() == 0
+    html = logged_in_client.get(f"/watch/{video.id}").get_data(as_text=True)
+    assert f'src="/media/videos/{video.video_path}"' in html
+    assert "data-hls" not in html
+
+
+def test_upload_queues_renditions(logged_in_client, pipeline):
+    """업로드 commit → mp4 + 화질별 queued 행 (같은 트랜잭션), commit 후 1단계 작업 예약."""
+    video = _upload(logged_in_client)
+    assert _statuses(video.id) == {"mp4": "queued", "hls_360p": "queued", "hls_720p": "queued", "hls_1080p": "queued"}
+    assert pipeline.calls == [("process", (video.id,))]
+
+
+def test_pipeline_states_and_hls_playback(logged_in_client, pipeline):
+    """faststart 완료 → 길이 기록·높은 화질 skipped·HLS 예약, 화질 완료 → master 작성 후 시청 페이지가 HLS 사용."""
+    video = _upload(logged_in_client)
+    pipeline.calls.clear()
+
+    pipeline.prepared(video.id, 12.6, 1280, 720)
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).duration == 13
+    assert _statuses(video.id) == {"mp4": "ready", "hls_360p": "queued", "hls_720p": "queued", "hls_1080p": "skipped"}
+    assert pipeline.calls == [("segment", (video.id, "hls_360p")), ("segment", (video.id, "hls_720p"))]
+    assert Rendition.query.filter_by(video_id=video.id, name="hls_360p").one().width == 640
+
+    studio = logged_in_client.get("/studio/").get_data(as_text=True)
+    assert "변환 중 1/3" in studio
+
+    pipeline.segmented(video.id, "hls_360p")
+    master = os.path.join(pipeline.folder, str(video.id), transcode.MASTER_PLAYLIST)
+    with open(master, encoding="utf-8") as f:
+        assert f.read().splitlines()[-1] == "hls_360p/index.m3u8"
+
+    html = logged_in_client.get(f"/watch/{video.id}").get_data(as_text=True)
+    assert f'data-hls="/media/transcoded/{video.id}/master.m3u8"' in html
+    assert f'src="/media/transcoded/{video.id}/faststart.mp4"' in html
+    resp = logged_in_client.get(f"/media/transcoded/{video.id}/master.m3u8")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/vnd.apple.mpegurl"
+
+    pipeline.segmented(video.id, "hls_720p")
+    status = logged_in_client.get(f"/studio/videos/{video.id}/transcode").get_json()
+    assert status["summary"] == {"status": "ready", "ready": 3, "total": 3}
+    assert status["duration"] == 13
+    assert {r["name"]: r["status"] for r in status["renditions"]}["hls_1080p"] == "skipped"
+
+
+def test_temp_output_not_served(client, pipeline):
+    """변환 중 임시 출력(.<화질>.tmp/)은 결과 폴더 안에 있어도 404, 완성된 결과만 응답."""
+    video_dir = pipeline.video_dir(1)
+    for rel in (".hls_720p.tmp/index.m3u8", "hls_360p/index.m3u8"):
+        os.makedirs(os.path.dirname(os.path.join(video_dir, rel)), exist_ok=True)
+        with open(os.path.join(video_dir, rel), "w", encoding="utf-8") as f:
+            f.write("#EXTM3U\n")
+    assert client.get("/media/transcoded/1/.hls_720p.tmp/index.m3u8").status_code == 404
+    assert client.get("/media/transcoded/1/hls_360p/index.m3u8").status_code == 200
+
+
+def test_low_resolution_keeps_lowest_rendition(logged_in_client, pipeline):
+    """원본이 가장 낮은 화질보다 작으면 그 화질을 원본 높이로 만들고 나머지는 skipped."""
+    video = _upload(logged_in_client)
+    pipeline.prepared(video.id, None, 426, 240)
+    row = Rendition.query.filter_by(video_id=video.id, name="hls_360p").one()
+    assert (row.status, row.width, row.height) == ("queued", 426, 240)
+    assert _statuses(video.id)["hls_720p"] == "skipped"
+
+
+def test_delete_removes_renditions_and_output(logged_in_client, pipeline):
+    """비디오 삭제 → 변환 행은 같은 트랜잭션, 결과 폴더는 commit 후 삭제. 삭제 후 끝난 작업은 결과를 버림."""
+    video = _upload(logged_in_client)
+    video_id = video.id
+    pipeline.prepared(video_id, 5.0, 640, 360)
+    pipeline.segmented(video_id, "hls_360p")
+    assert os.path.isdir(pipeline.video_dir(video_id))
+
+    logged_in_client.post(f"/studio/delete/{video_id}")
+    assert Rendition.query.filter_by(video_id=video_id).count() == 0
+    assert not os.path.exists(pipeline.video_dir(video_id))
+
+    os.makedirs(pipeline.video_dir(video_id))
+    pipeline.segmented(video_id, "hls_720p")
+    assert not os.path.exists(pipeline.video_dir(video_id))
+
+
+def test_requeue(logged_in_client, pipeline, app):
+    """faststart 전이면 처음부터, 끝났으면 실패한 화질만 다시 예약. backfill 은 변환 행 없는 기존 비디오 포함."""
+    from app import transcoder
+
+    done = _upload(logged_in_client, "done")
+    pending = _upload(logged_in_client, "pending")
+    pipeline.prepared(done.id, 5.0, 1280, 720)
+    pipeline._set(done.id, "hls_720p", status="failed", error="x")
+    pipeline.enabled = False
+    old = _upload(logged_in_client, "old")
+    pipeline.enabled = True
+    pipeline.calls.clear()
+
+    assert transcoder.requeue() == 3
+    assert sorted(pipeline.calls) == [
+        ("process", (pending.id,)),
+        ("segment", (done.id, "hls_360p")),  # 아직 queued
+        ("segment", (done.id, "hls_720p")),
+    ]
+
+    pipeline.calls.clear()
+    transcoder.requeue(backfill=True)
+    assert ("process", (old.id,)) in pipeline.calls
+    assert _statuses(old.id)["mp4"] == "queued"
+
+
+def test_claim_runs_each_job_once(logged_in_client, pipeline):
+    """여러 워커가 같은 작업을 예약해도 queued → running 으로 가져간 1곳만 실행."""
+    video = _upload(logged_in_client)
+    assert pipeline._claim(video.id, "mp4") is True
+    assert pipeline._claim(video.id, "mp4") is False
+    assert _statuses(video.id)["mp4"] == "running"
+
+
+def test_resume_after_restart(logged_in_client, pipeline):
+    """재시작 후 첫 요청: queued 작업과 오래 running 으로 남은 작업을 다시 예약 (프로세스마다 1번)."""
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import update
+
+    queued = _upload(logged_in_client, "queued")
+    stale = _upload(logged_in_client, "stale")
+    busy = _upload(logged_in_client, "busy")
+    long_ago = datetime.now(timezone.utc) - timedelta(seconds=pipeline.stale_after + 60)
+    db.session.execute(
+        update(Rendition).where(Rendition.video_id == stale.id, Rendition.name == "mp4")
+        .values(status="running", updated_at=long_ago)
+    )
+    pipeline._claim(busy.id, "mp4")  # 다른 워커가 지금 변환 중
+    db.session.commit()
+    pipeline.calls.clear()
+    pipeline.resumed = False
+
+    logged_in_client.get("/")
+    assert sorted(pipeline.calls) == [("process", (queued.id,)), ("process", (stale.id,))]
+    assert _statuses(stale.id)["mp4"] == "queued"
+    logged_in_client.get("/")
+    assert len(pipeline.calls) == 2
+
+
+def test_slots_bound_concurrency_across_processes(app, tmp_path, monkeypatch):
+    """동시 실행 슬롯은 파일 잠금 – 모두 사용 중이면 하나가 풀릴 때까지 대기."""
+    import threading
+
+    if transcode.fcntl is None:
+        pytest.skip("flock 없는 플랫폼")
+    monkeypatch.setattr(transcode, "SLOT_POLL", 0.01)
+    state = app.extensions["transcoder"]
+    state.folder, state.workers = str(tmp_path), 1
+    other = transcode._Pipeline(app)  # 같은 노드의 다른 워커 프로세스
+    other.folder, other.workers = str(tmp_path), 1
+
+    held = state._acquire_slot()
+    acquired = threading.Event()
+
+    def wait_for_slot():
+        other._acquire_slot().close()
+        acquired.set()
+
+    thread = threading.Thread(target=wait_for_slot)
+    thread.start()
+    assert not acquired.wait(0.1)
+    held.close()
+    assert acquired.wait(2)
+    thread.join()
@@ -128,3 +128,93 @@ def test_commit_false(app_ctx, video):
     db.session.commit()  # 호출자가 명시적으로 commit
     video_reloaded = db.session.get(Video, video.id)
     assert len(video_reloaded.tags) == 2
+
+
+# ----- save_tags: 일괄 처리 -----
+def _count_statements(fn):
+    """fn 실행 중 DB 로 나간 SQL 문장 수."""
+    from sqlalchemy import event
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return len(statements)
+
+
+def test_save_tags_query_count_independent_of_tag_count(app_ctx, user):
+    """태그 2개든 20개든 쿼리 수 동일 (태그별 조회·INSERT 없음)."""
+    v1 = Video(title="적음", video_path="few.mp4", user_id=user.id)
+    v2 = Video(title="많음", video_path="many.mp4", user_id=user.id)
+    db.session.add_all([v1, v2])
+    db.session.commit()
+
+    few = _count_statements(lambda: v1.save_tags("a0, a1", commit=False))
+    many = _count_statements(lambda: v2.save_tags(", ".join(f"b{i}" for i in range(20)), commit=False))
+    db.session.commit()
+    assert few == many
+    assert sorted(t.name for t in v2.tags) == sorted(f"b{i}" for i in range(20))
+
+
+def test_save_tags_only_touches_changed_rows(app_ctx, video):
+    """그대로 남는 태그의 video_tags 행은 다시 쓰지 않음 (created_at 유지)."""
+    from sqlalchemy import select
+
+    from app.models.video import video_tags
+
+    video.save_tags("유지, 삭제")
+    kept = Tag.query.filter_by(name="유지").one()
+    stmt = select(video_tags.c.created_at).where(
+        video_tags.c.video_id == video.id, video_tags.c.tag_id == kept.id
+    )
+    before = db.session.execute(stmt).scalar()
+
+    video.save_tags("유지, 추가")
+    assert db.session.execute(stmt).scalar() == before
+    assert sorted(t.name for t in db.session.get(Video, video.id).tags) == ["유지", "추가"]
+
+
+def test_save_tags_dedupes_names(app_ctx, video):
+    """같은 이름이 여러 번 있어도 한 번만 연결."""
+    video.save_tags("중복, 중복 , 다른")
+    assert [t.name for t in video.tags] == ["중복", "다른"]
+
+
+def test_save_tags_tolerates_concurrently_created_tag(app_ctx, video, monkeypatch):
+    """조회 후 다른 트랜잭션이 같은 새 태그를 먼저 만든 경우에도 UNIQUE 위반 없이 연결."""
+    from app.utils import sql
+
+    original = sql.insert_ignore
+
+    def racing_insert(connection, table, rows, conflict_columns):
+        if table is Tag.__table__:
+            # 조회와 INSERT 사이에 다른 업로드가 같은 이름을 먼저 넣은 상황
+            connection.execute(table.insert().values(name="경쟁태그"))
+        original(connection, table, rows, conflict_columns)
+
+    monkeypatch.setattr(sql, "insert_ignore", racing_insert)
+    video.save_tags("경쟁태그")
+    assert [t.name for t in video.tags] == ["경쟁태그"]
+    assert Tag.query.filter_by(name="경쟁태그").count() == 1
+
+
+def test_save_tags_calls_tags_changed_hooks(app_ctx, video, monkeypatch):
+    """태그가 바뀐 경우에만 등록된 콜백을 추가·삭제된 tag_id 와 함께 호출 (바뀐 것이 없으면 호출 없음)."""
+    from app.models import video as video_module
+
+    calls = []
+    monkeypatch.setattr(video_module, "_TAGS_CHANGED_HOOKS", list(video_module._TAGS_CHANGED_HOOKS))
+    video_module.on_tags_changed(lambda session, connection, v, added, removed: calls.append((v.id, added, removed)))
+
+    video.save_tags("가, 나")
+    first = {t.name: t.id for t in video.tags}
+    video.save_tags("나, 다")
+    video.save_tags("나, 다")
+    third = Tag.query.filter_by(name="다").one().id
+    assert calls == [
+        (video.id, {first["가"], first["나"]}, set()),
+        (video.id, {third}, {first["가"]}),
+    ]
@@ -0,0 +1,120 @@
+# 단위 테스트 – 조회수 write-behind 버퍼 (app.utils.view_counter)
+
+import pytest
+from sqlalchemy import text
+
+from app import db, view_counter
+from app.models import User, Video
+
+
+@pytest.fixture
+def video(app_ctx):
+    """테스트용 비디오 (조회수 0)."""
+    v = Video(title="버퍼 테스트", video_path="buf.mp4", user_id=1, views=0)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _db_views(video_id):
+    """세션 캐시를 거치지 않고 videos.views 를 raw SQL로 조회."""
+    return db.session.execute(text("SELECT views FROM videos WHERE id = :id"), {"id": video_id}).scalar()
+
+
+def test_record_buffers_until_flush(client, app_ctx, video):
+    """임계치 전에는 DB에 쓰지 않고, flush 시 합산된 증가분이 한 번에 반영."""
+    for _ in range(3):
+        client.get(f"/watch/{video.id}")
+    assert _db_views(video.id) == 0
+    assert view_counter.pending(video.id) == 3
+
+    assert view_counter.flush() == 1
+    assert _db_views(video.id) == 3
+    assert view_counter.pending(video.id) == 0
+
+
+def test_record_shows_fresh_count_before_flush(client, app_ctx, video):
+    """미반영 증가분도 화면·API 응답에는 반영 (approximately fresh)."""
+    client.get(f"/watch/{video.id}")
+    resp = client.get(f"/api/videos/{video.id}")
+    assert resp.get_json()["item"]["views"] == 2
+    resp = client.get(f"/watch/{video.id}")
+    assert "조회수 3회" in resp.data.decode("utf-8")
+
+
+def test_threshold_triggers_flush(app, client, app_ctx, video):
+    """VIEW_COUNTER_FLUSH_THRESHOLD 도달 시 요청 중 자동 flush."""
+    app.extensions["view_counter"].threshold = 2
+    client.get(f"/watch/{video.id}")
+    assert _db_views(video.id) == 0
+    client.get(f"/watch/{video.id}")
+    assert _db_views(video.id) == 2
+    assert view_counter.pending(video.id) == 0
+
+
+def test_overlay_not_written_on_unrelated_commit(client, app_ctx, video):
+    """미반영 증가분 표시는 dirty가 아니므로 다른 commit 에 섞여 저장되지 않음."""
+    client.get(f"/watch/{video.id}")
+    u = db.session.get(User, 1)
+    u.nickname = "닉네임"
+    db.session.commit()
+    assert _db_views(video.id) == 0
+    view_counter.flush()
+    assert _db_views(video.id) == 1
+
+
+def test_file_backend_spool_is_shared(app, app_ctx, video, tmp_path):
+    """file 백엔드: spool 에 기록된 증가분(다른 워커 분 포함)을 flush 한 번에 반영."""
+    buffer = app.extensions["view_counter"]
+    buffer.backend = "file"
+    buffer.spool_path = str(tmp_path / "views.spool")
+    # 다른 워커 프로세스가 남긴 기록 시뮬레이션
+    with open(buffer.spool_path, "w", encoding="utf-8") as f:
+        f.write(f"{video.id}\n{video.id}\n")
+
+    buffer.record(video.id)
+    assert view_counter.flush() == 1
+    assert _db_views(video.id) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_flush_failure_does_not_fail_request(app, client, app_ctx, video):
+    """요청 중 flush 가 DB 오류로 실패해도 시청 페이지는 200, 증가분은 버퍼에 남아 다음 flush 에서 반영."""
+    from sqlalchemy import event
+    from sqlalchemy.exc import OperationalError
+
+    app.extensions["view_counter"].threshold = 1
+
+    def locked(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE videos SET views"):
+            raise OperationalError(statement, parameters, Exception("database is locked"))
+
+    event.listen(db.engine, "before_cursor_execute", locked)
+    try:
+        assert client.get(f"/watch/{video.id}").status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", locked)
+    assert view_counter.pending(video.id) == 1
+    assert _db_views(video.id) == 0
+    view_counter.flush()
+    assert _db_views(video.id) == 1
+
+
+def test_timer_flushes_after_traffic_stops(app, client, app_ctx, video):
+    """주기 flush 스레드: 시청이 더 없어도 interval 이 지나면 반영."""
+    import time
+
+    buffer = app.extensions["view_counter"]
+    app.config["VIEW_COUNTER_TIMER"] = True
+    buffer.interval = 0.1
+    buffer.threshold = 1000
+    try:
+        buffer.last_flush = time.monotonic()
+        view_counter.record(video)
+        deadline = time.monotonic() + 5
+        while view_counter.pending(video.id) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        buffer.stop_timer()
+    assert view_counter.pending(video.id) == 0
+    assert _db_views(video.id) == 1
@@ -3,7 +3,7 @@
 import pytest
 from sqlalchemy import text
 
-from app import db
+from app import db, view_counter
 from app.models import User, Video
 
 
@@ -63,8 +63,9 @@ def test_watch_increments_views(client, app_ctx, video):
 
 
 def test_watch_videos_table_views_reflected(client, app_ctx, video):
-    """시청 후 videos 테이블의 views 컬럼이 DB에 반영되는지 raw SQL로 확인."""
+    """시청 후 videos 테이블의 views 컬럼이 DB에 반영되는지 raw SQL로 확인 (write-behind flush 후)."""
     client.get(f"/watch/{video.id}")
+    view_counter.flush()
     row = db.session.execute(
         text("SELECT views FROM videos WHERE id = :id"),
         {"id": video.id},
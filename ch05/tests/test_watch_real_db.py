@@ -5,7 +5,7 @@
 import pytest
 from sqlalchemy import text
 
-from app import db
+from app import db, view_counter
 from app.models import User, Video
 
 
@@ -35,6 +35,8 @@ def test_watch_increments_views_in_real_db(real_client, real_app_ctx):
     # 시청 요청 (GET /watch/<id>) → DB에 조회수 1 증가 반영
     resp = real_client.get(f"/watch/{video.id}")
     assert resp.status_code == 200
+    # write-behind 버퍼에 쌓인 증가분을 DB에 반영
+    view_counter.flush()
 
     # DB에서 직접 조회해 조회수 1 증가 반영 확인
     row = db.session.execute(